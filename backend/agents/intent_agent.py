@@ -11,6 +11,8 @@ from enum import Enum
 from typing import Optional
 from pydantic import BaseModel
 
+from cache import generate_with_semantic_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -78,8 +80,14 @@ Respond with JSON: {"intent": "<type>", "confidence": 0.0-1.0, "keywords": [], "
         examples = "\n".join([f"Q: \"{ex['query']}\" -> {ex['intent']}" for ex in self.FEW_SHOT_EXAMPLES])
         prompt = f"Examples:\n{examples}\n\nClassify: \"{query}\""
 
-        response = await self.llm.generate(
-            prompt=prompt, system_prompt=self.SYSTEM_PROMPT, max_tokens=200, temperature=0.1
+        response = await generate_with_semantic_cache(
+            self.llm,
+            namespace="intent_classification",
+            semantic_text=query,
+            prompt=prompt,
+            system_prompt=self.SYSTEM_PROMPT,
+            max_tokens=200,
+            temperature=0.1,
         )
 
         try:
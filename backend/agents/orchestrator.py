@@ -10,8 +10,10 @@ Coordinates the 6-agent system for processing user queries:
 6. Response Agent - Generates final response
 """
 
+import asyncio
 import logging
-from typing import Optional, Dict, Any
+import time
+from typing import Optional, Dict, Any, AsyncIterator
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 
@@ -24,6 +26,12 @@ from .response_agent import ResponseAgent, ResponseResult
 
 logger = logging.getLogger(__name__)
 
+# Speculative candidate search covers the largest limit the planner asks for.
+PREFETCH_CANDIDATE_LIMIT = 30
+# Intents whose plan has no {"query": ...} search task (TaskPlanningAgent.plan):
+# COMPARE looks up entity_index, EXPLAIN retrieves, IDENTIFY_GAPS analyzes gaps.
+NO_PREFETCH_INTENTS = frozenset({IntentType.COMPARE, IntentType.EXPLAIN, IntentType.IDENTIFY_GAPS})
+
 
 @dataclass
 class ConversationContext:
@@ -69,6 +77,10 @@ class AgentOrchestrator:
     Pipeline flow:
     Query → Intent → Concept Extraction → Task Planning →
     Query Execution → Reasoning → Response
+
+    In pipelined mode (default) intent classification and concept extraction
+    run concurrently, and a candidate entity search is started speculatively
+    so it is usually finished by the time planning is.
     """
 
     # PERF-011: Memory optimization - limit conversation context storage
@@ -81,8 +93,10 @@ class AgentOrchestrator:
         graph_store=None,
         vector_store=None,
         db_connection=None,
+        pipelined: bool = True,
     ):
         self.llm = llm_provider
+        self.pipelined = pipelined
         self.graph_store = graph_store
         self.vector_store = vector_store
         self.db = db_connection
@@ -173,6 +187,26 @@ class AgentOrchestrator:
 
         return ""
 
+    async def _prefetch_candidates(self, query: str, project_id: str) -> dict:
+        """
+        Speculatively run the candidate entity search a planned search task would.
+
+        Returns a prefetch map for QueryExecutionAgent.execute:
+        {(project_id, query): (limit, results)}; empty on failure.
+        """
+        if not self.graph_store or not project_id:
+            return {}
+        try:
+            results = await self.graph_store.search_entities(
+                query=query,
+                project_id=project_id,
+                limit=PREFETCH_CANDIDATE_LIMIT,
+            )
+            return {(project_id, query): (PREFETCH_CANDIDATE_LIMIT, results or [])}
+        except Exception as e:
+            logger.warning(f"Candidate prefetch failed: {e}")
+            return {}
+
     async def process_query(
         self,
         query: str,
@@ -196,96 +230,214 @@ class AgentOrchestrator:
         Returns:
             OrchestratorResult with answer and metadata
         """
+        result = None
+        async for event in self.process_query_stream(
+            query,
+            project_id,
+            conversation_id=conversation_id,
+            include_processing_steps=include_processing_steps,
+            selected_node_ids=selected_node_ids,
+            pinned_node_ids=pinned_node_ids,
+            stream_tokens=False,
+        ):
+            if event["event"] == "result":
+                result = event["data"]
+        return result
+
+    @staticmethod
+    def _stage_event(processing_steps: list, step: Dict[str, Any]) -> Dict[str, Any]:
+        processing_steps.append(step)
+        return {"event": "stage", "data": step}
+
+    async def process_query_stream(
+        self,
+        query: str,
+        project_id: str,
+        conversation_id: Optional[str] = None,
+        include_processing_steps: bool = False,
+        selected_node_ids: Optional[list[str]] = None,
+        pinned_node_ids: Optional[list[str]] = None,
+        stream_tokens: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run the agent pipeline, yielding events as soon as they are available.
+
+        Events are dicts with ``event`` and ``data``:
+        - "stage": a processing step (same dict as in ``processing_steps``)
+        - "retrieval_trace": the retrieval trace, right after reasoning
+        - "token": a chunk of answer text (only when ``stream_tokens``)
+        - "result": the final OrchestratorResult (always last)
+
+        Args are as for ``process_query``; ``stream_tokens`` streams the answer
+        from ResponseAgent.generate_stream instead of awaiting generate().
+        """
         processing_steps = []
+        latencies: Dict[str, float] = {}
+        started_at = time.perf_counter()
+        prefetch_task: Optional[asyncio.Task] = None
+
+        async def timed(stage: str, coro):
+            stage_start = time.perf_counter()
+            try:
+                return await coro
+            finally:
+                latencies[stage] = round((time.perf_counter() - stage_start) * 1000, 2)
 
         try:
-            # v0.7.0: Enhance query with selected node context (Graph-to-Prompt)
+            # v0.7.0: Enhance query with selected node context (Graph-to-Prompt).
+            # Needed first: every later stage sees the enhanced query.
             node_context = ""
             all_node_ids = (selected_node_ids or []) + (pinned_node_ids or [])
             if all_node_ids:
-                node_context = await self._get_node_context(project_id, all_node_ids)
+                node_context = await timed(
+                    "node_context", self._get_node_context(project_id, all_node_ids)
+                )
                 if node_context:
                     query = f"{node_context}\n\n{query}"
                     logger.info(f"Graph-to-Prompt: Enhanced query with {len(all_node_ids)} nodes")
 
-            # Step 1: Intent Classification
-            logger.info(f"[1/6] Classifying intent for: {query[:50]}...")
-            intent_result = await self.intent_agent.classify(query)
-            processing_steps.append({
+            if self.pipelined:
+                # Steps 1-2 only need the query: run them side by side. Once the
+                # intent is known to plan a query search, start the candidate
+                # search so it overlaps extraction and planning.
+                logger.info(f"[1-2/6] Classifying intent and extracting concepts for: {query[:50]}...")
+
+                async def classify_and_prefetch() -> IntentResult:
+                    nonlocal prefetch_task
+                    result = await timed("intent_classification", self.intent_agent.classify(query))
+                    if result.intent not in NO_PREFETCH_INTENTS:
+                        prefetch_task = asyncio.create_task(
+                            timed("candidate_prefetch", self._prefetch_candidates(query, project_id))
+                        )
+                    return result
+
+                intent_result, extraction_result = await asyncio.gather(
+                    classify_and_prefetch(),
+                    timed("concept_extraction", self.concept_agent.extract(query)),
+                )
+            else:
+                # Step 1: Intent Classification
+                logger.info(f"[1/6] Classifying intent for: {query[:50]}...")
+                intent_result = await timed("intent_classification", self.intent_agent.classify(query))
+
+                # Step 2: Concept/Entity Extraction
+                logger.info(f"[2/6] Extracting concepts...")
+                extraction_result = await timed("concept_extraction", self.concept_agent.extract(query))
+
+            yield self._stage_event(processing_steps, {
                 "step": "intent_classification",
                 "result": {
                     "intent": intent_result.intent.value,
                     "confidence": intent_result.confidence,
-                }
+                },
+                "latency_ms": latencies["intent_classification"],
             })
-
-
-            # Step 2: Concept/Entity Extraction
-            logger.info(f"[2/6] Extracting concepts...")
-            extraction_result = await self.concept_agent.extract(query)
-            processing_steps.append({
+            yield self._stage_event(processing_steps, {
                 "step": "concept_extraction",
                 "result": {
                     "entities_found": len(extraction_result.entities),
                     "keywords": extraction_result.keywords[:5],
-                }
+                },
+                "latency_ms": latencies["concept_extraction"],
             })
 
             # Step 3: Task Planning
             logger.info(f"[3/6] Planning tasks...")
-            task_plan = await self.planning_agent.plan(
-                query, intent_result.intent, extraction_result.entities
+            task_plan = await timed(
+                "task_planning",
+                self.planning_agent.plan(query, intent_result.intent, extraction_result.entities),
             )
-            processing_steps.append({
+            yield self._stage_event(processing_steps, {
                 "step": "task_planning",
                 "result": {
                     "num_tasks": len(task_plan.tasks),
                     "complexity": task_plan.estimated_complexity,
-                }
+                },
+                "latency_ms": latencies["task_planning"],
             })
 
+            # Scope planned tasks to this project so searches can use the prefetch
+            for task in task_plan.tasks:
+                task.parameters.setdefault("project_id", project_id)
+
+            prefetched = {}
+            if prefetch_task is not None:
+                prefetched = await prefetch_task
+                prefetch_task = None
+
             # Step 4: Query Execution
             logger.info(f"[4/6] Executing {len(task_plan.tasks)} tasks...")
-            execution_result = await self.execution_agent.execute(task_plan)
-            processing_steps.append({
+            execution_result = await timed(
+                "query_execution",
+                self.execution_agent.execute(task_plan, prefetched=prefetched),
+            )
+            yield self._stage_event(processing_steps, {
                 "step": "query_execution",
                 "result": {
                     "successful_tasks": sum(1 for r in execution_result.results if r.success),
                     "total_tasks": len(execution_result.results),
                     "nodes_accessed": len(execution_result.nodes_accessed),
-                }
+                },
+                "latency_ms": latencies["query_execution"],
             })
 
             # Step 5: Reasoning (with gap analysis)
             logger.info(f"[5/6] Applying reasoning with gap analysis...")
-            reasoning_result = await self.reasoning_agent.reason(
+            reasoning_result = await timed("reasoning", self.reasoning_agent.reason(
                 query,
                 intent_result.intent,
                 execution_result,
                 project_id=project_id,  # Pass project_id for gap analysis
                 include_gaps=True,
-            )
-            processing_steps.append({
+            ))
+            yield self._stage_event(processing_steps, {
                 "step": "reasoning",
                 "result": {
                     "num_steps": len(reasoning_result.steps),
                     "confidence": reasoning_result.confidence,
                     "research_gaps": len(reasoning_result.research_gaps),
                     "hidden_connections": len(reasoning_result.hidden_connections),
-                }
+                },
+                "latency_ms": latencies["reasoning"],
             })
+            retrieval_trace = self.response_agent._build_retrieval_trace(reasoning_result)
+            if retrieval_trace:
+                yield {"event": "retrieval_trace", "data": retrieval_trace}
 
             # Step 6: Response Generation
             logger.info(f"[6/6] Generating response...")
-            response_result = await self.response_agent.generate(
-                query, reasoning_result, intent_result.intent
-            )
-            processing_steps.append({
+            if stream_tokens:
+                response_result = None
+                stage_start = time.perf_counter()
+                async for item in self.response_agent.generate_stream(
+                    query, reasoning_result, intent_result.intent
+                ):
+                    if isinstance(item, ResponseResult):
+                        response_result = item
+                        continue
+                    if "first_token" not in latencies:
+                        latencies["first_token"] = round((time.perf_counter() - started_at) * 1000, 2)
+                    yield {"event": "token", "data": item}
+                latencies["response_generation"] = round((time.perf_counter() - stage_start) * 1000, 2)
+            else:
+                response_result = await timed("response_generation", self.response_agent.generate(
+                    query, reasoning_result, intent_result.intent
+                ))
+            yield self._stage_event(processing_steps, {
                 "step": "response_generation",
                 "result": {
                     "answer_length": len(response_result.answer),
                     "num_citations": len(response_result.citations),
-                }
+                },
+                "latency_ms": latencies["response_generation"],
+            })
+            yield self._stage_event(processing_steps, {
+                "step": "latency_breakdown",
+                "result": {
+                    **latencies,
+                    "total_ms": round((time.perf_counter() - started_at) * 1000, 2),
+                    "pipelined": self.pipelined,
+                },
             })
 
             # Update conversation context if provided
@@ -315,7 +467,7 @@ class AgentOrchestrator:
                 for gap in reasoning_result.research_gaps
             ]
 
-            return OrchestratorResult(
+            yield {"event": "result", "data": OrchestratorResult(
                 content=response_result.answer,
                 citations=[c.label for c in response_result.citations],
                 highlighted_nodes=response_result.highlighted_nodes,
@@ -327,19 +479,23 @@ class AgentOrchestrator:
                 retrieval_trace=response_result.retrieval_trace,
                 research_gaps=research_gap_summaries,
                 hidden_connections=reasoning_result.hidden_connections,
-            )
+            )}
 
         except Exception as e:
             logger.error(f"Orchestration error: {e}")
-            processing_steps.append({
+            yield self._stage_event(processing_steps, {
                 "step": "error",
                 "error": str(e),
             })
 
-            return OrchestratorResult(
+            yield {"event": "result", "data": OrchestratorResult(
                 content=f"I encountered an error while processing your query. Please try rephrasing or ask a different question.\n\nError: {str(e)}",
                 processing_steps=processing_steps if include_processing_steps else [],
-            )
+            )}
+        finally:
+            # Speculative work is abandoned if the pipeline failed before using it
+            if prefetch_task is not None:
+                prefetch_task.cancel()
 
     async def process_with_llm_enhancement(
         self,
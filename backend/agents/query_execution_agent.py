@@ -5,6 +5,7 @@ Executes sub-tasks by running SQL queries, vector searches, and graph traversals
 Supports all task types from TaskPlanningAgent: search, retrieve, analyze, compare, explain, analyze_gaps.
 """
 
+import asyncio
 import logging
 import json
 import time
@@ -17,6 +18,10 @@ from graph.reranker import SemanticReranker
 
 logger = logging.getLogger(__name__)
 
+# Independent sub-tasks run concurrently; each gets its own deadline.
+DEFAULT_MAX_PARALLEL_TASKS = 4
+DEFAULT_TASK_TIMEOUT_SECONDS = 30.0
+
 
 @dataclass
 class TraceStep:
@@ -27,6 +32,8 @@ class TraceStep:
     edge_ids: list = field(default_factory=list)
     thought: str = ""
     duration_ms: float = 0.0
+    queue_wait_ms: float = 0.0  # Waiting on dependencies / a free execution slot
+    run_ms: float = 0.0  # Time spent in the task handler itself
 
 
 class QueryResult(BaseModel):
@@ -49,13 +56,23 @@ class QueryExecutionAgent:
     Supports task types: search, retrieve, analyze, compare, explain, analyze_gaps.
     """
 
-    def __init__(self, db_connection=None, vector_store=None, graph_store=None, llm_provider=None):
+    def __init__(
+        self,
+        db_connection=None,
+        vector_store=None,
+        graph_store=None,
+        llm_provider=None,
+        max_parallel_tasks: int = DEFAULT_MAX_PARALLEL_TASKS,
+        task_timeout_seconds: Optional[float] = DEFAULT_TASK_TIMEOUT_SECONDS,
+    ):
         self.db = db_connection
         self.vector_store = vector_store
         self.graph_store = graph_store
         self.llm = llm_provider
-        self._previous_results: dict[int, Any] = {}  # Store results for dependent tasks
-        
+        # Execution state lives in execute(); the agent is shared across requests.
+        self.max_parallel_tasks = max(1, max_parallel_tasks)
+        self.task_timeout_seconds = task_timeout_seconds
+
         # Initialize hierarchical retriever for chunk-based search
         self.hierarchical_retriever = HierarchicalRetriever(graph_store=graph_store) if graph_store else None
 
@@ -130,117 +147,110 @@ class QueryExecutionAgent:
 
         return filtered
 
-    async def execute(self, task_plan) -> ExecutionResult:
+    async def execute(self, task_plan, prefetched: Optional[dict] = None) -> ExecutionResult:
         """
         Execute all tasks in the plan.
 
+        ``prefetched`` maps (project_id, query) to (limit, results) of an entity
+        search the orchestrator already ran speculatively; matching search
+        tasks reuse it instead of querying again.
+
+        Tasks form a DAG through ``depends_on`` (indices of earlier tasks);
+        independent tasks run concurrently, up to ``max_parallel_tasks`` at a
+        time. A task that fails or exceeds ``task_timeout_seconds`` is reported
+        as failed and its dependents are skipped without running.
+
         Routing considers both task_type and search_strategy:
         - search_strategy="vector": use vector/text search (default)
         - search_strategy="graph_traversal": use multi-hop graph traversal
         - search_strategy="hybrid": run both vector search and graph traversal, merge results
         """
-        results = []
-        nodes_accessed = []
-        edges_traversed = []
-        trace_steps = []
-        self._previous_results = {}
-        step_counter = 0
+        tasks = list(task_plan.tasks)
+        if not tasks:
+            return ExecutionResult(results=[])
 
-        for i, task in enumerate(task_plan.tasks):
-            # Check dependencies
-            deps_satisfied = all(
-                results[dep].success for dep in task.depends_on if dep < len(results)
-            )
+        call_start = time.perf_counter()
+        slots = asyncio.Semaphore(self.max_parallel_tasks)
+        runners: list[asyncio.Task] = []
 
-            if not deps_satisfied:
-                results.append(
-                    QueryResult(
-                        task_index=i,
-                        success=False,
-                        error="Dependencies not satisfied",
-                    )
-                )
-                continue
+        async def run(i: int, task) -> tuple[QueryResult, Optional[TraceStep]]:
+            # Only earlier tasks can be dependencies (forward references are ignored)
+            deps = [dep for dep in task.depends_on if 0 <= dep < i]
+            dep_outcomes = await asyncio.gather(*(runners[dep] for dep in deps))
+            if not all(outcome.success for outcome, _ in dep_outcomes):
+                return QueryResult(task_index=i, success=False, error="Dependencies not satisfied"), None
 
-            try:
-                # Get dependent results for context
-                dep_results = [self._previous_results.get(dep) for dep in task.depends_on]
+            dep_data = {dep: outcome.data for dep, (outcome, _) in zip(deps, dep_outcomes)}
+            dep_results = [dep_data.get(dep) for dep in task.depends_on]
 
-                # Read search_strategy from SubTask (defaults to "vector")
-                search_strategy = getattr(task, "search_strategy", "vector")
+            async with slots:
                 step_start = time.perf_counter()
-
-                # Route to appropriate handler
-                if task.task_type == "graph_traversal":
-                    data = await self._execute_graph_traversal(task.parameters, dep_results)
-                elif task.task_type == "search":
-                    if search_strategy == "graph_traversal":
-                        data = await self._execute_graph_traversal(task.parameters, dep_results)
-                    elif search_strategy == "hybrid":
-                        data = await self._execute_hybrid(task.parameters, dep_results)
-                    else:
-                        data = await self._execute_search(task.parameters)
-                elif task.task_type == "document_search":
-                    # Chunk-based document search with hierarchical retrieval
-                    params = {**task.parameters, "use_chunks": True}
-                    data = await self._execute_search(params)
-                elif task.task_type == "retrieve":
-                    if search_strategy == "hybrid":
-                        data = await self._execute_hybrid(task.parameters, dep_results)
-                    else:
-                        data = await self._execute_retrieve(task.parameters)
-                elif task.task_type == "analyze":
-                    data = await self._execute_analyze(task.parameters, dep_results)
-                elif task.task_type == "compare":
-                    data = await self._execute_compare(task.parameters, dep_results)
-                elif task.task_type == "explain":
-                    data = await self._execute_explain(task.parameters, dep_results)
-                elif task.task_type == "analyze_gaps":
-                    data = await self._execute_gap_analysis(task.parameters)
-                else:
-                    logger.warning(f"Unknown task type: {task.task_type}, returning empty result")
-                    data = {"task_type": task.task_type, "status": "unsupported"}
-
-                # Record trace step
-                step_duration_ms = (time.perf_counter() - step_start) * 1000
-                step_node_ids = []
-                if isinstance(data, dict) and "nodes" in data:
-                    step_node_ids = [n.get("id", "") for n in data.get("nodes", []) if isinstance(n, dict)]
-                elif isinstance(data, list):
-                    step_node_ids = [item["id"] for item in data if isinstance(item, dict) and "id" in item]
-                trace_steps.append(TraceStep(
-                    step_index=step_counter,
-                    action=task.task_type if hasattr(task, 'task_type') else 'unknown',
-                    node_ids=step_node_ids[:20],
-                    thought=f"Executed {task.task_type} with strategy={search_strategy}",
-                    duration_ms=round(step_duration_ms, 2),
-                ))
-                step_counter += 1
-
-                # Store for dependent tasks
-                self._previous_results[i] = data
-
-                # Track accessed nodes
-                if isinstance(data, dict) and "nodes" in data:
-                    nodes_accessed.extend([n.get("id", "") for n in data.get("nodes", [])])
-                if isinstance(data, dict) and "edges" in data:
-                    edges_traversed.extend(
-                        [e.get("id", "") for e in data.get("edges", []) if isinstance(e, dict)]
+                try:
+                    data = await asyncio.wait_for(
+                        self._run_task(task, dep_results, prefetched),
+                        timeout=self.task_timeout_seconds or None,
                     )
-                if isinstance(data, list):
-                    for item in data:
-                        if isinstance(item, dict) and "id" in item:
-                            nodes_accessed.append(item["id"])
+                except asyncio.TimeoutError:
+                    logger.error(f"Task execution timed out: {task.task_type} after {self.task_timeout_seconds}s")
+                    return QueryResult(
+                        task_index=i,
+                        success=False,
+                        error=f"Timed out after {self.task_timeout_seconds}s",
+                    ), None
+                except Exception as e:
+                    logger.error(f"Task execution failed: {task.task_type} - {e}")
+                    return QueryResult(task_index=i, success=False, error=str(e)), None
+                step_end = time.perf_counter()
+
+            # Record trace step
+            step_node_ids = []
+            if isinstance(data, dict) and "nodes" in data:
+                step_node_ids = [n.get("id", "") for n in data.get("nodes", []) if isinstance(n, dict)]
+            elif isinstance(data, list):
+                step_node_ids = [item["id"] for item in data if isinstance(item, dict) and "id" in item]
+            run_ms = round((step_end - step_start) * 1000, 2)
+            trace_step = TraceStep(
+                action=task.task_type if hasattr(task, 'task_type') else 'unknown',
+                node_ids=step_node_ids[:20],
+                thought=f"Executed {task.task_type} with strategy={getattr(task, 'search_strategy', 'vector')}",
+                duration_ms=run_ms,
+                queue_wait_ms=round((step_start - call_start) * 1000, 2),
+                run_ms=run_ms,
+            )
+            return QueryResult(task_index=i, success=True, data=data), trace_step
 
-                results.append(
-                    QueryResult(task_index=i, success=True, data=data)
-                )
+        for i, task in enumerate(tasks):
+            runners.append(asyncio.create_task(run(i, task)))
+        try:
+            outcomes = await asyncio.gather(*runners)
+        finally:
+            for runner in runners:
+                runner.cancel()
 
-            except Exception as e:
-                logger.error(f"Task execution failed: {task.task_type} - {e}")
-                results.append(
-                    QueryResult(task_index=i, success=False, error=str(e))
+        results = []
+        nodes_accessed = []
+        edges_traversed = []
+        trace_steps = []
+        for result, trace_step in outcomes:
+            results.append(result)
+            if trace_step is not None:
+                trace_step.step_index = len(trace_steps)
+                trace_steps.append(trace_step)
+            if not result.success:
+                continue
+
+            # Track accessed nodes
+            data = result.data
+            if isinstance(data, dict) and "nodes" in data:
+                nodes_accessed.extend([n.get("id", "") for n in data.get("nodes", [])])
+            if isinstance(data, dict) and "edges" in data:
+                edges_traversed.extend(
+                    [e.get("id", "") for e in data.get("edges", []) if isinstance(e, dict)]
                 )
+            if isinstance(data, list):
+                for item in data:
+                    if isinstance(item, dict) and "id" in item:
+                        nodes_accessed.append(item["id"])
 
         return ExecutionResult(
             results=results,
@@ -249,6 +259,39 @@ class QueryExecutionAgent:
             trace_steps=trace_steps,
         )
 
+    async def _run_task(self, task, dep_results: list, prefetched: Optional[dict] = None) -> Any:
+        """Route a single sub-task to its handler."""
+        # Read search_strategy from SubTask (defaults to "vector")
+        search_strategy = getattr(task, "search_strategy", "vector")
+
+        if task.task_type == "graph_traversal":
+            return await self._execute_graph_traversal(task.parameters, dep_results)
+        elif task.task_type == "search":
+            if search_strategy == "graph_traversal":
+                return await self._execute_graph_traversal(task.parameters, dep_results)
+            elif search_strategy == "hybrid":
+                return await self._execute_hybrid(task.parameters, dep_results)
+            return await self._execute_search(task.parameters, prefetched)
+        elif task.task_type == "document_search":
+            # Chunk-based document search with hierarchical retrieval
+            params = {**task.parameters, "use_chunks": True}
+            return await self._execute_search(params)
+        elif task.task_type == "retrieve":
+            if search_strategy == "hybrid":
+                return await self._execute_hybrid(task.parameters, dep_results)
+            return await self._execute_retrieve(task.parameters)
+        elif task.task_type == "analyze":
+            return await self._execute_analyze(task.parameters, dep_results)
+        elif task.task_type == "compare":
+            return await self._execute_compare(task.parameters, dep_results)
+        elif task.task_type == "explain":
+            return await self._execute_explain(task.parameters, dep_results)
+        elif task.task_type == "analyze_gaps":
+            return await self._execute_gap_analysis(task.parameters)
+
+        logger.warning(f"Unknown task type: {task.task_type}, returning empty result")
+        return {"task_type": task.task_type, "status": "unsupported"}
+
     async def _execute_graph_traversal(self, params: dict, dep_results: list = None) -> dict:
         """
         Execute graph traversal query using recursive CTE via GraphStore.
@@ -389,11 +432,12 @@ class QueryExecutionAgent:
             "status": "hybrid_complete",
         }
 
-    async def _execute_search(self, params: dict) -> list:
+    async def _execute_search(self, params: dict, prefetched: Optional[dict] = None) -> list:
         """Execute a search query against the graph store.
         
         Supports both entity search and chunk-based document search.
         Set use_chunks=True to search through semantic chunks with parent context expansion.
+        Unfiltered entity searches reuse a matching ``prefetched`` result.
         """
         query = params.get("query", "")
         limit = params.get("limit", 20)
@@ -434,12 +478,16 @@ class QueryExecutionAgent:
         # Entity-based search (default)
         if self.graph_store and project_id:
             try:
-                results = await self.graph_store.search_entities(
-                    query=query,
-                    project_id=project_id,
-                    entity_types=entity_types,
-                    limit=limit,
-                )
+                cached = (prefetched or {}).get((project_id, query)) if not entity_types else None
+                if cached is not None and limit <= cached[0]:
+                    results = list(cached[1][:limit])
+                else:
+                    results = await self.graph_store.search_entities(
+                        query=query,
+                        project_id=project_id,
+                        entity_types=entity_types,
+                        limit=limit,
+                    )
                 results = self._apply_low_trust_filter(results, params)
 
                 # Rerank results for better relevance ordering (gated by hybrid_trace_v1)
@@ -447,7 +495,9 @@ class QueryExecutionAgent:
                 _flag_settings = _get_settings()
                 if results and query and _flag_settings.hybrid_trace_v1:
                     try:
-                        reranker = SemanticReranker()
+                        reranker = SemanticReranker(
+                            database=self.db or getattr(self.graph_store, "db", None)
+                        )
                         results = await reranker.rerank(query=query, results=results, top_k=min(20, limit))
                     except Exception as e:
                         logger.debug(f"Reranking skipped: {e}")
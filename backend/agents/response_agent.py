@@ -6,6 +6,7 @@ Generates user-friendly responses with citations and graph highlights.
 
 import json
 import logging
+from typing import AsyncIterator, Union
 from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
@@ -41,6 +42,20 @@ Respond with JSON:
     "suggested_follow_ups": ["question 1", "question 2", "question 3"]
 }"""
 
+    # Streaming answers go straight to the user, so ask for prose rather than JSON.
+    STREAM_SYSTEM_PROMPT = """You are a helpful research assistant presenting knowledge graph analysis results.
+Generate clear, informative responses that:
+1. Directly answer the user's question
+2. Reference specific findings from the analysis
+
+Respond with the answer only, in Markdown. Do not wrap it in JSON."""
+
+    HALLUCINATION_PHRASES = [
+        "not being initialized", "not initialized", "currently unavailable",
+        "graph is unavailable", "no data available", "knowledge graph is empty",
+        "unable to access the knowledge graph"
+    ]
+
     def __init__(self, llm_provider=None):
         self.llm = llm_provider
 
@@ -58,6 +73,8 @@ Respond with JSON:
                 "node_ids": getattr(s, 'node_ids', []),
                 "thought": getattr(s, 'thought', ''),
                 "duration_ms": getattr(s, 'duration_ms', 0.0),
+                "queue_wait_ms": getattr(s, 'queue_wait_ms', 0.0),
+                "run_ms": getattr(s, 'run_ms', 0.0),
             })
         reasoning_path = [nid for s in trace_steps for nid in getattr(s, 'node_ids', [])]
         return {
@@ -76,8 +93,49 @@ Respond with JSON:
                 logger.warning(f"LLM response generation failed: {e}")
         return self._generate_fallback(query, reasoning_result, intent)
 
-    async def _generate_with_llm(self, query: str, reasoning_result, intent) -> ResponseResult:
-        """Use LLM to generate natural language response."""
+    async def generate_stream(
+        self, query: str, reasoning_result, intent
+    ) -> AsyncIterator[Union[str, ResponseResult]]:
+        """
+        Stream the response.
+
+        Yields answer text chunks as the LLM produces them, then one final
+        ResponseResult. Its ``answer`` is authoritative: it can differ from the
+        streamed text when the hallucination guard replaces it.
+        """
+        if self.llm:
+            chunks: list[str] = []
+            try:
+                async for chunk in self.llm.generate_stream(
+                    prompt=self._build_prompt(query, reasoning_result, intent),
+                    system_prompt=self.STREAM_SYSTEM_PROMPT,
+                    max_tokens=1000,
+                    temperature=0.7,
+                ):
+                    if chunk:
+                        chunks.append(chunk)
+                        yield chunk
+            except Exception as e:
+                logger.warning(f"LLM response streaming failed: {e}")
+
+            answer = "".join(chunks).strip()
+            if answer:
+                yield ResponseResult(
+                    answer=self._guard_hallucination(answer, reasoning_result),
+                    citations=[],
+                    highlighted_nodes=reasoning_result.supporting_nodes,
+                    highlighted_edges=reasoning_result.supporting_edges,
+                    suggested_follow_ups=self._default_follow_ups(intent),
+                    retrieval_trace=self._build_retrieval_trace(reasoning_result),
+                )
+                return
+
+        # No LLM, or nothing streamed: emit the fallback answer in one piece
+        result = self._generate_fallback(query, reasoning_result, intent)
+        yield result.answer
+        yield result
+
+    def _build_prompt(self, query: str, reasoning_result, intent) -> str:
         steps_text = "\n".join([
             f"{s.step_number}. {s.description}: {s.conclusion}" for s in reasoning_result.steps
         ])
@@ -89,7 +147,28 @@ Reasoning steps:
 {steps_text}
 Confidence: {reasoning_result.confidence}"""
 
-        prompt = f"Generate a helpful response based on this analysis:\n{context}"
+        return f"Generate a helpful response based on this analysis:\n{context}"
+
+    def _guard_hallucination(self, answer: str, reasoning_result) -> str:
+        """Guard against LLM hallucination about graph initialization."""
+        if not any(phrase in answer.lower() for phrase in self.HALLUCINATION_PHRASES):
+            return answer
+
+        logger.warning(f"LLM hallucinated unavailability: {answer[:100]}...")
+        # Use the reasoning result's conclusion which is based on actual data
+        answer = reasoning_result.final_conclusion
+        if reasoning_result.research_gaps:
+            answer += "\n\n**Research Gaps Found:**\n"
+            for gap in reasoning_result.research_gaps:
+                answer += f"- {gap.gap_description}\n"
+                if gap.suggested_questions:
+                    for q in gap.suggested_questions[:2]:
+                        answer += f"  - {q}\n"
+        return answer
+
+    async def _generate_with_llm(self, query: str, reasoning_result, intent) -> ResponseResult:
+        """Use LLM to generate natural language response."""
+        prompt = self._build_prompt(query, reasoning_result, intent)
         response = await self.llm.generate(
             prompt=prompt, system_prompt=self.SYSTEM_PROMPT, max_tokens=1000, temperature=0.7
         )
@@ -98,25 +177,9 @@ Confidence: {reasoning_result.confidence}"""
             json_str = response.strip().replace("```json", "").replace("```", "").strip()
             data = json.loads(json_str)
 
-            answer = data.get("answer", reasoning_result.final_conclusion)
-
-            # Guard against LLM hallucination about graph initialization
-            hallucination_phrases = [
-                "not being initialized", "not initialized", "currently unavailable",
-                "graph is unavailable", "no data available", "knowledge graph is empty",
-                "unable to access the knowledge graph"
-            ]
-            if any(phrase in answer.lower() for phrase in hallucination_phrases):
-                logger.warning(f"LLM hallucinated unavailability: {answer[:100]}...")
-                # Use the reasoning result's conclusion which is based on actual data
-                answer = reasoning_result.final_conclusion
-                if reasoning_result.research_gaps:
-                    answer += "\n\n**Research Gaps Found:**\n"
-                    for gap in reasoning_result.research_gaps:
-                        answer += f"- {gap.gap_description}\n"
-                        if gap.suggested_questions:
-                            for q in gap.suggested_questions[:2]:
-                                answer += f"  - {q}\n"
+            answer = self._guard_hallucination(
+                data.get("answer", reasoning_result.final_conclusion), reasoning_result
+            )
 
             return ResponseResult(
                 answer=answer,
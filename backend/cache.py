@@ -1,19 +1,34 @@
 """
 LLM Response Cache Module
 
-Provides in-memory caching with TTL support for LLM responses.
-Designed to be replaceable with Redis for production deployments.
+Two-tier cache for LLM responses:
+- In-process LRU (O(1) get/set/evict) bounded by entry count and bytes
+- Optional persistent tier shared across workers and restarts
+  (SQLite or Postgres locally, Redis when available)
+
+An opt-in semantic layer returns cached answers for near-identical prompts
+(by query embedding similarity) in selected namespaces such as intent
+classification and cluster labeling.
 """
 
+import asyncio
 import hashlib
 import json
 import logging
+import sqlite3
+import threading
 import time
-from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+EmbedFn = Callable[[str], Awaitable[List[float]]]
+
 
 @dataclass
 class CacheEntry:
@@ -22,6 +37,7 @@ class CacheEntry:
     created_at: float
     ttl: int  # seconds
     hits: int = 0
+    size: int = 0  # bytes
 
     def is_expired(self) -> bool:
         """Check if entry has expired."""
@@ -33,17 +49,267 @@ class CacheEntry:
         return self.value
 
 
+def _entry_size(value: str) -> int:
+    return len(value.encode("utf-8")) if isinstance(value, str) else len(repr(value))
+
+
+# ============================================================================
+# Persistent Cache Backends
+# ============================================================================
+
+class CacheBackend(ABC):
+    """Abstract base class for persistent LLM cache tiers."""
+
+    name = "backend"
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        """Return the cached value, or None if missing/expired."""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        """Store a value for ``ttl`` seconds."""
+        pass
+
+    @abstractmethod
+    async def clear(self) -> int:
+        """Remove all entries; returns the number removed (if known)."""
+        pass
+
+    async def cleanup(self) -> int:
+        """Remove expired entries (if applicable)."""
+        return 0
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    SQLite-backed cache tier for local and single-host deployments.
+
+    Shared by all workers on the host and survives restarts. Calls run in a
+    thread so the event loop never blocks on disk I/O.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self._path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def _get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM llm_cache WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key: str, value: str, ttl: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + ttl),
+            )
+
+    def _delete(self, where: str, args: tuple) -> int:
+        with self._lock:
+            return self._conn.execute(f"DELETE FROM llm_cache {where}", args).rowcount
+
+    async def get(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        await asyncio.to_thread(self._set, key, value, ttl)
+
+    async def clear(self) -> int:
+        return await asyncio.to_thread(self._delete, "", ())
+
+    async def cleanup(self) -> int:
+        return await asyncio.to_thread(self._delete, "WHERE expires_at <= ?", (time.time(),))
+
+
+class PostgresCacheBackend(CacheBackend):
+    """
+    Postgres-backed cache tier (table ``llm_cache_entries``, migration 027).
+
+    Uses the application's Database wrapper; skipped while it is disconnected.
+    """
+
+    name = "postgres"
+
+    def __init__(self, database):
+        self._db = database
+
+    def _available(self) -> bool:
+        return bool(getattr(self._db, "is_connected", False))
+
+    async def get(self, key: str) -> Optional[str]:
+        if not self._available():
+            return None
+        return await self._db.fetchval(
+            "SELECT value FROM llm_cache_entries WHERE cache_key = $1 AND expires_at > NOW()",
+            key,
+        )
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        if not self._available():
+            return
+        await self._db.execute(
+            """
+            INSERT INTO llm_cache_entries (cache_key, value, expires_at)
+            VALUES ($1, $2, NOW() + make_interval(secs => $3))
+            ON CONFLICT (cache_key) DO UPDATE
+            SET value = EXCLUDED.value, expires_at = EXCLUDED.expires_at
+            """,
+            key,
+            value,
+            float(ttl),
+        )
+
+    async def clear(self) -> int:
+        if not self._available():
+            return 0
+        await self._db.execute("DELETE FROM llm_cache_entries")
+        return 0
+
+    async def cleanup(self) -> int:
+        if not self._available():
+            return 0
+        await self._db.execute("DELETE FROM llm_cache_entries WHERE expires_at <= NOW()")
+        return 0
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Redis-backed cache tier for multi-instance deployments.
+
+    Requires: pip install redis
+    """
+
+    name = "redis"
+
+    def __init__(self, redis_url: str, key_prefix: str = "llmcache:"):
+        self._redis_url = redis_url
+        self._key_prefix = key_prefix
+        self._redis = None
+
+    async def _get_redis(self):
+        """Lazy initialize Redis connection."""
+        if self._redis is None:
+            try:
+                import redis.asyncio as redis
+                self._redis = redis.from_url(self._redis_url, decode_responses=True)
+                logger.info("Redis LLM cache connected")
+            except ImportError:
+                logger.error("redis package not installed. Run: pip install redis")
+                raise
+        return self._redis
+
+    async def get(self, key: str) -> Optional[str]:
+        redis_client = await self._get_redis()
+        return await redis_client.get(f"{self._key_prefix}{key}")
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        redis_client = await self._get_redis()
+        await redis_client.set(f"{self._key_prefix}{key}", value, ex=ttl)
+
+    async def clear(self) -> int:
+        redis_client = await self._get_redis()
+        count = 0
+        async for redis_key in redis_client.scan_iter(match=f"{self._key_prefix}*"):
+            count += await redis_client.delete(redis_key)
+        return count
+
+
+# ============================================================================
+# Semantic Layer
+# ============================================================================
+
+class SemanticCache:
+    """
+    Embedding-similarity lookup for near-identical prompts.
+
+    Entries are grouped by namespace (e.g. "intent_classification") and by a
+    scope hash of the non-semantic call parameters, so only calls that differ
+    in wording alone can match. Each namespace is a bounded LRU.
+    """
+
+    def __init__(self, embed_fn: EmbedFn, threshold: float = 0.95, max_entries: int = 500):
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.max_entries = max_entries
+        # namespace -> key -> (scope, unit vector, response, expires_at)
+        self._entries: Dict[str, "OrderedDict[str, Tuple[str, np.ndarray, str, float]]"] = {}
+
+    async def embed(self, text: str) -> Optional[np.ndarray]:
+        try:
+            vector = np.asarray(await self.embed_fn(text), dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"Semantic cache embedding failed: {e}")
+            return None
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else None
+
+    def lookup(self, namespace: str, scope: str, vector: np.ndarray) -> Optional[Tuple[str, float]]:
+        """Return (response, similarity) of the closest live entry above threshold."""
+        entries = self._entries.get(namespace)
+        if not entries:
+            return None
+        now = time.time()
+        candidates = [
+            (key, entry) for key, entry in entries.items()
+            if entry[0] == scope and entry[3] > now and entry[1].shape == vector.shape
+        ]
+        if not candidates:
+            return None
+        matrix = np.stack([entry[1] for _, entry in candidates])
+        scores = matrix @ vector
+        best = int(np.argmax(scores))
+        if float(scores[best]) < self.threshold:
+            return None
+        key, entry = candidates[best]
+        entries.move_to_end(key)
+        return entry[2], float(scores[best])
+
+    def store(self, namespace: str, key: str, scope: str, vector: np.ndarray, response: str, ttl: int) -> None:
+        entries = self._entries.setdefault(namespace, OrderedDict())
+        entries[key] = (scope, vector, response, time.time() + ttl)
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def size(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# ============================================================================
+# LLM Cache
+# ============================================================================
+
 class LLMCache:
     """
-    In-memory cache for LLM responses.
+    Two-tier cache for LLM responses.
 
     Features:
     - TTL-based expiration
     - Content-based keys (hash of prompt + params)
-    - Statistics tracking
-    - Configurable max size with LRU eviction
+    - O(1) LRU eviction by entry count and (optionally) total bytes
+    - Optional persistent tier (``CacheBackend``) consulted on local misses
+    - Optional semantic layer (``SemanticCache``) for opt-in namespaces
+    - Hit/miss/byte statistics
 
-    Can be replaced with Redis backend for distributed caching.
+    ``get``/``set`` touch only the in-process tier; ``aget``/``aset`` also
+    use the persistent tier.
     """
 
     DEFAULT_TTL = 3600  # 1 hour
@@ -54,17 +320,29 @@ class LLMCache:
         default_ttl: int = DEFAULT_TTL,
         max_size: int = MAX_SIZE,
         enabled: bool = True,
+        max_bytes: int = 0,
+        backend: Optional[CacheBackend] = None,
+        semantic: Optional[SemanticCache] = None,
     ):
-        self._cache: Dict[str, CacheEntry] = {}
+        self._cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
         self.default_ttl = default_ttl
         self.max_size = max_size
+        self.max_bytes = max_bytes  # 0 = no byte cap
         self.enabled = enabled
+        self.backend = backend
+        self.semantic = semantic
+        self._bytes = 0
 
         # Statistics
         self.stats = {
             "hits": 0,
+            "persistent_hits": 0,
+            "semantic_hits": 0,
             "misses": 0,
             "evictions": 0,
+            "backend_errors": 0,
+            "bytes_served": 0,
+            "bytes_stored": 0,
         }
 
     def _generate_key(
@@ -91,6 +369,52 @@ class LLMCache:
         key_string = json.dumps(key_data, sort_keys=True)
         return hashlib.sha256(key_string.encode()).hexdigest()
 
+    # ------------------------------------------------------------------
+    # In-process tier
+    # ------------------------------------------------------------------
+
+    def _lookup_local(self, key: str) -> Optional[str]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if entry.is_expired():
+            self._remove(key)
+            return None
+        self._cache.move_to_end(key)
+        return entry.access()
+
+    def _store_local(self, key: str, value: str, ttl: int) -> None:
+        if key in self._cache:
+            self._remove(key)
+        size = _entry_size(value)
+        self._cache[key] = CacheEntry(value=value, created_at=time.time(), ttl=ttl, size=size)
+        self._bytes += size
+        while self._cache and (
+            len(self._cache) > self.max_size
+            or (self.max_bytes and self._bytes > self.max_bytes and len(self._cache) > 1)
+        ):
+            self._evict_oldest()
+
+    def _remove(self, key: str) -> None:
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _evict_oldest(self) -> None:
+        """Evict the least recently used entry (O(1))."""
+        if not self._cache:
+            return
+
+        _, entry = self._cache.popitem(last=False)
+        self._bytes -= entry.size
+        self.stats["evictions"] += 1
+        logger.debug("Evicted least recently used cache entry")
+
+    def _record_hit(self, tier: str, value: str) -> str:
+        self.stats[tier] += 1
+        self.stats["bytes_served"] += _entry_size(value)
+        return value
+
     def get(
         self,
         prompt: str,
@@ -100,7 +424,7 @@ class LLMCache:
         max_tokens: int = 1000,
     ) -> Optional[str]:
         """
-        Get cached response if available and not expired.
+        Get cached response from the in-process tier.
 
         Returns:
             Cached response or None if not found/expired
@@ -109,20 +433,13 @@ class LLMCache:
             return None
 
         key = self._generate_key(prompt, system_prompt, model, temperature, max_tokens)
-
-        entry = self._cache.get(key)
-        if entry is None:
+        value = self._lookup_local(key)
+        if value is None:
             self.stats["misses"] += 1
             return None
 
-        if entry.is_expired():
-            del self._cache[key]
-            self.stats["misses"] += 1
-            return None
-
-        self.stats["hits"] += 1
         logger.debug(f"LLM cache hit (key: {key[:16]}...)")
-        return entry.access()
+        return self._record_hit("hits", value)
 
     def set(
         self,
@@ -135,7 +452,7 @@ class LLMCache:
         ttl: Optional[int] = None,
     ) -> None:
         """
-        Cache an LLM response.
+        Cache an LLM response in the in-process tier.
 
         Args:
             response: LLM response to cache
@@ -149,33 +466,136 @@ class LLMCache:
         if not self.enabled:
             return
 
-        # Evict if at max size (simple LRU - remove oldest)
-        if len(self._cache) >= self.max_size:
-            self._evict_oldest()
+        key = self._generate_key(prompt, system_prompt, model, temperature, max_tokens)
+        self._store_local(key, response, ttl or self.default_ttl)
+        self.stats["bytes_stored"] += _entry_size(response)
+
+        logger.debug(f"LLM response cached (key: {key[:16]}...)")
+
+    # ------------------------------------------------------------------
+    # Persistent tier
+    # ------------------------------------------------------------------
+
+    async def aget(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+    ) -> Optional[str]:
+        """Get a cached response, falling through to the persistent tier."""
+        if not self.enabled:
+            return None
 
         key = self._generate_key(prompt, system_prompt, model, temperature, max_tokens)
+        value = self._lookup_local(key)
+        if value is not None:
+            return self._record_hit("hits", value)
+
+        if self.backend is not None:
+            try:
+                value = await self.backend.get(key)
+            except Exception as e:
+                self.stats["backend_errors"] += 1
+                logger.warning(f"LLM cache backend read failed: {e}")
+                value = None
+            if value is not None:
+                # Promote to the local tier for subsequent calls
+                self._store_local(key, value, self.default_ttl)
+                return self._record_hit("persistent_hits", value)
+
+        self.stats["misses"] += 1
+        return None
+
+    async def aset(
+        self,
+        response: str,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        ttl: Optional[int] = None,
+    ) -> None:
+        """Cache a response in both tiers."""
+        if not self.enabled:
+            return
 
-        self._cache[key] = CacheEntry(
-            value=response,
-            created_at=time.time(),
-            ttl=ttl or self.default_ttl,
-        )
+        ttl = ttl or self.default_ttl
+        self.set(response, prompt, system_prompt, model, temperature, max_tokens, ttl=ttl)
+        if self.backend is not None:
+            key = self._generate_key(prompt, system_prompt, model, temperature, max_tokens)
+            try:
+                await self.backend.set(key, response, ttl)
+            except Exception as e:
+                self.stats["backend_errors"] += 1
+                logger.warning(f"LLM cache backend write failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Semantic layer
+    # ------------------------------------------------------------------
+
+    @property
+    def semantic_enabled(self) -> bool:
+        return self.enabled and self.semantic is not None
+
+    async def semantic_get(
+        self,
+        namespace: str,
+        semantic_text: str,
+        **params,
+    ) -> Tuple[Optional[str], Optional[np.ndarray]]:
+        """
+        Look up a near-identical earlier call in ``namespace``.
 
-        logger.debug(f"LLM response cached (key: {key[:16]}...)")
+        ``params`` are the non-semantic call parameters (system_prompt, model,
+        temperature, max_tokens); they must match exactly. Returns
+        (response or None, query vector for a later ``semantic_set``).
+        """
+        if not self.semantic_enabled:
+            return None, None
 
-    def _evict_oldest(self) -> None:
-        """Evict the oldest entry from cache."""
-        if not self._cache:
+        vector = await self.semantic.embed(semantic_text)
+        if vector is None:
+            return None, None
+
+        match = self.semantic.lookup(namespace, self._generate_key("", **params), vector)
+        if match is None:
+            return None, vector
+
+        response, similarity = match
+        logger.debug(f"Semantic cache hit in {namespace} (similarity={similarity:.3f})")
+        return self._record_hit("semantic_hits", response), vector
+
+    def semantic_set(
+        self,
+        namespace: str,
+        semantic_text: str,
+        vector: Optional[np.ndarray],
+        response: str,
+        ttl: Optional[int] = None,
+        **params,
+    ) -> None:
+        """Remember ``response`` for ``semantic_text`` in ``namespace``."""
+        if not self.semantic_enabled or vector is None:
             return
+        self.semantic.store(
+            namespace,
+            key=hashlib.sha256(semantic_text.encode()).hexdigest(),
+            scope=self._generate_key("", **params),
+            vector=vector,
+            response=response,
+            ttl=ttl or self.default_ttl,
+        )
 
-        oldest_key = min(self._cache.keys(), key=lambda k: self._cache[k].created_at)
-        del self._cache[oldest_key]
-        self.stats["evictions"] += 1
-        logger.debug("Evicted oldest cache entry")
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
 
     def invalidate(self, pattern: Optional[str] = None) -> int:
         """
-        Invalidate cache entries.
+        Invalidate in-process cache entries (the persistent tier is kept).
 
         Args:
             pattern: If None, clear all. Otherwise, clear matching keys.
@@ -186,15 +606,16 @@ class LLMCache:
         if pattern is None:
             count = len(self._cache)
             self._cache.clear()
+            self._bytes = 0
+            if self.semantic is not None:
+                self.semantic.clear()
             return count
 
         # Pattern-based invalidation (for future use)
-        count = 0
         keys_to_remove = [k for k in self._cache.keys() if pattern in k]
         for key in keys_to_remove:
-            del self._cache[key]
-            count += 1
-        return count
+            self._remove(key)
+        return len(keys_to_remove)
 
     def cleanup_expired(self) -> int:
         """
@@ -209,30 +630,70 @@ class LLMCache:
         ]
 
         for key in expired_keys:
-            del self._cache[key]
+            self._remove(key)
 
         if expired_keys:
             logger.info(f"Cleaned up {len(expired_keys)} expired cache entries")
 
         return len(expired_keys)
 
+    async def cleanup_backend(self) -> int:
+        """Remove expired entries from the persistent tier."""
+        if self.backend is None:
+            return 0
+        try:
+            return await self.backend.cleanup()
+        except Exception as e:
+            logger.warning(f"LLM cache backend cleanup failed: {e}")
+            return 0
+
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
-        total_requests = self.stats["hits"] + self.stats["misses"]
-        hit_rate = self.stats["hits"] / total_requests if total_requests > 0 else 0.0
+        hits = self.stats["hits"] + self.stats["persistent_hits"] + self.stats["semantic_hits"]
+        total_requests = hits + self.stats["misses"]
+        hit_rate = hits / total_requests if total_requests > 0 else 0.0
 
         return {
             "enabled": self.enabled,
             "size": len(self._cache),
             "max_size": self.max_size,
+            "size_bytes": self._bytes,
+            "max_bytes": self.max_bytes,
             "hits": self.stats["hits"],
+            "persistent_hits": self.stats["persistent_hits"],
+            "semantic_hits": self.stats["semantic_hits"],
             "misses": self.stats["misses"],
             "evictions": self.stats["evictions"],
+            "backend_errors": self.stats["backend_errors"],
+            "bytes_served": self.stats["bytes_served"],
+            "bytes_stored": self.stats["bytes_stored"],
             "hit_rate": round(hit_rate, 3),
             "default_ttl": self.default_ttl,
+            "backend": self.backend.name if self.backend else "memory",
+            "semantic_enabled": self.semantic_enabled,
+            "semantic_entries": self.semantic.size() if self.semantic else 0,
         }
 
 
+async def generate_with_semantic_cache(
+    llm_provider,
+    namespace: str,
+    semantic_text: str,
+    **generate_kwargs,
+) -> str:
+    """
+    Call ``llm_provider.generate`` through the semantic cache when possible.
+
+    Providers that are not cache-wrapped are called directly, so callers can
+    use this unconditionally.
+    """
+    if getattr(type(llm_provider), "supports_semantic_cache", False):
+        return await llm_provider.generate_semantic(
+            namespace=namespace, semantic_text=semantic_text, **generate_kwargs
+        )
+    return await llm_provider.generate(**generate_kwargs)
+
+
 # Global cache instance
 _llm_cache: Optional[LLMCache] = None
 
@@ -245,10 +706,39 @@ def get_llm_cache() -> LLMCache:
     return _llm_cache
 
 
+def create_cache_backend(
+    kind: str,
+    sqlite_path: str = "",
+    database=None,
+    redis_url: str = "",
+) -> Optional[CacheBackend]:
+    """
+    Build the persistent tier named by ``kind`` ("memory", "sqlite", "postgres", "redis").
+
+    Returns None (in-process only) for "memory" or when the backend cannot be created.
+    """
+    try:
+        if kind == "sqlite" and sqlite_path:
+            return SQLiteCacheBackend(sqlite_path)
+        if kind == "postgres" and database is not None:
+            return PostgresCacheBackend(database)
+        if kind == "redis" and redis_url:
+            return RedisCacheBackend(redis_url)
+    except Exception as e:
+        logger.warning(f"LLM cache backend '{kind}' unavailable, using in-memory only: {e}")
+        return None
+    if kind != "memory":
+        logger.warning(f"LLM cache backend '{kind}' is not configured, using in-memory only")
+    return None
+
+
 def init_llm_cache(
     default_ttl: int = LLMCache.DEFAULT_TTL,
     max_size: int = LLMCache.MAX_SIZE,
     enabled: bool = True,
+    max_bytes: int = 0,
+    backend: Optional[CacheBackend] = None,
+    semantic: Optional[SemanticCache] = None,
 ) -> LLMCache:
     """Initialize the global LLM cache with custom settings."""
     global _llm_cache
@@ -256,6 +746,12 @@ def init_llm_cache(
         default_ttl=default_ttl,
         max_size=max_size,
         enabled=enabled,
+        max_bytes=max_bytes,
+        backend=backend,
+        semantic=semantic,
+    )
+    logger.info(
+        f"LLM cache initialized (TTL={default_ttl}s, max_size={max_size}, enabled={enabled}, "
+        f"backend={backend.name if backend else 'memory'}, semantic={semantic is not None})"
     )
-    logger.info(f"LLM cache initialized (TTL={default_ttl}s, max_size={max_size}, enabled={enabled})")
     return _llm_cache
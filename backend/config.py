@@ -78,6 +78,14 @@ class Settings(BaseSettings):
     llm_cache_enabled: bool = True  # Enable LLM response caching
     llm_cache_ttl: int = 3600  # Default cache TTL in seconds (1 hour)
     llm_cache_max_size: int = 50  # PERF-010: Further reduced for 512MB memory limit
+    llm_cache_max_bytes: int = 2_000_000  # In-process tier byte cap (0 = entry count only)
+    # Persistent tier shared across workers/restarts: memory | sqlite | postgres | redis
+    llm_cache_backend: Literal["memory", "sqlite", "postgres", "redis"] = "memory"
+    llm_cache_sqlite_path: str = "llm_cache.sqlite3"
+    # Semantic layer: near-identical intent/cluster-label prompts reuse cached answers
+    llm_cache_semantic_enabled: bool = False
+    llm_cache_semantic_threshold: float = 0.95  # Cosine similarity required for a hit
+    llm_cache_semantic_max_entries: int = 500  # Per namespace
 
     # Performance: Redis (for rate limiting and caching in production)
     redis_url: str = ""  # Redis connection URL (e.g., redis://localhost:6379)
@@ -88,6 +96,52 @@ class Settings(BaseSettings):
     # Can be overridden with RATE_LIMIT_ENABLED environment variable
     rate_limit_enabled: bool = True  # Enable API rate limiting
 
+    # Performance: Graph Analytics
+    # Centrality runs in a process pool so large graphs don't block the event loop.
+    # Above the node threshold, betweenness switches to k-source sampling.
+    centrality_process_workers: int = 1  # Kept low for 512MB memory limit
+    centrality_approx_node_threshold: int = 5000
+    centrality_betweenness_samples: int = 256
+
+    # Performance: shared graph snapshots
+    # Analytics endpoints share one compact (CSR + float32 embeddings) snapshot
+    # per project graph version, evicted LRU beyond this memory budget.
+    graph_snapshot_max_mb: int = 128
+    graph_snapshot_max_projects: int = 8
+    graph_snapshot_unversioned_ttl_seconds: float = 30.0
+
+    # Performance: gap clustering
+    # Concept clustering for gap detection runs in a worker process. Up to the
+    # exact threshold it uses full KMeans; above it, MiniBatchKMeans on
+    # embeddings reduced to gap_clustering_reduced_dim ("pca", "random" or
+    # "none"), with k chosen from a warm-started sweep on a sample.
+    gap_clustering_process_workers: int = 1
+    gap_clustering_exact_threshold: int = 2000
+    gap_clustering_sample_size: int = 5000
+    gap_clustering_reduction: str = "pca"
+    gap_clustering_reduced_dim: int = 64
+    # Concurrent LLM cluster-label calls during a gap refresh job.
+    gap_refresh_label_concurrency: int = 4
+
+    # Performance: PDF extraction
+    # PyMuPDF parsing runs in a process pool; each file gets a timeout and each
+    # worker an address-space cap (MB above its baseline).
+    pdf_extraction_workers: int = 1  # Kept low for 512MB memory limit
+    pdf_extraction_timeout_seconds: float = 120.0
+    pdf_extraction_memory_mb: int = 768
+    # Multi-PDF imports run parse -> extract -> resolve -> persist as a staged
+    # pipeline; parse uses pdf_extraction_workers, LLM stages share this limit.
+    pdf_import_llm_concurrency: int = 3
+    pdf_import_persist_concurrency: int = 2
+    pdf_import_queue_size: int = 4  # Max papers waiting between two stages
+
+    # Performance: upload spooling
+    # Import uploads are streamed to disk in fixed-size chunks; identical PDFs
+    # share one blob across jobs until no job links to it for the retention period.
+    upload_spool_dir: str = ""  # Empty = system temp dir
+    upload_chunk_size: int = 1024 * 1024  # 1MB
+    upload_blob_retention_hours: float = 24.0
+
     # Feature Flags
     lexical_graph_v1: bool = True
     hybrid_trace_v1: bool = True
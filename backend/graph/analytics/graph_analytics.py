@@ -4,6 +4,7 @@ Graph Analytics - Graph analysis, statistics, and research gap detection.
 Extracted from GraphStore for Single Responsibility Principle.
 """
 
+import asyncio
 import logging
 from typing import Optional
 from uuid import UUID
@@ -635,6 +636,7 @@ class GraphAnalytics:
         similarity_threshold: float = 0.7,
         llm_provider=None,
         entity_dao=None,
+        max_neighbors: Optional[int] = None,
     ) -> int:
         """
         Build semantic relationships between concepts in a project.
@@ -647,12 +649,36 @@ class GraphAnalytics:
             similarity_threshold: Minimum cosine similarity for relationship (0-1)
             llm_provider: Optional LLM provider for advanced relationship detection
             entity_dao: EntityDAO instance for adding relationships
+            max_neighbors: RELATED_TO cap per concept (default: builder default, 0 = unbounded)
 
         Returns:
-            Number of relationships created
+            Number of relationships created or updated
+        """
+        stats = await self.build_concept_relationships_with_stats(
+            project_id, similarity_threshold, llm_provider, entity_dao, max_neighbors
+        )
+        return stats["inserted"] + stats["updated"]
+
+    async def build_concept_relationships_with_stats(
+        self,
+        project_id: str,
+        similarity_threshold: float = 0.7,
+        llm_provider=None,
+        entity_dao=None,
+        max_neighbors: Optional[int] = None,
+    ) -> dict:
+        """
+        Same as build_concept_relationships(), returning write statistics.
+
+        Candidates are persisted with EntityDAO.bulk_upsert_relationships
+        (one COPY + merge) rather than one INSERT per edge.
+
+        Returns:
+            {"candidates": int, "inserted": int, "updated": int}
         """
         from graph.relationship_builder import ConceptCentricRelationshipBuilder
 
+        stats = {"candidates": 0, "inserted": 0, "updated": 0}
         try:
             # Get all concepts with embeddings from the project
             query = """
@@ -667,7 +693,7 @@ class GraphAnalytics:
 
             if len(rows) < 2:
                 logger.info(f"Not enough concepts with embeddings: {len(rows)}")
-                return 0
+                return stats
 
             # Convert to format expected by RelationshipBuilder
             concepts = []
@@ -688,42 +714,49 @@ class GraphAnalytics:
                 llm_provider=llm_provider,
                 similarity_threshold=similarity_threshold,
             )
-            candidates = builder.build_semantic_relationships(
-                concepts=concepts,
-                similarity_threshold=similarity_threshold,
+            # Blocked similarity search is CPU-bound; keep it off the event loop
+            candidates = await asyncio.to_thread(
+                builder.build_semantic_relationships,
+                concepts,
+                similarity_threshold,
+                max_neighbors,
             )
+            stats["candidates"] = len(candidates)
 
             # Store relationships using entity_dao if provided
             dao = entity_dao or self.entity_dao
             if not dao:
                 logger.warning("No entity_dao provided for relationship storage")
-                return 0
-
-            relationships_created = 0
-            for candidate in candidates:
-                try:
-                    await dao.add_relationship(
-                        project_id=project_id,
-                        source_id=candidate.source_id,
-                        target_id=candidate.target_id,
-                        relationship_type=candidate.relationship_type,
-                        properties={
+                return stats
+
+            written = await dao.bulk_upsert_relationships(
+                project_id,
+                [
+                    (
+                        candidate.source_id,
+                        candidate.target_id,
+                        candidate.relationship_type,
+                        {
                             "confidence": candidate.confidence,
                             "auto_generated": True,
                             **candidate.properties,
                         },
-                        weight=candidate.confidence,
+                        candidate.confidence,
                     )
-                    relationships_created += 1
-                except Exception as e:
-                    logger.warning(f"Failed to create relationship: {e}")
+                    for candidate in candidates
+                ],
+            )
+            stats.update(written)
 
-            logger.info(f"Created {relationships_created} semantic relationships")
-            return relationships_created
+            logger.info(
+                f"Semantic relationships: {stats['inserted']} created, "
+                f"{stats['updated']} updated"
+            )
+            return stats
 
         except Exception as e:
             logger.error(f"Error building concept relationships: {e}")
-            return 0
+            return stats
 
     # =========================================================================
     # Visualization Data
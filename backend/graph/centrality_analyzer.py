@@ -5,7 +5,11 @@ NetworkX-based centrality analysis for knowledge graphs.
 Provides methods for computing various centrality metrics and graph slicing.
 """
 
+import asyncio
 import logging
+import math
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from collections import OrderedDict
@@ -25,6 +29,10 @@ class CentralityMetrics:
     degree: Dict[str, float]
     eigenvector: Dict[str, float]
     pagerank: Dict[str, float]
+    # Set when betweenness was estimated from k sampled source nodes.
+    approximate: bool = False
+    sample_size: Optional[int] = None
+    error_bound: Optional[float] = None
 
 
 @dataclass
@@ -38,12 +46,152 @@ class ClusterResult:
     label: Optional[str] = None
 
 
+# Confidence level used for the sampled-betweenness error bound (1 - delta).
+BETWEENNESS_CONFIDENCE = 0.95
+
+# Lazily created process pool shared by all analyzers in this process.
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Return the shared centrality process pool, creating it on first use."""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=max(1, max_workers))
+    return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    """Shut down the shared centrality process pool (call on app shutdown)."""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+def _compact_edges(edges: List[dict]) -> List[Tuple[str, str, float]]:
+    """Reduce edge dicts to (source, target, weight) tuples for cheap pickling."""
+    compact = []
+    for edge in edges:
+        source = edge.get('source')
+        target = edge.get('target')
+        if source and target:
+            compact.append((source, target, float(edge.get('weight', 1.0))))
+    return compact
+
+
+def betweenness_error_bound(
+    num_nodes: int,
+    sample_size: int,
+    confidence: float = BETWEENNESS_CONFIDENCE,
+) -> float:
+    """
+    Hoeffding + union bound for k-source sampled betweenness.
+
+    With probability >= ``confidence`` every normalized betweenness estimate
+    is within the returned epsilon of its exact value:
+    epsilon = sqrt(ln(2n / delta) / (2k)).
+    """
+    if num_nodes <= 0 or sample_size <= 0:
+        return 0.0
+    delta = max(1e-12, 1.0 - confidence)
+    return math.sqrt(math.log(2 * num_nodes / delta) / (2 * sample_size))
+
+
+def _compute_centrality(
+    node_ids: List[str],
+    edges: List[Tuple[str, str, float]],
+    approx_node_threshold: int,
+    betweenness_samples: int,
+) -> CentralityMetrics:
+    """
+    Compute all centrality metrics from compact graph input.
+
+    Module-level so it can be dispatched to a worker process.
+    """
+    G = nx.Graph()
+    G.add_nodes_from(node_ids)
+    for source, target, weight in edges:
+        if G.has_node(source) and G.has_node(target):
+            G.add_edge(source, target, weight=weight)
+
+    if G.number_of_nodes() == 0:
+        return CentralityMetrics(
+            betweenness={},
+            degree={},
+            eigenvector={},
+            pagerank={}
+        )
+
+    # Compute betweenness centrality (k-source sampling above the threshold)
+    num_nodes = G.number_of_nodes()
+    sample_size = None
+    error_bound = None
+    try:
+        if approx_node_threshold > 0 and num_nodes > approx_node_threshold:
+            sample_size = min(max(1, betweenness_samples), num_nodes)
+            betweenness = nx.betweenness_centrality(
+                G, k=sample_size, weight='weight', seed=42
+            )
+            error_bound = round(betweenness_error_bound(num_nodes, sample_size), 6)
+            logger.info(
+                f"Approximate betweenness: n={num_nodes}, k={sample_size}, "
+                f"error_bound={error_bound}"
+            )
+        else:
+            betweenness = nx.betweenness_centrality(G, weight='weight')
+    except Exception as e:
+        logger.warning(f"Failed to compute betweenness centrality: {e}")
+        betweenness = {n: 0.0 for n in G.nodes()}
+        sample_size = None
+        error_bound = None
+
+    # Compute degree centrality
+    try:
+        degree = dict(G.degree())
+        max_degree = max(degree.values()) if degree else 1
+        max_degree = max_degree or 1
+        degree = {k: v / max_degree for k, v in degree.items()}
+    except Exception as e:
+        logger.warning(f"Failed to compute degree centrality: {e}")
+        degree = {n: 0.0 for n in G.nodes()}
+
+    # Compute eigenvector centrality
+    try:
+        eigenvector = nx.eigenvector_centrality(
+            G,
+            max_iter=100,
+            weight='weight'
+        )
+    except Exception as e:
+        logger.warning(f"Failed to compute eigenvector centrality, falling back to degree: {e}")
+        # Fallback to degree centrality instead of all zeros
+        eigenvector = degree.copy()
+
+    # Compute PageRank
+    try:
+        pagerank = nx.pagerank(G, weight='weight')
+    except Exception as e:
+        logger.warning(f"Failed to compute PageRank: {e}")
+        pagerank = {n: 0.0 for n in G.nodes()}
+
+    return CentralityMetrics(
+        betweenness=betweenness,
+        degree=degree,
+        eigenvector=eigenvector,
+        pagerank=pagerank,
+        approximate=sample_size is not None,
+        sample_size=sample_size,
+        error_bound=error_bound,
+    )
+
+
 class CentralityAnalyzer:
     """
     Analyzer for computing centrality metrics and performing graph operations.
 
     Supports:
-    - Betweenness centrality (bridge nodes)
+    - Betweenness centrality (bridge nodes, sampled above a node threshold)
     - Degree centrality (hub nodes)
     - Eigenvector centrality (influential nodes)
     - PageRank (importance)
@@ -53,7 +201,26 @@ class CentralityAnalyzer:
 
     CACHE_MAX_ENTRIES = 20
 
-    def __init__(self):
+    def __init__(
+        self,
+        approx_node_threshold: Optional[int] = None,
+        betweenness_samples: Optional[int] = None,
+        process_workers: Optional[int] = None,
+    ):
+        from config import settings
+
+        self.approx_node_threshold = (
+            settings.centrality_approx_node_threshold
+            if approx_node_threshold is None else approx_node_threshold
+        )
+        self.betweenness_samples = (
+            settings.centrality_betweenness_samples
+            if betweenness_samples is None else betweenness_samples
+        )
+        self.process_workers = (
+            settings.centrality_process_workers
+            if process_workers is None else process_workers
+        )
         # Bound cache size to prevent unbounded memory growth across many projects.
         self._cache: "OrderedDict[str, CentralityMetrics]" = OrderedDict()
 
@@ -112,73 +279,110 @@ class CentralityAnalyzer:
         Returns:
             CentralityMetrics with all computed metrics
         """
-        if cache_key and cache_key in self._cache:
-            metrics = self._cache[cache_key]
-            self._cache.move_to_end(cache_key)
-            return metrics
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        metrics = _compute_centrality(
+            [node.get('id') for node in nodes],
+            _compact_edges(edges),
+            approx_node_threshold=self.approx_node_threshold,
+            betweenness_samples=self.betweenness_samples,
+        )
+        self._cache_put(cache_key, metrics)
+        return metrics
 
-        G = self.build_graph(nodes, edges)
+    async def compute_all_centrality_async(
+        self,
+        nodes: List[dict],
+        edges: List[dict],
+        cache_key: Optional[str] = None
+    ) -> CentralityMetrics:
+        """
+        Compute all centrality metrics in the shared process pool.
 
-        if G.number_of_nodes() == 0:
-            empty_result = CentralityMetrics(
-                betweenness={},
-                degree={},
-                eigenvector={},
-                pagerank={}
-            )
-            return empty_result
+        Same result as compute_all_centrality(), but the CPU-bound NetworkX
+        work runs in a worker process so the event loop stays responsive.
+        Falls back to a worker thread if the process pool is unavailable.
 
-        # Compute betweenness centrality
-        try:
-            betweenness = nx.betweenness_centrality(G, weight='weight')
-        except Exception as e:
-            logger.warning(f"Failed to compute betweenness centrality: {e}")
-            betweenness = {n: 0.0 for n in G.nodes()}
+        Args:
+            nodes: List of node dictionaries
+            edges: List of edge dictionaries
+            cache_key: Optional key for caching results
 
-        # Compute degree centrality
-        try:
-            degree = dict(G.degree())
-            max_degree = max(degree.values()) if degree else 1
-            degree = {k: v / max_degree for k, v in degree.items()}
-        except Exception as e:
-            logger.warning(f"Failed to compute degree centrality: {e}")
-            degree = {n: 0.0 for n in G.nodes()}
+        Returns:
+            CentralityMetrics with all computed metrics
+        """
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
 
-        # Compute eigenvector centrality
-        try:
-            eigenvector = nx.eigenvector_centrality(
-                G,
-                max_iter=100,
-                weight='weight'
-            )
-        except Exception as e:
-            logger.warning(f"Failed to compute eigenvector centrality, falling back to degree: {e}")
-            # Fallback to degree centrality instead of all zeros
-            eigenvector = degree.copy()
+        return await self._compute_in_pool(
+            [node.get('id') for node in nodes], _compact_edges(edges), cache_key
+        )
 
-        # Compute PageRank
-        try:
-            pagerank = nx.pagerank(G, weight='weight')
-        except Exception as e:
-            logger.warning(f"Failed to compute PageRank: {e}")
-            pagerank = {n: 0.0 for n in G.nodes()}
-
-        metrics = CentralityMetrics(
-            betweenness=betweenness,
-            degree=degree,
-            eigenvector=eigenvector,
-            pagerank=pagerank
+    async def compute_snapshot_centrality_async(
+        self,
+        snapshot,
+        cache_key: Optional[str] = None
+    ) -> CentralityMetrics:
+        """
+        Compute all centrality metrics for a ProjectGraphSnapshot.
+
+        Like compute_all_centrality_async(), but node ids and weighted edges
+        come straight from the snapshot arrays instead of row dicts.
+        """
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        return await self._compute_in_pool(
+            list(snapshot.node_ids), snapshot.compact_edges(), cache_key
         )
 
-        if cache_key:
-            if cache_key in self._cache:
-                self._cache.move_to_end(cache_key)
-            self._cache[cache_key] = metrics
-            while len(self._cache) > self.CACHE_MAX_ENTRIES:
-                self._cache.popitem(last=False)
+    async def _compute_in_pool(
+        self,
+        node_ids: List[str],
+        edges: List[Tuple[str, str, float]],
+        cache_key: Optional[str],
+    ) -> CentralityMetrics:
+        """Run _compute_centrality in the process pool (thread fallback) and cache it."""
+        args = (
+            node_ids,
+            edges,
+            self.approx_node_threshold,
+            self.betweenness_samples,
+        )
 
+        loop = asyncio.get_running_loop()
+        try:
+            pool = _get_process_pool(self.process_workers)
+            metrics = await loop.run_in_executor(pool, _compute_centrality, *args)
+        except (BrokenProcessPool, OSError, RuntimeError) as e:
+            logger.warning(f"Centrality process pool unavailable, using thread: {e}")
+            shutdown_process_pool()
+            metrics = await asyncio.to_thread(_compute_centrality, *args)
+
+        self._cache_put(cache_key, metrics)
         return metrics
 
+    def _cache_get(self, cache_key: Optional[str]) -> Optional[CentralityMetrics]:
+        """Return cached metrics and refresh LRU position."""
+        if cache_key and cache_key in self._cache:
+            self._cache.move_to_end(cache_key)
+            return self._cache[cache_key]
+        return None
+
+    def _cache_put(self, cache_key: Optional[str], metrics: CentralityMetrics) -> None:
+        """Store metrics under cache_key with bounded LRU eviction."""
+        if not cache_key:
+            return
+        if cache_key in self._cache:
+            self._cache.move_to_end(cache_key)
+        self._cache[cache_key] = metrics
+        while len(self._cache) > self.CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
+
     def get_top_bridges(
         self,
         centrality: Dict[str, float],
@@ -206,7 +410,8 @@ class CentralityAnalyzer:
         nodes: List[dict],
         edges: List[dict],
         remove_top_n: int,
-        metric: str = 'betweenness'
+        metric: str = 'betweenness',
+        metrics: Optional[CentralityMetrics] = None
     ) -> Tuple[List[dict], List[dict], List[str], List[Tuple[str, float]]]:
         """
         Remove the top N nodes by centrality metric.
@@ -218,11 +423,13 @@ class CentralityAnalyzer:
             edges: Original list of edge dictionaries
             remove_top_n: Number of top nodes to remove
             metric: Centrality metric to use ('betweenness', 'degree', 'eigenvector')
+            metrics: Optional precomputed metrics (e.g. from compute_all_centrality_async)
 
         Returns:
             Tuple of (filtered_nodes, filtered_edges, removed_ids, top_bridges)
         """
-        metrics = self.compute_all_centrality(nodes, edges)
+        if metrics is None:
+            metrics = self.compute_all_centrality(nodes, edges)
 
         if metric == 'betweenness':
             centrality = metrics.betweenness
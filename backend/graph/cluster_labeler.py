@@ -9,6 +9,8 @@ import asyncio
 import logging
 from typing import Optional
 
+from cache import generate_with_semantic_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -83,7 +85,14 @@ async def generate_cluster_label(
                 "Label:"
             )
             label = await asyncio.wait_for(
-                llm_provider.generate(prompt=prompt, max_tokens=20, temperature=0.0),
+                generate_with_semantic_cache(
+                    llm_provider,
+                    namespace="cluster_label",
+                    semantic_text=", ".join(filtered),
+                    prompt=prompt,
+                    max_tokens=20,
+                    temperature=0.0,
+                ),
                 timeout=timeout,
             )
             result = label.strip().strip('"').strip("'")
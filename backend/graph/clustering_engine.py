@@ -0,0 +1,343 @@
+"""
+Clustering Engine
+
+Concept-embedding clustering for gap detection, sized for 50k+ concepts.
+
+- Up to ``gap_clustering_exact_threshold`` rows: full KMeans with an elbow
+  sweep (the original GapDetector behaviour).
+- Above it: optional PCA / random-projection reduction of the embeddings, a
+  warm-started MiniBatchKMeans sweep over k on a sample (each k starts from
+  the k-1 centers plus the worst-fit sample point), elbow selection with a
+  sampled silhouette as tie-breaker, and one MiniBatchKMeans fit on all rows.
+
+Work is dispatched to a dedicated process pool so it never blocks the event
+loop; tiny inputs run in a thread instead.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Inputs up to this many rows are clustered in a thread (process start-up and
+# pickling would cost more than the clustering itself).
+INLINE_MAX_ROWS = 256
+
+# Rows used for the sampled silhouette estimate.
+SILHOUETTE_SAMPLE_SIZE = 2000
+
+MINIBATCH_SIZE = 1024
+
+
+@dataclass
+class ClusteringResult:
+    """Cluster assignment for each input row."""
+    labels: np.ndarray  # int per row, 0..n_clusters-1
+    centers: np.ndarray  # (n_clusters x dim) in the input space
+    n_clusters: int
+    method: str  # "kmeans" or "minibatch_kmeans"
+    reduced_dim: Optional[int] = None
+    sample_size: Optional[int] = None
+    silhouette: Optional[float] = None
+
+
+# Lazily created process pool shared by all gap detectors in this process.
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Return the shared clustering process pool, creating it on first use."""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(
+            max_workers=max(1, settings.gap_clustering_process_workers)
+        )
+    return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    """Shut down the shared clustering process pool (call on app shutdown)."""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+def k_bounds(n_rows: int, min_clusters: int, max_clusters: int) -> Tuple[int, int]:
+    """Clamp the k search range to the number of rows."""
+    max_k = min(max_clusters, n_rows - 1)
+    min_k = min(min_clusters, max_k)
+    return min_k, max_k
+
+
+def select_elbow(k_values: List[int], inertias: List[float]) -> Optional[int]:
+    """Elbow by maximum second difference of inertia; None if too few points."""
+    if len(inertias) < 3:
+        return None
+    diffs2 = np.diff(np.diff(inertias))
+    if len(diffs2) == 0:
+        return None
+    return int(min(k_values[0] + int(np.argmax(diffs2)) + 1, k_values[-1]))
+
+
+def reduce_dimensions(
+    embeddings: np.ndarray,
+    method: str,
+    target_dim: int,
+    sample_size: int,
+    random_state: int = 42,
+) -> np.ndarray:
+    """
+    Project embeddings to ``target_dim`` dimensions.
+
+    "pca" fits randomized PCA on a sample and transforms all rows; "random"
+    uses a Gaussian random projection. Returns the input unchanged for
+    "none" or when it is already small enough.
+    """
+    n_rows, dim = embeddings.shape
+    if method == "none" or target_dim <= 0 or dim <= target_dim or n_rows <= target_dim:
+        return embeddings
+
+    if method == "random":
+        from sklearn.random_projection import GaussianRandomProjection
+
+        projector = GaussianRandomProjection(n_components=target_dim, random_state=random_state)
+        return projector.fit_transform(embeddings).astype(np.float32, copy=False)
+
+    from sklearn.decomposition import PCA
+
+    rng = np.random.default_rng(random_state)
+    fit_rows = embeddings
+    if n_rows > sample_size:
+        fit_rows = embeddings[rng.choice(n_rows, size=sample_size, replace=False)]
+    pca = PCA(n_components=target_dim, svd_solver="randomized", random_state=random_state)
+    pca.fit(fit_rows)
+    return pca.transform(embeddings).astype(np.float32, copy=False)
+
+
+def _exact_kmeans(
+    embeddings: np.ndarray,
+    n_clusters: Optional[int],
+    min_clusters: int,
+    max_clusters: int,
+    random_state: int,
+) -> ClusteringResult:
+    """Full KMeans with an elbow sweep (n_init=5 per k, n_init=10 final)."""
+    from sklearn.cluster import KMeans
+
+    if n_clusters is None:
+        n_clusters = estimate_optimal_k(embeddings, min_clusters, max_clusters, random_state)
+    n_clusters = min(n_clusters, len(embeddings))
+
+    kmeans = KMeans(n_clusters=n_clusters, random_state=random_state, n_init=10)
+    labels = kmeans.fit_predict(embeddings)
+    return ClusteringResult(
+        labels=labels,
+        centers=kmeans.cluster_centers_,
+        n_clusters=n_clusters,
+        method="kmeans",
+    )
+
+
+def estimate_optimal_k(
+    embeddings: np.ndarray,
+    min_clusters: int,
+    max_clusters: int,
+    random_state: int = 42,
+) -> int:
+    """Elbow-method k using full KMeans fits (for small inputs)."""
+    from sklearn.cluster import KMeans
+
+    min_k, max_k = k_bounds(len(embeddings), min_clusters, max_clusters)
+    if max_k <= min_k:
+        return min_k
+
+    k_values = list(range(min_k, max_k + 1))
+    inertias = [
+        KMeans(n_clusters=k, random_state=random_state, n_init=5).fit(embeddings).inertia_
+        for k in k_values
+    ]
+    elbow = select_elbow(k_values, inertias)
+    if elbow is not None:
+        return elbow
+    return min_k if len(inertias) < 3 else (min_k + max_k) // 2
+
+
+def _warm_sweep(
+    sample: np.ndarray,
+    min_k: int,
+    max_k: int,
+    random_state: int,
+) -> Tuple[List[int], List[float], List[np.ndarray], List[np.ndarray]]:
+    """
+    MiniBatchKMeans for k = min_k..max_k on ``sample``, each warm-started.
+
+    k+1 starts from the k centers plus the sample point farthest from its
+    center, so each step refines the previous solution instead of re-seeding.
+
+    Returns:
+        (k values, inertias, centers per k, sample labels per k)
+    """
+    from sklearn.cluster import MiniBatchKMeans
+
+    k_values, inertias, centers_by_k, labels_by_k = [], [], [], []
+    init: object = "k-means++"
+    n_init = 3
+    for k in range(min_k, max_k + 1):
+        model = MiniBatchKMeans(
+            n_clusters=k,
+            init=init,
+            n_init=n_init,
+            batch_size=MINIBATCH_SIZE,
+            random_state=random_state,
+        ).fit(sample)
+        k_values.append(k)
+        inertias.append(float(model.inertia_))
+        centers_by_k.append(model.cluster_centers_)
+        labels_by_k.append(model.labels_)
+
+        distances = model.transform(sample).min(axis=1)
+        init = np.vstack([model.cluster_centers_, sample[int(np.argmax(distances))]])
+        n_init = 1
+    return k_values, inertias, centers_by_k, labels_by_k
+
+
+def _sampled_silhouette(rows: np.ndarray, labels: np.ndarray, random_state: int) -> Optional[float]:
+    from sklearn.metrics import silhouette_score
+
+    if len(np.unique(labels)) < 2:
+        return None
+    return float(silhouette_score(
+        rows, labels,
+        sample_size=min(SILHOUETTE_SAMPLE_SIZE, len(rows)),
+        random_state=random_state,
+    ))
+
+
+def _input_space_centers(embeddings: np.ndarray, labels: np.ndarray, n_clusters: int) -> np.ndarray:
+    """Mean embedding per label (centers of a reduced-space fit, mapped back)."""
+    sums = np.zeros((n_clusters, embeddings.shape[1]), dtype=np.float64)
+    np.add.at(sums, labels, embeddings)
+    counts = np.bincount(labels, minlength=n_clusters).astype(np.float64)
+    return (sums / np.maximum(counts, 1.0)[:, None]).astype(np.float32)
+
+
+def _minibatch_kmeans(
+    embeddings: np.ndarray,
+    n_clusters: Optional[int],
+    min_clusters: int,
+    max_clusters: int,
+    sample_size: int,
+    reduction: str,
+    reduced_dim: int,
+    random_state: int,
+) -> ClusteringResult:
+    from sklearn.cluster import MiniBatchKMeans
+
+    reduced = reduce_dimensions(embeddings, reduction, reduced_dim, sample_size, random_state)
+    n_rows = len(reduced)
+    rng = np.random.default_rng(random_state)
+    sample_idx = (
+        rng.choice(n_rows, size=sample_size, replace=False) if n_rows > sample_size else np.arange(n_rows)
+    )
+    sample = reduced[sample_idx]
+
+    init: object = "k-means++"
+    if n_clusters is None:
+        min_k, max_k = k_bounds(len(sample), min_clusters, max_clusters)
+        k_values, inertias, centers_by_k, labels_by_k = _warm_sweep(sample, min_k, max_k, random_state)
+        n_clusters = select_elbow(k_values, inertias)
+        if n_clusters is None:
+            # Too few k values for an elbow: best sampled silhouette wins
+            scores = [_sampled_silhouette(sample, labels, random_state) for labels in labels_by_k]
+            n_clusters = max(
+                zip(k_values, scores), key=lambda ks: -1.0 if ks[1] is None else ks[1]
+            )[0]
+        init = centers_by_k[k_values.index(n_clusters)]
+    n_clusters = min(n_clusters, n_rows)
+
+    model = MiniBatchKMeans(
+        n_clusters=n_clusters,
+        init=init,
+        n_init=1 if isinstance(init, np.ndarray) else 3,
+        batch_size=MINIBATCH_SIZE,
+        random_state=random_state,
+    ).fit(reduced)
+    labels = model.labels_
+
+    return ClusteringResult(
+        labels=labels,
+        centers=_input_space_centers(embeddings, labels, n_clusters),
+        n_clusters=n_clusters,
+        method="minibatch_kmeans",
+        reduced_dim=reduced.shape[1] if reduced is not embeddings else None,
+        sample_size=len(sample),
+        silhouette=_sampled_silhouette(sample, labels[sample_idx], random_state),
+    )
+
+
+def cluster_embeddings(
+    embeddings: np.ndarray,
+    n_clusters: Optional[int] = None,
+    min_clusters: int = 3,
+    max_clusters: int = 10,
+    exact_threshold: int = 2000,
+    sample_size: int = 5000,
+    reduction: str = "pca",
+    reduced_dim: int = 64,
+    random_state: int = 42,
+) -> ClusteringResult:
+    """
+    Cluster embedding rows, choosing k by the elbow method when not given.
+
+    Module-level so it can be dispatched to a worker process.
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    if len(embeddings) <= exact_threshold:
+        return _exact_kmeans(embeddings, n_clusters, min_clusters, max_clusters, random_state)
+    return _minibatch_kmeans(
+        embeddings, n_clusters, min_clusters, max_clusters,
+        sample_size, reduction, reduced_dim, random_state,
+    )
+
+
+async def cluster_embeddings_async(
+    embeddings: np.ndarray,
+    n_clusters: Optional[int] = None,
+    min_clusters: int = 3,
+    max_clusters: int = 10,
+) -> ClusteringResult:
+    """
+    Run cluster_embeddings() with the configured engine settings off the event loop.
+
+    Uses the shared process pool; falls back to a worker thread if the pool
+    is unavailable.
+    """
+    args = (
+        np.asarray(embeddings, dtype=np.float32),
+        n_clusters,
+        min_clusters,
+        max_clusters,
+        settings.gap_clustering_exact_threshold,
+        settings.gap_clustering_sample_size,
+        settings.gap_clustering_reduction,
+        settings.gap_clustering_reduced_dim,
+    )
+    if len(args[0]) <= INLINE_MAX_ROWS:
+        return await asyncio.to_thread(cluster_embeddings, *args)
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_get_process_pool(), cluster_embeddings, *args)
+    except (BrokenProcessPool, OSError, RuntimeError) as e:
+        logger.warning(f"Clustering process pool unavailable, using thread: {e}")
+        shutdown_process_pool()
+        return await asyncio.to_thread(cluster_embeddings, *args)
@@ -3,14 +3,30 @@ Community Detection for Knowledge Graph
 
 Detects communities/clusters in the knowledge graph using graph topology.
 Supports Leiden algorithm (if available) with fallback to simple connected components.
+Both run on the shared in-memory ProjectGraphSnapshot.
+
+Incremental mode (update_communities_incremental) seeds the stored partition
+from concept_clusters, frees only the communities touched by relationships
+created since it was written (plus their new endpoints), refines those with
+Leiden (label propagation without leidenalg) and writes back only the diff.
+
+concept_clusters also holds the KMeans clusters written by gap refresh, which
+structural_gaps point at. Community rows are told apart by detection_method
+(COMMUNITY_ROWS_SQL); every community read and write is scoped to them.
 """
 
 import logging
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+COMMUNITY_DETECTION_METHODS = ("leiden", "connected_components", "label_propagation")
+# Literal predicate so ON CONFLICT can infer the partial unique index (migration 028)
+COMMUNITY_ROWS_SQL = "detection_method IN ('leiden', 'connected_components', 'label_propagation')"
+
 
 @dataclass
 class Community:
@@ -24,12 +40,44 @@ class Community:
     summary: str = ""
 
 
+@dataclass
+class IncrementalCommunityUpdate:
+    """Outcome of an incremental community update."""
+    communities: list[Community] = field(default_factory=list)
+    mode: str = "incremental"  # "incremental", "full" or "unchanged"
+    new_edges: int = 0
+    touched_communities: int = 0
+    nodes_added: int = 0  # Nodes without a stored community that joined one
+    nodes_moved: int = 0  # Nodes whose stored community changed (or was dropped)
+    upserted: int = 0
+    deleted: int = 0
+
+    @property
+    def nodes_changed(self) -> int:
+        return self.nodes_added + self.nodes_moved
+
+
+# Incremental mode never puts authorship or paper nodes into concept communities.
+INCREMENTAL_EXCLUDED_TYPES = ("Paper", "Author")
+
+
+@dataclass
+class IncrementalPlan:
+    """Seeded refinement subgraph for an incremental update."""
+    universe: np.ndarray  # snapshot node indices, position = local index
+    membership: np.ndarray  # initial community code per local node
+    free: np.ndarray  # bool per local node, True if it may move
+    edges: np.ndarray  # (m x 2) local endpoints
+    weights: np.ndarray  # float64 per edge
+    touched_communities: int = 0
+
+
 class CommunityDetector:
     """
     Detects communities in the knowledge graph.
 
     Uses Leiden algorithm if igraph+leidenalg are available,
-    otherwise falls back to simple connected components via SQL.
+    otherwise falls back to simple connected components.
     """
 
     def __init__(self, db_connection=None, llm_provider=None):
@@ -44,7 +92,7 @@ class CommunityDetector:
             import leidenalg
             return True
         except ImportError:
-            logger.info("igraph/leidenalg not available, using SQL-based clustering")
+            logger.info("igraph/leidenalg not available, using connected-components clustering")
             return False
 
     async def detect_communities(
@@ -56,6 +104,9 @@ class CommunityDetector:
         """
         Detect communities in the project's knowledge graph.
 
+        Both algorithms run on the shared ProjectGraphSnapshot, so repeat
+        detections on an unchanged graph do not re-read the project.
+
         Args:
             project_id: Project to analyze
             min_community_size: Minimum entities per community
@@ -64,17 +115,20 @@ class CommunityDetector:
         if not self.db:
             return []
 
+        from graph.graph_snapshot import graph_snapshot_service
+        snapshot = await graph_snapshot_service.get(self.db, project_id)
+
         if self._has_leiden:
             try:
-                return await self._detect_with_leiden(project_id, min_community_size, resolution)
+                return self._detect_with_leiden(snapshot, min_community_size, resolution)
             except Exception as e:
-                logger.warning(f"Leiden detection failed: {e}, falling back to SQL")
+                logger.warning(f"Leiden detection failed: {e}, falling back to connected components")
 
-        return await self._detect_with_sql(project_id, min_community_size)
+        return self._detect_connected_components(snapshot, min_community_size)
 
-    async def _detect_with_leiden(
+    def _detect_with_leiden(
         self,
-        project_id: str,
+        snapshot,
         min_community_size: int,
         resolution: float,
     ) -> list[Community]:
@@ -82,48 +136,25 @@ class CommunityDetector:
         import igraph as ig
         import leidenalg
 
-        # Fetch entities and relationships
-        entities = await self.db.fetch(
-            """
-            SELECT id::text, name, entity_type
-            FROM entities
-            WHERE project_id = $1 AND entity_type != 'Paper'
-            """,
-            project_id,
-        )
-
-        if not entities:
+        # Non-Paper entities and the relationships between them
+        node_mask = snapshot.node_mask(exclude_types=("Paper",))
+        members_idx = np.flatnonzero(node_mask)
+        if members_idx.size == 0:
             return []
 
-        entity_id_to_idx = {row["id"]: i for i, row in enumerate(entities)}
-
-        relationships = await self.db.fetch(
-            """
-            SELECT source_id::text, target_id::text, weight
-            FROM relationships r
-            JOIN entities e1 ON r.source_id = e1.id
-            JOIN entities e2 ON r.target_id = e2.id
-            WHERE e1.project_id = $1
-                AND e1.entity_type != 'Paper'
-                AND e2.entity_type != 'Paper'
-            """,
-            project_id,
-        )
-
-        # Build igraph graph
-        edges = []
-        weights = []
-        for rel in relationships:
-            src_idx = entity_id_to_idx.get(rel["source_id"])
-            tgt_idx = entity_id_to_idx.get(rel["target_id"])
-            if src_idx is not None and tgt_idx is not None:
-                edges.append((src_idx, tgt_idx))
-                weights.append(float(rel["weight"] or 1.0))
-
-        if not edges:
+        edge_mask = snapshot.edge_mask(node_mask)
+        if not edge_mask.any():
             return []
 
-        g = ig.Graph(n=len(entities), edges=edges, directed=False)
+        # Re-index the subgraph to 0..n-1 for igraph
+        local = np.full(snapshot.num_nodes, -1, dtype=np.int64)
+        local[members_idx] = np.arange(members_idx.size)
+        edges = np.column_stack(
+            (local[snapshot.edge_src[edge_mask]], local[snapshot.edge_dst[edge_mask]])
+        ).tolist()
+        weights = snapshot.weights[edge_mask].astype(float).tolist()
+
+        g = ig.Graph(n=int(members_idx.size), edges=edges, directed=False)
         g.es["weight"] = weights
 
         # Run Leiden
@@ -133,16 +164,14 @@ class CommunityDetector:
         )
 
         # Build communities
+        from graph.cluster_labeler import fallback_label
         communities = []
         for comm_id, members in enumerate(partition):
             if len(members) < min_community_size:
                 continue
 
-            entity_ids = [entities[idx]["id"] for idx in members]
-            # Use most common entity type as label hint
-            types = [entities[idx]["entity_type"] for idx in members]
-            top_names = [entities[idx]["name"] for idx in members[:10]]
-            from graph.cluster_labeler import fallback_label
+            entity_ids = [snapshot.node_ids[members_idx[idx]] for idx in members]
+            top_names = [snapshot.names[members_idx[idx]] for idx in members[:10]]
             label = fallback_label(top_names)
 
             communities.append(Community(
@@ -156,94 +185,43 @@ class CommunityDetector:
 
         return communities
 
-    async def _detect_with_sql(
+    def _detect_connected_components(
         self,
-        project_id: str,
+        snapshot,
         min_community_size: int,
     ) -> list[Community]:
         """
-        SQL-based community detection using connected components.
+        Community detection using connected components.
         Groups entities that are connected via relationships.
         """
-        # Get all non-Paper entities with their connections
-        rows = await self.db.fetch(
-            """
-            WITH entity_connections AS (
-                SELECT
-                    e.id::text as entity_id,
-                    e.name,
-                    e.entity_type,
-                    array_agg(DISTINCT
-                        CASE
-                            WHEN r.source_id = e.id THEN r.target_id::text
-                            ELSE r.source_id::text
-                        END
-                    ) FILTER (WHERE r.id IS NOT NULL) as connected_ids
-                FROM entities e
-                LEFT JOIN relationships r ON (e.id = r.source_id OR e.id = r.target_id)
-                    AND r.relationship_type NOT IN ('AUTHORED_BY', 'CITES')
-                WHERE e.project_id = $1
-                    AND e.entity_type NOT IN ('Paper', 'Author')
-                GROUP BY e.id, e.name, e.entity_type
-            )
-            SELECT * FROM entity_connections
-            """,
-            project_id,
-        )
-
-        if not rows:
+        # Non-Paper/Author entities, ignoring authorship and citation links
+        node_mask = snapshot.node_mask(exclude_types=("Paper", "Author"))
+        if not node_mask.any():
             return []
+        edge_mask = snapshot.edge_mask(
+            node_mask, exclude_relationship_types=("AUTHORED_BY", "CITES")
+        )
+        labels = snapshot.connected_components(node_mask, edge_mask)
 
-        # Simple union-find for connected components
-        parent = {}
-
-        def find(x):
-            while parent.get(x, x) != x:
-                parent[x] = parent.get(parent[x], parent[x])
-                x = parent[x]
-            return x
-
-        def union(x, y):
-            px, py = find(x), find(y)
-            if px != py:
-                parent[px] = py
-
-        # Initialize all entities
-        entity_map = {}
-        for row in rows:
-            eid = row["entity_id"]
-            entity_map[eid] = {"name": row["name"], "entity_type": row["entity_type"]}
-            parent[eid] = eid
-
-        # Union connected entities
-        for row in rows:
-            eid = row["entity_id"]
-            connected = row["connected_ids"] or []
-            for cid in connected:
-                if cid in entity_map:
-                    union(eid, cid)
-
-        # Group by component
-        components = {}
-        for eid in entity_map:
-            root = find(eid)
-            if root not in components:
-                components[root] = []
-            components[root].append(eid)
+        # Group by component (members in id order)
+        selected = np.flatnonzero(node_mask)
+        order = np.argsort(labels[selected], kind="stable")
+        boundaries = np.flatnonzero(np.diff(labels[selected][order])) + 1
+        components = np.split(selected[order], boundaries)
 
         # Build communities
+        from graph.cluster_labeler import fallback_label
         communities = []
-        for comm_id, (root, members) in enumerate(
-            sorted(components.items(), key=lambda x: len(x[1]), reverse=True)
+        for comm_id, members in enumerate(
+            sorted(components, key=len, reverse=True)
         ):
             if len(members) < min_community_size:
                 continue
 
-            top_names = [entity_map[m]["name"] for m in members[:10]]
-            from graph.cluster_labeler import fallback_label
+            top_names = [snapshot.names[m] for m in members[:10]]
             communities.append(Community(
                 community_id=comm_id,
-                entity_ids=members,
+                entity_ids=[snapshot.node_ids[m] for m in members],
                 label=fallback_label(top_names),
                 size=len(members),
                 detection_method="connected_components",
@@ -257,20 +235,407 @@ class CommunityDetector:
         project_id: str,
         communities: list[Community],
     ) -> None:
-        """Store detected communities in the database."""
+        """Replace the project's stored communities with one bulk insert."""
         if not self.db:
             return
 
-        for comm in communities:
-            await self.db.execute(
-                """
-                INSERT INTO concept_clusters
-                    (project_id, cluster_label, entity_ids, detection_method, community_level)
-                VALUES ($1, $2, $3::uuid[], $4, $5)
-                """,
-                project_id,
-                comm.label,
+        rows = [
+            (
+                comm.community_id,
                 comm.entity_ids,
+                [],
+                len(comm.entity_ids),
+                comm.label,
                 comm.detection_method,
                 comm.level,
             )
+            for comm in communities
+        ]
+        await self._write_community_diff(project_id, rows, deleted_ids=None)
+
+    async def _write_community_diff(
+        self,
+        project_id: str,
+        upserts: list[tuple],
+        deleted_ids: Optional[list[int]],
+    ) -> None:
+        """
+        Apply community changes in one transaction.
+
+        upserts: (cluster_id, entity_ids, concept_names, size, label,
+        detection_method, level) tuples. deleted_ids: cluster ids to remove,
+        or None to replace every stored community of the project.
+        """
+        project_id = str(project_id)
+        async with self.db.transaction() as conn:
+            if deleted_ids is None:
+                await conn.execute(
+                    f"DELETE FROM concept_clusters WHERE project_id = $1 AND {COMMUNITY_ROWS_SQL}",
+                    project_id,
+                )
+            elif deleted_ids:
+                await conn.execute(
+                    f"""
+                    DELETE FROM concept_clusters
+                    WHERE project_id = $1 AND cluster_id = ANY($2::int[]) AND {COMMUNITY_ROWS_SQL}
+                    """,
+                    project_id,
+                    deleted_ids,
+                )
+            if upserts:
+                await conn.executemany(
+                    f"""
+                    INSERT INTO concept_clusters
+                        (project_id, cluster_id, concepts, concept_names, size, label,
+                         detection_method, community_level, updated_at)
+                    VALUES ($1, $2, $3::uuid[], $4, $5, $6, $7, $8, NOW())
+                    ON CONFLICT (project_id, cluster_id) WHERE {COMMUNITY_ROWS_SQL} DO UPDATE SET
+                        concepts = EXCLUDED.concepts,
+                        concept_names = EXCLUDED.concept_names,
+                        size = EXCLUDED.size,
+                        label = COALESCE(concept_clusters.label, EXCLUDED.label),
+                        detection_method = EXCLUDED.detection_method,
+                        updated_at = NOW()
+                    """,
+                    [(project_id, *row) for row in upserts],
+                )
+            # The newest updated_at is the incremental-update watermark
+            await conn.execute(
+                f"UPDATE concept_clusters SET updated_at = NOW() WHERE project_id = $1 AND {COMMUNITY_ROWS_SQL}",
+                project_id,
+            )
+        await self._invalidate_metrics(project_id)
+
+    async def _advance_watermark(self, project_id: str) -> None:
+        """Mark relationships up to now as processed when no community changed."""
+        await self.db.execute(
+            f"UPDATE concept_clusters SET updated_at = NOW() WHERE project_id = $1 AND {COMMUNITY_ROWS_SQL}",
+            project_id,
+        )
+
+    async def _invalidate_metrics(self, project_id: str) -> None:
+        """Drop cached graph metrics that read concept_clusters."""
+        from graph.metrics_cache import graph_metrics_store, metrics_cache
+
+        await metrics_cache.invalidate_project(project_id)
+        await graph_metrics_store.invalidate_project(self.db, project_id)
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    async def update_communities_incremental(
+        self,
+        project_id: str,
+        min_community_size: int = 3,
+        resolution: float = 1.0,
+    ) -> IncrementalCommunityUpdate:
+        """
+        Update stored communities after papers were appended to a project.
+
+        Falls back to full detection and storage when no partition is stored.
+        """
+        if not self.db:
+            return IncrementalCommunityUpdate(mode="unchanged")
+
+        project_id = str(project_id)
+        stored_rows = await self.db.fetch(
+            f"""
+            SELECT cluster_id, concepts::text[] AS concepts, label,
+                   COALESCE(updated_at, created_at) AS written_at
+            FROM concept_clusters
+            WHERE project_id = $1 AND cluster_id IS NOT NULL AND {COMMUNITY_ROWS_SQL}
+            """,
+            project_id,
+        )
+        if not stored_rows:
+            communities = await self.detect_communities(project_id, min_community_size, resolution)
+            await self.store_communities(project_id, communities)
+            return IncrementalCommunityUpdate(
+                communities=communities,
+                mode="full",
+                nodes_added=sum(c.size for c in communities),
+                upserted=len(communities),
+            )
+
+        watermark = max((r["written_at"] for r in stored_rows if r["written_at"] is not None), default=None)
+        new_edge_rows = await self.db.fetch(
+            """
+            SELECT source_id::text AS source_id, target_id::text AS target_id
+            FROM relationships
+            WHERE project_id = $1 AND ($2::timestamptz IS NULL OR created_at > $2)
+            """,
+            project_id,
+            watermark,
+        )
+
+        from graph.graph_snapshot import graph_snapshot_service
+        snapshot = await graph_snapshot_service.get(self.db, project_id)
+
+        stored = {
+            int(r["cluster_id"]): [str(cid) for cid in (r["concepts"] or [])] for r in stored_rows
+        }
+        stored_labels = {int(r["cluster_id"]): r["label"] for r in stored_rows}
+        new_edges = [(r["source_id"], r["target_id"]) for r in new_edge_rows]
+
+        plan = plan_incremental_update(snapshot, stored, new_edges)
+        if plan is None:
+            if new_edges:
+                await self._advance_watermark(project_id)
+            return IncrementalCommunityUpdate(mode="unchanged", new_edges=len(new_edges))
+
+        method = "label_propagation"
+        refined = None
+        n = int(plan.universe.size)
+        if self._has_leiden:
+            try:
+                refined = refine_with_leiden(
+                    n, plan.edges, plan.weights, plan.membership, plan.free, resolution
+                )
+                method = "leiden"
+            except Exception as e:
+                logger.warning(f"Incremental Leiden refinement failed: {e}, using label propagation")
+        if refined is None:
+            refined = refine_with_label_propagation(n, plan.edges, plan.weights, plan.membership, plan.free)
+
+        result = build_community_diff(
+            snapshot, plan.universe, refined, plan.free, stored, stored_labels,
+            min_community_size, method,
+        )
+        if result.upserts or result.deleted_ids:
+            await self._write_community_diff(project_id, result.upserts, result.deleted_ids)
+        else:
+            await self._advance_watermark(project_id)
+
+        logger.info(
+            f"Incremental communities for {project_id}: {len(new_edges)} new edges, "
+            f"{plan.touched_communities} communities refined, "
+            f"{result.nodes_added + result.nodes_moved} nodes changed community"
+        )
+        return IncrementalCommunityUpdate(
+            communities=result.communities,
+            new_edges=len(new_edges),
+            touched_communities=plan.touched_communities,
+            nodes_added=result.nodes_added,
+            nodes_moved=result.nodes_moved,
+            upserted=len(result.upserts),
+            deleted=len(result.deleted_ids),
+        )
+
+
+def plan_incremental_update(
+    snapshot,
+    stored: Dict[int, List[str]],
+    new_edges: List[Tuple[str, str]],
+):
+    """
+    Build the refinement subgraph for an incremental update.
+
+    The universe is every stored member still in the graph plus the endpoints
+    of new edges. Stored communities containing an endpoint of a new edge are
+    "touched"; their members and all new nodes are free, everything else is
+    fixed to its stored community.
+
+    Returns:
+        IncrementalPlan, or None when no new edge lies inside the graph
+    """
+    allowed = snapshot.node_mask(exclude_types=INCREMENTAL_EXCLUDED_TYPES)
+    stored_of = np.full(snapshot.num_nodes, -1, dtype=np.int64)
+    for cluster_id, members in stored.items():
+        for member in members:
+            i = snapshot.index.get(member)
+            if i is not None and allowed[i]:
+                stored_of[i] = cluster_id
+
+    endpoints = np.zeros(snapshot.num_nodes, dtype=bool)
+    for source, target in new_edges:
+        s, t = snapshot.index.get(source), snapshot.index.get(target)
+        if s is not None and t is not None and allowed[s] and allowed[t] and s != t:
+            endpoints[s] = endpoints[t] = True
+    if not endpoints.any():
+        return None
+
+    in_universe = (stored_of >= 0) | endpoints
+    universe = np.flatnonzero(in_universe)
+    touched = np.unique(stored_of[endpoints & (stored_of >= 0)])
+
+    # Stored communities become codes 0..k-1; each new node starts as a singleton
+    seeds = stored_of[universe]
+    _, codes = np.unique(seeds[seeds >= 0], return_inverse=True)
+    membership = np.empty(universe.size, dtype=np.int64)
+    membership[seeds >= 0] = codes
+    n_new = int((seeds < 0).sum())
+    membership[seeds < 0] = codes.max(initial=-1) + 1 + np.arange(n_new)
+    free = (seeds < 0) | np.isin(seeds, touched)
+
+    local = np.full(snapshot.num_nodes, -1, dtype=np.int64)
+    local[universe] = np.arange(universe.size)
+    edge_mask = snapshot.edge_mask(in_universe)
+    edges = np.column_stack((local[snapshot.edge_src[edge_mask]], local[snapshot.edge_dst[edge_mask]]))
+    return IncrementalPlan(
+        universe=universe,
+        membership=membership,
+        free=free,
+        edges=edges,
+        weights=snapshot.weights[edge_mask].astype(np.float64),
+        touched_communities=int(touched.size),
+    )
+
+
+def refine_with_leiden(
+    n: int,
+    edges: np.ndarray,
+    weights: np.ndarray,
+    membership: np.ndarray,
+    free: np.ndarray,
+    resolution: float,
+) -> np.ndarray:
+    """Leiden seeded with ``membership``; only ``free`` nodes may move."""
+    import igraph as ig
+    import leidenalg
+
+    g = ig.Graph(n=n, edges=edges.tolist(), directed=False)
+    partition = leidenalg.RBConfigurationVertexPartition(
+        g,
+        initial_membership=membership.tolist(),
+        weights=weights.tolist(),
+        resolution_parameter=resolution,
+    )
+    optimiser = leidenalg.Optimiser()
+    optimiser.optimise_partition(partition, is_membership_fixed=(~free).tolist())
+    return np.asarray(partition.membership, dtype=np.int64)
+
+
+def refine_with_label_propagation(
+    n: int,
+    edges: np.ndarray,
+    weights: np.ndarray,
+    membership: np.ndarray,
+    free: np.ndarray,
+    max_rounds: int = 20,
+) -> np.ndarray:
+    """
+    Weighted label propagation over the free nodes (fixed nodes keep their label).
+
+    Each free node takes the community with the largest total edge weight among
+    its neighbours; ties keep the current community, else the lowest id.
+    """
+    from scipy.sparse import coo_matrix
+
+    labels = membership.copy()
+    if edges.size == 0:
+        return labels
+    rows = np.concatenate([edges[:, 0], edges[:, 1]])
+    cols = np.concatenate([edges[:, 1], edges[:, 0]])
+    data = np.concatenate([weights, weights])
+    adjacency = coo_matrix((data, (rows, cols)), shape=(n, n)).tocsr()
+
+    free_nodes = np.flatnonzero(free)
+    for _ in range(max_rounds):
+        changed = 0
+        for i in free_nodes:
+            start, end = adjacency.indptr[i], adjacency.indptr[i + 1]
+            if start == end:
+                continue
+            votes: Dict[int, float] = {}
+            for j, w in zip(adjacency.indices[start:end], adjacency.data[start:end]):
+                if j != i:
+                    votes[labels[j]] = votes.get(labels[j], 0.0) + w
+            if not votes:
+                continue
+            best = max(votes.values())
+            if votes.get(labels[i], -1.0) >= best:
+                continue
+            labels[i] = min(c for c, v in votes.items() if v == best)
+            changed += 1
+        if not changed:
+            break
+    return labels
+
+
+@dataclass
+class CommunityDiff:
+    """Rows to write plus node-level change counts."""
+    communities: list[Community]
+    upserts: list[tuple]
+    deleted_ids: list[int]
+    nodes_added: int
+    nodes_moved: int
+
+
+def build_community_diff(
+    snapshot,
+    universe: np.ndarray,
+    labels: np.ndarray,
+    free: np.ndarray,
+    stored: Dict[int, List[str]],
+    stored_labels: Dict[int, Optional[str]],
+    min_community_size: int,
+    method: str,
+) -> CommunityDiff:
+    """
+    Map refined communities back to stored cluster ids and diff them.
+
+    Each refined community inherits the stored cluster id it overlaps most
+    (greedy, largest overlap first); the rest get fresh ids. Communities that
+    contain a fixed node are carried over whatever their size; only
+    communities made up entirely of free nodes must reach
+    ``min_community_size``.
+    """
+    from graph.cluster_labeler import fallback_label
+
+    node_ids = [snapshot.node_ids[i] for i in universe]
+    stored_of = {member: cluster_id for cluster_id, members in stored.items() for member in members}
+    seeds = np.array([stored_of.get(node_id, -1) for node_id in node_ids], dtype=np.int64)
+
+    # Overlap counts between refined and stored communities
+    overlap: Dict[Tuple[int, int], int] = {}
+    for label, seed in zip(labels.tolist(), seeds.tolist()):
+        if seed >= 0:
+            overlap[(label, seed)] = overlap.get((label, seed), 0) + 1
+    assigned: Dict[int, int] = {}
+    claimed = set()
+    for (label, seed), _ in sorted(overlap.items(), key=lambda kv: (-kv[1], kv[0])):
+        if label not in assigned and seed not in claimed:
+            assigned[label] = seed
+            claimed.add(seed)
+    next_id = max(stored, default=-1) + 1
+    for label in sorted(set(labels.tolist())):
+        if label not in assigned:
+            assigned[label] = next_id
+            next_id += 1
+
+    members_of: Dict[int, List[int]] = {}
+    for pos, label in enumerate(labels.tolist()):
+        members_of.setdefault(assigned[label], []).append(pos)
+
+    communities, upserts, kept = [], [], set()
+    final_of = np.full(universe.size, -1, dtype=np.int64)
+    for cluster_id in sorted(members_of):
+        positions = members_of[cluster_id]
+        if len(positions) < min_community_size and free[positions].all():
+            continue
+        kept.add(cluster_id)
+        final_of[positions] = cluster_id
+        entity_ids = [node_ids[p] for p in positions]
+        names = [snapshot.names[universe[p]] for p in positions]
+        label = stored_labels.get(cluster_id) or fallback_label(names[:10])
+        communities.append(Community(
+            community_id=cluster_id,
+            entity_ids=entity_ids,
+            label=label,
+            size=len(entity_ids),
+            detection_method=method,
+        ))
+        if set(entity_ids) != set(stored.get(cluster_id, ())):
+            upserts.append((cluster_id, entity_ids, names, len(entity_ids), label, method, 0))
+
+    moved_mask = (seeds >= 0) & (final_of != seeds)
+    added_mask = (seeds < 0) & (final_of >= 0)
+    return CommunityDiff(
+        communities=communities,
+        upserts=upserts,
+        deleted_ids=sorted(set(stored) - kept),
+        nodes_added=int(added_mask.sum()),
+        nodes_moved=int(moved_mask.sum()),
+    )
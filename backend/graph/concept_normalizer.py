@@ -14,7 +14,7 @@ import logging
 import re
 from dataclasses import dataclass
 from difflib import SequenceMatcher
-from typing import Optional
+from typing import Iterable, Optional
 from uuid import UUID
 
 logger = logging.getLogger(__name__)
@@ -123,6 +123,99 @@ def similarity_ratio(s1: str, s2: str) -> float:
     return SequenceMatcher(None, s1, s2).ratio()
 
 
+def _qgrams(s: str, q: int = 3) -> set[str]:
+    padded = f"{' ' * (q - 1)}{s} "
+    return {padded[i:i + q] for i in range(len(padded) - q + 1)}
+
+
+class FuzzyNameIndex:
+    """
+    Q-gram inverted index over normalized names for fuzzy lookups.
+
+    Only names sharing at least one padded trigram with the query and passing
+    the SequenceMatcher length bound (2 * min(len) / (len_a + len_b) >= threshold)
+    are scored, instead of every known name.
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        # normalized key -> name returned on match
+        self._targets: dict[str, str] = {}
+        # insertion order, so ties resolve like a linear scan would
+        self._order: dict[str, int] = {}
+        self._postings: dict[str, set[str]] = {}
+        for name in names:
+            self.add(name)
+
+    def __len__(self) -> int:
+        return len(self._targets)
+
+    def add(self, name: str, canonical_name: Optional[str] = None) -> None:
+        """
+        Index ``name``. Lookups hitting it return ``canonical_name`` (default:
+        ``name`` itself). An explicit canonical overrides an existing entry.
+        """
+        key = normalize_string(name)
+        if not key:
+            return
+        if key in self._targets:
+            if canonical_name is not None:
+                self._targets[key] = canonical_name
+            return
+        self._targets[key] = canonical_name if canonical_name is not None else name
+        self._order[key] = len(self._order)
+        for gram in _qgrams(key):
+            self._postings.setdefault(gram, set()).add(key)
+
+    def remove(self, name: str) -> None:
+        key = normalize_string(name)
+        if self._targets.pop(key, None) is None:
+            return
+        self._order.pop(key, None)
+        for gram in _qgrams(key):
+            bucket = self._postings.get(gram)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._postings[gram]
+
+    def redirect(self, old_canonical: str, new_canonical: str) -> None:
+        """Point every entry that resolves to ``old_canonical`` at ``new_canonical``."""
+        for key, target in self._targets.items():
+            if target == old_canonical:
+                self._targets[key] = new_canonical
+
+    def best_match(self, normalized_name: str, threshold: float) -> Optional[tuple[str, float]]:
+        """Return (name, score) of the best entry scoring >= threshold, if any."""
+        if not normalized_name or not self._targets:
+            return None
+
+        query_len = len(normalized_name)
+        candidates: set[str] = set()
+        for gram in _qgrams(normalized_name):
+            candidates.update(self._postings.get(gram, ()))
+
+        best_key = None
+        best_score = 0.0
+        for key in sorted(candidates, key=self._order.__getitem__):
+            key_len = len(key)
+            if 2 * min(query_len, key_len) < threshold * (query_len + key_len):
+                continue
+            matcher = SequenceMatcher(None, normalized_name, key)
+            if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+                continue
+            score = matcher.ratio()
+            if score > best_score and score >= threshold:
+                best_key, best_score = key, score
+
+        if best_key is None:
+            return None
+        return self._targets[best_key], best_score
+
+
+# Fuzzy index over the built-in canonical concepts (shared, immutable)
+BUILTIN_CANONICAL_INDEX = FuzzyNameIndex(CONCEPT_ALIASES.keys())
+
+
 class ConceptNormalizer:
     """
     Normalizes concepts to canonical forms for graph deduplication.
@@ -153,6 +246,10 @@ class ConceptNormalizer:
         self._db_aliases_loaded = False
         self._db_aliases: dict[str, str] = {}
 
+        # Per-project fuzzy indexes over Concept names (loaded once, then
+        # updated incrementally by add_alias / merge_concepts)
+        self._fuzzy_indexes: dict[str, FuzzyNameIndex] = {}
+
     async def normalize(
         self,
         concept_name: str,
@@ -261,6 +358,68 @@ class ConceptNormalizer:
             logger.warning(f"Failed to load database aliases: {e}")
             self._db_aliases_loaded = True  # Don't retry on failure
 
+    async def normalize_many(
+        self,
+        concept_names: list[str],
+        project_id: Optional[str] = None,
+        use_llm: bool = False,
+    ) -> list[NormalizationResult]:
+        """
+        Normalize a batch of concept names (e.g. all concepts of one paper).
+
+        Aliases and the project's fuzzy index are loaded once for the batch and
+        each distinct normalized form is resolved only once.
+
+        Returns:
+            One NormalizationResult per input name, in input order
+        """
+        if self.db and not self._db_aliases_loaded:
+            await self._load_db_aliases(project_id)
+        if self.db and project_id:
+            await self._get_fuzzy_index(project_id)
+
+        resolved: dict[str, NormalizationResult] = {}
+        results: list[NormalizationResult] = []
+        for name in concept_names:
+            key = normalize_string(name)
+            if key not in resolved:
+                resolved[key] = await self.normalize(name, project_id, use_llm=use_llm)
+            result = resolved[key]
+            results.append(
+                result if result.original_name == name
+                else NormalizationResult(
+                    original_name=name,
+                    canonical_name=result.canonical_name,
+                    canonical_id=result.canonical_id,
+                    confidence=result.confidence,
+                    match_type=result.match_type,
+                )
+            )
+        return results
+
+    async def _get_fuzzy_index(self, project_id: str) -> Optional[FuzzyNameIndex]:
+        """Return the project's Concept-name index, loading it on first use."""
+        index = self._fuzzy_indexes.get(str(project_id))
+        if index is not None:
+            return index
+
+        try:
+            rows = await self.db.fetch(
+                """
+                SELECT name FROM entities
+                WHERE project_id = $1 AND entity_type = 'Concept'
+                """,
+                project_id,
+            )
+        except Exception as e:
+            logger.warning(f"Fuzzy match database query failed: {e}")
+            return None
+
+        index = FuzzyNameIndex(row["name"] for row in rows)
+        self._fuzzy_indexes[str(project_id)] = index
+        logger.info(f"Loaded fuzzy index with {len(index)} concepts for project {project_id}")
+        return index
+
     async def _find_fuzzy_match(
         self,
         normalized_name: str,
@@ -271,35 +430,16 @@ class ConceptNormalizer:
         best_score = 0.0
 
         # Check against built-in canonicals
-        for canonical in CONCEPT_ALIASES.keys():
-            normalized_canonical = normalize_string(canonical)
-            score = similarity_ratio(normalized_name, normalized_canonical)
-
-            if score > best_score and score >= self.fuzzy_threshold:
-                best_score = score
-                best_match = canonical
+        builtin = BUILTIN_CANONICAL_INDEX.best_match(normalized_name, self.fuzzy_threshold)
+        if builtin:
+            best_match, best_score = builtin
 
-        # Check against database concepts
+        # Check against the project's concepts
         if self.db and project_id:
-            try:
-                rows = await self.db.fetch(
-                    """
-                    SELECT name FROM entities
-                    WHERE project_id = $1 AND entity_type = 'Concept'
-                    """,
-                    project_id,
-                )
-
-                for row in rows:
-                    db_normalized = normalize_string(row["name"])
-                    score = similarity_ratio(normalized_name, db_normalized)
-
-                    if score > best_score and score >= self.fuzzy_threshold:
-                        best_score = score
-                        best_match = row["name"]
-
-            except Exception as e:
-                logger.warning(f"Fuzzy match database query failed: {e}")
+            index = await self._get_fuzzy_index(project_id)
+            project_match = index.best_match(normalized_name, self.fuzzy_threshold) if index else None
+            if project_match and project_match[1] > best_score:
+                best_match, best_score = project_match
 
         if best_match:
             return NormalizationResult(
@@ -391,11 +531,14 @@ Return ONLY the canonical concept name, nothing else."""
             normalized = normalize_string(alias)
             # We need to look up the canonical name
             row = await self.db.fetchrow(
-                "SELECT name FROM entities WHERE id = $1",
+                "SELECT name, project_id FROM entities WHERE id = $1",
                 canonical_concept_id,
             )
             if row:
                 self._db_aliases[normalized] = row["name"]
+                index = self._fuzzy_indexes.get(str(row["project_id"]))
+                if index is not None:
+                    index.add(alias, canonical_name=row["name"])
 
             return True
 
@@ -434,6 +577,11 @@ Return ONLY the canonical concept name, nothing else."""
                     duplicate_id,
                     project_id,
                 )
+                canonical_row = await conn.fetchrow(
+                    "SELECT name FROM entities WHERE id = $1 AND project_id = $2",
+                    canonical_id,
+                    project_id,
+                )
                 if dup_row:
                     await conn.execute(
                         """
@@ -480,7 +628,20 @@ Return ONLY the canonical concept name, nothing else."""
                 )
 
                 logger.info(f"Merged concept {duplicate_id} into {canonical_id}")
-                return True
+
+            # Fuzzy hits on the duplicate now resolve to the canonical concept
+            if dup_row and canonical_row:
+                dup_name, canonical_name = dup_row["name"], canonical_row["name"]
+                index = self._fuzzy_indexes.get(str(project_id))
+                if index is not None:
+                    index.add(canonical_name)
+                    index.add(dup_name, canonical_name=canonical_name)
+                    index.redirect(dup_name, canonical_name)
+                self._db_aliases[normalize_string(dup_name)] = canonical_name
+                for key, cached in list(self._canonical_cache.items()):
+                    if cached == dup_name:
+                        self._canonical_cache[key] = canonical_name
+            return True
 
         except Exception as e:
             logger.error(f"Failed to merge concepts: {e}")
@@ -22,7 +22,7 @@ import json
 import logging
 import re
 import time
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -39,6 +39,11 @@ SLOW_API_THRESHOLD = 10.0
 MAX_RETRIES = 1
 RETRY_DELAY_SECONDS = 0.5
 
+# Batch extraction retries failed papers with exponential back-off
+# (RETRY_DELAY_SECONDS * 2^attempt) inside the paper's own task.
+BATCH_MAX_RETRIES = 2
+EXTRACTION_MAX_TOKENS = 1500
+
 # v0.10.0: Type-specific minimum confidence thresholds
 # Higher thresholds for types that need stronger evidence
 ENTITY_TYPE_CONFIDENCE_THRESHOLDS = {
@@ -446,6 +451,7 @@ class EntityExtractor:
         use_accurate_model: bool = False,
         seed_concepts: Optional[List[str]] = None,
         user_notes: Optional[List[str]] = None,
+        max_retries: int = MAX_RETRIES,
     ) -> dict:
         """
         Extract entities from a paper's title and abstract.
@@ -457,6 +463,7 @@ class EntityExtractor:
             use_accurate_model: Use more accurate (slower/expensive) model
             seed_concepts: User-provided concepts (from Zotero tags) to boost
             user_notes: User notes to include in extraction context
+            max_retries: LLM retry attempts (exponential back-off)
 
         Returns:
             Dictionary with extracted entities by type
@@ -475,7 +482,8 @@ class EntityExtractor:
             try:
                 result = await self._llm_extraction(
                     title, abstract, paper_id, use_accurate_model,
-                    seed_concepts=seed_concepts, user_notes=user_notes
+                    seed_concepts=seed_concepts, user_notes=user_notes,
+                    max_retries=max_retries,
                 )
                 self._extraction_cache[cache_key] = result
                 return result
@@ -570,6 +578,7 @@ class EntityExtractor:
         use_accurate: bool,
         seed_concepts: Optional[List[str]] = None,
         user_notes: Optional[List[str]] = None,
+        max_retries: int = MAX_RETRIES,
     ) -> dict:
         """Extract entities using LLM with retry logic (BUG-031 Fix)."""
         # Build additional context from seed concepts and notes
@@ -595,9 +604,15 @@ class EntityExtractor:
 
         # BUG-031 Fix: Add retry logic for resilience
         # PERF-011: Track timing for debugging long API calls
+        from llm.rate_limiter import estimate_tokens, get_provider_limiter, provider_key
+
         last_error = None
-        for attempt in range(MAX_RETRIES + 1):
+        limiter = get_provider_limiter(provider_key(self.llm))
+        for attempt in range(max_retries + 1):
             try:
+                # Provider RPM/TPM budget is shared by all concurrent extractions
+                await limiter.acquire(estimate_tokens(prompt, EXTRACTION_MAX_TOKENS))
+
                 # PERF-011: Log before API call to track gaps
                 api_start_time = time.time()
                 logger.debug(f"PERF-011: Starting LLM API call for '{title[:40]}...' (attempt {attempt + 1})")
@@ -607,7 +622,7 @@ class EntityExtractor:
                     try:
                         response = await self.llm.generate_json(
                             prompt,
-                            max_tokens=1500,
+                            max_tokens=EXTRACTION_MAX_TOKENS,
                             temperature=0.1,
                         )
                         # PERF-011: Log API call timing
@@ -644,7 +659,7 @@ class EntityExtractor:
 
                 response = await self.llm.generate(
                     prompt,
-                    max_tokens=1500,
+                    max_tokens=EXTRACTION_MAX_TOKENS,
                     temperature=0.1,
                     use_accurate=use_accurate,
                 )
@@ -673,22 +688,22 @@ class EntityExtractor:
                     return result
 
                 # Only retry if result is None (actual failure)
-                if attempt < MAX_RETRIES:
-                    logger.warning(f"Null result, retrying ({attempt + 1}/{MAX_RETRIES})")
-                    await asyncio.sleep(RETRY_DELAY_SECONDS)
+                if attempt < max_retries:
+                    logger.warning(f"Null result, retrying ({attempt + 1}/{max_retries})")
+                    await asyncio.sleep(RETRY_DELAY_SECONDS * (2 ** attempt))
                     continue
 
             except Exception as e:
                 last_error = e
-                if attempt < MAX_RETRIES:
+                if attempt < max_retries:
                     logger.warning(f"LLM extraction attempt {attempt + 1} failed: {e}, retrying...")
-                    await asyncio.sleep(RETRY_DELAY_SECONDS)
+                    await asyncio.sleep(RETRY_DELAY_SECONDS * (2 ** attempt))
                 else:
                     logger.error(f"All LLM extraction attempts failed: {e}")
 
         # All retries exhausted, return empty result
         if last_error:
-            logger.error(f"LLM extraction failed after {MAX_RETRIES + 1} attempts: {last_error}")
+            logger.error(f"LLM extraction failed after {max_retries + 1} attempts: {last_error}")
         return self._empty_result()
 
     def _extract_json_from_text(self, text: str) -> Optional[dict]:
@@ -1089,36 +1104,84 @@ class EntityExtractor:
             "claims": [],
         }
 
+    async def extract_stream(
+        self,
+        papers: List[dict],
+        max_concurrency: Optional[int] = None,
+        max_retries: int = BATCH_MAX_RETRIES,
+    ) -> AsyncIterator[Tuple[int, dict]]:
+        """
+        Extract entities from many papers concurrently.
+
+        Concurrency defaults to the provider's limit; every LLM call also draws
+        from the provider's shared RPM/TPM token bucket. A failing paper backs
+        off and retries inside its own task, so the rest of the batch keeps
+        flowing.
+
+        Args:
+            papers: List of dicts with 'title', 'abstract', 'paper_id'
+            max_concurrency: Max papers in flight (default: provider limit)
+            max_retries: LLM retry attempts per paper
+
+        Yields:
+            (index into papers, extraction result) in completion order
+        """
+        if not papers:
+            return
+
+        if max_concurrency is None:
+            from llm.rate_limiter import get_provider_limits, provider_key
+
+            max_concurrency = get_provider_limits(provider_key(self.llm)).max_concurrency
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def run(index: int, paper: dict) -> Tuple[int, dict]:
+            async with semaphore:
+                result = await self.extract_from_paper(
+                    title=paper.get("title", ""),
+                    abstract=paper.get("abstract", ""),
+                    paper_id=paper.get("paper_id"),
+                    max_retries=max_retries,
+                )
+                return index, result
+
+        tasks = [asyncio.create_task(run(i, paper)) for i, paper in enumerate(papers)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
     async def batch_extract(
         self,
         papers: List[dict],
         batch_size: int = 10,
         progress_callback=None,
+        max_concurrency: Optional[int] = None,
     ) -> List[dict]:
         """
-        Extract entities from multiple papers in batches.
+        Extract entities from multiple papers concurrently (see ``extract_stream``).
 
         Args:
             papers: List of dicts with 'title', 'abstract', 'paper_id'
             batch_size: Number of papers to process before progress update
             progress_callback: Optional callback(current, total)
+            max_concurrency: Max papers in flight (default: provider limit)
 
         Returns:
-            List of extraction results
+            List of extraction results, in input order
         """
-        results = []
+        results: List[Optional[dict]] = [None] * len(papers)
         total = len(papers)
+        completed = 0
 
-        for i, paper in enumerate(papers):
-            result = await self.extract_from_paper(
-                title=paper.get("title", ""),
-                abstract=paper.get("abstract", ""),
-                paper_id=paper.get("paper_id"),
-            )
-            results.append(result)
+        async for index, result in self.extract_stream(papers, max_concurrency=max_concurrency):
+            results[index] = result
+            completed += 1
 
-            if progress_callback and (i + 1) % batch_size == 0:
-                progress_callback(i + 1, total)
+            if progress_callback and completed % batch_size == 0:
+                progress_callback(completed, total)
 
         if progress_callback:
             progress_callback(total, total)
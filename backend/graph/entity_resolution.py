@@ -7,21 +7,185 @@ all importers (ScholaRAG, PDF, Zotero) apply the same rules.
 
 from __future__ import annotations
 
-import itertools
 from dataclasses import dataclass, field
 from difflib import SequenceMatcher
 import json
 import logging
 import re
+import zlib
 from typing import Any, Dict, List, Optional, Set, Tuple
 
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity as sklearn_cosine_similarity
 
 from graph.entity_extractor import ExtractedEntity, create_default_disambiguator
 
 logger = logging.getLogger(__name__)
 
+# Buckets up to these sizes are compared exhaustively; larger ones go through
+# the approximate indexes below and only the surfaced pairs are scored.
+EXACT_EMBEDDING_BUCKET_MAX = 1024
+EXACT_STRING_BUCKET_MAX = 256
+
+# Random-projection LSH: ANN_TABLES tables of ANN_BITS_PER_TABLE hyperplanes.
+# Tuned for the default llm_review_threshold (0.82): one bit collides with
+# p ~= 0.81, so recall ~= 1 - (1 - p^12)^60 ~= 0.99 (~0.9997 at cosine 0.88).
+ANN_BITS_PER_TABLE = 12
+ANN_TABLES = 60
+ANN_SCORE_CHUNK = 65536
+# Hash groups larger than this are not expanded pairwise; their members are
+# searched exactly instead, in row blocks of at most ANN_EXACT_BLOCK_ELEMENTS.
+ANN_MAX_GROUP_SIZE = 256
+ANN_EXACT_BLOCK_ELEMENTS = 1 << 24
+
+# MinHash over character trigrams: MINHASH_BANDS bands of MINHASH_ROWS rows.
+# Trigram Jaccard 0.6 is surfaced with ~0.99 probability, 0.1 with ~0.003.
+MINHASH_BANDS = 32
+MINHASH_ROWS = 4
+_MINHASH_PRIME = (1 << 31) - 1
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Return float32 rows scaled to unit length (zero rows stay zero)."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def _exact_cosine_pairs(unit: np.ndarray, threshold: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """All (i < j) pairs with cosine >= threshold from a dense similarity matrix."""
+    sims = unit @ unit.T
+    rows, cols = np.triu_indices(unit.shape[0], k=1)
+    scores = sims[rows, cols]
+    keep = scores >= threshold
+    return rows[keep], cols[keep], scores[keep]
+
+
+def _blocked_cosine_pairs(
+    unit: np.ndarray,
+    members: np.ndarray,
+    threshold: float,
+) -> np.ndarray:
+    """
+    Exact (i < j) pairs among ``members`` with cosine >= threshold.
+
+    Scores row blocks against all members so memory stays bounded by
+    ANN_EXACT_BLOCK_ELEMENTS. Returns pair codes ``i * n + j`` (global indices).
+    """
+    n = unit.shape[0]
+    members = np.sort(members)
+    sub = unit[members]
+    block = max(1, ANN_EXACT_BLOCK_ELEMENTS // max(1, members.size))
+    codes: List[np.ndarray] = []
+    for start in range(0, members.size, block):
+        sims = sub[start:start + block] @ sub.T
+        rows, cols = np.nonzero(sims >= threshold)
+        rows += start
+        upper = cols > rows
+        codes.append(members[rows[upper]].astype(np.int64) * n + members[cols[upper]])
+    return np.concatenate(codes) if codes else np.empty(0, dtype=np.int64)
+
+
+def _lsh_cosine_pairs(
+    unit: np.ndarray,
+    threshold: float,
+    bits_per_table: int = ANN_BITS_PER_TABLE,
+    tables: int = ANN_TABLES,
+    seed: int = 0,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Approximate (i < j) pairs with cosine >= threshold via random-projection LSH.
+
+    Vectors are mean-centered before hashing so anisotropic embeddings spread
+    over the buckets. Rows sharing a hash code in any table become candidates;
+    members of groups larger than ANN_MAX_GROUP_SIZE are searched exactly in
+    blocks instead. Candidates are scored exactly, so every returned pair
+    truly clears ``threshold``.
+    """
+    n, dim = unit.shape
+    rng = np.random.default_rng(seed)
+    planes = rng.standard_normal((dim, bits_per_table * tables)).astype(np.float32)
+    centered = _normalize_rows(unit - unit.mean(axis=0, keepdims=True))
+    bits = (centered @ planes) > 0
+    weights = (1 << np.arange(bits_per_table, dtype=np.int64))
+
+    encoded: List[np.ndarray] = []
+    oversized = np.zeros(n, dtype=bool)
+    for t in range(tables):
+        codes = bits[:, t * bits_per_table:(t + 1) * bits_per_table].astype(np.int64) @ weights
+        order = np.argsort(codes, kind="stable")
+        sorted_codes = codes[order]
+        starts = np.flatnonzero(np.r_[True, np.diff(sorted_codes) != 0])
+        sizes = np.diff(np.r_[starts, n])
+        for start, size in zip(starts[sizes > 1].tolist(), sizes[sizes > 1].tolist()):
+            if size > ANN_MAX_GROUP_SIZE:
+                oversized[order[start:start + size]] = True
+                continue
+            group = np.sort(order[start:start + size])
+            gi, gj = np.triu_indices(group.size, k=1)
+            encoded.append(group[gi].astype(np.int64) * n + group[gj])
+
+    if oversized.any():
+        encoded.append(_blocked_cosine_pairs(unit, np.flatnonzero(oversized), threshold))
+
+    if not encoded:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0, dtype=np.float32)
+
+    pair_codes = np.unique(np.concatenate(encoded))
+    rows = pair_codes // n
+    cols = pair_codes % n
+    scores = np.empty(pair_codes.size, dtype=np.float32)
+    for start in range(0, pair_codes.size, ANN_SCORE_CHUNK):
+        stop = start + ANN_SCORE_CHUNK
+        scores[start:stop] = np.einsum(
+            "ij,ij->i", unit[rows[start:stop]], unit[cols[start:stop]]
+        )
+    keep = scores >= threshold
+    return rows[keep], cols[keep], scores[keep]
+
+
+def _char_trigrams(value: str) -> Set[str]:
+    padded = f"  {value} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _minhash_candidate_pairs(
+    values: List[str],
+    bands: int = MINHASH_BANDS,
+    rows: int = MINHASH_ROWS,
+    seed: int = 0,
+) -> Set[Tuple[int, int]]:
+    """
+    Candidate (i < j) index pairs whose character-trigram MinHash signatures
+    agree on at least one band.
+    """
+    num_perm = bands * rows
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, _MINHASH_PRIME, size=(num_perm, 1), dtype=np.uint64)
+    b = rng.integers(0, _MINHASH_PRIME, size=(num_perm, 1), dtype=np.uint64)
+
+    signatures = np.empty((len(values), num_perm), dtype=np.uint64)
+    for idx, value in enumerate(values):
+        shingles = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) % _MINHASH_PRIME for s in _char_trigrams(value)),
+            dtype=np.uint64,
+        )
+        signatures[idx] = ((a * shingles[None, :] + b) % _MINHASH_PRIME).min(axis=1)
+
+    pairs: Set[Tuple[int, int]] = set()
+    for band in range(bands):
+        band_buckets: Dict[bytes, List[int]] = {}
+        band_sig = signatures[:, band * rows:(band + 1) * rows]
+        for idx in range(len(values)):
+            band_buckets.setdefault(band_sig[idx].tobytes(), []).append(idx)
+        for members in band_buckets.values():
+            if len(members) < 2:
+                continue
+            for i in range(len(members)):
+                for j in range(i + 1, len(members)):
+                    pairs.add((members[i], members[j]))
+    return pairs
+
 
 @dataclass
 class EntityResolutionStats:
@@ -331,6 +495,10 @@ class EntityResolutionService:
     ) -> List[Tuple[Tuple[str, str, str], Tuple[str, str, str], float]]:
         """
         Generate candidate merge pairs within (entity_type, context_bucket).
+
+        Small buckets are compared exhaustively. Buckets larger than
+        ``EXACT_STRING_BUCKET_MAX`` are blocked with a character-trigram
+        MinHash index so only names sharing a signature band are scored.
         """
         if len(name_keys) < 2:
             return []
@@ -344,16 +512,22 @@ class EntityResolutionService:
             if len(bucket_keys) < 2:
                 continue
             ordered = sorted(bucket_keys, key=lambda x: x[2])
-            for i in range(len(ordered)):
+            if len(ordered) <= EXACT_STRING_BUCKET_MAX:
+                index_pairs = (
+                    (i, j) for i in range(len(ordered)) for j in range(i + 1, len(ordered))
+                )
+            else:
+                index_pairs = sorted(_minhash_candidate_pairs([key[2] for key in ordered]))
+
+            for i, j in index_pairs:
                 left = ordered[i]
-                for j in range(i + 1, len(ordered)):
-                    right = ordered[j]
-                    # Lightweight blocking to keep runtime practical.
-                    if abs(len(left[2]) - len(right[2])) > 20:
-                        continue
-                    score = self._similarity_score(left[2], right[2])
-                    if score >= min_similarity:
-                        candidates.append((left, right, score))
+                right = ordered[j]
+                # Lightweight blocking to keep runtime practical.
+                if abs(len(left[2]) - len(right[2])) > 20:
+                    continue
+                score = self._similarity_score(left[2], right[2])
+                if score >= min_similarity:
+                    candidates.append((left, right, score))
 
         candidates.sort(key=lambda item: item[2], reverse=True)
         if max_pairs is not None:
@@ -375,6 +549,9 @@ class EntityResolutionService:
         complements the string-based ``_generate_candidate_pairs`` by capturing
         semantic similarity that surface-form heuristics may miss.
 
+        Buckets larger than ``EXACT_EMBEDDING_BUCKET_MAX`` use a random-projection
+        LSH index over normalized float32 vectors instead of a dense n x n matrix.
+
         Args:
             entities_with_embeddings: List of dicts, each containing:
                 - ``entity_type`` (str)
@@ -432,16 +609,17 @@ class EntityResolutionService:
                 continue
 
             unique_keys = [keys[i] for i in unique_indices]
-            matrix = np.vstack([vectors[i].reshape(1, -1) for i in unique_indices])
+            unit = _normalize_rows(np.vstack([vectors[i].reshape(1, -1) for i in unique_indices]))
 
-            # Compute pairwise cosine similarity in one pass.
-            sim_matrix = sklearn_cosine_similarity(matrix)
+            if len(unique_keys) <= EXACT_EMBEDDING_BUCKET_MAX:
+                rows, cols, scores = _exact_cosine_pairs(unit, embedding_review_threshold)
+            else:
+                rows, cols, scores = _lsh_cosine_pairs(unit, embedding_review_threshold)
 
-            for i in range(len(unique_keys)):
-                for j in range(i + 1, len(unique_keys)):
-                    score = float(sim_matrix[i, j])
-                    if score >= embedding_review_threshold:
-                        candidates.append((unique_keys[i], unique_keys[j], score))
+            candidates.extend(
+                (unique_keys[i], unique_keys[j], float(score))
+                for i, j, score in zip(rows.tolist(), cols.tolist(), scores.tolist())
+            )
 
         candidates.sort(key=lambda item: item[2], reverse=True)
         if max_pairs is not None:
@@ -975,15 +1153,17 @@ class EntityResolutionService:
         Second-pass entity linking: find entities with the same canonical_name
         across different source papers and create SAME_AS relationships.
 
-        This runs *after* standard entity resolution.  It queries the persisted
-        ``entities`` table, groups rows by ``(entity_type, name)`` where the
-        entities originate from more than one source paper, and inserts
-        ``SAME_AS`` relationship rows for each cross-paper pair.
+        This runs *after* standard entity resolution.  For each entity type a
+        single statement self-joins the persisted ``entities`` table on
+        ``(entity_type, name)`` with differing ``source_paper_id`` and inserts
+        the resulting ``SAME_AS`` pairs with ``ON CONFLICT DO NOTHING``.
+        Counts come back through ``RETURNING`` so no per-pair round-trips are
+        needed, and processing one type at a time bounds the join size on
+        large projects.
 
         Args:
             project_id: UUID string of the project.
-            db: Database connection (asyncpg-compatible with ``fetch`` /
-                ``fetchval`` / ``execute`` helpers).
+            db: Database connection (asyncpg-compatible with ``fetchrow``).
             entity_types: Entity types to consider.  Defaults to
                 ``["Method", "Dataset", "Concept"]``.
 
@@ -994,124 +1174,68 @@ class EntityResolutionService:
         if entity_types is None:
             entity_types = ["Method", "Dataset", "Concept"]
 
-        # -----------------------------------------------------------------
-        # Step 1: Find entities grouped by (entity_type, name) that appear
-        #         in more than one distinct source paper.
-        # -----------------------------------------------------------------
-        # ``properties->>'source_paper_id'`` stores the originating paper for
-        # each entity row.  We aggregate entity ids and distinct paper ids.
-        type_placeholders = ", ".join(
-            f"${i + 2}" for i in range(len(entity_types))
-        )
-        query = f"""
+        # Pairs are normalised to source_id < target_id so reruns hit the
+        # unique (source_id, target_id, relationship_type) constraint.
+        query = """
+            WITH candidates AS (
+                SELECT id, name, properties->>'source_paper_id' AS paper_id
+                FROM entities
+                WHERE project_id = $1
+                  AND entity_type::text = $2
+                  AND properties->>'source_paper_id' IS NOT NULL
+            ),
+            pairs AS (
+                SELECT a.id AS source_id, b.id AS target_id, a.name
+                FROM candidates a
+                JOIN candidates b
+                  ON b.name = a.name
+                 AND b.id > a.id
+                 AND b.paper_id <> a.paper_id
+            ),
+            inserted AS (
+                INSERT INTO relationships
+                    (project_id, source_id, target_id,
+                     relationship_type, weight, properties)
+                SELECT
+                    $1, source_id, target_id, 'SAME_AS', 1.0,
+                    jsonb_build_object(
+                        'auto_generated', true,
+                        'link_type', 'cross_paper',
+                        'canonical_name', name,
+                        'entity_type', $2::text
+                    )
+                FROM pairs
+                ON CONFLICT (source_id, target_id, relationship_type)
+                DO NOTHING
+                RETURNING 1
+            )
             SELECT
-                entity_type::text AS entity_type,
-                name,
-                array_agg(id) AS entity_ids,
-                array_agg(DISTINCT properties->>'source_paper_id')
-                    FILTER (WHERE properties->>'source_paper_id' IS NOT NULL)
-                    AS paper_ids
-            FROM entities
-            WHERE project_id = $1
-              AND entity_type::text IN ({type_placeholders})
-              AND properties->>'source_paper_id' IS NOT NULL
-            GROUP BY entity_type, name
-            HAVING COUNT(DISTINCT properties->>'source_paper_id') > 1
+                (SELECT COUNT(DISTINCT name) FROM pairs) AS groups_found,
+                (SELECT COUNT(*) FROM pairs) AS pairs_found,
+                (SELECT COUNT(*) FROM inserted) AS links_created
         """
 
-        params: list = [project_id] + entity_types
-        groups = await db.fetch(query, *params)
-
-        groups_found = len(groups)
+        groups_found = 0
         links_created = 0
         skipped_existing = 0
 
-        logger.info(
-            "Cross-paper linking for project %s: %d groups across types %s",
-            project_id,
-            groups_found,
-            entity_types,
-        )
-
-        # -----------------------------------------------------------------
-        # Step 2: For each group, create SAME_AS relationships between all
-        #         pairs of entities from *different* papers.
-        # -----------------------------------------------------------------
-        for row in groups:
-            entity_ids = list(row["entity_ids"])
-            canonical_name = row["name"]
-            etype = row["entity_type"]
-
-            if len(entity_ids) < 2:
+        for etype in entity_types:
+            row = await db.fetchrow(query, project_id, etype)
+            if not row:
                 continue
 
-            # Build a mapping of entity_id -> source_paper_id so we only
-            # link entities from different papers.
-            id_paper_query = """
-                SELECT id, properties->>'source_paper_id' AS paper_id
-                FROM entities
-                WHERE id = ANY($1::uuid[])
-            """
-            id_rows = await db.fetch(id_paper_query, entity_ids)
-            id_to_paper: Dict[str, Optional[str]] = {
-                str(r["id"]): r["paper_id"] for r in id_rows
-            }
-
-            for left_id, right_id in itertools.combinations(
-                [str(eid) for eid in entity_ids], 2
-            ):
-                left_paper = id_to_paper.get(left_id)
-                right_paper = id_to_paper.get(right_id)
-
-                # Only link across different papers
-                if left_paper == right_paper:
-                    continue
-
-                # Normalise direction so (left, right) is deterministic
-                if left_id > right_id:
-                    left_id, right_id = right_id, left_id
-
-                # Check if SAME_AS relationship already exists
-                existing = await db.fetchval(
-                    """
-                    SELECT 1 FROM relationships
-                    WHERE project_id = $1
-                      AND source_id = $2::uuid
-                      AND target_id = $3::uuid
-                      AND relationship_type = 'SAME_AS'
-                    LIMIT 1
-                    """,
-                    project_id,
-                    left_id,
-                    right_id,
-                )
-
-                if existing:
-                    skipped_existing += 1
-                    continue
-
-                properties = json.dumps({
-                    "auto_generated": True,
-                    "link_type": "cross_paper",
-                    "canonical_name": canonical_name,
-                    "entity_type": etype,
-                })
-
-                await db.execute(
-                    """
-                    INSERT INTO relationships
-                        (project_id, source_id, target_id,
-                         relationship_type, weight, properties)
-                    VALUES ($1, $2::uuid, $3::uuid, 'SAME_AS', 1.0, $4)
-                    ON CONFLICT (source_id, target_id, relationship_type)
-                    DO NOTHING
-                    """,
-                    project_id,
-                    left_id,
-                    right_id,
-                    properties,
-                )
-                links_created += 1
+            type_links = int(row["links_created"] or 0)
+            groups_found += int(row["groups_found"] or 0)
+            links_created += type_links
+            skipped_existing += int(row["pairs_found"] or 0) - type_links
+
+            logger.info(
+                "Cross-paper linking for project %s (%s): %d groups, %d links created",
+                project_id,
+                etype,
+                row["groups_found"],
+                type_links,
+            )
 
         logger.info(
             "Cross-paper linking complete: %d groups, %d links created, "
@@ -38,8 +38,8 @@ from typing import Optional
 from collections import defaultdict
 import asyncio
 import numpy as np
-from sklearn.cluster import KMeans
-from sklearn.metrics.pairwise import cosine_similarity
+
+from graph.clustering_engine import cluster_embeddings_async, estimate_optimal_k
 
 logger = logging.getLogger(__name__)
 
@@ -113,6 +113,70 @@ CLUSTER_COLORS = [
 ]
 
 
+def _has_vector(embedding) -> bool:
+    return embedding is not None and len(embedding) > 0
+
+
+# Upper bound on similarities materialized at once per potential-edge chunk
+POTENTIAL_EDGE_BLOCK_ELEMENTS = 1 << 22
+
+
+def _top_k(scores: np.ndarray, k: int, mask: Optional[np.ndarray] = None) -> list[int]:
+    """Indices of the ``k`` highest scores among ``mask``, best first (ties by index)."""
+    candidates = np.flatnonzero(mask) if mask is not None else np.arange(scores.shape[0])
+    if candidates.size == 0 or k <= 0:
+        return []
+    if candidates.size > k:
+        part = np.argpartition(-scores[candidates], k - 1)[:k]
+        candidates = np.sort(candidates[part])
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order].tolist()
+
+
+class ConceptEmbeddingMatrix:
+    """
+    Row-normalized float32 embedding matrix over a concept list.
+
+    Built once per analysis so similarity scoring is a matrix product instead
+    of per-pair cosine calls. Concepts without an embedding, or whose
+    dimension differs from the first embedding seen, are left out.
+    """
+
+    def __init__(self, concepts: list[dict]):
+        self.ids: list[str] = []
+        self.names: list[str] = []
+        vectors = []
+        dim = None
+        for concept in concepts:
+            embedding = concept.get("embedding")
+            if not _has_vector(embedding):
+                continue
+            vector = np.asarray(embedding, dtype=np.float32).ravel()
+            if dim is None:
+                dim = vector.shape[0]
+            if vector.shape[0] != dim:
+                continue
+            self.ids.append(concept["id"])
+            self.names.append(concept.get("name", ""))
+            vectors.append(vector)
+
+        self.row_of = {cid: i for i, cid in enumerate(self.ids)}
+        if vectors:
+            matrix = np.vstack(vectors)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            # Zero vectors stay zero (cosine similarity 0), as in sklearn
+            self.vectors = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+        else:
+            self.vectors = np.zeros((0, 0), dtype=np.float32)
+
+    @property
+    def size(self) -> int:
+        return len(self.ids)
+
+    def rows(self, concept_ids: list[str]) -> np.ndarray:
+        return self.vectors[[self.row_of[cid] for cid in concept_ids]]
+
+
 class GapDetector:
     """
     Detects structural gaps in the knowledge graph.
@@ -134,6 +198,7 @@ class GapDetector:
         self,
         concepts: list[dict],
         n_clusters: Optional[int] = None,
+        label_clusters: bool = True,
     ) -> list[ConceptCluster]:
         """
         Cluster concepts based on their embeddings using K-means.
@@ -141,6 +206,8 @@ class GapDetector:
         Args:
             concepts: List of concept dicts with 'id', 'name', 'embedding'
             n_clusters: Number of clusters (auto-determined if None)
+            label_clusters: Generate LLM cluster names; pass False when the
+                caller labels the clusters itself
 
         Returns:
             List of ConceptCluster objects
@@ -202,7 +269,10 @@ class GapDetector:
                                 c["name"] for c in concepts_with_embeddings
                                 if c["id"] in set(cluster_ids)
                             ]
-                            label = await self._generate_cluster_label(cluster_keywords)
+                            label = (
+                                await self._generate_cluster_label(cluster_keywords)
+                                if label_clusters else ""
+                            )
                             clusters_result.append(ConceptCluster(
                                 id=comm.community_id,
                                 label=label,
@@ -216,19 +286,24 @@ class GapDetector:
             logger.warning(f"Leiden clustering failed, falling back to K-means: {e}")
 
         # Stack embeddings into matrix
-        embeddings = np.array([c["embedding"] for c in concepts_with_embeddings], dtype=np.float32)
-
-        # Determine optimal number of clusters
-        if n_clusters is None:
-            n_clusters = self._determine_optimal_clusters(embeddings)
-
-        n_clusters = min(n_clusters, len(concepts_with_embeddings))
-
-        # Run K-means clustering
-        logger.info(f"Clustering {len(concepts_with_embeddings)} concepts into {n_clusters} clusters")
-
-        kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-        cluster_labels = kmeans.fit_predict(embeddings)
+        embeddings = np.vstack([
+            np.asarray(c["embedding"], dtype=np.float32) for c in concepts_with_embeddings
+        ])
+
+        # Exact KMeans for small projects; sampled, reduced MiniBatchKMeans
+        # in a worker process above gap_clustering_exact_threshold
+        clustering = await cluster_embeddings_async(
+            embeddings,
+            n_clusters=n_clusters,
+            min_clusters=self.min_clusters,
+            max_clusters=self.max_clusters,
+        )
+        cluster_labels = clustering.labels
+
+        logger.info(
+            f"Clustered {len(concepts_with_embeddings)} concepts into {clustering.n_clusters} clusters "
+            f"({clustering.method})"
+        )
 
         # Build cluster objects
         clusters = {}
@@ -249,20 +324,20 @@ class GapDetector:
         # Set centroids and finalize
         result = []
         for cluster_id, cluster in clusters.items():
-            cluster.centroid = kmeans.cluster_centers_[cluster_id]
+            cluster.centroid = clustering.centers[cluster_id]
 
             # Use top 5 most central concepts as keywords
             cluster.keywords = cluster.keywords[:5]
 
             # Generate cluster name from top keywords using LLM
-            if cluster.keywords:
+            if cluster.keywords and label_clusters:
                 try:
                     cluster.name = await self._generate_cluster_label(cluster.keywords)
                 except Exception as e:
                     logger.warning(f"LLM label generation failed for cluster {cluster_id}: {e}")
                     from graph.cluster_labeler import fallback_label
                     cluster.name = fallback_label(cluster.keywords[:5]) if cluster.keywords else f"Cluster {cluster_id + 1}"
-            else:
+            elif not cluster.keywords:
                 cluster.name = f"Cluster {cluster_id + 1}"
 
             result.append(cluster)
@@ -274,33 +349,7 @@ class GapDetector:
         """
         Determine optimal number of clusters using elbow method.
         """
-        max_k = min(self.max_clusters, len(embeddings) - 1)
-        min_k = min(self.min_clusters, max_k)
-
-        if max_k <= min_k:
-            return min_k
-
-        inertias = []
-        k_range = range(min_k, max_k + 1)
-
-        for k in k_range:
-            kmeans = KMeans(n_clusters=k, random_state=42, n_init=5)
-            kmeans.fit(embeddings)
-            inertias.append(kmeans.inertia_)
-
-        # Find elbow using second derivative
-        if len(inertias) < 3:
-            return min_k
-
-        diffs = np.diff(inertias)
-        diffs2 = np.diff(diffs)
-
-        # Elbow is where second derivative is maximum (most negative curvature)
-        if len(diffs2) > 0:
-            elbow_idx = np.argmax(diffs2) + min_k + 1
-            return int(min(elbow_idx, max_k))
-
-        return (min_k + max_k) // 2
+        return estimate_optimal_k(embeddings, self.min_clusters, self.max_clusters)
 
     def detect_gaps(
         self,
@@ -539,6 +588,7 @@ class GapDetector:
         gap: StructuralGap,
         concepts: list[dict],
         centrality_metrics: list[CentralityMetrics],
+        matrix: Optional["ConceptEmbeddingMatrix"] = None,
     ) -> list[str]:
         """
         Find concepts that could bridge a structural gap.
@@ -551,62 +601,72 @@ class GapDetector:
             gap: The structural gap to bridge
             concepts: All concepts with embeddings
             centrality_metrics: Pre-calculated centrality metrics
+            matrix: Optional prebuilt ConceptEmbeddingMatrix for ``concepts``
 
         Returns:
             List of concept IDs that could bridge the gap
         """
-        # Get concepts from both clusters
-        cluster_a_concepts = [c for c in concepts if c["id"] in gap.concept_a_ids]
-        cluster_b_concepts = [c for c in concepts if c["id"] in gap.concept_b_ids]
+        return self.find_bridge_candidates_batch(
+            [gap], concepts, centrality_metrics, matrix=matrix
+        )[gap.id]
 
-        if not cluster_a_concepts or not cluster_b_concepts:
-            return []
-
-        # Get centrality lookup
-        centrality_by_id = {m.entity_id: m for m in centrality_metrics}
+    def find_bridge_candidates_batch(
+        self,
+        gaps: list[StructuralGap],
+        concepts: list[dict],
+        centrality_metrics: list[CentralityMetrics],
+        top_k: int = 5,
+        matrix: Optional["ConceptEmbeddingMatrix"] = None,
+    ) -> dict[str, list[str]]:
+        """
+        Bridge candidates for several gaps in one batched pass.
 
-        # Score all concepts as potential bridges
-        bridge_scores = []
+        Mean similarity is linear, so each cluster contributes one matrix-vector
+        product against the sum of its member vectors (O(concepts) per cluster)
+        instead of a concepts x members similarity matrix.
 
-        for concept in concepts:
-            cid = concept["id"]
-
-            # Skip concepts already in either cluster
-            if cid in gap.concept_a_ids or cid in gap.concept_b_ids:
-                continue
+        Returns:
+            Mapping of gap id -> up to ``top_k`` concept IDs, best first
+        """
+        matrix = matrix or ConceptEmbeddingMatrix(concepts)
+        result: dict[str, list[str]] = {gap.id: [] for gap in gaps}
+        if matrix.size == 0:
+            return result
 
-            embedding = concept.get("embedding")
-            if embedding is None:
+        # Denominators count members without embeddings, as the per-pair version did
+        concept_ids = {c["id"] for c in concepts}
+        centrality_by_id = {m.entity_id: m.betweenness for m in centrality_metrics}
+        betweenness = np.array(
+            [centrality_by_id.get(cid, 0.0) for cid in matrix.ids], dtype=np.float32
+        )
+
+        for gap in gaps:
+            a_ids = set(gap.concept_a_ids) & concept_ids
+            b_ids = set(gap.concept_b_ids) & concept_ids
+            if not a_ids or not b_ids:
                 continue
 
-            # Calculate average similarity to both clusters
-            emb_array = np.array(embedding).reshape(1, -1)
-
-            sim_to_a = 0.0
-            for c in cluster_a_concepts:
-                if c.get("embedding"):
-                    c_emb = np.array(c["embedding"]).reshape(1, -1)
-                    sim_to_a += cosine_similarity(emb_array, c_emb)[0][0]
-            sim_to_a /= len(cluster_a_concepts) if cluster_a_concepts else 1
-
-            sim_to_b = 0.0
-            for c in cluster_b_concepts:
-                if c.get("embedding"):
-                    c_emb = np.array(c["embedding"]).reshape(1, -1)
-                    sim_to_b += cosine_similarity(emb_array, c_emb)[0][0]
-            sim_to_b /= len(cluster_b_concepts) if cluster_b_concepts else 1
+            sim_to_a = self._mean_similarity(matrix, a_ids)
+            sim_to_b = self._mean_similarity(matrix, b_ids)
 
             # Bridge score = geometric mean of similarities * betweenness
-            avg_similarity = (sim_to_a * sim_to_b) ** 0.5
-            betweenness = centrality_by_id.get(cid, CentralityMetrics(cid)).betweenness
+            avg_similarity = np.sqrt(np.clip(sim_to_a * sim_to_b, 0.0, None))
+            scores = avg_similarity * (1 + betweenness)
 
-            bridge_score = avg_similarity * (1 + betweenness)
+            # Skip concepts already in either cluster
+            candidates = np.ones(matrix.size, dtype=bool)
+            candidates[[matrix.row_of[cid] for cid in a_ids | b_ids if cid in matrix.row_of]] = False
+            result[gap.id] = [matrix.ids[i] for i in _top_k(scores, top_k, candidates)]
 
-            bridge_scores.append((cid, bridge_score))
+        return result
 
-        # Sort by bridge score and return top 5
-        bridge_scores.sort(key=lambda x: x[1], reverse=True)
-        return [cid for cid, _ in bridge_scores[:5]]
+    @staticmethod
+    def _mean_similarity(matrix: "ConceptEmbeddingMatrix", member_ids: set[str]) -> np.ndarray:
+        """Similarity of every concept to the embedded members, summed and divided by all members."""
+        embedded = [cid for cid in member_ids if cid in matrix.row_of]
+        if not embedded:
+            return np.zeros(matrix.size, dtype=np.float32)
+        return matrix.vectors @ matrix.rows(embedded).sum(axis=0) / len(member_ids)
 
     def compute_potential_edges(
         self,
@@ -614,6 +674,7 @@ class GapDetector:
         concepts: list[dict],
         top_n: int = 5,
         min_similarity: float = 0.3,
+        matrix: Optional["ConceptEmbeddingMatrix"] = None,
     ) -> list[PotentialEdge]:
         """
         Compute potential (ghost) edges between two clusters in a gap.
@@ -626,63 +687,73 @@ class GapDetector:
             concepts: List of concept dicts with 'id', 'name', 'embedding'
             top_n: Maximum number of potential edges to return
             min_similarity: Minimum cosine similarity threshold
+            matrix: Optional prebuilt ConceptEmbeddingMatrix for ``concepts``
 
         Returns:
             List of PotentialEdge objects sorted by similarity (highest first)
         """
-        # Build concept lookup
-        concept_by_id = {c["id"]: c for c in concepts}
+        return self.compute_potential_edges_batch(
+            [gap], concepts, top_n=top_n, min_similarity=min_similarity, matrix=matrix
+        )[gap.id]
 
-        # Get concepts from each cluster
-        cluster_a_concepts = [
-            concept_by_id[cid] for cid in gap.concept_a_ids
-            if cid in concept_by_id and concept_by_id[cid].get("embedding")
-        ]
-        cluster_b_concepts = [
-            concept_by_id[cid] for cid in gap.concept_b_ids
-            if cid in concept_by_id and concept_by_id[cid].get("embedding")
-        ]
+    def compute_potential_edges_batch(
+        self,
+        gaps: list[StructuralGap],
+        concepts: list[dict],
+        top_n: int = 5,
+        min_similarity: float = 0.3,
+        matrix: Optional["ConceptEmbeddingMatrix"] = None,
+    ) -> dict[str, list[PotentialEdge]]:
+        """
+        Potential edges for several gaps.
 
-        if not cluster_a_concepts or not cluster_b_concepts:
-            return []
+        Each gap scores its (cluster A x cluster B) block in row chunks of at
+        most POTENTIAL_EDGE_BLOCK_ELEMENTS similarities, keeping the top
+        ``top_n`` pairs of every chunk via argpartition, so memory does not
+        grow with the number or size of the gaps.
 
-        # Calculate pairwise similarities between clusters
-        similarity_pairs = []
-
-        for concept_a in cluster_a_concepts:
-            emb_a = np.array(concept_a["embedding"]).reshape(1, -1)
-
-            for concept_b in cluster_b_concepts:
-                emb_b = np.array(concept_b["embedding"]).reshape(1, -1)
-                similarity = cosine_similarity(emb_a, emb_b)[0][0]
-
-                if similarity >= min_similarity:
-                    similarity_pairs.append((
-                        concept_a["id"],
-                        concept_b["id"],
-                        concept_a["name"],
-                        concept_b["name"],
-                        float(similarity),
-                    ))
-
-        # Sort by similarity (highest first) and take top N
-        similarity_pairs.sort(key=lambda x: x[4], reverse=True)
-        top_pairs = similarity_pairs[:top_n]
-
-        # Create PotentialEdge objects
-        potential_edges = [
-            PotentialEdge(
-                source_id=source_id,
-                target_id=target_id,
-                similarity=sim,
-                gap_id=gap.id,
-                source_name=source_name,
-                target_name=target_name,
-            )
-            for source_id, target_id, source_name, target_name, sim in top_pairs
-        ]
+        Returns:
+            Mapping of gap id -> PotentialEdge list, highest similarity first
+        """
+        matrix = matrix or ConceptEmbeddingMatrix(concepts)
+        result: dict[str, list[PotentialEdge]] = {gap.id: [] for gap in gaps}
+        if matrix.size == 0 or top_n <= 0:
+            return result
+
+        for gap in gaps:
+            a_ids = [cid for cid in gap.concept_a_ids if cid in matrix.row_of]
+            b_ids = [cid for cid in gap.concept_b_ids if cid in matrix.row_of]
+            if not a_ids or not b_ids:
+                continue
+
+            a_rows = matrix.rows(a_ids)
+            b_rows_t = matrix.rows(b_ids).T
+            width = len(b_ids)
+            chunk = max(1, POTENTIAL_EDGE_BLOCK_ELEMENTS // width)
+            flats: list[np.ndarray] = []
+            sims: list[np.ndarray] = []
+            for start in range(0, len(a_ids), chunk):
+                block = (a_rows[start:start + chunk] @ b_rows_t).ravel()
+                top = np.asarray(_top_k(block, top_n, block >= min_similarity), dtype=np.int64)
+                flats.append(top + start * width)
+                sims.append(block[top])
+
+            flat = np.concatenate(flats)
+            similarity = np.concatenate(sims)
+            order = np.lexsort((flat, -similarity))[:top_n]
+            result[gap.id] = [
+                PotentialEdge(
+                    source_id=a_ids[flat[i] // width],
+                    target_id=b_ids[flat[i] % width],
+                    similarity=float(similarity[i]),
+                    gap_id=gap.id,
+                    source_name=matrix.names[matrix.row_of[a_ids[flat[i] // width]]],
+                    target_name=matrix.names[matrix.row_of[b_ids[flat[i] % width]]],
+                )
+                for i in order.tolist()
+            ]
 
-        return potential_edges
+        return result
 
     async def generate_bridge_hypotheses(
         self,
@@ -885,10 +956,16 @@ Return ONLY the research questions, one per line, without numbering or bullets.
         self,
         concepts: list[dict],
         relationships: list[dict],
+        label_clusters: bool = True,
     ) -> dict:
         """
         Perform full gap analysis on the knowledge graph.
 
+        Args:
+            concepts: List of concept dicts with 'id', 'name', 'embedding'
+            relationships: List of relationship dicts
+            label_clusters: Generate LLM cluster names while clustering
+
         Returns:
             {
                 "clusters": list of ConceptCluster,
@@ -900,23 +977,16 @@ Return ONLY the research questions, one per line, without numbering or bullets.
         logger.info(f"Analyzing graph with {len(concepts)} concepts and {len(relationships)} relationships")
 
         # Step 1: Cluster concepts
-        clusters = await self.cluster_concepts(concepts)
+        clusters = await self.cluster_concepts(concepts, label_clusters=label_clusters)
 
-        # Step 2: Calculate centrality
-        centrality = self.calculate_centrality(concepts, relationships)
-
-        # Step 3: Detect gaps
-        gaps = self.detect_gaps(clusters, relationships, concepts)
+        # Steps 2-4 are pure CPU work; keep them off the event loop
+        centrality, gaps, top_gaps = await asyncio.to_thread(
+            self._score_structure, clusters, concepts, relationships
+        )
 
-        # Step 4: Find bridge candidates and generate questions for top gaps
+        # Step 5: Generate research questions for top gaps
         concept_by_id = {c["id"]: c for c in concepts}
-
-        for gap in gaps[:5]:  # Top 5 gaps only
-            gap.bridge_concepts = self.find_bridge_candidates(gap, concepts, centrality)
-
-            # Compute potential edges (ghost edges) for visualization
-            gap.potential_edges = self.compute_potential_edges(gap, concepts, top_n=5)
-
+        for gap in top_gaps:
             # Get concept names for LLM
             a_names = [concept_by_id[cid]["name"] for cid in gap.concept_a_ids if cid in concept_by_id]
             b_names = [concept_by_id[cid]["name"] for cid in gap.concept_b_ids if cid in concept_by_id]
@@ -935,6 +1005,40 @@ Return ONLY the research questions, one per line, without numbering or bullets.
             "summary": summary,
         }
 
+    def _score_structure(
+        self,
+        clusters: list[ConceptCluster],
+        concepts: list[dict],
+        relationships: list[dict],
+        top_n_gaps: int = 5,
+    ) -> tuple[list[CentralityMetrics], list[StructuralGap], list[StructuralGap]]:
+        """
+        Centrality, gap detection and bridge/ghost-edge scoring.
+
+        Synchronous so analyze_graph can run it in a worker thread.
+
+        Returns:
+            (centrality, gaps, top_gaps) where top_gaps carry bridge concepts
+            and potential edges
+        """
+        # Step 2: Calculate centrality
+        centrality = self.calculate_centrality(concepts, relationships)
+
+        # Step 3: Detect gaps
+        gaps = self.detect_gaps(clusters, relationships, concepts)
+
+        # Step 4: Bridge candidates and potential (ghost) edges for all top
+        # gaps in one batched pass over a shared normalized embedding matrix.
+        top_gaps = gaps[:top_n_gaps]
+        matrix = ConceptEmbeddingMatrix(concepts)
+        bridges = self.find_bridge_candidates_batch(top_gaps, concepts, centrality, matrix=matrix)
+        potential_edges = self.compute_potential_edges_batch(top_gaps, concepts, top_n=5, matrix=matrix)
+        for gap in top_gaps:
+            gap.bridge_concepts = bridges[gap.id]
+            gap.potential_edges = potential_edges[gap.id]
+
+        return centrality, gaps, top_gaps
+
     def _generate_summary(self, clusters: list[ConceptCluster], gaps: list[StructuralGap]) -> str:
         """
         Generate a text summary of the gap analysis.
@@ -0,0 +1,403 @@
+"""
+Gap Refresh Job
+
+Re-runs gap detection for a project as a JobStore-tracked background job
+(job type ``gap_refresh``):
+
+1. build concept inputs from the shared graph snapshot (TF-IDF pseudo-
+   embeddings when too few concepts have embeddings)
+2. cluster and detect gaps (GapDetector)
+3. label clusters with bounded concurrency
+4. write clusters, gaps (with potential edges) and centrality properties
+   with batched statements in a single transaction
+
+Readers keep seeing the previous analysis until step 4 commits. A job that
+dies mid-way (e.g. server restart, see JobStore.mark_running_as_interrupted)
+leaves the previous analysis untouched and can simply be started again.
+"""
+
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config import settings
+from graph.community_detector import COMMUNITY_ROWS_SQL
+from graph.graph_snapshot import ANALYTIC_ENTITY_TYPES, ProjectGraphSnapshot
+from jobs.job_store import JobStatus, JobStore
+
+logger = logging.getLogger(__name__)
+
+GAP_REFRESH_JOB_TYPE = "gap_refresh"
+
+MIN_CONCEPTS_FOR_EMBEDDING_PATH = 10
+MAX_TFIDF_FEATURES = 64
+
+# project_id -> job_id of the refresh currently running in this process
+_active_refresh_jobs: Dict[str, str] = {}
+_background_tasks: set = set()
+
+
+@dataclass
+class GapInputs:
+    """Concepts and relationships handed to GapDetector.analyze_graph()."""
+    concepts: List[dict] = field(default_factory=list)
+    relationships: List[dict] = field(default_factory=list)
+    total_concepts: int = 0
+    no_gaps_reason: Optional[str] = None  # Set when analysis cannot run
+
+
+def build_gap_inputs(snapshot: ProjectGraphSnapshot) -> GapInputs:
+    """Concept dicts (float32 embeddings) and relationship dicts from a snapshot."""
+    concept_mask = snapshot.node_mask(include_types=ANALYTIC_ENTITY_TYPES)
+
+    # Concepts with embeddings first (snapshot nodes are in id order)
+    concepts = [
+        {
+            "id": snapshot.node_ids[i],
+            "name": snapshot.names[i],
+            "embedding": snapshot.embedding_of(i),
+        }
+        for i in np.flatnonzero(concept_mask & snapshot.has_embedding)
+    ]
+
+    if len(concepts) < MIN_CONCEPTS_FOR_EMBEDDING_PATH:
+        # TF-IDF fallback: all concepts regardless of embedding status
+        logger.warning(
+            "Only %d concepts with embeddings (need %d+). Using TF-IDF fallback.",
+            len(concepts),
+            MIN_CONCEPTS_FOR_EMBEDDING_PATH,
+        )
+        all_concepts = [
+            {"id": snapshot.node_ids[i], "name": snapshot.names[i]}
+            for i in np.flatnonzero(concept_mask)
+        ]
+        if len(all_concepts) < 3:
+            return GapInputs(total_concepts=len(all_concepts), no_gaps_reason="insufficient_concepts")
+
+        try:
+            concepts = _tfidf_concepts(all_concepts)
+        except Exception as e:
+            logger.error(f"TF-IDF fallback failed: {e}")
+            return GapInputs(total_concepts=len(all_concepts), no_gaps_reason="embedding_unavailable")
+
+    relationships = [
+        {"source_id": source, "target_id": target, "type": rel_type}
+        for source, target, rel_type, _ in snapshot.iter_edges()
+    ]
+    return GapInputs(concepts=concepts, relationships=relationships, total_concepts=len(concepts))
+
+
+def _tfidf_concepts(all_concepts: List[dict]) -> List[dict]:
+    """Attach TF-IDF pseudo-embeddings of concept names."""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    concept_names = [(c["name"] or "").strip() for c in all_concepts]
+    concept_names = [
+        n if n else f"concept_{all_concepts[i]['id'][:8]}" for i, n in enumerate(concept_names)
+    ]
+    vectorizer = TfidfVectorizer(
+        max_features=MAX_TFIDF_FEATURES,
+        stop_words='english',
+        dtype=np.float32,
+    )
+    tfidf_matrix = vectorizer.fit_transform(concept_names)
+    feature_count = tfidf_matrix.shape[1]
+    if feature_count == 0:
+        raise ValueError("TF-IDF produced zero features")
+
+    dense = tfidf_matrix.toarray().astype(np.float32, copy=False)
+    logger.info(
+        "TF-IDF fallback: generated pseudo-embeddings for %d concepts (features=%d)",
+        len(all_concepts),
+        feature_count,
+    )
+    return [
+        {"id": c["id"], "name": c["name"], "embedding": dense[i]}
+        for i, c in enumerate(all_concepts)
+    ]
+
+
+async def label_clusters(gap_detector, clusters: list, concept_name_map: Dict[str, str]) -> Dict[int, str]:
+    """
+    Label every cluster, running LLM label calls concurrently.
+
+    Clusters with keywords get an LLM label (gap_refresh_label_concurrency calls
+    in flight at most); others fall back to their first concept names.
+    """
+    semaphore = asyncio.Semaphore(max(1, settings.gap_refresh_label_concurrency))
+
+    async def _label(cluster) -> str:
+        if cluster.keywords:
+            async with semaphore:
+                return await gap_detector._generate_cluster_label(cluster.keywords)
+        names = [concept_name_map.get(cid, "") for cid in cluster.concept_ids]
+        filtered_names = [n for n in names if n and n.strip()]
+        return ", ".join(filtered_names[:3]) if filtered_names else f"Cluster {cluster.id + 1}"
+
+    labels = await asyncio.gather(*(_label(cluster) for cluster in clusters))
+    for cluster, label in zip(clusters, labels):
+        cluster.name = label
+    return {cluster.id: label for cluster, label in zip(clusters, labels)}
+
+
+def build_persistence_rows(
+    project_id: str,
+    concepts: List[dict],
+    relationships: List[dict],
+    analysis: dict,
+    labels: Dict[int, str],
+) -> dict:
+    """
+    Rows for the bulk writes: ``clusters`` and ``gaps`` (executemany argument
+    tuples) and ``centrality`` (parallel arrays for one UPDATE ... FROM unnest).
+    """
+    project_id = str(project_id)
+    concept_name_map = {c["id"]: c["name"] for c in concepts}
+    position = {c["id"]: i for i, c in enumerate(concepts)}
+    clusters = analysis.get("clusters", [])
+    cluster_by_id = {cluster.id: cluster for cluster in clusters}
+
+    # Intra-cluster edge counts in one pass over the edges
+    cluster_of = {str(cid): cluster.id for cluster in clusters for cid in cluster.concept_ids}
+    intra_edges: Dict[int, int] = {}
+    for rel in relationships:
+        source_cluster = cluster_of.get(rel["source_id"])
+        if source_cluster is not None and source_cluster == cluster_of.get(rel["target_id"]):
+            intra_edges[source_cluster] = intra_edges.get(source_cluster, 0) + 1
+
+    cluster_rows = []
+    for cluster in clusters:
+        n = len(set(str(cid) for cid in cluster.concept_ids))
+        max_edges = n * (n - 1) / 2
+        density = intra_edges.get(cluster.id, 0) / max_edges if n >= 2 and max_edges > 0 else 0.0
+        cluster_rows.append((
+            project_id,
+            cluster.id,
+            [str(cid) for cid in cluster.concept_ids],
+            [concept_name_map.get(cid, "") for cid in cluster.concept_ids],
+            len(cluster.concept_ids),
+            density,
+            labels.get(cluster.id, f"Cluster {cluster.id + 1}"),
+        ))
+
+    def _names_in_concept_order(ids, limit=None) -> List[str]:
+        ordered = sorted((cid for cid in ids if cid in position), key=position.get)
+        names = [concept_name_map[cid] for cid in ordered if concept_name_map[cid]]
+        return names[:limit] if limit else names
+
+    def _cluster_names(ids, cluster_id) -> List[str]:
+        names = _names_in_concept_order(ids, 5)
+        if not names:
+            cluster = cluster_by_id.get(cluster_id)
+            if cluster and cluster.keywords:
+                names = [k for k in cluster.keywords[:3] if k and k.strip()]
+        return names or [f"Cluster {cluster_id + 1}"]
+
+    gap_rows = []
+    for gap in analysis.get("gaps", []):
+        potential_edges_json = [
+            {
+                "source_id": pe.source_id,
+                "target_id": pe.target_id,
+                "similarity": pe.similarity,
+                "gap_id": pe.gap_id,
+                "source_name": pe.source_name,
+                "target_name": pe.target_name,
+            }
+            for pe in (gap.potential_edges or [])
+        ]
+        concept_ids_a = set(str(cid) for cid in gap.concept_a_ids)
+        concept_ids_b = set(str(cid) for cid in gap.concept_b_ids)
+        gap_rows.append((
+            project_id,
+            gap.cluster_a_id,
+            gap.cluster_b_id,
+            list(concept_ids_a),
+            list(concept_ids_b),
+            _cluster_names(concept_ids_a, gap.cluster_a_id),
+            _cluster_names(concept_ids_b, gap.cluster_b_id),
+            gap.gap_strength,
+            # Store concept names instead of UUIDs for bridge_candidates
+            _names_in_concept_order(set(gap.bridge_concepts or [])) or gap.bridge_concepts or [],
+            gap.suggested_research_questions or [],
+            json.dumps(potential_edges_json),
+        ))
+
+    metrics = analysis.get("centrality", [])
+    centrality = {
+        "ids": [str(m.entity_id) for m in metrics],
+        "degree": [float(m.degree) for m in metrics],
+        "betweenness": [float(m.betweenness) for m in metrics],
+        "pagerank": [float(m.pagerank) for m in metrics],
+    }
+    return {"clusters": cluster_rows, "gaps": gap_rows, "centrality": centrality}
+
+
+async def persist_gap_analysis(database, project_id: str, rows: dict) -> None:
+    """Replace the project's clusters and gaps and update centrality, atomically."""
+    project_id = str(project_id)
+    centrality = rows["centrality"]
+    async with database.transaction() as conn:
+        # Serialize concurrent refreshes of the same project
+        await conn.execute("SELECT pg_advisory_xact_lock(hashtext($1))", f"gap_refresh:{project_id}")
+        # Leave community-detection rows alone; they share concept_clusters
+        await conn.execute(
+            f"DELETE FROM concept_clusters WHERE project_id = $1 AND NOT COALESCE({COMMUNITY_ROWS_SQL}, false)",
+            project_id,
+        )
+        await conn.execute("DELETE FROM structural_gaps WHERE project_id = $1", project_id)
+        if rows["clusters"]:
+            await conn.executemany(
+                """
+                INSERT INTO concept_clusters
+                    (project_id, cluster_id, concepts, concept_names, size, density, label, detection_method)
+                VALUES ($1, $2, $3, $4, $5, $6, $7, 'kmeans')
+                """,
+                rows["clusters"],
+            )
+        if rows["gaps"]:
+            await conn.executemany(
+                """
+                INSERT INTO structural_gaps (
+                    project_id, cluster_a_id, cluster_b_id,
+                    cluster_a_concepts, cluster_b_concepts,
+                    cluster_a_names, cluster_b_names,
+                    gap_strength, bridge_candidates, research_questions, potential_edges
+                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
+                """,
+                rows["gaps"],
+            )
+        if centrality["ids"]:
+            await conn.execute(
+                """
+                UPDATE entities e
+                SET properties = e.properties || jsonb_build_object(
+                    'centrality_degree', u.degree,
+                    'centrality_betweenness', u.betweenness,
+                    'centrality_pagerank', u.pagerank
+                )
+                FROM unnest($2::text[], $3::float8[], $4::float8[], $5::float8[])
+                    AS u(id, degree, betweenness, pagerank)
+                WHERE e.project_id = $1::uuid AND e.id = u.id::uuid
+                """,
+                project_id,
+                centrality["ids"],
+                centrality["degree"],
+                centrality["betweenness"],
+                centrality["pagerank"],
+            )
+
+
+async def run_gap_refresh(
+    job_store: JobStore,
+    job_id: str,
+    project_id: str,
+    database,
+    user_id: Optional[str] = None,
+) -> None:
+    """Background task body for a gap refresh job."""
+    from graph.gap_detector import GapDetector
+    from graph.graph_snapshot import graph_snapshot_service
+    from graph.metrics_cache import graph_metrics_store, metrics_cache
+
+    project_id = str(project_id)
+    try:
+        await job_store.update_job(
+            job_id, status=JobStatus.RUNNING, progress=0.05, message="Loading concept graph"
+        )
+        snapshot = await graph_snapshot_service.get(database, project_id)
+        inputs = await asyncio.to_thread(build_gap_inputs, snapshot)
+        if inputs.no_gaps_reason:
+            await job_store.update_job(
+                job_id,
+                status=JobStatus.COMPLETED,
+                progress=1.0,
+                message="Not enough concepts for gap analysis",
+                result={
+                    "clusters": 0,
+                    "gaps": 0,
+                    "total_concepts": inputs.total_concepts,
+                    "no_gaps_reason": inputs.no_gaps_reason,
+                },
+            )
+            return
+
+        await job_store.update_job(
+            job_id, progress=0.2, message=f"Clustering {len(inputs.concepts)} concepts"
+        )
+        from llm.user_provider import create_llm_provider_for_user
+        llm = await create_llm_provider_for_user(user_id)
+        gap_detector = GapDetector(llm_provider=llm)
+        # Clusters are labeled below in one concurrent pass, not one by one
+        analysis = await gap_detector.analyze_graph(
+            inputs.concepts, inputs.relationships, label_clusters=False
+        )
+
+        clusters = analysis.get("clusters", [])
+        await job_store.update_job(job_id, progress=0.6, message=f"Labeling {len(clusters)} clusters")
+        concept_name_map = {c["id"]: c["name"] for c in inputs.concepts}
+        labels = await label_clusters(gap_detector, clusters, concept_name_map)
+
+        await job_store.update_job(job_id, progress=0.85, message="Saving gap analysis")
+        rows = await asyncio.to_thread(
+            build_persistence_rows, project_id, inputs.concepts, inputs.relationships, analysis, labels
+        )
+        await persist_gap_analysis(database, project_id, rows)
+
+        await metrics_cache.invalidate_project(project_id)
+        await graph_metrics_store.invalidate_project(database, project_id)
+
+        await job_store.update_job(
+            job_id,
+            status=JobStatus.COMPLETED,
+            progress=1.0,
+            message="Gap analysis refreshed",
+            result={
+                "clusters": len(rows["clusters"]),
+                "gaps": len(rows["gaps"]),
+                "total_concepts": inputs.total_concepts,
+                "no_gaps_reason": None,
+            },
+        )
+    except Exception as e:
+        logger.error(f"Gap refresh {job_id} for project {project_id} failed: {e}")
+        await job_store.update_job(
+            job_id,
+            status=JobStatus.FAILED,
+            message="Gap analysis refresh failed",
+            error=str(e),
+        )
+    finally:
+        if _active_refresh_jobs.get(project_id) == job_id:
+            _active_refresh_jobs.pop(project_id, None)
+
+
+async def start_gap_refresh(
+    job_store: JobStore,
+    project_id: str,
+    database,
+    user_id: Optional[str] = None,
+) -> str:
+    """
+    Create a gap refresh job and start it in the background.
+
+    Returns the id of the refresh already running for the project, if any.
+    """
+    project_id = str(project_id)
+    active_job_id = _active_refresh_jobs.get(project_id)
+    if active_job_id:
+        return active_job_id
+
+    job = await job_store.create_job(
+        job_type=GAP_REFRESH_JOB_TYPE,
+        metadata={"project_id": project_id},
+    )
+    _active_refresh_jobs[project_id] = job.id
+    task = asyncio.create_task(run_gap_refresh(job_store, job.id, project_id, database, user_id))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return job.id
@@ -0,0 +1,488 @@
+"""
+Shared in-memory project graph snapshots for analytics.
+
+Centrality, graph metrics, diversity, gap refresh and community detection all
+need the same project graph. ``GraphSnapshotService`` loads it once per graph
+version (``project_graph_versions``, migration 026) into compact numpy arrays:
+
+- a node-id <-> index table with names and entity-type codes
+- the edge list (int32 endpoints, type codes, float32 weights)
+- an undirected CSR adjacency (indptr / indices / edge index per entry)
+- a float32 embedding matrix for analytic (non-Paper/Author) entities
+
+Snapshots are shared across endpoints and requests, memory-accounted, and
+evicted LRU once the configured byte budget is exceeded. Repeat analytics
+calls on an unchanged graph skip the DB scan and the object construction.
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Entity types used by the concept-level analytics (gaps, metrics, diversity).
+ANALYTIC_ENTITY_TYPES = (
+    "Concept", "Method", "Finding", "Problem", "Dataset", "Metric", "Innovation", "Limitation",
+)
+
+# Rough per-object overhead of a Python str plus its dict slot, for accounting.
+_INDEX_ENTRY_OVERHEAD = 100
+
+
+def _to_vector(value) -> Optional[np.ndarray]:
+    """Parse a pgvector value (string, list or array) into a float32 vector."""
+    if value is None:
+        return None
+    try:
+        if isinstance(value, str):
+            clean = value.strip().strip("[]")
+            if not clean:
+                return None
+            return np.array(clean.split(","), dtype=np.float32)
+        vector = np.asarray(value, dtype=np.float32).ravel()
+        return vector if vector.size else None
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class ProjectGraphSnapshot:
+    """Immutable, version-stamped compact view of one project's graph."""
+    project_id: str
+    version: Optional[int]
+    node_ids: List[str]
+    names: List[Optional[str]]
+    entity_types: List[str]  # type code -> entity type
+    type_codes: np.ndarray  # int16 per node
+    edge_src: np.ndarray  # int32 per edge
+    edge_dst: np.ndarray  # int32 per edge
+    relationship_types: List[str]  # type code -> relationship type
+    edge_type_codes: np.ndarray  # int16 per edge
+    weights: np.ndarray  # float32 per edge (relationships.weight)
+    property_weights: np.ndarray  # float32 per edge (properties->>'weight', default 1.0)
+    indptr: np.ndarray  # int64, CSR row offsets (undirected)
+    indices: np.ndarray  # int32, CSR neighbour node indices
+    csr_edges: np.ndarray  # int32, edge index behind each CSR entry
+    embeddings: np.ndarray  # float32 (rows x dim)
+    embedding_rows: np.ndarray  # int32 per node, row in embeddings or -1
+    index: Dict[str, int] = field(default_factory=dict)
+    loaded_at: float = field(default_factory=time.monotonic)
+    nbytes: int = 0
+
+    def __post_init__(self):
+        if not self.index:
+            self.index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        if not self.nbytes:
+            self.nbytes = self._estimate_nbytes()
+
+    def _estimate_nbytes(self) -> int:
+        arrays = (
+            self.type_codes, self.edge_src, self.edge_dst, self.edge_type_codes,
+            self.weights, self.property_weights, self.indptr, self.indices,
+            self.csr_edges, self.embeddings, self.embedding_rows,
+        )
+        total = sum(a.nbytes for a in arrays)
+        total += sum(sys.getsizeof(s) for s in self.node_ids)
+        total += sum(sys.getsizeof(s) for s in self.names if s)
+        total += len(self.node_ids) * _INDEX_ENTRY_OVERHEAD
+        return total
+
+    # ------------------------------------------------------------------
+    # Shape and lookups
+    # ------------------------------------------------------------------
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self) -> int:
+        return int(self.edge_src.shape[0])
+
+    @property
+    def has_embedding(self) -> np.ndarray:
+        """Boolean mask of nodes that have an embedding."""
+        return self.embedding_rows >= 0
+
+    def entity_type_of(self, i: int) -> str:
+        return self.entity_types[self.type_codes[i]]
+
+    def name_of(self, node_id: str) -> str:
+        """Node name by id (falls back to the id, like CentralityAnalyzer.get_node_name)."""
+        i = self.index.get(node_id)
+        if i is None:
+            return node_id
+        return self.names[i] if self.names[i] is not None else node_id
+
+    def degree(self) -> np.ndarray:
+        """Undirected degree per node."""
+        return np.diff(self.indptr)
+
+    def neighbors(self, i: int) -> np.ndarray:
+        """Neighbour node indices of node ``i``."""
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    # ------------------------------------------------------------------
+    # Masks
+    # ------------------------------------------------------------------
+
+    def _type_code_mask(self, codes: Sequence[str], lookup: List[str], values: np.ndarray) -> np.ndarray:
+        wanted = [lookup.index(t) for t in codes if t in lookup]
+        return np.isin(values, np.array(wanted, dtype=values.dtype))
+
+    def node_mask(
+        self,
+        include_types: Optional[Sequence[str]] = None,
+        exclude_types: Optional[Sequence[str]] = None,
+        with_embedding: bool = False,
+    ) -> np.ndarray:
+        """Boolean node mask filtered by entity type and embedding presence."""
+        mask = np.ones(self.num_nodes, dtype=bool)
+        if include_types is not None:
+            mask &= self._type_code_mask(include_types, self.entity_types, self.type_codes)
+        if exclude_types:
+            mask &= ~self._type_code_mask(exclude_types, self.entity_types, self.type_codes)
+        if with_embedding:
+            mask &= self.has_embedding
+        return mask
+
+    def edge_mask(
+        self,
+        node_mask: Optional[np.ndarray] = None,
+        exclude_relationship_types: Optional[Sequence[str]] = None,
+    ) -> np.ndarray:
+        """Boolean edge mask: both endpoints in ``node_mask``, type not excluded."""
+        mask = np.ones(self.num_edges, dtype=bool)
+        if node_mask is not None:
+            mask &= node_mask[self.edge_src] & node_mask[self.edge_dst]
+        if exclude_relationship_types:
+            mask &= ~self._type_code_mask(
+                exclude_relationship_types, self.relationship_types, self.edge_type_codes
+            )
+        return mask
+
+    # ------------------------------------------------------------------
+    # Views for dict-based analyzers
+    # ------------------------------------------------------------------
+
+    def node_dicts(self, node_mask: Optional[np.ndarray] = None) -> List[dict]:
+        """Nodes as ``{"id", "entity_type", "name"}`` dicts, in id order."""
+        selected = range(self.num_nodes) if node_mask is None else np.flatnonzero(node_mask)
+        return [
+            {
+                "id": self.node_ids[i],
+                "entity_type": self.entity_types[self.type_codes[i]],
+                "name": self.names[i],
+            }
+            for i in selected
+        ]
+
+    def iter_edges(self, edge_mask: Optional[np.ndarray] = None) -> Iterator[Tuple[str, str, str, float]]:
+        """Yield ``(source_id, target_id, relationship_type, property_weight)``."""
+        selected = range(self.num_edges) if edge_mask is None else np.flatnonzero(edge_mask)
+        node_ids = self.node_ids
+        rel_types = self.relationship_types
+        src, dst = self.edge_src, self.edge_dst
+        type_codes, weights = self.edge_type_codes, self.property_weights
+        for e in selected:
+            yield node_ids[src[e]], node_ids[dst[e]], rel_types[type_codes[e]], float(weights[e])
+
+    def compact_edges(self, edge_mask: Optional[np.ndarray] = None) -> List[Tuple[str, str, float]]:
+        """``(source_id, target_id, weight)`` tuples for the centrality worker."""
+        return [(s, t, w) for s, t, _, w in self.iter_edges(edge_mask)]
+
+    # ------------------------------------------------------------------
+    # Embeddings and structure
+    # ------------------------------------------------------------------
+
+    def embedding_matrix(self, node_indices: np.ndarray) -> np.ndarray:
+        """float32 embedding rows for the given nodes (all must have embeddings)."""
+        return self.embeddings[self.embedding_rows[node_indices]]
+
+    def embedding_of(self, i: int) -> Optional[np.ndarray]:
+        row = self.embedding_rows[i]
+        return self.embeddings[row] if row >= 0 else None
+
+    def connected_components(
+        self,
+        node_mask: Optional[np.ndarray] = None,
+        edge_mask: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Component label per node over the masked subgraph (-1 outside the mask).
+
+        Labels are contiguous from 0 in order of each component's lowest node index.
+        """
+        from scipy.sparse import coo_matrix
+        from scipy.sparse.csgraph import connected_components
+
+        if node_mask is None:
+            node_mask = np.ones(self.num_nodes, dtype=bool)
+        edges = self.edge_mask(node_mask)
+        if edge_mask is not None:
+            edges &= edge_mask
+
+        n = self.num_nodes
+        src, dst = self.edge_src[edges], self.edge_dst[edges]
+        adjacency = coo_matrix((np.ones(src.shape[0], dtype=np.int8), (src, dst)), shape=(n, n))
+        _, labels = connected_components(adjacency, directed=False)
+
+        result = np.full(n, -1, dtype=np.int64)
+        selected = np.flatnonzero(node_mask)
+        _, relabeled = np.unique(labels[selected], return_inverse=True)
+        # np.unique sorts labels; scipy labels components by first-seen node, so
+        # the order already follows the lowest node index.
+        result[selected] = relabeled
+        return result
+
+
+def build_graph_snapshot(
+    project_id: str,
+    version: Optional[int],
+    entity_rows: Sequence,
+    relationship_rows: Sequence,
+) -> ProjectGraphSnapshot:
+    """
+    Build a snapshot from entity and relationship rows.
+
+    entity_rows: ``id``, ``entity_type``, ``name``, ``embedding`` (ordered by id)
+    relationship_rows: ``source_id``, ``target_id``, ``relationship_type``,
+    ``weight``, ``property_weight``. Edges whose endpoints are not in
+    ``entity_rows`` are dropped.
+    """
+    n = len(entity_rows)
+    node_ids = [str(row["id"]) for row in entity_rows]
+    names = [row["name"] for row in entity_rows]
+    index = {node_id: i for i, node_id in enumerate(node_ids)}
+
+    entity_types: List[str] = []
+    type_lookup: Dict[str, int] = {}
+    type_codes = np.empty(n, dtype=np.int16)
+    embedding_rows = np.full(n, -1, dtype=np.int32)
+    vectors: List[np.ndarray] = []
+    dim: Optional[int] = None
+    for i, row in enumerate(entity_rows):
+        entity_type = str(row["entity_type"])
+        code = type_lookup.get(entity_type)
+        if code is None:
+            code = type_lookup[entity_type] = len(entity_types)
+            entity_types.append(entity_type)
+        type_codes[i] = code
+
+        vector = _to_vector(row["embedding"])
+        if vector is None:
+            continue
+        if dim is None:
+            dim = vector.shape[0]
+        if vector.shape[0] != dim:
+            continue  # Mixed embedding models: keep the first dimension only
+        embedding_rows[i] = len(vectors)
+        vectors.append(vector)
+    embeddings = np.vstack(vectors) if vectors else np.zeros((0, 0), dtype=np.float32)
+
+    relationship_types: List[str] = []
+    rel_lookup: Dict[str, int] = {}
+    src_list, dst_list, rel_codes, weight_list, prop_weight_list = [], [], [], [], []
+    for row in relationship_rows:
+        s = index.get(str(row["source_id"]))
+        t = index.get(str(row["target_id"]))
+        if s is None or t is None:
+            continue
+        rel_type = str(row["relationship_type"])
+        code = rel_lookup.get(rel_type)
+        if code is None:
+            code = rel_lookup[rel_type] = len(relationship_types)
+            relationship_types.append(rel_type)
+        src_list.append(s)
+        dst_list.append(t)
+        rel_codes.append(code)
+        weight = row["weight"]
+        prop_weight = row["property_weight"]
+        weight_list.append(1.0 if weight is None else weight)
+        prop_weight_list.append(1.0 if prop_weight is None else prop_weight)
+
+    edge_src = np.array(src_list, dtype=np.int32)
+    edge_dst = np.array(dst_list, dtype=np.int32)
+    m = edge_src.shape[0]
+
+    # Undirected CSR: every edge appears under both endpoints (self-loops once).
+    edge_ids = np.arange(m, dtype=np.int32)
+    reverse = edge_src != edge_dst
+    rows = np.concatenate([edge_src, edge_dst[reverse]])
+    cols = np.concatenate([edge_dst, edge_src[reverse]])
+    entry_edges = np.concatenate([edge_ids, edge_ids[reverse]])
+    order = np.argsort(rows, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+
+    return ProjectGraphSnapshot(
+        project_id=str(project_id),
+        version=version,
+        node_ids=node_ids,
+        names=names,
+        entity_types=entity_types,
+        type_codes=type_codes,
+        edge_src=edge_src,
+        edge_dst=edge_dst,
+        relationship_types=relationship_types,
+        edge_type_codes=np.array(rel_codes, dtype=np.int16),
+        weights=np.array(weight_list, dtype=np.float32),
+        property_weights=np.array(prop_weight_list, dtype=np.float32),
+        indptr=indptr,
+        indices=cols[order].astype(np.int32, copy=False),
+        csr_edges=entry_edges[order],
+        embeddings=embeddings.astype(np.float32, copy=False),
+        embedding_rows=embedding_rows,
+        index=index,
+    )
+
+
+async def load_graph_snapshot(database, project_id, version: Optional[int]) -> ProjectGraphSnapshot:
+    """Fetch a project's entities and relationships and build a snapshot."""
+    entity_rows = await database.fetch(
+        """
+        SELECT id::text AS id, entity_type::text AS entity_type, name,
+               CASE WHEN entity_type::text = ANY($2::text[]) THEN embedding END AS embedding
+        FROM entities
+        WHERE project_id = $1
+        ORDER BY id
+        """,
+        str(project_id),
+        list(ANALYTIC_ENTITY_TYPES),
+    )
+    relationship_rows = await database.fetch(
+        """
+        SELECT source_id::text AS source_id, target_id::text AS target_id,
+               relationship_type::text AS relationship_type, weight,
+               COALESCE((properties->>'weight')::float, 1.0) AS property_weight
+        FROM relationships
+        WHERE project_id = $1
+        """,
+        str(project_id),
+    )
+    return await asyncio.to_thread(
+        build_graph_snapshot, str(project_id), version, entity_rows, relationship_rows
+    )
+
+
+class GraphSnapshotService:
+    """
+    Version-checked LRU of project graph snapshots.
+
+    Each ``get()`` reads the project's graph version (one indexed lookup) and
+    returns the cached snapshot if it matches. Concurrent misses for the same
+    project share one load. When the version table is unavailable, snapshots
+    are reused for ``unversioned_ttl_seconds`` instead.
+    """
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        max_projects: Optional[int] = None,
+        unversioned_ttl_seconds: Optional[float] = None,
+    ):
+        self.max_bytes = (
+            settings.graph_snapshot_max_mb * 1024 * 1024 if max_bytes is None else max_bytes
+        )
+        self.max_projects = (
+            settings.graph_snapshot_max_projects if max_projects is None else max_projects
+        )
+        self.unversioned_ttl_seconds = (
+            settings.graph_snapshot_unversioned_ttl_seconds
+            if unversioned_ttl_seconds is None else unversioned_ttl_seconds
+        )
+        self._snapshots: "OrderedDict[str, ProjectGraphSnapshot]" = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _fresh(self, snapshot: Optional[ProjectGraphSnapshot], version: Optional[int]) -> bool:
+        if snapshot is None or snapshot.version != version:
+            return False
+        if version is None:
+            return time.monotonic() - snapshot.loaded_at < self.unversioned_ttl_seconds
+        return True
+
+    async def get(self, database, project_id) -> ProjectGraphSnapshot:
+        """Return the snapshot for the project's current graph version."""
+        from graph.metrics_cache import graph_metrics_store
+
+        project_id = str(project_id)
+        version = await graph_metrics_store.get_graph_version(database, project_id)
+
+        snapshot = self._snapshots.get(project_id)
+        if self._fresh(snapshot, version):
+            self._hits += 1
+            self._snapshots.move_to_end(project_id)
+            return snapshot
+
+        lock = self._locks.setdefault(project_id, asyncio.Lock())
+        async with lock:
+            snapshot = self._snapshots.get(project_id)
+            if self._fresh(snapshot, version):
+                self._hits += 1
+                self._snapshots.move_to_end(project_id)
+                return snapshot
+
+            self._misses += 1
+            started = time.monotonic()
+            snapshot = await load_graph_snapshot(database, project_id, version)
+            logger.info(
+                f"Loaded graph snapshot for {project_id}@{version}: "
+                f"{snapshot.num_nodes} nodes, {snapshot.num_edges} edges, "
+                f"{snapshot.nbytes / (1024 * 1024):.1f}MB in {time.monotonic() - started:.2f}s"
+            )
+            self._store(snapshot)
+            return snapshot
+
+    def _store(self, snapshot: ProjectGraphSnapshot) -> None:
+        previous = self._snapshots.pop(snapshot.project_id, None)
+        if previous is not None:
+            self._bytes -= previous.nbytes
+        self._snapshots[snapshot.project_id] = snapshot
+        self._bytes += snapshot.nbytes
+
+        # Evict least recently used, but always keep the snapshot just loaded.
+        while len(self._snapshots) > 1 and (
+            self._bytes > self.max_bytes or len(self._snapshots) > self.max_projects
+        ):
+            project_id, evicted = self._snapshots.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            self._locks.pop(project_id, None)
+            self._evictions += 1
+
+    def invalidate(self, project_id: Optional[str] = None) -> None:
+        """Drop one project's snapshot, or all of them."""
+        if project_id is None:
+            self._snapshots.clear()
+            self._bytes = 0
+            return
+        evicted = self._snapshots.pop(str(project_id), None)
+        if evicted is not None:
+            self._bytes -= evicted.nbytes
+
+    def get_stats(self) -> dict:
+        total = self._hits + self._misses
+        return {
+            "projects": len(self._snapshots),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "hit_rate": round(self._hits / total, 4) if total else 0.0,
+        }
+
+
+graph_snapshot_service = GraphSnapshotService()
@@ -141,6 +141,10 @@ class GraphStore:
         """PERF-014: Batch insert relationships. Returns count inserted."""
         return await self._entity_dao.batch_add_relationships(project_id, relationships)
 
+    async def bulk_upsert_relationships(self, project_id: str, relationships: list) -> dict:
+        """Bulk COPY + merge relationships. Returns {"inserted", "updated"} counts."""
+        return await self._entity_dao.bulk_upsert_relationships(project_id, relationships)
+
     # =========================================================================
     # Project & Paper Operations (delegated to EntityDAO)
     # =========================================================================
@@ -267,10 +271,25 @@ class GraphStore:
         project_id: str,
         similarity_threshold: float = 0.7,
         llm_provider=None,
+        max_neighbors: Optional[int] = None,
     ) -> int:
         """Build semantic relationships between concepts in a project."""
         return await self._analytics.build_concept_relationships(
-            project_id, similarity_threshold, llm_provider, self._entity_dao
+            project_id, similarity_threshold, llm_provider, self._entity_dao,
+            max_neighbors=max_neighbors,
+        )
+
+    async def build_concept_relationships_with_stats(
+        self,
+        project_id: str,
+        similarity_threshold: float = 0.7,
+        llm_provider=None,
+        max_neighbors: Optional[int] = None,
+    ) -> dict:
+        """Build semantic relationships and return candidate/inserted/updated counts."""
+        return await self._analytics.build_concept_relationships_with_stats(
+            project_id, similarity_threshold, llm_provider, self._entity_dao,
+            max_neighbors=max_neighbors,
         )
 
     # =========================================================================
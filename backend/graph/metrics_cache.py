@@ -1,10 +1,14 @@
-"""Bounded async TTL cache for heavy graph metric endpoints."""
+"""Caches for heavy graph metric endpoints: in-process TTL and persistent versioned store."""
 
 import asyncio
+import json
+import logging
 import time
 from collections import OrderedDict
 from typing import Any, Optional, Tuple
 
+logger = logging.getLogger(__name__)
+
 
 class MetricsTTLCache:
     """Small in-process TTL cache with project-scoped invalidation."""
@@ -31,10 +35,10 @@ class MetricsTTLCache:
             self._cache.move_to_end(cache_key)
             return value
 
-    async def set(self, cache_key: str, value: Any) -> None:
-        """Store value with TTL and bounded size."""
+    async def set(self, cache_key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value with TTL (default ttl_seconds) and bounded size."""
         now = time.monotonic()
-        expires_at = now + self.ttl_seconds
+        expires_at = now + (self.ttl_seconds if ttl is None else ttl)
         async with self._lock:
             expired_keys = [k for k, (exp, _) in self._cache.items() if exp <= now]
             for key in expired_keys:
@@ -56,3 +60,141 @@ class MetricsTTLCache:
 
 metrics_cache = MetricsTTLCache(ttl_seconds=30.0, max_entries=12)
 
+
+
+class GraphMetricsStore:
+    """
+    Postgres-backed metrics store keyed by project graph version.
+
+    `project_graph_versions.version` is bumped by triggers on entity/relationship
+    writes (migration 026). A stored payload is only served while its
+    graph_version matches the current one, so results survive restarts and are
+    shared across workers, and recomputes happen only after the graph changed.
+
+    A small in-process LRU keyed by (project, metric, version) avoids
+    re-decoding large payloads on every hit. If the store tables are missing or
+    the DB is unavailable, falls back to the TTL cache behaviour (entries expire
+    after fallback_ttl_seconds unless set() is given a per-metric TTL).
+    """
+
+    def __init__(
+        self,
+        local_cache: Optional[MetricsTTLCache] = None,
+        fallback_ttl_seconds: float = 30.0,
+    ):
+        # Versioned keys never go stale, so the local TTL only bounds memory age.
+        self._local = local_cache or MetricsTTLCache(ttl_seconds=600.0, max_entries=32)
+        self.fallback_ttl_seconds = fallback_ttl_seconds
+
+    @staticmethod
+    def _local_key(project_id: str, metric_key: str, graph_version: Optional[int]) -> str:
+        return f"{project_id}:{metric_key}@{graph_version if graph_version is not None else 'ttl'}"
+
+    async def get_graph_version(self, database, project_id) -> Optional[int]:
+        """Return the current graph version, or None if the store is unavailable."""
+        try:
+            version = await database.fetchval(
+                "SELECT version FROM project_graph_versions WHERE project_id = $1",
+                str(project_id),
+            )
+            return int(version or 0)
+        except Exception as e:
+            logger.debug(f"Graph version lookup unavailable: {e}")
+            return None
+
+    async def get(self, database, project_id, metric_key: str) -> Tuple[Optional[int], Optional[Any]]:
+        """
+        Return (graph_version, payload) for a metric.
+
+        payload is None when nothing valid is stored for the current version.
+        Pass the returned graph_version back to set() after recomputing.
+        """
+        project_id = str(project_id)
+        graph_version = await self.get_graph_version(database, project_id)
+        local_key = self._local_key(project_id, metric_key, graph_version)
+
+        cached = await self._local.get(local_key)
+        if cached is not None or graph_version is None:
+            return graph_version, cached
+
+        try:
+            payload = await database.fetchval(
+                """
+                SELECT payload FROM graph_metrics_store
+                WHERE project_id = $1 AND metric_key = $2 AND graph_version = $3
+                """,
+                project_id,
+                metric_key,
+                graph_version,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to read stored metrics {metric_key} for {project_id}: {e}")
+            return graph_version, None
+
+        if isinstance(payload, str):
+            payload = json.loads(payload)
+        if not isinstance(payload, dict):
+            return graph_version, None
+
+        await self._local.set(local_key, payload)
+        return graph_version, payload
+
+    async def set(
+        self,
+        database,
+        project_id,
+        metric_key: str,
+        graph_version: Optional[int],
+        payload: Any,
+        fallback_ttl: Optional[float] = None,
+    ) -> None:
+        """
+        Persist a computed payload stamped with the version it was computed at.
+
+        Without a graph version the payload is only cached locally, for
+        fallback_ttl seconds (default fallback_ttl_seconds).
+        """
+        project_id = str(project_id)
+        local_key = self._local_key(project_id, metric_key, graph_version)
+        if graph_version is None:
+            ttl = self.fallback_ttl_seconds if fallback_ttl is None else fallback_ttl
+            await self._local.set(local_key, payload, ttl=ttl)
+            return
+        await self._local.set(local_key, payload)
+
+        try:
+            await database.execute(
+                """
+                INSERT INTO graph_metrics_store (project_id, metric_key, graph_version, payload, computed_at)
+                VALUES ($1, $2, $3, $4::jsonb, NOW())
+                ON CONFLICT (project_id, metric_key) DO UPDATE
+                SET graph_version = EXCLUDED.graph_version,
+                    payload = EXCLUDED.payload,
+                    computed_at = NOW()
+                WHERE graph_metrics_store.graph_version <= EXCLUDED.graph_version
+                """,
+                project_id,
+                metric_key,
+                graph_version,
+                json.loads(json.dumps(payload, default=str)),
+            )
+        except Exception as e:
+            logger.warning(f"Failed to persist metrics {metric_key} for {project_id}: {e}")
+
+    async def invalidate_project(self, database, project_id) -> None:
+        """
+        Bump the graph version for changes the triggers don't see
+        (e.g. recomputed clusters or gap analysis).
+        """
+        project_id = str(project_id)
+        await self._local.invalidate_project(project_id)
+        try:
+            await database.execute(
+                "SELECT bump_graph_version(ARRAY[$1::uuid])",
+                project_id,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to bump graph version for {project_id}: {e}")
+
+
+graph_metrics_store = GraphMetricsStore()
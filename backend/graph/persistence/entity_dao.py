@@ -11,6 +11,8 @@ from uuid import UUID, uuid4
 from dataclasses import dataclass
 from datetime import datetime
 
+import asyncpg
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,6 +29,14 @@ def _normalize_relationship_type(raw_type) -> str:
     return normalized
 
 
+# Errors caused by the rows themselves (bad id or type, missing entity);
+# anything else (connection loss, ...) fails the whole write.
+_ROW_REJECTION_ERRORS = (
+    asyncpg.exceptions.DataError,
+    asyncpg.exceptions.IntegrityConstraintViolationError,
+)
+
+
 @dataclass
 class Node:
     """Graph node representing an entity."""
@@ -245,6 +255,119 @@ class EntityDAO:
                     logger.debug(f"Individual relationship insert failed: {inner_e}")
             return count
 
+    async def bulk_upsert_relationships(self, project_id: str, relationships: list) -> dict:
+        """
+        Bulk insert/update relationships with a single COPY + merge.
+
+        Rows are staged into a temp table with asyncpg copy_records_to_table and
+        merged with one INSERT ... ON CONFLICT, instead of one round-trip per
+        edge. Conflicting edges take the new properties and weight, matching
+        add_relationship(). Duplicate (source, target, type) rows in the input
+        keep the highest weight. If the database rejects the batch because of
+        bad rows, it is split and retried so the valid rows are still written;
+        rejected rows are logged and skipped.
+
+        Each item in relationships is a tuple:
+        (source_id, target_id, relationship_type, properties_dict, weight)
+
+        Returns:
+            {"inserted": int, "updated": int}
+        """
+        stats = {"inserted": 0, "updated": 0}
+        if not relationships:
+            return stats
+
+        if not self.db:
+            for source_id, target_id, rel_type, properties, weight in relationships:
+                await self.add_relationship(
+                    project_id, source_id, target_id, rel_type, properties, weight
+                )
+            stats["inserted"] = len(relationships)
+            return stats
+
+        records = [
+            (
+                str(uuid4()),
+                str(project_id),
+                str(source_id),
+                str(target_id),
+                _normalize_relationship_type(rel_type),
+                json.dumps(properties or {}),
+                float(weight if weight is not None else 1.0),
+            )
+            for source_id, target_id, rel_type, properties, weight in relationships
+        ]
+
+        await self._merge_relationship_records_isolating(records, stats)
+
+        logger.info(
+            f"Bulk upserted {len(records)} relationships: "
+            f"{stats['inserted']} inserted, {stats['updated']} updated"
+        )
+        return stats
+
+    async def _merge_relationship_records(self, records: list) -> tuple:
+        """Stage records with COPY and merge them in one transaction; returns (inserted, updated)."""
+        async with self.db.transaction() as conn:
+            await conn.execute("""
+                CREATE TEMP TABLE _relationship_stage (
+                    id TEXT,
+                    project_id TEXT,
+                    source_id TEXT,
+                    target_id TEXT,
+                    relationship_type TEXT,
+                    properties TEXT,
+                    weight DOUBLE PRECISION
+                ) ON COMMIT DROP
+            """)
+            await conn.copy_records_to_table(
+                "_relationship_stage",
+                records=records,
+                columns=[
+                    "id", "project_id", "source_id", "target_id",
+                    "relationship_type", "properties", "weight",
+                ],
+            )
+            row = await conn.fetchrow("""
+                WITH merged AS (
+                    INSERT INTO relationships (id, project_id, source_id, target_id, relationship_type, properties, weight)
+                    SELECT DISTINCT ON (source_id, target_id, relationship_type)
+                        id::uuid, project_id::uuid, source_id::uuid, target_id::uuid,
+                        relationship_type::relationship_type, properties::jsonb, weight
+                    FROM _relationship_stage
+                    ORDER BY source_id, target_id, relationship_type, weight DESC
+                    ON CONFLICT (source_id, target_id, relationship_type) DO UPDATE SET
+                        properties = EXCLUDED.properties,
+                        weight = EXCLUDED.weight
+                    RETURNING (xmax = 0) AS inserted
+                )
+                SELECT
+                    COUNT(*) FILTER (WHERE inserted) AS inserted,
+                    COUNT(*) FILTER (WHERE NOT inserted) AS updated
+                FROM merged
+            """)
+
+        if not row:
+            return 0, 0
+        return int(row["inserted"] or 0), int(row["updated"] or 0)
+
+    async def _merge_relationship_records_isolating(self, records: list, stats: dict) -> None:
+        """Merge records, halving the batch on row-level rejections until bad rows are isolated."""
+        try:
+            inserted, updated = await self._merge_relationship_records(records)
+        except _ROW_REJECTION_ERRORS as e:
+            if len(records) == 1:
+                _, _, source_id, target_id, rel_type, _, _ = records[0]
+                logger.warning(f"Rejected relationship {source_id} -> {target_id} ({rel_type}): {e}")
+                return
+            logger.debug(f"Relationship batch of {len(records)} rejected, splitting: {e}")
+            mid = len(records) // 2
+            await self._merge_relationship_records_isolating(records[:mid], stats)
+            await self._merge_relationship_records_isolating(records[mid:], stats)
+            return
+        stats["inserted"] += inserted
+        stats["updated"] += updated
+
     # =========================================================================
     # Relationship Operations
     # =========================================================================
@@ -16,7 +16,6 @@ from dataclasses import dataclass, field
 from typing import Optional
 from collections import defaultdict
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 
 logger = logging.getLogger(__name__)
 
@@ -71,35 +70,50 @@ class ConceptCentricRelationshipBuilder:
     - USES_METHOD: Paper → Method
     """
 
+    # Memory budget for one block of the similarity matrix (float32)
+    SIMILARITY_BLOCK_BYTES = 32 * 1024 * 1024
+
     def __init__(
         self,
         llm_provider=None,
         similarity_threshold: float = 0.7,
         cooccurrence_threshold: int = 2,
+        max_neighbors: Optional[int] = 50,
     ):
         self.llm = llm_provider
         self.similarity_threshold = similarity_threshold
         self.cooccurrence_threshold = cooccurrence_threshold
+        self.max_neighbors = max_neighbors  # RELATED_TO cap per concept (None/0 = unbounded)
 
     def build_semantic_relationships(
         self,
         concepts: list[dict],
         similarity_threshold: Optional[float] = None,
+        max_neighbors: Optional[int] = None,
+        block_size: Optional[int] = None,
     ) -> list[RelationshipCandidate]:
         """
         Build RELATED_TO relationships based on embedding similarity.
 
+        Similarities are computed in row blocks against the normalized float32
+        embedding matrix, so the full n x n matrix is never materialized. Each
+        concept keeps at most ``max_neighbors`` neighbours above the threshold
+        (selected with argpartition); a pair is emitted once if either side
+        keeps the other.
+
         Args:
             concepts: List of concept dicts with 'id', 'name', 'embedding'
             similarity_threshold: Minimum cosine similarity (default: 0.7)
+            max_neighbors: Neighbour cap per concept (default: builder setting, 0 = unbounded)
+            block_size: Rows per similarity block (default: sized to ~SIMILARITY_BLOCK_BYTES)
 
         Returns:
             List of RELATED_TO relationship candidates
         """
         if similarity_threshold is None:
             similarity_threshold = self.similarity_threshold
-
-        relationships = []
+        if max_neighbors is None:
+            max_neighbors = self.max_neighbors
 
         # Filter concepts with embeddings
         concepts_with_embeddings = [
@@ -111,38 +125,104 @@ class ConceptCentricRelationshipBuilder:
             logger.warning("Too few concepts with embeddings for semantic relationships")
             return []
 
-        logger.info(f"Computing semantic similarity for {len(concepts_with_embeddings)} concepts")
+        n = len(concepts_with_embeddings)
+        logger.info(f"Computing semantic similarity for {n} concepts")
 
-        # Stack embeddings into matrix
-        embeddings = np.array([c["embedding"] for c in concepts_with_embeddings])
+        # Stack and L2-normalize embeddings so a dot product is cosine similarity
+        embeddings = np.asarray([c["embedding"] for c in concepts_with_embeddings], dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings /= np.maximum(norms, 1e-12)
 
-        # Compute pairwise cosine similarity
-        similarity_matrix = cosine_similarity(embeddings)
-
-        # Extract relationships above threshold
-        for i in range(len(concepts_with_embeddings)):
-            for j in range(i + 1, len(concepts_with_embeddings)):
-                similarity = similarity_matrix[i, j]
+        pairs, scores = self._blocked_similarity_pairs(
+            embeddings, similarity_threshold, max_neighbors, block_size
+        )
 
-                if similarity >= similarity_threshold:
-                    relationships.append(
-                        RelationshipCandidate(
-                            source_id=concepts_with_embeddings[i]["id"],
-                            target_id=concepts_with_embeddings[j]["id"],
-                            relationship_type="RELATED_TO",
-                            confidence=float(similarity),
-                            properties={
-                                "similarity_score": float(similarity),
-                                "inference_method": "embedding_similarity",
-                            },
-                            source_type="Concept",
-                            target_type="Concept",
-                        )
-                    )
+        relationships = []
+        for (i, j), similarity in zip(pairs.tolist(), scores.tolist()):
+            relationships.append(
+                RelationshipCandidate(
+                    source_id=concepts_with_embeddings[i]["id"],
+                    target_id=concepts_with_embeddings[j]["id"],
+                    relationship_type="RELATED_TO",
+                    confidence=float(similarity),
+                    properties={
+                        "similarity_score": float(similarity),
+                        "inference_method": "embedding_similarity",
+                    },
+                    source_type="Concept",
+                    target_type="Concept",
+                )
+            )
 
-        logger.info(f"Found {len(relationships)} semantic relationships (threshold: {similarity_threshold})")
+        logger.info(
+            f"Found {len(relationships)} semantic relationships "
+            f"(threshold: {similarity_threshold}, max_neighbors: {max_neighbors})"
+        )
         return relationships
 
+    def _blocked_similarity_pairs(
+        self,
+        embeddings: np.ndarray,
+        threshold: float,
+        max_neighbors: Optional[int],
+        block_size: Optional[int] = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find (i, j) pairs with i < j and cosine similarity >= threshold.
+
+        Args:
+            embeddings: Row-normalized float32 matrix (n x d)
+            threshold: Minimum similarity
+            max_neighbors: Per-row top-k cap (None/0 = unbounded)
+            block_size: Rows per block
+
+        Returns:
+            (pairs, scores): int64 array (m x 2) sorted by (i, j), float32 array (m,)
+        """
+        n = embeddings.shape[0]
+        if block_size is None:
+            block_size = max(1, min(n, self.SIMILARITY_BLOCK_BYTES // (4 * n)))
+        k = max_neighbors if max_neighbors and max_neighbors < n - 1 else None
+
+        pair_keys = []
+        pair_scores = []
+        for start in range(0, n, block_size):
+            stop = min(start + block_size, n)
+            sims = embeddings[start:stop] @ embeddings.T
+            rows = np.arange(stop - start)
+            sims[rows, rows + start] = -np.inf  # exclude self-similarity
+
+            if k is None:
+                # Upper triangle only: each unordered pair is seen exactly once
+                cols_grid = np.arange(n)
+                mask = (sims >= threshold) & (cols_grid[None, :] > (rows + start)[:, None])
+                r, cols = np.nonzero(mask)
+                src = r + start
+                dst = cols
+                vals = sims[r, cols]
+            else:
+                top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+                top_vals = np.take_along_axis(sims, top, axis=1)
+                r, c = np.nonzero(top_vals >= threshold)
+                src = r + start
+                dst = top[r, c]
+                vals = top_vals[r, c]
+
+            lo = np.minimum(src, dst).astype(np.int64)
+            hi = np.maximum(src, dst).astype(np.int64)
+            pair_keys.append(lo * n + hi)
+            pair_scores.append(vals.astype(np.float32))
+
+        if not pair_keys:
+            return np.empty((0, 2), dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        keys = np.concatenate(pair_keys)
+        scores = np.concatenate(pair_scores)
+        # Deduplicate pairs kept from both ends; np.unique also sorts by (i, j)
+        keys, first = np.unique(keys, return_index=True)
+        pairs = np.stack([keys // n, keys % n], axis=1)
+        return pairs, scores[first]
+
     def build_cooccurrence_relationships(
         self,
         concepts: list[dict],
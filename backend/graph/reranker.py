@@ -3,16 +3,70 @@ Semantic Reranker
 
 Re-ranks search results using embedding-based cosine similarity.
 Uses the project's existing EmbeddingService for embeddings.
+
+Embedding work is batched and kept off the event loop:
+- stored `entities.embedding` vectors are reused when their dimension matches
+  the query embedding
+- the query and all remaining result texts go out in one `embed_texts` call
+- query embeddings are memoized in a content-hash LRU
+- scoring is a single normalized matrix-vector product
 """
 
+import asyncio
+import hashlib
+import json
 import logging
-import numpy as np
+from collections import OrderedDict
 from typing import Optional
 
+import numpy as np
+
 from embedding_service import EmbeddingService, get_embedding_service
 
 logger = logging.getLogger(__name__)
 
+# Shared across reranker instances (one is created per search).
+QUERY_CACHE_MAX_ENTRIES = 256
+_query_embedding_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+
+def _query_cache_key(query: str) -> str:
+    return hashlib.sha256(query.strip().lower().encode("utf-8")).hexdigest()
+
+
+def _get_cached_query_embedding(query: str) -> Optional[np.ndarray]:
+    key = _query_cache_key(query)
+    vec = _query_embedding_cache.get(key)
+    if vec is not None:
+        _query_embedding_cache.move_to_end(key)
+    return vec
+
+
+def _cache_query_embedding(query: str, vec: np.ndarray) -> None:
+    key = _query_cache_key(query)
+    _query_embedding_cache[key] = vec
+    _query_embedding_cache.move_to_end(key)
+    while len(_query_embedding_cache) > QUERY_CACHE_MAX_ENTRIES:
+        _query_embedding_cache.popitem(last=False)
+
+
+def clear_query_embedding_cache() -> None:
+    """Drop all memoized query embeddings."""
+    _query_embedding_cache.clear()
+
+
+def _parse_stored_embedding(value) -> Optional[np.ndarray]:
+    """Parse a pgvector column value (list/ndarray or '[...]' text) to float32."""
+    if value is None:
+        return None
+    try:
+        if isinstance(value, str):
+            value = json.loads(value)
+        vec = np.asarray(value, dtype=np.float32)
+    except (TypeError, ValueError):
+        return None
+    return vec if vec.ndim == 1 and vec.size > 0 else None
+
 
 class SemanticReranker:
     """
@@ -20,8 +74,9 @@ class SemanticReranker:
     between query embedding and result embeddings.
     """
 
-    def __init__(self, embedding_service: Optional[EmbeddingService] = None):
+    def __init__(self, embedding_service: Optional[EmbeddingService] = None, database=None):
         self._embedding_service = embedding_service
+        self.database = database
 
     @property
     def embedding_service(self) -> Optional[EmbeddingService]:
@@ -32,6 +87,47 @@ class SemanticReranker:
                 logger.warning(f"EmbeddingService unavailable for reranker: {e}")
         return self._embedding_service
 
+    @staticmethod
+    def _result_text(result: dict) -> str:
+        text_parts = [result.get("name", "")]
+        props = result.get("properties", {})
+        if isinstance(props, dict):
+            if props.get("description"):
+                text_parts.append(props["description"])
+            if props.get("abstract"):
+                text_parts.append(props["abstract"][:500])
+        return ". ".join(text_parts)
+
+    async def _load_stored_embeddings(self, results: list[dict]) -> dict[str, np.ndarray]:
+        """Fetch existing entity embeddings for the results in one query."""
+        if self.database is None:
+            return {}
+
+        ids = [str(r["id"]) for r in results if r.get("id")]
+        if not ids:
+            return {}
+
+        try:
+            rows = await self.database.fetch(
+                """
+                SELECT id, embedding
+                FROM entities
+                WHERE id = ANY($1::uuid[])
+                AND embedding IS NOT NULL
+                """,
+                ids,
+            )
+        except Exception as e:
+            logger.debug(f"Stored embeddings unavailable for reranking: {e}")
+            return {}
+
+        stored = {}
+        for row in rows:
+            vec = _parse_stored_embedding(row["embedding"])
+            if vec is not None:
+                stored[str(row["id"])] = vec
+        return stored
+
     async def rerank(
         self,
         query: str,
@@ -57,47 +153,63 @@ class SemanticReranker:
             return results[:top_k]
 
         try:
-            # Get query embedding
-            query_embedding = self.embedding_service.embed_text(query)
-            query_vec = np.array(query_embedding)
-
-            # Build text representations for each result
-            result_texts = []
-            for r in results:
-                text_parts = [r.get("name", "")]
-                props = r.get("properties", {})
-                if isinstance(props, dict):
-                    if props.get("description"):
-                        text_parts.append(props["description"])
-                    if props.get("abstract"):
-                        text_parts.append(props["abstract"][:500])
-                result_texts.append(". ".join(text_parts))
-
-            # Get embeddings for all results
-            result_embeddings = []
-            for text in result_texts:
-                try:
-                    emb = self.embedding_service.embed_text(text)
-                    result_embeddings.append(np.array(emb))
-                except Exception:
-                    result_embeddings.append(None)
-
-            # Compute cosine similarity and combine scores
+            query_vec = _get_cached_query_embedding(query)
+            stored = await self._load_stored_embeddings(results)
+
+            result_vecs: list[Optional[np.ndarray]] = []
+            missing: list[int] = []
+            for i, r in enumerate(results):
+                vec = stored.get(str(r.get("id"))) if r.get("id") else None
+                result_vecs.append(vec)
+                if vec is None:
+                    missing.append(i)
+
+            # One batched embedding call (query + uncovered results) on a worker thread
+            batch_texts = [self._result_text(results[i]) for i in missing]
+            if query_vec is None:
+                batch_texts.insert(0, query)
+            if batch_texts:
+                embeddings = await asyncio.to_thread(self.embedding_service.embed_texts, batch_texts)
+                if query_vec is None:
+                    query_vec = np.asarray(embeddings[0], dtype=np.float32)
+                    _cache_query_embedding(query, query_vec)
+                    embeddings = embeddings[1:]
+                for i, emb in zip(missing, embeddings):
+                    if emb:
+                        result_vecs[i] = np.asarray(emb, dtype=np.float32)
+
+            # Stored vectors from a different embedding model can't be compared; re-embed those
+            missing_set = set(missing)
+            stale = [
+                i for i, vec in enumerate(result_vecs)
+                if i not in missing_set and vec is not None and vec.size != query_vec.size
+            ]
+            if stale:
+                embeddings = await asyncio.to_thread(
+                    self.embedding_service.embed_texts, [self._result_text(results[i]) for i in stale]
+                )
+                for i, emb in zip(stale, embeddings):
+                    result_vecs[i] = np.asarray(emb, dtype=np.float32) if emb else None
+
+            # Vectorized cosine similarity over all embedded results
+            rerank_scores = np.zeros(len(results), dtype=np.float32)
+            has_vec = np.array(
+                [v is not None and v.size == query_vec.size for v in result_vecs], dtype=bool
+            )
+            norm_q = float(np.linalg.norm(query_vec))
+            if has_vec.any() and norm_q > 0:
+                matrix = np.vstack([v for v, ok in zip(result_vecs, has_vec) if ok])
+                norms = np.linalg.norm(matrix, axis=1)
+                sims = (matrix @ query_vec) / (np.maximum(norms, 1e-12) * norm_q)
+                sims[norms == 0] = 0.0
+                rerank_scores[has_vec] = sims
+
             reranked = []
             for i, r in enumerate(results):
                 original_score = r.get("score", 0.5)
 
-                if result_embeddings[i] is not None:
-                    result_vec = result_embeddings[i]
-                    # Cosine similarity
-                    dot = np.dot(query_vec, result_vec)
-                    norm_q = np.linalg.norm(query_vec)
-                    norm_r = np.linalg.norm(result_vec)
-                    if norm_q > 0 and norm_r > 0:
-                        rerank_score = float(dot / (norm_q * norm_r))
-                    else:
-                        rerank_score = 0.0
-
+                if has_vec[i]:
+                    rerank_score = float(rerank_scores[i])
                     # Weighted combination
                     combined_score = (weight_original * original_score) + (weight_rerank * rerank_score)
                 else:
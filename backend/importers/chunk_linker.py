@@ -0,0 +1,178 @@
+"""
+Entity-to-chunk linker shared by the PDF and Zotero importers (Phase 7A).
+
+All entity names of a paper are compiled into one Aho-Corasick automaton, so
+each chunk is lowercased and scanned exactly once regardless of how many
+entities there are. Matches must sit on word boundaries ("graph" does not
+match inside "paragraph"). The resulting links are written with a single
+``UPDATE ... FROM unnest(...)`` statement per paper.
+"""
+
+import logging
+from collections import deque
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+MIN_ENTITY_NAME_LENGTH = 3
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class EntityNameAutomaton:
+    """Aho-Corasick automaton over lowercased entity names."""
+
+    def __init__(self, names: Iterable[str]):
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for name in names:
+            pattern = (name or "").strip().lower()
+            self.patterns.append(pattern)
+            if pattern:
+                self._add(pattern, len(self.patterns) - 1)
+        self._build_failure_links()
+
+    def _add(self, pattern: str, index: int) -> None:
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = nxt
+        self._output[node].append(index)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find(self, text: str) -> Set[int]:
+        """Return indices of patterns occurring in ``text`` on word boundaries."""
+        text = text.lower()
+        found: Set[int] = set()
+        node = 0
+        for pos, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for index in self._output[node]:
+                if index in found:
+                    continue
+                pattern = self.patterns[index]
+                start = pos - len(pattern) + 1
+                if _is_word_char(pattern[0]) and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if _is_word_char(pattern[-1]) and pos + 1 < len(text) and _is_word_char(text[pos + 1]):
+                    continue
+                found.add(index)
+        return found
+
+
+def match_entities_to_chunks(
+    entity_ids_and_names: List[Tuple[str, str]],
+    chunks: List[Dict[str, Any]],
+) -> Dict[str, List[str]]:
+    """
+    Map entity ids to the ids of chunks that mention them.
+
+    Names shorter than ``MIN_ENTITY_NAME_LENGTH`` are ignored. Entities sharing
+    a name share one automaton pattern.
+    """
+    ids_by_name: Dict[str, List[str]] = {}
+    for entity_id, entity_name in entity_ids_and_names:
+        if not entity_name or len(entity_name) < MIN_ENTITY_NAME_LENGTH:
+            continue
+        ids_by_name.setdefault(entity_name.strip().lower(), []).append(str(entity_id))
+    if not ids_by_name or not chunks:
+        return {}
+
+    names = list(ids_by_name)
+    automaton = EntityNameAutomaton(names)
+
+    matches: Dict[str, List[str]] = {}
+    for chunk in chunks:
+        text = chunk.get("text") or ""
+        if not text:
+            continue
+        chunk_id = str(chunk["id"])
+        for index in automaton.find(text):
+            for entity_id in ids_by_name[names[index]]:
+                matches.setdefault(entity_id, []).append(chunk_id)
+    return matches
+
+
+async def link_entities_to_chunks(
+    db,
+    paper_id: str,
+    entity_ids_and_names: List[Tuple[str, str]],
+    chunks: List[Dict[str, Any]],
+) -> int:
+    """
+    Merge matched chunk ids into ``entities.properties.source_chunk_ids``.
+
+    Args:
+        db: Database with an ``execute`` helper.
+        paper_id: Paper UUID (for logging only; chunks are already scoped).
+        entity_ids_and_names: List of (entity_id, canonical_name) tuples
+        chunks: Chunk rows with ``id`` and ``text``
+
+    Returns:
+        Number of entity-chunk links written
+    """
+    matches = match_entities_to_chunks(entity_ids_and_names, chunks)
+    if not matches or db is None:
+        return 0
+
+    entity_ids: List[str] = []
+    chunk_ids: List[str] = []
+    for entity_id, matched in matches.items():
+        entity_ids.extend([entity_id] * len(matched))
+        chunk_ids.extend(matched)
+
+    await db.execute(
+        """
+        UPDATE entities e
+        SET properties = jsonb_set(
+            COALESCE(e.properties, '{}'::jsonb),
+            '{source_chunk_ids}',
+            (
+                SELECT jsonb_agg(DISTINCT val)
+                FROM (
+                    SELECT jsonb_array_elements_text(
+                        COALESCE(e.properties->'source_chunk_ids', '[]'::jsonb)
+                    ) AS val
+                    UNION
+                    SELECT unnest(links.chunk_ids) AS val
+                ) combined
+            )
+        )
+        FROM (
+            SELECT entity_id, array_agg(chunk_id) AS chunk_ids
+            FROM unnest($1::uuid[], $2::text[]) AS u(entity_id, chunk_id)
+            GROUP BY entity_id
+        ) links
+        WHERE e.id = links.entity_id
+        """,
+        entity_ids,
+        chunk_ids,
+    )
+
+    logger.debug(f"Phase 7A: {len(chunk_ids)} links for {len(matches)} entities in paper {paper_id}")
+    return len(chunk_ids)
@@ -0,0 +1,245 @@
+"""
+Off-loop PDF extraction (PyMuPDF) for the PDF and Zotero importers.
+
+PyMuPDF parsing, metadata and table extraction are CPU bound and hold the
+GIL, so they run in a small shared process pool instead of the API event
+loop. Workers return compact results (non-empty page texts, a metadata dict,
+table entities) rather than document objects.
+
+Each file gets a wall-clock timeout and each worker an address-space cap on
+top of its baseline, so one pathological PDF cannot hang or bloat the API
+worker. A timed-out file takes its pool down with it; the next call starts a
+fresh pool.
+"""
+
+import asyncio
+import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import fitz  # PyMuPDF
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PDFExtraction:
+    """Compact result of one PDF extraction."""
+    pages: List[str] = field(default_factory=list)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    table_entities: list = field(default_factory=list)
+    table_relationships: list = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        return "\n\n".join(self.pages)
+
+
+# Lazily created process pool shared by all importers in this process.
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _limit_worker_memory(memory_cap_mb: int) -> None:
+    """Pool initializer: cap the worker's address space at baseline + memory_cap_mb."""
+    if memory_cap_mb <= 0:
+        return
+    try:
+        import resource
+
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        with open("/proc/self/statm") as statm:
+            baseline = int(statm.read().split()[0]) * page_size
+        limit = baseline + memory_cap_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, OSError, ValueError) as e:
+        logger.debug(f"PDF worker memory cap unavailable: {e}")
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Return the shared PDF extraction pool, creating it on first use."""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(
+            max_workers=max(1, settings.pdf_extraction_workers),
+            initializer=_limit_worker_memory,
+            initargs=(settings.pdf_extraction_memory_mb,),
+        )
+    return _process_pool
+
+
+def _discard_process_pool() -> None:
+    """Kill the current pool's workers (e.g. one is stuck on a timed-out file)."""
+    global _process_pool
+    pool, _process_pool = _process_pool, None
+    if pool is None:
+        return
+    for process in list(getattr(pool, "_processes", {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_process_pool() -> None:
+    """Shut down the shared PDF extraction pool (call on app shutdown)."""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+def parse_pdf_metadata(
+    pdf_metadata: Optional[Dict[str, Any]],
+    first_page_text: str,
+    full_text: str,
+    pdf_path: str,
+) -> Dict[str, Any]:
+    """Derive title/authors/year/abstract from PDF properties and text."""
+    metadata = {
+        "title": None,
+        "authors": [],
+        "year": None,
+        "abstract": None,
+    }
+
+    # Try to get metadata from PDF properties
+    if pdf_metadata:
+        if pdf_metadata.get("title"):
+            metadata["title"] = pdf_metadata["title"]
+        if pdf_metadata.get("author"):
+            # Authors might be comma or semicolon separated
+            authors = re.split(r'[;,]', pdf_metadata["author"])
+            metadata["authors"] = [a.strip() for a in authors if a.strip()]
+        if pdf_metadata.get("creationDate"):
+            # Try to extract year from creation date
+            year_match = re.search(r'(\d{4})', pdf_metadata["creationDate"])
+            if year_match:
+                metadata["year"] = int(year_match.group(1))
+
+    # If title not found, the first substantial line of page one is often the title
+    if not metadata["title"] and first_page_text:
+        lines = [l.strip() for l in first_page_text.split('\n') if l.strip()]
+        for line in lines[:5]:
+            if len(line) > 10 and len(line) < 200:  # Reasonable title length
+                metadata["title"] = line
+                break
+
+    # Try to extract abstract
+    abstract_match = re.search(
+        r'abstract[:\s]*(.{100,2000}?)(?=\n\n|\nintroduction|\n1\.)',
+        full_text or "",
+        re.IGNORECASE | re.DOTALL
+    )
+    if abstract_match:
+        metadata["abstract"] = abstract_match.group(1).strip()
+
+    # Use filename as fallback title
+    if not metadata["title"]:
+        metadata["title"] = Path(pdf_path).stem.replace("_", " ").replace("-", " ")
+
+    return metadata
+
+
+def extract_pdf_content(
+    pdf_path: str,
+    max_pages: Optional[int] = None,
+    include_text: bool = True,
+    include_metadata: bool = False,
+    include_tables: bool = False,
+) -> PDFExtraction:
+    """
+    Parse a PDF synchronously.
+
+    Module-level so it can be dispatched to a worker process. Pages are
+    loaded one at a time and released immediately (MEM-002).
+    """
+    result = PDFExtraction()
+
+    if include_text or include_metadata:
+        doc = fitz.open(pdf_path)
+        try:
+            page_count = len(doc) if max_pages is None else min(len(doc), max_pages)
+            first_page_text = ""
+            for i in range(page_count):
+                page = doc.load_page(i)
+                text = page.get_text()
+                if i == 0:
+                    first_page_text = text
+                if text.strip():
+                    result.pages.append(text)
+                page = None
+            if include_metadata:
+                result.metadata = parse_pdf_metadata(
+                    doc.metadata, first_page_text, result.text, pdf_path
+                )
+        finally:
+            doc.close()
+        if not include_text:
+            result.pages = []
+
+    if include_tables:
+        from graph.table_extractor import TableExtractor
+
+        result.table_entities, result.table_relationships = TableExtractor().extract_all_tables(pdf_path)
+
+    return result
+
+
+async def extract_pdf_async(
+    pdf_path: str,
+    max_pages: Optional[int] = None,
+    include_text: bool = True,
+    include_metadata: bool = False,
+    include_tables: bool = False,
+    timeout: Optional[float] = None,
+) -> PDFExtraction:
+    """
+    Run ``extract_pdf_content`` in the shared process pool.
+
+    Never raises for per-file problems: timeouts, worker crashes (including
+    the memory cap) and parse errors come back as ``PDFExtraction.error``.
+    Falls back to a thread when a process pool cannot be created here.
+    """
+    if timeout is None:
+        timeout = settings.pdf_extraction_timeout_seconds
+    args = (pdf_path, max_pages, include_text, include_metadata, include_tables)
+    loop = asyncio.get_running_loop()
+
+    for attempt in range(2):
+        try:
+            pool = _get_process_pool()
+        except (OSError, RuntimeError) as e:
+            logger.warning(f"PDF process pool unavailable, extracting in a thread: {e}")
+            try:
+                return await asyncio.to_thread(extract_pdf_content, *args)
+            except Exception as thread_error:
+                return PDFExtraction(error=str(thread_error))
+
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(pool, extract_pdf_content, *args),
+                timeout=timeout if timeout and timeout > 0 else None,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"PDF extraction timed out after {timeout}s: {pdf_path}")
+            _discard_process_pool()
+            return PDFExtraction(error="timeout")
+        except BrokenProcessPool:
+            # A worker died (memory cap, crash, or another file's timeout); retry once.
+            logger.warning(f"PDF worker pool broke while extracting {pdf_path} (attempt {attempt + 1})")
+            if _process_pool is pool:
+                _discard_process_pool()
+        except MemoryError:
+            logger.warning(f"PDF extraction exceeded the worker memory cap: {pdf_path}")
+            return PDFExtraction(error="memory limit exceeded")
+        except Exception as e:
+            logger.error(f"Error extracting PDF {pdf_path}: {e}")
+            return PDFExtraction(error=str(e))
+
+    return PDFExtraction(error="worker crashed")
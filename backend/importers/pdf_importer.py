@@ -13,28 +13,137 @@ Process:
 6. Build knowledge graph
 """
 
+import asyncio
 import logging
-import re
 import tempfile
 import os
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, List, Callable, Dict, Any
+from typing import Optional, List, Callable, Dict, Any, Awaitable, Tuple
 from uuid import uuid4
 from datetime import datetime
 
-import fitz  # PyMuPDF
-
+from config import settings
 from database import Database
 from graph.graph_store import GraphStore
 from graph.entity_extractor import EntityExtractor
 from graph.entity_resolution import EntityResolutionService
 from graph.relationship_builder import ConceptCentricRelationshipBuilder
 from graph.table_extractor import TableExtractor
+from importers.chunk_linker import link_entities_to_chunks
+from importers.pdf_extraction import extract_pdf_async, extract_pdf_content, parse_pdf_metadata
 from importers.semantic_chunker import SemanticChunker
 
 logger = logging.getLogger(__name__)
 
 
+_PAPER_REL_TYPES = {
+    "Concept": "DISCUSSES_CONCEPT",
+    "Method": "USES_METHOD",
+    "Finding": "REPORTS_FINDING",
+}
+
+_SECTION_REL_TYPES = {
+    **_PAPER_REL_TYPES,
+    "Problem": "ADDRESSES_PROBLEM",
+    "Innovation": "PROPOSES_INNOVATION",
+    "Dataset": "USES_DATASET",
+}
+
+
+def _new_paper_stats() -> Dict[str, Any]:
+    return {
+        "authors_extracted": 0,
+        "concepts_extracted": 0,
+        "methods_extracted": 0,
+        "findings_extracted": 0,
+        "chunks_created": 0,
+        "raw_entities_extracted": 0,
+        "entities_after_resolution": 0,
+        "merges_applied": 0,
+        "llm_pairs_reviewed": 0,
+        "llm_pairs_confirmed": 0,
+        "potential_false_merge_count": 0,
+        "potential_false_merge_samples": [],
+        "table_entities_extracted": 0,
+        "table_relationships_extracted": 0,
+    }
+
+
+@dataclass
+class _PaperWork:
+    """Per-file state carried through the multi-PDF import pipeline."""
+    index: int
+    filename: str
+    content: Optional[bytes]
+    path: Optional[str] = None  # Spooled upload; used instead of content when set
+    full_text: str = ""
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    sections: list = field(default_factory=list)
+    table_entities: list = field(default_factory=list)
+    table_relationships: list = field(default_factory=list)
+    paper_id: Optional[str] = None
+    section_entities: list = field(default_factory=list)
+    paper_entities: list = field(default_factory=list)
+    resolved_section_entities: list = field(default_factory=list)
+    resolved_entities: list = field(default_factory=list)
+    stats: Dict[str, Any] = field(default_factory=_new_paper_stats)
+    error: Optional[str] = None
+
+    def result(self) -> Dict[str, Any]:
+        if self.error:
+            return {"success": False, "error": self.error}
+        return {"success": True, "paper_id": self.paper_id, "stats": self.stats}
+
+
+async def run_staged_pipeline(
+    items: List[Any],
+    stages: List[Tuple[str, Callable[[Any], Awaitable[None]], int]],
+    on_complete: Callable[[Any], None],
+    queue_size: int = 4,
+) -> None:
+    """
+    Push items through ``stages`` with per-stage worker counts.
+
+    Stages are connected by bounded queues, so a fast stage blocks instead of
+    buffering unboundedly ahead of a slow one. An item whose handler raises
+    (or that already carries an ``error``) skips the remaining handlers but
+    still reaches ``on_complete`` exactly once.
+    """
+    queues: List[asyncio.Queue] = [asyncio.Queue(maxsize=queue_size) for _ in stages]
+
+    async def feed() -> None:
+        for item in items:
+            await queues[0].put(item)
+        for _ in range(stages[0][2]):
+            await queues[0].put(None)
+
+    async def worker(index: int) -> None:
+        name, handler, _ = stages[index]
+        while True:
+            item = await queues[index].get()
+            if item is None:
+                return
+            if getattr(item, "error", None) is None:
+                try:
+                    await handler(item)
+                except Exception as e:
+                    logger.error(f"Pipeline stage '{name}' failed for {getattr(item, 'filename', item)}: {e}")
+                    item.error = str(e)
+            if index + 1 < len(stages):
+                await queues[index + 1].put(item)
+            else:
+                on_complete(item)
+
+    async def run_stage(index: int) -> None:
+        await asyncio.gather(*(worker(index) for _ in range(stages[index][2])))
+        if index + 1 < len(stages):
+            for _ in range(stages[index + 1][2]):
+                await queues[index + 1].put(None)
+
+    await asyncio.gather(feed(), *(run_stage(i) for i in range(len(stages))))
+
+
 class PDFImporter:
     """Import PDF files directly without ScholaRAG project structure."""
 
@@ -93,49 +202,10 @@ class PDFImporter:
             if not chunks:
                 return 0
 
-            links_created = 0
-
-            for entity_id, entity_name in entity_ids_and_names:
-                if not entity_name or len(entity_name) < 3:
-                    continue
-
-                # Find chunks that mention this entity (case-insensitive)
-                matching_chunk_ids = []
-                name_lower = entity_name.lower()
-                for chunk in chunks:
-                    chunk_text = (chunk.get("text") or "").lower()
-                    if name_lower in chunk_text:
-                        matching_chunk_ids.append(chunk["id"])
-
-                if matching_chunk_ids:
-                    # Update entity properties with source_chunk_ids
-                    try:
-                        if hasattr(self.graph_store, '_entity_dao') and self.graph_store._entity_dao.db:
-                            await self.graph_store._entity_dao.db.execute(
-                                """
-                                UPDATE entities
-                                SET properties = jsonb_set(
-                                    COALESCE(properties, '{}'::jsonb),
-                                    '{source_chunk_ids}',
-                                    (
-                                        SELECT jsonb_agg(DISTINCT val)
-                                        FROM (
-                                            SELECT jsonb_array_elements_text(
-                                                COALESCE(properties->'source_chunk_ids', '[]'::jsonb)
-                                            ) AS val
-                                            UNION
-                                            SELECT unnest($2::text[]) AS val
-                                        ) combined
-                                    )
-                                )
-                                WHERE id = $1
-                                """,
-                                entity_id,
-                                matching_chunk_ids,
-                            )
-                            links_created += len(matching_chunk_ids)
-                    except Exception as e:
-                        logger.debug(f"Failed to update source_chunk_ids for entity {entity_id}: {e}")
+            db = self.graph_store._entity_dao.db if hasattr(self.graph_store, '_entity_dao') else None
+            links_created = await link_entities_to_chunks(
+                db, paper_id, entity_ids_and_names, chunks
+            )
 
             if links_created > 0:
                 logger.info(
@@ -182,14 +252,35 @@ class PDFImporter:
 
         Runs silently -- if table detection fails, import continues normally.
         """
-        try:
-            table_entities, table_relationships = self.table_extractor.extract_all_tables(pdf_path)
+        extraction = await extract_pdf_async(pdf_path, include_text=False, include_tables=True)
+        if extraction.error:
+            logger.warning(f"Table extraction failed (non-fatal): {extraction.error}")
+            return
+        if extraction.table_entities:
+            self._update_progress(
+                "tables", 0.88, f"Storing {len(extraction.table_entities)} table entities..."
+            )
+        await self._store_table_entities(
+            extraction.table_entities,
+            extraction.table_relationships,
+            project_id,
+            paper_id,
+            stats,
+        )
 
+    async def _store_table_entities(
+        self,
+        table_entities: list,
+        table_relationships: list,
+        project_id: str,
+        paper_id: str,
+        stats: Dict[str, Any],
+    ) -> None:
+        """Store already-extracted table entities and EVALUATED_ON relationships (non-fatal)."""
+        try:
             if not table_entities and not table_relationships:
                 return
 
-            self._update_progress("tables", 0.88, f"Storing {len(table_entities)} table entities...")
-
             # Map entity names to stored entity IDs for relationship creation
             entity_name_to_id: Dict[str, str] = {}
 
@@ -245,115 +336,67 @@ class PDFImporter:
             # Non-fatal: import continues without table data
 
     def extract_text_from_pdf(self, pdf_path: str) -> str:
-        """Extract all text from a PDF file."""
+        """Extract all text from a PDF file (synchronous; prefer ``extract_pdf_async``)."""
         try:
-            doc = fitz.open(pdf_path)
-            text_parts = []
-
-            for page_num, page in enumerate(doc):
-                text = page.get_text()
-                if text.strip():
-                    text_parts.append(text)
-
-            doc.close()
-            return "\n\n".join(text_parts)
+            return extract_pdf_content(pdf_path).text
         except Exception as e:
             logger.error(f"Error extracting text from PDF: {e}")
             return ""
 
     def extract_metadata_from_pdf(self, pdf_path: str) -> Dict[str, Any]:
-        """Extract metadata from PDF file."""
-        metadata = {
-            "title": None,
-            "authors": [],
-            "year": None,
-            "abstract": None,
-        }
-
+        """Extract metadata from PDF file (synchronous; prefer ``extract_pdf_async``)."""
         try:
-            doc = fitz.open(pdf_path)
-
-            # Try to get metadata from PDF properties
-            pdf_metadata = doc.metadata
-            if pdf_metadata:
-                if pdf_metadata.get("title"):
-                    metadata["title"] = pdf_metadata["title"]
-                if pdf_metadata.get("author"):
-                    # Authors might be comma or semicolon separated
-                    author_str = pdf_metadata["author"]
-                    authors = re.split(r'[;,]', author_str)
-                    metadata["authors"] = [a.strip() for a in authors if a.strip()]
-                if pdf_metadata.get("creationDate"):
-                    # Try to extract year from creation date
-                    date_str = pdf_metadata["creationDate"]
-                    year_match = re.search(r'(\d{4})', date_str)
-                    if year_match:
-                        metadata["year"] = int(year_match.group(1))
-
-            # If title not found, try to extract from first page
-            if not metadata["title"] and doc.page_count > 0:
-                first_page_text = doc[0].get_text()
-                lines = [l.strip() for l in first_page_text.split('\n') if l.strip()]
-
-                # First substantial line is often the title
-                for line in lines[:5]:  # Check first 5 lines
-                    if len(line) > 10 and len(line) < 200:  # Reasonable title length
-                        metadata["title"] = line
-                        break
-
-            # Try to extract abstract
-            full_text = self.extract_text_from_pdf(pdf_path)
-            abstract_match = re.search(
-                r'abstract[:\s]*(.{100,2000}?)(?=\n\n|\nintroduction|\n1\.)',
-                full_text,
-                re.IGNORECASE | re.DOTALL
-            )
-            if abstract_match:
-                metadata["abstract"] = abstract_match.group(1).strip()
-
-            doc.close()
-
+            return extract_pdf_content(pdf_path, include_text=False, include_metadata=True).metadata
         except Exception as e:
             logger.error(f"Error extracting metadata: {e}")
+            return parse_pdf_metadata(None, "", "", pdf_path)
 
-        # Use filename as fallback title
-        if not metadata["title"]:
-            metadata["title"] = Path(pdf_path).stem.replace("_", " ").replace("-", " ")
-
-        return metadata
+    async def _extract_text_and_metadata(self, pdf_path: str) -> tuple[str, Dict[str, Any]]:
+        """Extract text and metadata in one off-loop pass over the PDF."""
+        extraction = await extract_pdf_async(pdf_path, include_metadata=True)
+        if extraction.error:
+            logger.error(f"Error extracting PDF {pdf_path}: {extraction.error}")
+        metadata = extraction.metadata or parse_pdf_metadata(None, "", "", pdf_path)
+        return extraction.text, metadata
 
     async def import_single_pdf(
         self,
-        pdf_content: bytes,
-        filename: str,
+        pdf_content: Optional[bytes] = None,
+        filename: str = "",
         project_name: Optional[str] = None,
         research_question: Optional[str] = None,
         extract_concepts: bool = True,
+        pdf_path: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Import a single PDF file and create a knowledge graph.
 
         Args:
-            pdf_content: Raw PDF file bytes
+            pdf_content: Raw PDF file bytes (ignored when pdf_path is given)
             filename: Original filename
             project_name: Optional project name (defaults to filename)
             research_question: Optional research question (will be generated if not provided)
             extract_concepts: Whether to use LLM for concept extraction
+            pdf_path: Path to the PDF on disk (e.g. a spooled upload); read in
+                place and left for the caller to clean up
 
         Returns:
             Import result with project_id and statistics
         """
         self._update_progress("starting", 0.0, "Starting PDF import...")
 
-        # Save PDF to temp file
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp_file:
-            tmp_file.write(pdf_content)
-            tmp_path = tmp_file.name
+        if pdf_path:
+            tmp_path = pdf_path
+        else:
+            # Save PDF to temp file
+            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp_file:
+                tmp_file.write(pdf_content)
+                tmp_path = tmp_file.name
 
         try:
             # Extract text and metadata
             self._update_progress("extracting", 0.1, "Extracting text from PDF...")
-            full_text = self.extract_text_from_pdf(tmp_path)
+            full_text, metadata = await self._extract_text_and_metadata(tmp_path)
 
             if not full_text or len(full_text) < 100:
                 return {
@@ -362,7 +405,6 @@ class PDFImporter:
                 }
 
             self._update_progress("extracting", 0.2, "Extracting metadata...")
-            metadata = self.extract_metadata_from_pdf(tmp_path)
 
             # Generate project info
             project_id = str(uuid4())
@@ -557,15 +599,16 @@ class PDFImporter:
                 "error": str(e),
             }
         finally:
-            # Clean up temp file
-            try:
-                os.unlink(tmp_path)
-            except:
-                pass
+            # Clean up temp file (spooled uploads belong to the caller)
+            if not pdf_path:
+                try:
+                    os.unlink(tmp_path)
+                except:
+                    pass
 
     async def import_multiple_pdfs(
         self,
-        pdf_files: List[tuple],  # List of (filename, content) tuples
+        pdf_files: List[tuple],  # List of (filename, content or path) tuples
         project_name: str,
         research_question: Optional[str] = None,
         extract_concepts: bool = True,
@@ -573,8 +616,14 @@ class PDFImporter:
         """
         Import multiple PDF files into a single project.
 
+        Papers flow through a staged pipeline (parse -> extract -> resolve ->
+        persist). Each stage has its own worker count and bounded queues sit
+        between stages, so CPU-bound parsing overlaps with LLM-bound
+        extraction of earlier papers without buffering every parsed PDF.
+
         Args:
-            pdf_files: List of (filename, content) tuples
+            pdf_files: List of (filename, content) tuples; content is either
+                the raw bytes or the path of a spooled upload
             project_name: Name for the project
             research_question: Optional research question
             extract_concepts: Whether to use LLM for concept extraction
@@ -615,22 +664,13 @@ class PDFImporter:
             "table_relationships_extracted": 0,
         }
 
-        for i, (filename, content) in enumerate(pdf_files):
-            progress = 0.1 + (0.8 * (i / len(pdf_files)))
-            self._update_progress(
-                "importing",
-                progress,
-                f"Processing {i+1}/{len(pdf_files)}: {filename}"
-            )
-
-            # Import single PDF (but use existing project)
-            result = await self._import_pdf_to_project(
-                pdf_content=content,
-                filename=filename,
-                project_id=project_id,
-                extract_concepts=extract_concepts,
-            )
+        total = len(pdf_files)
+        completed = 0
 
+        def on_paper_done(work: _PaperWork) -> None:
+            nonlocal completed
+            completed += 1
+            result = work.result()
             if result["success"]:
                 total_stats["papers_imported"] += 1
                 for key in [
@@ -654,8 +694,47 @@ class PDFImporter:
                     total_stats["potential_false_merge_samples"] = total_stats[
                         "potential_false_merge_samples"
                     ][:15]
+                status = "imported"
             else:
                 total_stats["papers_failed"] += 1
+                status = f"failed ({result.get('error')})"
+
+            self._update_progress(
+                "importing",
+                0.1 + (0.8 * (completed / total)),
+                f"Processed {completed}/{total}: {work.filename} {status}",
+            )
+
+        def stage(name: str, handler: Callable[["_PaperWork"], Awaitable[None]]):
+            async def run(work: _PaperWork) -> None:
+                self._update_progress(
+                    "importing",
+                    0.1 + (0.8 * (completed / total)),
+                    f"[{name}] {work.index + 1}/{total}: {work.filename}",
+                )
+                await handler(work)
+            return run
+
+        llm_workers = max(1, settings.pdf_import_llm_concurrency)
+        await run_staged_pipeline(
+            [
+                _PaperWork(index=i, filename=name, content=None, path=str(source))
+                if isinstance(source, (str, os.PathLike))
+                else _PaperWork(index=i, filename=name, content=source)
+                for i, (name, source) in enumerate(pdf_files)
+            ],
+            [
+                ("parse", stage("parse", lambda w: self._parse_paper(w, project_id)),
+                 max(1, settings.pdf_extraction_workers)),
+                ("extract", stage("extract", lambda w: self._extract_paper_entities(w, extract_concepts)),
+                 llm_workers),
+                ("resolve", stage("resolve", self._resolve_paper_entities), llm_workers),
+                ("persist", stage("persist", lambda w: self._persist_paper(w, project_id)),
+                 max(1, settings.pdf_import_persist_concurrency)),
+            ],
+            on_complete=on_paper_done,
+            queue_size=max(1, settings.pdf_import_queue_size),
+        )
 
         # Build relationships across all papers
         if extract_concepts and self.graph_store:
@@ -681,280 +760,252 @@ class PDFImporter:
             "stats": total_stats,
         }
 
-    async def _import_pdf_to_project(
-        self,
-        pdf_content: bytes,
-        filename: str,
-        project_id: str,
-        extract_concepts: bool = True,
-    ) -> Dict[str, Any]:
-        """Import a single PDF into an existing project."""
-        # Save to temp file
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp_file:
-            tmp_file.write(pdf_content)
-            tmp_path = tmp_file.name
-
-        try:
-            full_text = self.extract_text_from_pdf(tmp_path)
-            if not full_text or len(full_text) < 100:
-                return {"success": False, "error": "Could not extract text"}
+    async def _parse_paper(self, work: "_PaperWork", project_id: str) -> None:
+        """Pipeline stage 1: parse the PDF, register the paper and store its chunks."""
+        if work.path:
+            extraction = await extract_pdf_async(
+                work.path, include_metadata=True, include_tables=bool(self.graph_store)
+            )
+        else:
+            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp_file:
+                tmp_file.write(work.content)
+                tmp_path = tmp_file.name
+            work.content = None  # Raw bytes are no longer needed
 
-            metadata = self.extract_metadata_from_pdf(tmp_path)
+            try:
+                extraction = await extract_pdf_async(
+                    tmp_path, include_metadata=True, include_tables=bool(self.graph_store)
+                )
+            finally:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+        if extraction.error:
+            logger.error(f"Error extracting PDF {work.filename}: {extraction.error}")
+        full_text = extraction.text
+        if not full_text or len(full_text) < 100:
+            work.error = "Could not extract text"
+            return
+
+        work.full_text = full_text
+        work.metadata = extraction.metadata or parse_pdf_metadata(None, "", "", work.filename)
+        work.table_entities = extraction.table_entities
+        work.table_relationships = extraction.table_relationships
+        metadata = work.metadata
+
+        # Create Paper entity using GraphStore
+        if self.graph_store:
+            work.paper_id = await self.graph_store.add_entity(
+                project_id=project_id,
+                entity_type="Paper",
+                name=metadata["title"] or work.filename,
+                properties={
+                    "title": metadata["title"],
+                    "abstract": metadata.get("abstract") or full_text[:2000],
+                    "year": metadata.get("year"),
+                    "source": "direct_upload",
+                    "filename": work.filename,
+                },
+            )
 
-            stats = {
-                "authors_extracted": 0,
-                "concepts_extracted": 0,
-                "methods_extracted": 0,
-                "findings_extracted": 0,
-                "chunks_created": 0,
-                "raw_entities_extracted": 0,
-                "entities_after_resolution": 0,
-                "merges_applied": 0,
-                "llm_pairs_reviewed": 0,
-                "llm_pairs_confirmed": 0,
-                "potential_false_merge_count": 0,
-                "potential_false_merge_samples": [],
-                "table_entities_extracted": 0,
-                "table_relationships_extracted": 0,
-            }
-            stored_entity_keys = set()
+            # Create Author entities and relationships
+            for author_name in metadata.get("authors", []):
+                author_id = await self.graph_store.add_entity(
+                    project_id=project_id,
+                    entity_type="Author",
+                    name=author_name,
+                    properties={"name": author_name},
+                )
+                work.stats["authors_extracted"] += 1
 
-            # Create Paper entity using GraphStore
-            paper_id = None
-            if self.graph_store:
-                paper_id = await self.graph_store.add_entity(
+                # Create AUTHORED_BY relationship
+                await self.graph_store.add_relationship(
                     project_id=project_id,
-                    entity_type="Paper",
-                    name=metadata["title"] or filename,
-                    properties={
-                        "title": metadata["title"],
-                        "abstract": metadata.get("abstract") or full_text[:2000],
-                        "year": metadata.get("year"),
-                        "source": "direct_upload",
-                        "filename": filename,
-                    },
+                    source_id=work.paper_id,
+                    target_id=author_id,
+                    relationship_type="AUTHORED_BY",
+                    properties={},
                 )
 
-                # Create Author entities and relationships
-                for author_name in metadata.get("authors", []):
-                    author_id = await self.graph_store.add_entity(
+        # Semantic Chunking: Create hierarchical chunks from full text
+        if work.paper_id and self.graph_store and len(full_text) > 500:
+            try:
+                chunked_result = await asyncio.to_thread(
+                    self.semantic_chunker.chunk_academic_text,
+                    text=full_text,
+                    paper_id=work.paper_id,
+                    detect_sections=True,
+                    max_chunk_tokens=400,
+                )
+                if chunked_result.get("chunks"):
+                    await self.graph_store.store_chunks(
                         project_id=project_id,
-                        entity_type="Author",
-                        name=author_name,
-                        properties={"name": author_name},
+                        paper_id=work.paper_id,
+                        chunks=chunked_result["chunks"],
                     )
-                    stats["authors_extracted"] += 1
-
-                    # Create AUTHORED_BY relationship
-                    await self.graph_store.add_relationship(
-                        project_id=project_id,
-                        source_id=paper_id,
-                        target_id=author_id,
-                        relationship_type="AUTHORED_BY",
-                        properties={},
-                    )
-
-            # Semantic Chunking: Create hierarchical chunks from full text
-            chunks_created = 0
-            if paper_id and self.graph_store and len(full_text) > 500:
-                try:
-                    # Chunk the full text with section detection
-                    chunked_result = self.semantic_chunker.chunk_academic_text(
-                        text=full_text,
-                        paper_id=paper_id,
-                        detect_sections=True,
-                        max_chunk_tokens=400,
-                    )
-                    
-                    if chunked_result.get("chunks"):
-                        # Store chunks using graph_store
-                        await self.graph_store.store_chunks(
-                            project_id=project_id,
-                            paper_id=paper_id,
-                            chunks=chunked_result["chunks"],
-                        )
-                        chunks_created = len(chunked_result["chunks"])
-                        logger.info(f"Created {chunks_created} semantic chunks for {filename}")
-                        
-                        # Use section-aware extraction if sections detected (gated by lexical_graph_v1)
-                        from config import get_settings as _get_settings
-                        _flag_settings = _get_settings()
-                        _section_entity_ids_and_names: list[tuple[str, str]] = []
-                        if chunked_result.get("sections") and extract_concepts and _flag_settings.lexical_graph_v1:
-                            try:
-                                section_entities = await self.entity_extractor.extract_from_sections(
-                                    sections=chunked_result["sections"],
-                                    paper_id=paper_id,
-                                )
-                                resolved_section_entities, section_resolution = await self.entity_resolution.resolve_entities_async(
-                                    section_entities,
-                                    use_llm_confirmation=True,
-                                )
-                                self._accumulate_resolution_stats(stats, section_resolution)
-                                # Merge section entities into main extraction
-                                if resolved_section_entities:
-                                    for entity in resolved_section_entities:
-                                        entity_type_str = str(entity.entity_type.value) if hasattr(entity.entity_type, 'value') else str(entity.entity_type)
-                                        canonical_name = self.entity_resolution.canonicalize_name(entity.name)
-                                        entity_key = f"{entity_type_str}:{canonical_name}"
-                                        if entity_key in stored_entity_keys:
-                                            stats["merges_applied"] += 1
-                                            continue
-
-                                        entity_id = await self.graph_store.add_entity(
-                                            project_id=project_id,
-                                            entity_type=entity_type_str,
-                                            name=canonical_name,
-                                            properties={
-                                                "definition": getattr(entity, 'definition', ''),
-                                                "description": getattr(entity, 'description', ''),
-                                                "source_paper_ids": [paper_id],
-                                                "confidence": getattr(entity, 'confidence', 0.7),
-                                                "source_section": getattr(entity, 'source_section', ''),
-                                            },
-                                        )
-                                        if paper_id and entity_id:
-                                            rel_type = {
-                                                "Concept": "DISCUSSES_CONCEPT",
-                                                "Method": "USES_METHOD",
-                                                "Finding": "REPORTS_FINDING",
-                                                "Problem": "ADDRESSES_PROBLEM",
-                                                "Innovation": "PROPOSES_INNOVATION",
-                                                "Dataset": "USES_DATASET",
-                                            }.get(entity_type_str, "RELATED_TO")
-                                            await self.graph_store.add_relationship(
-                                                project_id=project_id,
-                                                source_id=paper_id,
-                                                target_id=entity_id,
-                                                relationship_type=rel_type,
-                                                properties={"confidence": getattr(entity, 'confidence', 0.7)},
-                                            )
-                                        if entity_type_str == "Concept":
-                                            stats["concepts_extracted"] += 1
-                                        elif entity_type_str == "Method":
-                                            stats["methods_extracted"] += 1
-                                        elif entity_type_str == "Finding":
-                                            stats["findings_extracted"] += 1
-                                        stored_entity_keys.add(entity_key)
-                                        # Phase 7A: Track for chunk-entity linking
-                                        if entity_id:
-                                            _section_entity_ids_and_names.append((entity_id, canonical_name))
-                            except Exception as e:
-                                logger.warning(f"Section-aware extraction failed: {e}")
-                except Exception as e:
-                    logger.warning(f"Semantic chunking failed for {filename}: {e}")
-
-            stats["chunks_created"] = chunks_created
-
-            # Phase 7A: Track entity_id -> name for chunk-entity linking
-            _entity_ids_and_names: list[tuple[str, str]] = []
-
-            if extract_concepts and self.graph_store:
-                try:
-                    text_for_extraction = metadata.get("abstract") or full_text[:4000]
-                    extraction_result = await self.entity_extractor.extract_from_paper(
-                        title=metadata["title"] or filename,
-                        abstract=text_for_extraction,
-                        paper_id=paper_id,
-                    )
-
-                    # Store entities from all categories
-                    all_entities = (
-                        extraction_result.get("concepts", []) +
-                        extraction_result.get("methods", []) +
-                        extraction_result.get("findings", [])
-                    )
-                    resolved_entities, resolution = await self.entity_resolution.resolve_entities_async(
-                        all_entities,
-                        use_llm_confirmation=True,
-                    )
-                    self._accumulate_resolution_stats(stats, resolution)
-
-                    for entity in resolved_entities:
-                        # Get entity type as string
-                        entity_type_str = str(entity.entity_type.value) if hasattr(entity.entity_type, 'value') else str(entity.entity_type)
-                        canonical_name = self.entity_resolution.canonicalize_name(entity.name)
-                        entity_key = f"{entity_type_str}:{canonical_name}"
-                        if entity_key in stored_entity_keys:
-                            stats["merges_applied"] += 1
-                            continue
-
-                        entity_id = await self.graph_store.add_entity(
-                            project_id=project_id,
-                            entity_type=entity_type_str,
-                            name=canonical_name,
-                            properties={
-                                "definition": getattr(entity, 'definition', ''),
-                                "description": getattr(entity, 'description', ''),
-                                "source_paper_ids": [paper_id] if paper_id else [],
-                                "confidence": getattr(entity, 'confidence', 0.7),
-                            },
-                        )
+                    work.stats["chunks_created"] = len(chunked_result["chunks"])
+                    work.sections = chunked_result.get("sections") or []
+                    logger.info(f"Created {work.stats['chunks_created']} semantic chunks for {work.filename}")
+            except Exception as e:
+                logger.warning(f"Semantic chunking failed for {work.filename}: {e}")
+
+    async def _extract_paper_entities(self, work: "_PaperWork", extract_concepts: bool) -> None:
+        """Pipeline stage 2 (LLM): section-aware and abstract-level entity extraction."""
+        if not extract_concepts or not self.graph_store:
+            return
+
+        # Use section-aware extraction if sections detected (gated by lexical_graph_v1)
+        if work.sections and settings.lexical_graph_v1:
+            try:
+                work.section_entities = await self.entity_extractor.extract_from_sections(
+                    sections=work.sections,
+                    paper_id=work.paper_id,
+                )
+            except Exception as e:
+                logger.warning(f"Section-aware extraction failed: {e}")
 
-                        # Create relationship from Paper to this entity
-                        if paper_id and entity_id:
-                            rel_type = {
-                                "Concept": "DISCUSSES_CONCEPT",
-                                "Method": "USES_METHOD",
-                                "Finding": "REPORTS_FINDING",
-                            }.get(entity_type_str, "RELATED_TO")
+        try:
+            extraction_result = await self.entity_extractor.extract_from_paper(
+                title=work.metadata["title"] or work.filename,
+                abstract=work.metadata.get("abstract") or work.full_text[:4000],
+                paper_id=work.paper_id,
+            )
+            work.paper_entities = (
+                extraction_result.get("concepts", []) +
+                extraction_result.get("methods", []) +
+                extraction_result.get("findings", [])
+            )
+        except Exception as e:
+            logger.warning(f"Entity extraction failed for {work.filename}: {e}")
 
-                            await self.graph_store.add_relationship(
-                                project_id=project_id,
-                                source_id=paper_id,
-                                target_id=entity_id,
-                                relationship_type=rel_type,
-                                properties={"confidence": getattr(entity, 'confidence', 0.7)},
-                            )
+    async def _resolve_paper_entities(self, work: "_PaperWork") -> None:
+        """Pipeline stage 3 (LLM-confirmed): resolve extracted entities."""
+        if work.section_entities:
+            try:
+                work.resolved_section_entities, resolution = await self.entity_resolution.resolve_entities_async(
+                    work.section_entities,
+                    use_llm_confirmation=True,
+                )
+                self._accumulate_resolution_stats(work.stats, resolution)
+            except Exception as e:
+                logger.warning(f"Section-aware extraction failed: {e}")
 
-                        if entity_type_str == "Concept":
-                            stats["concepts_extracted"] += 1
-                        elif entity_type_str == "Method":
-                            stats["methods_extracted"] += 1
-                        elif entity_type_str == "Finding":
-                            stats["findings_extracted"] += 1
-                        stored_entity_keys.add(entity_key)
-                        # Phase 7A: Track for chunk-entity linking
-                        if entity_id:
-                            _entity_ids_and_names.append((entity_id, canonical_name))
+        if work.paper_entities:
+            try:
+                work.resolved_entities, resolution = await self.entity_resolution.resolve_entities_async(
+                    work.paper_entities,
+                    use_llm_confirmation=True,
+                )
+                self._accumulate_resolution_stats(work.stats, resolution)
+            except Exception as e:
+                logger.warning(f"Entity extraction failed for {work.filename}: {e}")
 
-                except Exception as e:
-                    logger.warning(f"Entity extraction failed for {filename}: {e}")
+    async def _store_resolved_entities(
+        self,
+        work: "_PaperWork",
+        project_id: str,
+        entities: list,
+        stored_entity_keys: set,
+        from_sections: bool,
+    ) -> list[tuple[str, str]]:
+        """Store resolved entities with Paper relationships; returns (entity_id, name) pairs."""
+        stats = work.stats
+        paper_id = work.paper_id
+        rel_types = _SECTION_REL_TYPES if from_sections else _PAPER_REL_TYPES
+        tracked: list[tuple[str, str]] = []
+
+        for entity in entities:
+            # Get entity type as string
+            entity_type_str = str(entity.entity_type.value) if hasattr(entity.entity_type, 'value') else str(entity.entity_type)
+            canonical_name = self.entity_resolution.canonicalize_name(entity.name)
+            entity_key = f"{entity_type_str}:{canonical_name}"
+            if entity_key in stored_entity_keys:
+                stats["merges_applied"] += 1
+                continue
+
+            properties = {
+                "definition": getattr(entity, 'definition', ''),
+                "description": getattr(entity, 'description', ''),
+                "source_paper_ids": [paper_id] if paper_id else [],
+                "confidence": getattr(entity, 'confidence', 0.7),
+            }
+            if from_sections:
+                properties["source_section"] = getattr(entity, 'source_section', '')
 
-            # Phase 7A: Link entities to source chunks for provenance
-            if paper_id and chunks_created > 0:
-                all_tracked = list(_entity_ids_and_names)
-                # Merge section-extracted entities if they were tracked
-                try:
-                    all_tracked = _section_entity_ids_and_names + all_tracked
-                except NameError:
-                    pass  # _section_entity_ids_and_names not defined (no chunking occurred)
-                if all_tracked:
-                    await self._link_entities_to_chunks(project_id, paper_id, all_tracked)
+            entity_id = await self.graph_store.add_entity(
+                project_id=project_id,
+                entity_type=entity_type_str,
+                name=canonical_name,
+                properties=properties,
+            )
 
-            # Phase 9A: Table extraction for SOTA comparison tables
-            if self.graph_store and paper_id:
-                await self._extract_tables_from_pdf(
-                    pdf_path=tmp_path,
+            # Create relationship from Paper to this entity
+            if paper_id and entity_id:
+                await self.graph_store.add_relationship(
                     project_id=project_id,
-                    paper_id=paper_id,
-                    stats=stats,
+                    source_id=paper_id,
+                    target_id=entity_id,
+                    relationship_type=rel_types.get(entity_type_str, "RELATED_TO"),
+                    properties={"confidence": getattr(entity, 'confidence', 0.7)},
                 )
 
-            if stats["raw_entities_extracted"] > 0:
-                stats["canonicalization_rate"] = (
-                    stats["merges_applied"] / stats["raw_entities_extracted"]
+            if entity_type_str == "Concept":
+                stats["concepts_extracted"] += 1
+            elif entity_type_str == "Method":
+                stats["methods_extracted"] += 1
+            elif entity_type_str == "Finding":
+                stats["findings_extracted"] += 1
+            stored_entity_keys.add(entity_key)
+            # Phase 7A: Track for chunk-entity linking
+            if entity_id:
+                tracked.append((entity_id, canonical_name))
+
+        return tracked
+
+    async def _persist_paper(self, work: "_PaperWork", project_id: str) -> None:
+        """Pipeline stage 4: store entities, link chunks and store table entities."""
+        stored_entity_keys: set = set()
+        tracked: list[tuple[str, str]] = []
+
+        if self.graph_store:
+            try:
+                tracked += await self._store_resolved_entities(
+                    work, project_id, work.resolved_section_entities, stored_entity_keys, from_sections=True
                 )
-            else:
-                stats["canonicalization_rate"] = 0.0
+            except Exception as e:
+                logger.warning(f"Section-aware extraction failed: {e}")
+            try:
+                tracked += await self._store_resolved_entities(
+                    work, project_id, work.resolved_entities, stored_entity_keys, from_sections=False
+                )
+            except Exception as e:
+                logger.warning(f"Entity extraction failed for {work.filename}: {e}")
+
+        # Phase 7A: Link entities to source chunks for provenance
+        if work.paper_id and work.stats["chunks_created"] > 0 and tracked:
+            await self._link_entities_to_chunks(project_id, work.paper_id, tracked)
+
+        # Phase 9A: Table extraction for SOTA comparison tables
+        if self.graph_store and work.paper_id:
+            await self._store_table_entities(
+                work.table_entities,
+                work.table_relationships,
+                project_id,
+                work.paper_id,
+                work.stats,
+            )
 
-            return {"success": True, "paper_id": paper_id, "stats": stats}
+        if work.stats["raw_entities_extracted"] > 0:
+            work.stats["canonicalization_rate"] = (
+                work.stats["merges_applied"] / work.stats["raw_entities_extracted"]
+            )
+        else:
+            work.stats["canonicalization_rate"] = 0.0
 
-        except Exception as e:
-            logger.error(f"Failed to import {filename}: {e}")
-            return {"success": False, "error": str(e)}
-        finally:
-            try:
-                os.unlink(tmp_path)
-            except:
-                pass
+        # Drop intermediate payloads once the paper is persisted
+        work.full_text = ""
+        work.sections = []
+        work.section_entities = work.paper_entities = []
+        work.resolved_section_entities = work.resolved_entities = []
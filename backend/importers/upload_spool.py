@@ -0,0 +1,199 @@
+"""
+Disk spool for uploaded import files (PDF and Zotero imports).
+
+Uploads are streamed in fixed-size chunks into a per-job spool directory,
+hashed incrementally (SHA-256) and checked against per-file and per-job size
+limits as they arrive, so the API process never holds a whole upload in
+memory. Importers receive file paths instead of bytes.
+
+PDFs are deduplicated by content hash across jobs: the first copy of a PDF
+becomes a blob in a shared content-addressed store and every job's spool
+entry is a hard link to it. Blobs that no job references any more are kept
+for a retention period (re-uploads on resume hit them) and then pruned.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds its per-file or per-job size limit."""
+
+    def __init__(self, limit_bytes: int, message: Optional[str] = None):
+        self.limit_bytes = limit_bytes
+        super().__init__(message or f"Upload exceeds {limit_bytes // (1024 * 1024)}MB limit")
+
+
+@dataclass
+class SpooledFile:
+    """One upload written to the spool."""
+    filename: str
+    path: str
+    size: int
+    sha256: str
+    deduplicated: bool = False
+
+
+def spool_root() -> Path:
+    """Root directory holding per-job spools and the shared blob store."""
+    root = Path(settings.upload_spool_dir or tempfile.gettempdir()) / "scholarag_uploads"
+    return root
+
+
+def safe_relative_path(filename: Optional[str]) -> Optional[Path]:
+    """Return ``filename`` as a relative path, or None if it could escape the spool."""
+    if not filename:
+        return None
+    if filename.startswith("/") or filename.startswith("..") or "../" in filename or "..\\" in filename:
+        return None
+    return Path(filename)
+
+
+class UploadSpool:
+    """
+    Per-job spool directory.
+
+    Usage:
+        spool = UploadSpool(prefix="zotero_import_", max_total_bytes=500 * MB)
+        saved = await spool.save(upload, relative_path="files/ABC/paper.pdf", dedupe=True)
+        ...
+        spool.cleanup()
+    """
+
+    def __init__(
+        self,
+        prefix: str = "upload_",
+        max_total_bytes: Optional[int] = None,
+        root: Optional[Path] = None,
+    ):
+        self.root = Path(root) if root else spool_root()
+        self.blob_dir = self.root / "blobs"
+        jobs_dir = self.root / "jobs"
+        jobs_dir.mkdir(parents=True, exist_ok=True)
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.path = Path(tempfile.mkdtemp(prefix=prefix, dir=jobs_dir))
+        self.max_total_bytes = max_total_bytes
+        self.total_bytes = 0
+
+    async def save(
+        self,
+        upload,
+        relative_path: Optional[Path] = None,
+        max_bytes: Optional[int] = None,
+        dedupe: bool = False,
+    ) -> SpooledFile:
+        """
+        Stream an ``UploadFile`` (anything with ``async read(size)``) to the spool.
+
+        Args:
+            upload: Uploaded file
+            relative_path: Target path inside the spool (defaults to the file name)
+            max_bytes: Per-file size limit
+            dedupe: Link identical content to the shared blob store
+
+        Raises:
+            UploadTooLargeError: A size limit was exceeded (partial file removed)
+        """
+        relative_path = Path(relative_path or Path(upload.filename or "upload").name)
+        target = self.path / relative_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        part = target.with_name(target.name + ".part")
+
+        digest = hashlib.sha256()
+        size = 0
+        chunk_size = max(64 * 1024, settings.upload_chunk_size)
+        try:
+            with open(part, "wb") as out:
+                while True:
+                    chunk = await upload.read(chunk_size)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if max_bytes is not None and size > max_bytes:
+                        raise UploadTooLargeError(max_bytes)
+                    if self.max_total_bytes is not None and self.total_bytes + size > self.max_total_bytes:
+                        raise UploadTooLargeError(
+                            self.max_total_bytes,
+                            f"Total file size exceeds {self.max_total_bytes // (1024 * 1024)}MB limit",
+                        )
+                    digest.update(chunk)
+                    out.write(chunk)
+        except BaseException:
+            part.unlink(missing_ok=True)
+            raise
+
+        self.total_bytes += size
+        sha256 = digest.hexdigest()
+        deduplicated = self._place(part, target, sha256) if dedupe else False
+        if not dedupe:
+            os.replace(part, target)
+
+        return SpooledFile(
+            filename=upload.filename or relative_path.name,
+            path=str(target),
+            size=size,
+            sha256=sha256,
+            deduplicated=deduplicated,
+        )
+
+    def _place(self, part: Path, target: Path, sha256: str) -> bool:
+        """Hard-link ``target`` to the blob for ``sha256``; returns True if it already existed."""
+        blob = self.blob_dir / sha256
+        try:
+            if blob.exists():
+                os.link(blob, target)
+                part.unlink(missing_ok=True)
+                os.utime(blob)  # Refresh retention
+                return True
+            os.replace(part, blob)
+            os.link(blob, target)
+            return False
+        except OSError as e:
+            # Hard links unavailable (e.g. another filesystem): keep a private copy
+            logger.debug(f"Upload dedup unavailable for {target.name}: {e}")
+            if part.exists():
+                os.replace(part, target)
+            elif not target.exists():
+                shutil.copyfile(blob, target)
+            return False
+
+    def cleanup(self) -> None:
+        """Remove this job's spool directory (shared blobs stay until pruned)."""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def prune_blob_store(retention_hours: Optional[float] = None, root: Optional[Path] = None) -> int:
+    """
+    Delete blobs no spool links to that are older than the retention period.
+
+    Returns:
+        Number of blobs removed
+    """
+    if retention_hours is None:
+        retention_hours = settings.upload_blob_retention_hours
+    blob_dir = Path(root or spool_root()) / "blobs"
+    if not blob_dir.is_dir():
+        return 0
+
+    cutoff = time.time() - retention_hours * 3600
+    removed = 0
+    for blob in blob_dir.iterdir():
+        try:
+            stat = blob.stat()
+            if stat.st_nlink <= 1 and stat.st_mtime < cutoff:
+                blob.unlink()
+                removed += 1
+        except OSError:
+            continue
+    return removed
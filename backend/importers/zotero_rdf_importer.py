@@ -33,13 +33,13 @@ from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional
 from uuid import uuid4
 
-import fitz  # PyMuPDF
-
 from database import Database
 from graph.graph_store import GraphStore
 from graph.entity_extractor import EntityExtractor, ExtractedEntity, EntityType
 from graph.entity_resolution import EntityResolutionService
 from graph.relationship_builder import ConceptCentricRelationshipBuilder
+from importers.chunk_linker import link_entities_to_chunks
+from importers.pdf_extraction import extract_pdf_async, extract_pdf_content
 from importers.semantic_chunker import SemanticChunker
 
 logger = logging.getLogger(__name__)
@@ -189,48 +189,10 @@ class ZoteroRDFImporter:
             if not chunks:
                 return 0
 
-            links_created = 0
-
-            for entity_id, entity_name in entity_ids_and_names:
-                if not entity_name or len(entity_name) < 3:
-                    continue
-
-                # Find chunks that mention this entity (case-insensitive)
-                matching_chunk_ids = []
-                name_lower = entity_name.lower()
-                for chunk in chunks:
-                    chunk_text = (chunk.get("text") or "").lower()
-                    if name_lower in chunk_text:
-                        matching_chunk_ids.append(chunk["id"])
-
-                if matching_chunk_ids:
-                    try:
-                        if self.db:
-                            await self.db.execute(
-                                """
-                                UPDATE entities
-                                SET properties = jsonb_set(
-                                    COALESCE(properties, '{}'::jsonb),
-                                    '{source_chunk_ids}',
-                                    (
-                                        SELECT jsonb_agg(DISTINCT val)
-                                        FROM (
-                                            SELECT jsonb_array_elements_text(
-                                                COALESCE(properties->'source_chunk_ids', '[]'::jsonb)
-                                            ) AS val
-                                            UNION
-                                            SELECT unnest($2::text[]) AS val
-                                        ) combined
-                                    )
-                                )
-                                WHERE id = $1
-                                """,
-                                entity_id,
-                                matching_chunk_ids,
-                            )
-                            links_created += len(matching_chunk_ids)
-                    except Exception as e:
-                        logger.debug(f"Failed to update source_chunk_ids for entity {entity_id}: {e}")
+            db = self.db
+            links_created = await link_entities_to_chunks(
+                db, paper_id, entity_ids_and_names, chunks
+            )
 
             if links_created > 0:
                 logger.info(
@@ -623,35 +585,24 @@ class ZoteroRDFImporter:
             return []
 
     def extract_text_from_pdf(self, pdf_path: str, max_pages: int = 50) -> str:
-        """Extract text from PDF using PyMuPDF.
+        """Extract text from PDF using PyMuPDF (synchronous; prefer ``extract_pdf_async``).
 
         MEM-002: Processes pages individually and caps at max_pages
         to limit memory usage for very long PDFs.
         """
         try:
-            doc = fitz.open(pdf_path)
-            text_parts = []
-            page_count = min(len(doc), max_pages)
-
-            for i in range(page_count):
-                page = doc.load_page(i)
-                text = page.get_text()
-                if text.strip():
-                    text_parts.append(text)
-                # MEM-002: Release page resources immediately
-                page = None
-
-            doc.close()
-
-            full_text = "\n\n".join(text_parts)
-            # MEM-002: Free intermediate list
-            del text_parts
-
-            return full_text
+            return extract_pdf_content(pdf_path, max_pages=max_pages).text
         except Exception as e:
             logger.error(f"Error extracting text from PDF {pdf_path}: {e}")
             return ""
 
+    async def _extract_pdf_text(self, pdf_path: str, max_pages: int = 50) -> str:
+        """Extract PDF text in the shared process pool (timeout + memory cap)."""
+        extraction = await extract_pdf_async(pdf_path, max_pages=max_pages)
+        if extraction.error:
+            logger.error(f"Error extracting text from PDF {pdf_path}: {extraction.error}")
+        return extraction.text
+
     async def _build_cooccurrence_relationships(
         self,
         project_id: str,
@@ -795,11 +746,11 @@ class ZoteroRDFImporter:
             paper_start_time = time.time()
 
             try:
-                # Get PDF text if available (PERF-014: run in thread pool)
+                # Get PDF text if available (parsed in the PDF process pool)
                 pdf_text = ""
                 if item.item_key in pdf_map:
                     pdf_path = pdf_map[item.item_key]
-                    pdf_text = await asyncio.to_thread(self.extract_text_from_pdf, pdf_path)
+                    pdf_text = await self._extract_pdf_text(pdf_path)
                     if pdf_text:
                         async with results_lock:
                             self.progress.pdfs_processed += 1
@@ -1054,7 +1005,12 @@ class ZoteroRDFImporter:
         }
 
         # PERF-014: Concurrent paper processing with semaphore
-        semaphore = asyncio.Semaphore(3)  # Max 3 concurrent papers (Groq 28 RPM)
+        # Per-provider concurrency; RPM/TPM are enforced by the shared limiter
+        from llm.rate_limiter import get_provider_limits, provider_key
+
+        semaphore = asyncio.Semaphore(
+            get_provider_limits(provider_key(self.entity_extractor.llm)).max_concurrency
+        )
         concept_cache_lock = asyncio.Lock()
         results_lock = asyncio.Lock()
         batch_size = 5
@@ -1165,7 +1121,6 @@ class ZoteroRDFImporter:
 
                 gap_detector = GapDetector()
                 min_concepts_for_gap = 10
-                max_concepts_for_gap = 1200
                 max_tfidf_features = 64
 
                 pid = project_id if isinstance(project_id, __import__('uuid').UUID) \
@@ -1179,10 +1134,8 @@ class ZoteroRDFImporter:
                     WHERE project_id = $1 AND entity_type::text = 'Concept'
                     AND embedding IS NOT NULL
                     ORDER BY id
-                    LIMIT $2
                     """,
                     pid,
-                    max_concepts_for_gap,
                 )
 
                 concepts_for_gap = []
@@ -1191,15 +1144,15 @@ class ZoteroRDFImporter:
                     if emb is not None:
                         # Handle pgvector embedding format
                         if isinstance(emb, str):
-                            emb_list = [float(x) for x in emb.strip("[]").split(",")]
+                            emb_vec = np.array(emb.strip("[]").split(","), dtype=np.float32)
                         elif isinstance(emb, (list, tuple)):
-                            emb_list = [float(x) for x in emb]
+                            emb_vec = np.asarray(emb, dtype=np.float32)
                         else:
                             continue
                         concepts_for_gap.append({
                             "id": r["id"],
                             "name": r["name"],
-                            "embedding": emb_list,
+                            "embedding": emb_vec,
                         })
 
                 # TF-IDF fallback: if no embeddings available, generate pseudo-embeddings
@@ -1215,10 +1168,8 @@ class ZoteroRDFImporter:
                         FROM entities
                         WHERE project_id = $1 AND entity_type::text = 'Concept'
                         ORDER BY id
-                        LIMIT $2
                         """,
                         pid,
-                        max_concepts_for_gap,
                     )
 
                     if len(all_concept_rows) >= min_concepts_for_gap:
@@ -1237,7 +1188,7 @@ class ZoteroRDFImporter:
 
                             concepts_for_gap = []
                             for i, r in enumerate(all_concept_rows):
-                                tfidf_vec = tfidf_matrix.getrow(i).toarray().astype(np.float32, copy=False).ravel().tolist()
+                                tfidf_vec = tfidf_matrix.getrow(i).toarray().astype(np.float32, copy=False).ravel()
                                 concepts_for_gap.append({
                                     "id": r["id"],
                                     "name": r["name"],
@@ -1245,10 +1196,9 @@ class ZoteroRDFImporter:
                                 })
                             logger.info(
                                 "TF-IDF fallback: generated %d pseudo-embeddings "
-                                "(features=%d, concept_cap=%d)",
+                                "(features=%d)",
                                 len(concepts_for_gap),
                                 feature_count,
-                                max_concepts_for_gap,
                             )
                         except Exception as tfidf_err:
                             logger.error(f"TF-IDF fallback failed: {tfidf_err}")
@@ -1485,7 +1435,7 @@ class ZoteroRDFImporter:
                 pdf_text = ""
                 if item.item_key in pdf_map:
                     pdf_path = pdf_map[item.item_key]
-                    pdf_text = self.extract_text_from_pdf(pdf_path)
+                    pdf_text = await self._extract_pdf_text(pdf_path)
                     if pdf_text:
                         results["pdfs_processed"] += 1
                 
@@ -1596,6 +1546,19 @@ class ZoteroRDFImporter:
             except Exception as e:
                 logger.warning(f"Co-occurrence relationship building failed: {e}")
 
+        # Refine only the communities the new papers touched
+        if self.db and results["relationships_created"] > 0:
+            self._update_progress("communities", 0.97, "Updating communities...")
+            try:
+                from graph.community_detector import CommunityDetector
+                update = await CommunityDetector(db_connection=self.db).update_communities_incremental(
+                    str(project_id)
+                )
+                results["community_update_mode"] = update.mode
+                results["community_nodes_changed"] = update.nodes_changed
+            except Exception as e:
+                logger.warning(f"Incremental community update failed: {e}")
+
         self._update_progress("complete", 1.0, "Sync complete!")
 
         if results["raw_entities_extracted"] > 0:
@@ -113,11 +113,23 @@ class JobStore:
     CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
     CREATE INDEX IF NOT EXISTS idx_jobs_type ON jobs(job_type);
     CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs(created_at DESC);
+
+    -- Append-only log of papers processed by an import job (resume support).
+    -- The primary key doubles as the index for the per-job resume query.
+    CREATE TABLE IF NOT EXISTS import_checkpoints (
+        job_id UUID NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+        paper_id TEXT NOT NULL,
+        paper_index INT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (job_id, paper_id)
+    );
     """
 
     def __init__(self, db_connection=None):
         self.db = db_connection
         self._memory_store: dict[str, Job] = {}
+        # Fallback checkpoint log: {job_id: {paper_id: paper_index}}
+        self._memory_checkpoints: dict[str, dict[str, Optional[int]]] = {}
 
     async def _db_execute_with_retry(self, operation_name: str, query: str, *args) -> bool:
         """
@@ -441,3 +453,75 @@ class JobStore:
                 job.updated_at = datetime.now()
                 count += 1
         return count
+
+    # =========================================================================
+    # Import checkpoints (append-only, one row per processed paper)
+    # =========================================================================
+
+    async def append_checkpoints(
+        self,
+        job_id: str,
+        entries: list[tuple[str, Optional[int]]],
+    ) -> bool:
+        """
+        Record processed papers for a job in one batched insert.
+
+        Args:
+            job_id: Import job ID
+            entries: (paper_id, paper_index) tuples; duplicates are ignored
+
+        Returns:
+            True if persisted to the database (or memory when no DB)
+        """
+        if not entries:
+            return True
+
+        if self.db:
+            for attempt in range(MAX_RETRIES):
+                try:
+                    await self.db.executemany(
+                        """
+                        INSERT INTO import_checkpoints (job_id, paper_id, paper_index)
+                        VALUES ($1, $2, $3)
+                        ON CONFLICT (job_id, paper_id) DO NOTHING
+                        """,
+                        [(job_id, paper_id, index) for paper_id, index in entries],
+                    )
+                    return True
+                except Exception as e:
+                    if attempt < MAX_RETRIES - 1:
+                        await asyncio.sleep(RETRY_DELAY_BASE * (2 ** attempt))
+                    else:
+                        logger.error(
+                            f"DB append_checkpoints failed after {MAX_RETRIES} retries: {type(e).__name__}"
+                        )
+            logger.warning(f"Job {job_id} checkpoints stored in memory only")
+
+        log = self._memory_checkpoints.setdefault(job_id, {})
+        for paper_id, index in entries:
+            log.setdefault(paper_id, index)
+        return self.db is None
+
+    async def get_processed_paper_ids(self, job_id: str) -> list[str]:
+        """Return paper IDs recorded for a job, in processing order."""
+        paper_ids: list[str] = []
+        if self.db:
+            try:
+                rows = await self.db.fetch(
+                    """
+                    SELECT paper_id FROM import_checkpoints
+                    WHERE job_id = $1
+                    ORDER BY paper_index NULLS LAST, created_at
+                    """,
+                    job_id,
+                )
+                paper_ids = [row["paper_id"] for row in rows]
+            except Exception as e:
+                logger.warning(f"Failed to load checkpoints from DB: {type(e).__name__}")
+
+        # Include entries that only reached the memory fallback
+        memory_ids = self._memory_checkpoints.get(job_id, {})
+        if memory_ids:
+            seen = set(paper_ids)
+            paper_ids.extend(pid for pid in memory_ids if pid not in seen)
+        return paper_ids
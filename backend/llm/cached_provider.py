@@ -28,8 +28,12 @@ class CachedLLMProvider(BaseLLMProvider):
     - Skips caching for generate_stream() (real-time requirement)
     - Configurable TTL per-call override
     - Cache bypass for specific calls
+    - Persistent tier lookups via the global LLMCache backend
+    - Semantic lookups for opt-in namespaces (generate_semantic)
     """
 
+    supports_semantic_cache = True
+
     def __init__(
         self,
         provider: BaseLLMProvider,
@@ -77,7 +81,7 @@ class CachedLLMProvider(BaseLLMProvider):
             cache = get_llm_cache()
 
             # Try to get from cache
-            cached_response = cache.get(
+            cached_response = await cache.aget(
                 prompt=prompt,
                 system_prompt=system_prompt,
                 model=resolved_model,
@@ -102,7 +106,7 @@ class CachedLLMProvider(BaseLLMProvider):
         # Cache the response
         if self._cache_enabled and not skip_cache:
             cache = get_llm_cache()
-            cache.set(
+            await cache.aset(
                 response=response,
                 prompt=prompt,
                 system_prompt=system_prompt,
@@ -115,6 +119,68 @@ class CachedLLMProvider(BaseLLMProvider):
 
         return response
 
+    async def generate_semantic(
+        self,
+        namespace: str,
+        semantic_text: str,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
+        use_accurate: bool = False,
+        skip_cache: bool = False,
+        cache_ttl: Optional[int] = None,
+    ) -> str:
+        """
+        Generate with a semantic cache lookup before the exact-match path.
+
+        Args:
+            namespace: Semantic cache namespace (e.g. "intent_classification")
+            semantic_text: Text compared by embedding similarity (e.g. the user query)
+        """
+        cache = get_llm_cache()
+        if not self._cache_enabled or skip_cache or not cache.semantic_enabled:
+            return await self.generate(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                model=model,
+                use_accurate=use_accurate,
+                skip_cache=skip_cache,
+                cache_ttl=cache_ttl,
+            )
+
+        params = {
+            "system_prompt": system_prompt,
+            "model": model or self._provider.get_model(use_accurate),
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+        cached_response, vector = await cache.semantic_get(namespace, semantic_text, **params)
+        if cached_response is not None:
+            return cached_response
+
+        response = await self.generate(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            model=model,
+            use_accurate=use_accurate,
+            cache_ttl=cache_ttl,
+        )
+        cache.semantic_set(
+            namespace,
+            semantic_text,
+            vector,
+            response,
+            ttl=cache_ttl or self._default_ttl,
+            **params,
+        )
+        return response
+
     async def generate_stream(
         self,
         prompt: str,
@@ -0,0 +1,116 @@
+"""
+Provider-aware LLM rate limiting.
+
+A token bucket per provider enforces both requests-per-minute and
+tokens-per-minute budgets. Limiters are shared process-wide, so concurrent
+imports draw from the same budget instead of each assuming the full quota.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Rough chars-per-token ratio used to estimate prompt size before sending.
+CHARS_PER_TOKEN = 4
+
+
+@dataclass(frozen=True)
+class ProviderLimits:
+    """Budget for one LLM provider."""
+    requests_per_minute: int
+    tokens_per_minute: int
+    max_concurrency: int
+
+
+# Conservative defaults (lowest paid/free tier of each provider).
+PROVIDER_LIMITS: Dict[str, ProviderLimits] = {
+    "groq": ProviderLimits(requests_per_minute=28, tokens_per_minute=12_000, max_concurrency=3),
+    "anthropic": ProviderLimits(requests_per_minute=50, tokens_per_minute=40_000, max_concurrency=5),
+    "openai": ProviderLimits(requests_per_minute=500, tokens_per_minute=200_000, max_concurrency=8),
+    "google": ProviderLimits(requests_per_minute=15, tokens_per_minute=1_000_000, max_concurrency=3),
+}
+DEFAULT_PROVIDER_LIMITS = ProviderLimits(requests_per_minute=30, tokens_per_minute=20_000, max_concurrency=3)
+
+
+class TokenBucketLimiter:
+    """
+    Dual token bucket (requests and tokens) refilled continuously.
+
+    ``acquire`` waits until both buckets can cover the call, then debits them.
+    Request burst is capped at ``max_concurrency``; a single call larger than
+    the whole token budget is clamped so it can still proceed.
+    """
+
+    def __init__(self, limits: ProviderLimits, clock=time.monotonic):
+        self.limits = limits
+        self._clock = clock
+        self._request_rate = limits.requests_per_minute / 60.0
+        self._token_rate = limits.tokens_per_minute / 60.0
+        self._request_capacity = float(max(1, min(limits.max_concurrency, limits.requests_per_minute)))
+        self._token_capacity = float(max(1, limits.tokens_per_minute))
+        self._requests = self._request_capacity
+        self._tokens = self._token_capacity
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = max(0.0, now - self._updated)
+        self._updated = now
+        self._requests = min(self._request_capacity, self._requests + elapsed * self._request_rate)
+        self._tokens = min(self._token_capacity, self._tokens + elapsed * self._token_rate)
+
+    def _wait_time(self, tokens: float) -> float:
+        request_wait = (1.0 - self._requests) / self._request_rate if self._requests < 1.0 else 0.0
+        token_wait = (tokens - self._tokens) / self._token_rate if self._tokens < tokens else 0.0
+        return max(request_wait, token_wait)
+
+    async def acquire(self, tokens: int = 0) -> float:
+        """Wait for capacity for one request of ``tokens`` tokens; returns seconds waited."""
+        tokens = float(min(max(0, tokens), self._token_capacity))
+        waited = 0.0
+        while True:
+            async with self._lock:
+                self._refill()
+                wait = self._wait_time(tokens)
+                if wait <= 0:
+                    self._requests -= 1.0
+                    self._tokens -= tokens
+                    return waited
+            logger.debug(f"Rate limiter: waiting {wait:.2f}s")
+            await asyncio.sleep(wait)
+            waited += wait
+
+
+_limiters: Dict[str, TokenBucketLimiter] = {}
+
+
+def provider_key(llm_provider) -> str:
+    """Normalize an LLM provider (possibly cache-wrapped) to its limits key."""
+    name = getattr(llm_provider, "name", None)
+    if not isinstance(name, str) or not name:
+        return "default"
+    return name[len("cached_"):] if name.startswith("cached_") else name
+
+
+def get_provider_limits(name: Optional[str]) -> ProviderLimits:
+    return PROVIDER_LIMITS.get(name or "", DEFAULT_PROVIDER_LIMITS)
+
+
+def get_provider_limiter(name: Optional[str]) -> TokenBucketLimiter:
+    """Return the shared limiter for a provider, creating it on first use."""
+    key = name or "default"
+    limiter = _limiters.get(key)
+    if limiter is None:
+        limiter = TokenBucketLimiter(get_provider_limits(key))
+        _limiters[key] = limiter
+    return limiter
+
+
+def estimate_tokens(text: str, completion_tokens: int = 0) -> int:
+    """Estimate prompt + completion tokens for budgeting."""
+    return len(text or "") // CHARS_PER_TOKEN + completion_tokens
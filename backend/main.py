@@ -14,7 +14,7 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from config import settings
 from database import db, init_db, close_db
-from cache import init_llm_cache, get_llm_cache
+from cache import init_llm_cache, get_llm_cache, create_cache_backend, SemanticCache
 from routers import auth, chat, graph, import_, integrations, prisma, projects, teams, system, quota
 from routers import settings as settings_router
 from auth.supabase_client import supabase_client
@@ -25,6 +25,10 @@ from middleware.quota_middleware import QuotaTrackingMiddleware
 from middleware.error_tracking import ErrorTrackingMiddleware, init_error_tracker
 from middleware.cors_error_handler import CORSErrorHandlerMiddleware
 from jobs.job_store import JobStore
+from graph.centrality_analyzer import shutdown_process_pool
+from importers.pdf_extraction import shutdown_process_pool as shutdown_pdf_process_pool
+from graph.clustering_engine import shutdown_process_pool as shutdown_clustering_process_pool
+from importers.upload_spool import prune_blob_store
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -49,12 +53,7 @@ async def periodic_cache_cleanup() -> None:
             cleaned = cache.cleanup_expired()
             if cleaned > 0:
                 logger.info(f"PERF-011: Cleaned {cleaned} expired cache entries")
-
-            # Flush quota usage buffer regularly to avoid in-memory growth.
-            quota_service = get_quota_service()
-            flushed = await quota_service.flush_buffer()
-            if flushed > 0:
-                logger.info(f"PERF-011: Flushed {flushed} quota usage buffer entries")
+            await cache.cleanup_backend()
 
             # Run heavier maintenance every hour.
             if maintenance_tick % 12 == 0:
@@ -69,6 +68,13 @@ async def periodic_cache_cleanup() -> None:
                         logger.info(f"PERF-011: Cleaned {cleaned_jobs} old JobStore records")
                 except Exception as e:
                     logger.warning(f"PERF-011: Failed periodic job cleanup: {e}")
+
+                try:
+                    pruned = await asyncio.to_thread(prune_blob_store)
+                    if pruned > 0:
+                        logger.info(f"PERF-011: Pruned {pruned} unreferenced upload blobs")
+                except Exception as e:
+                    logger.warning(f"PERF-011: Failed upload blob pruning: {e}")
         except asyncio.CancelledError:
             logger.debug("Cache cleanup task cancelled")
             break
@@ -116,13 +122,36 @@ async def lifespan(app: FastAPI):
         logger.warning(f"   ⚠️ DEFAULT_LLM_PROVIDER={settings.default_llm_provider} but using {available_provider} (key available)")
     logger.info(f"   LLM Provider: {available_provider}/{settings.default_llm_model}")
 
-    # Initialize LLM cache
+    # Initialize LLM cache (in-process LRU + optional persistent/semantic tiers)
+    semantic_cache = None
+    if settings.llm_cache_semantic_enabled:
+        async def _embed_query(text: str):
+            from llm.embedding_factory import get_embedding_factory
+            return await get_embedding_factory().get_query_embedding(text)
+
+        semantic_cache = SemanticCache(
+            embed_fn=_embed_query,
+            threshold=settings.llm_cache_semantic_threshold,
+            max_entries=settings.llm_cache_semantic_max_entries,
+        )
     init_llm_cache(
         default_ttl=settings.llm_cache_ttl,
         max_size=settings.llm_cache_max_size,
         enabled=settings.llm_cache_enabled,
+        max_bytes=settings.llm_cache_max_bytes,
+        backend=create_cache_backend(
+            settings.llm_cache_backend,
+            sqlite_path=settings.llm_cache_sqlite_path,
+            database=db,  # Used once connected below
+            redis_url=settings.redis_url,
+        ),
+        semantic=semantic_cache,
+    )
+    logger.info(
+        f"   LLM Cache: {'enabled' if settings.llm_cache_enabled else 'disabled'} "
+        f"(TTL={settings.llm_cache_ttl}s, backend={settings.llm_cache_backend}, "
+        f"semantic={settings.llm_cache_semantic_enabled})"
     )
-    logger.info(f"   LLM Cache: {'enabled' if settings.llm_cache_enabled else 'disabled'} (TTL={settings.llm_cache_ttl}s)")
 
     # Initialize rate limit store (Redis or in-memory)
     init_rate_limit_store(
@@ -134,7 +163,7 @@ async def lifespan(app: FastAPI):
     # Initialize API quota service
     # Quota service tracks per-user/project API usage for external services
     init_quota_service(db=None, cache_ttl=60)  # DB will be connected later
-    logger.info("   API Quota Service: initialized (in-memory cache)")
+    logger.info("   API Quota Service: initialized (in-memory cache, write-behind usage buffer)")
 
     # Initialize error tracking service (PERF-004)
     # Tracks HTTP errors for monitoring and alerting
@@ -209,6 +238,11 @@ async def lifespan(app: FastAPI):
         # In development: allow memory-only mode for testing
         logger.warning("   Running in memory-only mode (development only)")
 
+    # Quota usage is buffered in memory and written behind by a background flusher
+    quota_service = get_quota_service()
+    quota_service.db = db if db.is_connected else None
+    quota_service.start()
+
     # PERF-011: Start periodic cache cleanup task
     global _cleanup_task
     _cleanup_task = asyncio.create_task(periodic_cache_cleanup())
@@ -228,10 +262,10 @@ async def lifespan(app: FastAPI):
             pass
         logger.info("   PERF-011: Cache cleanup task stopped")
 
-    # Flush and clear quota service caches
+    # Stop the quota write-behind flusher, flush and clear quota service caches
     try:
         quota_service = get_quota_service()
-        flushed = await quota_service.flush_buffer()
+        flushed = await quota_service.stop()
         quota_service.clear_cache()
         logger.info(f"   PERF-011: Quota cache cleared (flushed {flushed} buffered entries)")
     except Exception as e:
@@ -250,12 +284,17 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"   PERF-011: Failed shutdown import/job cleanup: {e}")
 
-    # PERF-011: Clean up LLM cache to free memory
+    # PERF-011: Clean up LLM cache to free memory (the persistent tier is kept)
     cache = get_llm_cache()
     cache_size = len(cache._cache)
     cache.invalidate()
     logger.info(f"   PERF-011: Cleared {cache_size} LLM cache entries")
 
+    # Stop centrality, PDF extraction and gap clustering worker processes
+    shutdown_process_pool()
+    shutdown_pdf_process_pool()
+    shutdown_clustering_process_pool()
+
     await close_db()
 
 
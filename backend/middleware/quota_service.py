@@ -17,7 +17,7 @@ Usage:
     if status.is_exceeded:
         raise QuotaExceededException(status)
 
-    # Track API call after completion
+    # Track API call after completion (buffered; no DB write in the request path)
     await quota.track_usage(
         user_id=user_id,
         api_type="semantic_scholar",
@@ -25,15 +25,23 @@ Usage:
         response_status=200,
         response_time_ms=150
     )
+
+    # Background write-behind flusher (app lifespan)
+    quota.start()
+    ...
+    await quota.stop()  # final flush
 """
 
 import asyncio
 import logging
+import uuid
 from dataclasses import dataclass
 from datetime import date, datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional, Tuple
 
+import asyncpg
+
 logger = logging.getLogger(__name__)
 
 
@@ -128,6 +136,81 @@ class QuotaStatus:
         }
 
 
+# Write-behind defaults
+DEFAULT_FLUSH_INTERVAL_SECONDS = 5.0
+DEFAULT_MAX_BUFFER_KEYS = 10_000  # Hard cap on distinct buffered aggregates
+OVERFLOW_ENDPOINT = "*"  # Endpoint recorded for aggregates folded at the cap
+MAX_ROW_WRITE_ATTEMPTS = 3  # Flushes a rejected row is retried before it is dropped
+
+# (user_id, project_id, api_type, endpoint, usage_date, usage_hour)
+UsageKey = Tuple[str, Optional[str], str, str, date, int]
+
+
+@dataclass
+class UsageAggregate:
+    """Buffered usage for one (user, api_type, hour) bucket."""
+    call_count: int = 0
+    error_count: int = 0
+    total_response_time_ms: int = 0
+    timed_calls: int = 0
+    last_status: Optional[int] = None
+    last_error: Optional[str] = None
+
+    def add(
+        self,
+        call_count: int,
+        response_status: Optional[int],
+        response_time_ms: Optional[int],
+        error_message: Optional[str],
+    ) -> None:
+        self.call_count += call_count
+        if response_time_ms is not None:
+            self.total_response_time_ms += response_time_ms
+            self.timed_calls += 1
+        if response_status is not None:
+            self.last_status = response_status
+        if error_message:
+            self.error_count += 1
+            self.last_error = error_message
+
+    def merge(self, other: "UsageAggregate") -> None:
+        self.call_count += other.call_count
+        self.error_count += other.error_count
+        self.total_response_time_ms += other.total_response_time_ms
+        self.timed_calls += other.timed_calls
+        self.last_status = other.last_status if other.last_status is not None else self.last_status
+        self.last_error = other.last_error or self.last_error
+
+    @property
+    def avg_response_time_ms(self) -> Optional[int]:
+        if not self.timed_calls:
+            return None
+        return round(self.total_response_time_ms / self.timed_calls)
+
+
+def _db_user_id(user_id: str) -> Optional[str]:
+    """Map a quota user id to the api_usage.user_id UUID column (NULL if not a UUID)."""
+    try:
+        return str(uuid.UUID(str(user_id)))
+    except ValueError:
+        return None
+
+
+def _db_project_id(project_id: Optional[str]) -> Optional[str]:
+    """Map a request project id to the api_usage.project_id UUID column (NULL if not a UUID)."""
+    if not project_id:
+        return None
+    return _db_user_id(project_id)
+
+
+def _is_row_error(exc: Exception) -> bool:
+    """True if the database rejected the row itself (bad value, FK violation)."""
+    return isinstance(
+        exc,
+        (asyncpg.exceptions.DataError, asyncpg.exceptions.IntegrityConstraintViolationError),
+    )
+
+
 class QuotaExceededException(Exception):
     """Raised when API quota is exceeded."""
 
@@ -145,29 +228,65 @@ class QuotaService:
     - Checking quotas before API calls
     - Tracking usage after API calls
     - In-memory caching for fast quota checks
-    - Database persistence for durability
+    - Database persistence for durability (write-behind)
+
+    Usage is aggregated in memory per (user, api_type, hour) bucket and
+    written by a background flusher with one batched insert per interval.
+    Pending and in-flight counts stay visible to quota checks until the
+    batch commits; a failed batch is merged back into the buffer, except for
+    rows the database rejects, which are retried individually and dropped
+    after ``MAX_ROW_WRITE_ATTEMPTS`` flushes. When the
+    buffer reaches its high-water mark the flusher is woken early, and at the
+    hard cap new buckets are folded into a per-(user, api_type, hour)
+    overflow bucket so memory stays bounded without losing counts.
     """
 
-    def __init__(self, db=None, cache_ttl: int = 60):
+    def __init__(
+        self,
+        db=None,
+        cache_ttl: int = 60,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+        max_buffer_keys: int = DEFAULT_MAX_BUFFER_KEYS,
+    ):
         """
         Initialize quota service.
 
         Args:
             db: Database connection (AsyncSession or similar)
             cache_ttl: Cache time-to-live in seconds
+            flush_interval: Seconds between background buffer flushes
+            max_buffer_keys: Maximum distinct buffered usage aggregates
         """
         self.db = db
         self.cache_ttl = cache_ttl
+        self.flush_interval = flush_interval
+        self.max_buffer_keys = max(1, max_buffer_keys)
 
         # In-memory cache for quota status
         # Format: {(user_id, api_type): (QuotaStatus, timestamp)}
         self._cache: Dict[Tuple[str, str], Tuple[QuotaStatus, float]] = {}
         self._cache_lock = asyncio.Lock()
 
-        # In-memory usage buffer for batching DB writes
+        # Write-behind buffer of aggregated usage rows awaiting a flush
+        self._usage_buffer: Dict[UsageKey, UsageAggregate] = {}
+        # Unpersisted call counts (buffered + in-flight) for quota checks
         # Format: {(user_id, api_type, date): usage_count}
-        self._usage_buffer: Dict[Tuple[str, str, date], int] = {}
+        self._pending_usage: Dict[Tuple[str, str, date], int] = {}
         self._buffer_lock = asyncio.Lock()
+        self._flush_lock = asyncio.Lock()
+        self._flush_wakeup = asyncio.Event()
+        self._flusher_task: Optional[asyncio.Task] = None
+        # Failed write attempts for rows the database rejected
+        self._write_attempts: Dict[UsageKey, int] = {}
+
+        self.stats = {
+            "flushes": 0,
+            "rows_written": 0,
+            "calls_written": 0,
+            "flush_failures": 0,
+            "rows_dropped": 0,
+            "overflow_folds": 0,
+        }
 
     async def check_quota(
         self,
@@ -285,11 +404,11 @@ class QuotaService:
         api_type: str,
         usage_date: date,
     ) -> int:
-        """Get current usage from buffer and database."""
+        """Get current usage from unpersisted (buffered/in-flight) counts and database."""
         # Check buffer first
         buffer_key = (user_id, api_type, usage_date)
         async with self._buffer_lock:
-            buffered = self._usage_buffer.get(buffer_key, 0)
+            buffered = self._pending_usage.get(buffer_key, 0)
 
         # Query database if available
         db_usage = 0
@@ -372,12 +491,31 @@ class QuotaService:
         if not user_id:
             user_id = "anonymous"
 
-        today = date.today()
-        buffer_key = (user_id, api_type, today)
+        # project_id comes straight from the query string; only UUIDs reach the DB
+        project_id = _db_project_id(project_id)
 
-        # Update buffer
+        now = datetime.now()
+        usage_date = now.date()
+        key: UsageKey = (user_id, project_id, api_type, endpoint, usage_date, now.hour)
+
+        # Update buffer (no DB write in the request path)
         async with self._buffer_lock:
-            self._usage_buffer[buffer_key] = self._usage_buffer.get(buffer_key, 0) + call_count
+            aggregate = self._usage_buffer.get(key)
+            if aggregate is None:
+                if len(self._usage_buffer) >= self.max_buffer_keys:
+                    # Hard cap: fold into a coarse bucket instead of growing
+                    key = (user_id, None, api_type, OVERFLOW_ENDPOINT, usage_date, now.hour)
+                    self.stats["overflow_folds"] += 1
+                aggregate = self._usage_buffer.setdefault(key, UsageAggregate())
+            aggregate.add(call_count, response_status, response_time_ms, error_message)
+
+            pending_key = (user_id, api_type, usage_date)
+            self._pending_usage[pending_key] = self._pending_usage.get(pending_key, 0) + call_count
+            buffer_size = len(self._usage_buffer)
+
+        # Back-pressure: wake the flusher early at the high-water mark
+        if buffer_size >= self.max_buffer_keys * 0.8:
+            self._flush_wakeup.set()
 
         # Invalidate cache
         cache_key = (user_id, api_type)
@@ -385,79 +523,91 @@ class QuotaService:
             if cache_key in self._cache:
                 del self._cache[cache_key]
 
-        # Write to database (can be done async/batched for performance)
-        await self._write_usage_to_db(
-            user_id=user_id,
-            api_type=api_type,
-            endpoint=endpoint,
-            call_count=call_count,
-            project_id=project_id,
-            response_status=response_status,
-            response_time_ms=response_time_ms,
-            error_message=error_message,
-            request_ip=request_ip,
-            user_agent=user_agent,
-        )
+        logger.debug(f"Buffered API usage: {api_type}/{endpoint} for user {user_id}")
 
-    async def _write_usage_to_db(
+    async def _write_usage_batch(self, batch: Dict[UsageKey, UsageAggregate]) -> None:
+        """Write aggregated usage rows in a single batched statement."""
+        query = """
+            INSERT INTO api_usage (
+                user_id, project_id, api_type, endpoint, call_count,
+                usage_date, usage_hour, response_status, response_time_ms,
+                error_message
+            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+        """
+        rows = [
+            (
+                # Anonymous/non-UUID users are stored as NULL (user_id is a UUID column)
+                _db_user_id(user_id),
+                project_id,
+                api_type,
+                endpoint,
+                aggregate.call_count,
+                usage_date,
+                usage_hour,
+                aggregate.last_status,
+                aggregate.avg_response_time_ms,
+                aggregate.last_error,
+            )
+            for (user_id, project_id, api_type, endpoint, usage_date, usage_hour), aggregate
+            in batch.items()
+        ]
+
+        # asyncpg executemany runs the whole batch atomically
+        await self.db.executemany(query, rows)
+
+    async def _write_rows_individually(
         self,
-        user_id: str,
-        api_type: str,
-        endpoint: str,
-        call_count: int,
-        project_id: Optional[str] = None,
-        response_status: Optional[int] = None,
-        response_time_ms: Optional[int] = None,
-        error_message: Optional[str] = None,
-        request_ip: Optional[str] = None,
-        user_agent: Optional[str] = None,
-    ) -> None:
-        """Write usage record to database."""
-        if not self.db:
-            logger.debug("No database connection, skipping usage write")
-            return
-
-        try:
-            query = """
-                INSERT INTO api_usage (
-                    user_id, project_id, api_type, endpoint, call_count,
-                    usage_date, usage_hour, response_status, response_time_ms,
-                    error_message, request_ip, user_agent
-                ) VALUES (
-                    $1, $2, $3, $4, $5,
-                    CURRENT_DATE, EXTRACT(HOUR FROM NOW())::INT, $6, $7,
-                    $8, $9, $10
-                )
-            """
+        batch: Dict[UsageKey, UsageAggregate],
+        batch_error: Exception,
+    ) -> Tuple[Dict[UsageKey, UsageAggregate], Dict[UsageKey, UsageAggregate], Dict[UsageKey, UsageAggregate]]:
+        """
+        Retry a failed batch row by row so one rejected row cannot block the rest.
 
-            # Handle anonymous user (use NULL for proper DB storage)
-            db_user_id = None if user_id == "anonymous" else user_id
+        Connection-level failures are not retried here: the whole batch is
+        returned for the next flush. Rows the database rejects count an
+        attempt and are dropped once they reach ``MAX_ROW_WRITE_ATTEMPTS``.
 
-            # For asyncpg:
-            if hasattr(self.db, 'execute'):
-                await self.db.execute(
-                    query,
-                    db_user_id, project_id, api_type, endpoint, call_count,
-                    response_status, response_time_ms, error_message,
-                    request_ip, user_agent
-                )
+        Returns:
+            (written, retry, dropped) partitions of the batch
+        """
+        written: Dict[UsageKey, UsageAggregate] = {}
+        retry: Dict[UsageKey, UsageAggregate] = {}
+        dropped: Dict[UsageKey, UsageAggregate] = {}
+        if not _is_row_error(batch_error):
+            return written, dict(batch), dropped
+
+        items = list(batch.items())
+        for index, (key, aggregate) in enumerate(items):
+            try:
+                await self._write_usage_batch({key: aggregate})
+            except Exception as e:
+                if not _is_row_error(e):
+                    retry.update(items[index:])
+                    break
+                attempts = self._write_attempts.get(key, 0) + 1
+                if attempts >= MAX_ROW_WRITE_ATTEMPTS:
+                    self._write_attempts.pop(key, None)
+                    dropped[key] = aggregate
+                    logger.error(
+                        f"Dropping usage record {key} ({aggregate.call_count} calls) "
+                        f"after {attempts} failed writes: {e}"
+                    )
+                else:
+                    self._write_attempts[key] = attempts
+                    retry[key] = aggregate
             else:
-                # For SQLAlchemy async:
-                from sqlalchemy import text
-                await self.db.execute(
-                    text(query.replace('$', ':')),
-                    {
-                        "1": db_user_id, "2": project_id, "3": api_type,
-                        "4": endpoint, "5": call_count, "6": response_status,
-                        "7": response_time_ms, "8": error_message,
-                        "9": request_ip, "10": user_agent
-                    }
-                )
+                written[key] = aggregate
+        return written, retry, dropped
 
-            logger.debug(f"Tracked API usage: {api_type}/{endpoint} for user {user_id}")
-
-        except Exception as e:
-            logger.error(f"Failed to write usage to database: {e}")
+    async def _restore_batch(self, batch: Dict[UsageKey, UsageAggregate]) -> None:
+        """Merge an unwritten batch back into the buffer."""
+        async with self._buffer_lock:
+            for key, aggregate in batch.items():
+                existing = self._usage_buffer.get(key)
+                if existing is None:
+                    self._usage_buffer[key] = aggregate
+                else:
+                    existing.merge(aggregate)
 
     async def get_usage_summary(
         self,
@@ -507,22 +657,107 @@ class QuotaService:
         """
         Flush usage buffer to database.
 
-        Called periodically or on shutdown.
+        Called by the background flusher and on shutdown. Pending counts stay
+        visible to quota checks until the batch commits; on failure the batch
+        is retried row by row and unwritten rows are merged back into the
+        buffer for the next attempt (rejected rows are eventually dropped).
+
+        Without a database the buffer is the only usage record, so only
+        buckets from previous days (which no longer affect quotas) are dropped.
 
         Returns:
-            Number of records flushed
+            Number of aggregated records flushed
         """
+        if not self.db:
+            return await self._drop_stale_buckets()
+
+        async with self._flush_lock:
+            async with self._buffer_lock:
+                batch = self._usage_buffer
+                self._usage_buffer = {}
+            if not batch:
+                return 0
+
+            dropped: Dict[UsageKey, UsageAggregate] = {}
+            try:
+                await self._write_usage_batch(batch)
+                written = batch
+            except Exception as e:
+                self.stats["flush_failures"] += 1
+                logger.error(f"Failed to flush {len(batch)} usage records: {e}")
+                written, retry, dropped = await self._write_rows_individually(batch, e)
+                await self._restore_batch(retry)
+
+            # Persisted or dropped: stop counting these calls as pending
+            async with self._buffer_lock:
+                for settled in (written, dropped):
+                    for key, aggregate in settled.items():
+                        user_id, _, api_type, _, usage_date, _ = key
+                        self._write_attempts.pop(key, None)
+                        pending_key = (user_id, api_type, usage_date)
+                        remaining = self._pending_usage.get(pending_key, 0) - aggregate.call_count
+                        if remaining > 0:
+                            self._pending_usage[pending_key] = remaining
+                        else:
+                            self._pending_usage.pop(pending_key, None)
+
+            self.stats["rows_dropped"] += len(dropped)
+            if not written:
+                return 0
+            self.stats["flushes"] += 1
+            self.stats["rows_written"] += len(written)
+            self.stats["calls_written"] += sum(a.call_count for a in written.values())
+            logger.debug(f"Flushed {len(written)} aggregated usage records")
+            return len(written)
+
+    async def _drop_stale_buckets(self) -> int:
+        today = date.today()
         async with self._buffer_lock:
-            buffer_copy = self._usage_buffer.copy()
-            self._usage_buffer.clear()
+            stale = [key for key in self._usage_buffer if key[4] < today]
+            for key in stale:
+                del self._usage_buffer[key]
+            for pending_key in [k for k in self._pending_usage if k[2] < today]:
+                del self._pending_usage[pending_key]
+        return len(stale)
+
+    async def _flush_loop(self) -> None:
+        """Flush every ``flush_interval`` seconds, or earlier under back-pressure."""
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_wakeup.clear()
+            try:
+                await self.flush_buffer()
+            except Exception as e:
+                logger.warning(f"Quota usage flush failed: {e}")
 
-        count = 0
-        for (user_id, api_type, usage_date), call_count in buffer_copy.items():
-            # Note: This is a simplified flush - real implementation would batch
-            logger.debug(f"Flushing buffer: {user_id}/{api_type}/{usage_date}: {call_count}")
-            count += 1
+    def start(self) -> None:
+        """Start the background write-behind flusher (idempotent)."""
+        if self._flusher_task is None or self._flusher_task.done():
+            self._flusher_task = asyncio.create_task(self._flush_loop())
 
-        return count
+    async def stop(self) -> int:
+        """Stop the background flusher and flush whatever is still buffered."""
+        if self._flusher_task is not None:
+            self._flusher_task.cancel()
+            try:
+                await self._flusher_task
+            except asyncio.CancelledError:
+                pass
+            self._flusher_task = None
+        return await self.flush_buffer()
+
+    def get_buffer_stats(self) -> Dict[str, Any]:
+        """Write-behind buffer statistics."""
+        return {
+            **self.stats,
+            "buffered_records": len(self._usage_buffer),
+            "pending_calls": sum(self._pending_usage.values()),
+            "max_buffer_keys": self.max_buffer_keys,
+            "flusher_running": self._flusher_task is not None and not self._flusher_task.done(),
+        }
 
     def clear_cache(self) -> None:
         """Clear the quota cache."""
@@ -536,10 +771,20 @@ class QuotaService:
 _quota_service: Optional[QuotaService] = None
 
 
-def init_quota_service(db=None, cache_ttl: int = 60) -> QuotaService:
+def init_quota_service(
+    db=None,
+    cache_ttl: int = 60,
+    flush_interval: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+    max_buffer_keys: int = DEFAULT_MAX_BUFFER_KEYS,
+) -> QuotaService:
     """Initialize the global quota service."""
     global _quota_service
-    _quota_service = QuotaService(db=db, cache_ttl=cache_ttl)
+    _quota_service = QuotaService(
+        db=db,
+        cache_ttl=cache_ttl,
+        flush_interval=flush_interval,
+        max_buffer_keys=max_buffer_keys,
+    )
     logger.info("Quota service initialized")
     return _quota_service
 
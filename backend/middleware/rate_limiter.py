@@ -11,15 +11,21 @@ Supports:
 - In-memory storage (single instance, development)
 - Redis storage (multi-instance, production)
 
+Both default stores use a sliding-window counter: fixed memory per client
+key (current and previous window counts), with the previous window weighted
+by its remaining overlap. The in-memory store expires idle keys lazily with a
+timing wheel; the Redis store runs one Lua script per request.
+
 Note: 429 responses include CORS headers to prevent browser CORS errors.
 """
 
+import math
 import re
 import time
 import logging
 from abc import ABC, abstractmethod
 from collections import defaultdict
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse
@@ -145,18 +151,182 @@ class InMemoryRateLimitStore(RateLimitStore):
             logger.debug(f"Rate limiter cleanup: removed {len(keys_to_remove)} stale entries")
 
 
+class _WindowCounter:
+    """Sliding-window counter state for one client key."""
+
+    __slots__ = ("window_index", "current", "previous", "expires_at", "wheel_slot")
+
+    def __init__(self, window_index: int):
+        self.window_index = window_index
+        self.current = 0
+        self.previous = 0
+        self.expires_at = 0.0
+        self.wheel_slot = -1  # -1 = not scheduled
+
+
+def sliding_window_check(
+    counter: _WindowCounter,
+    now: float,
+    max_requests: int,
+    window_seconds: int,
+) -> Tuple[bool, int]:
+    """
+    Apply one request to a sliding-window counter (O(1)).
+
+    The estimate is ``previous * overlap + current``, where ``overlap`` is the
+    fraction of the previous fixed window still inside the sliding window.
+    Rejected requests are not counted.
+
+    Returns:
+        (is_limited, remaining_requests)
+    """
+    index = int(now // window_seconds)
+    if index != counter.window_index:
+        counter.previous = counter.current if index == counter.window_index + 1 else 0
+        counter.current = 0
+        counter.window_index = index
+
+    overlap = 1.0 - (now - index * window_seconds) / window_seconds
+    estimated = counter.previous * overlap + counter.current
+    if estimated >= max_requests:
+        return True, 0
+
+    counter.current += 1
+    return False, max(0, max_requests - math.ceil(estimated) - 1)
+
+
+class SlidingWindowRateLimitStore(RateLimitStore):
+    """
+    In-memory rate limit storage using a sliding-window counter.
+
+    Per-request cost and per-key memory are constant regardless of request
+    rate. Idle keys are expired lazily by a hashed timing wheel: each key sits
+    in the slot of its expiry tick, and only slots whose tick has passed are
+    visited, so cleanup never walks the whole key space.
+
+    Suitable for single-instance deployments.
+    """
+
+    def __init__(self, tick_seconds: float = 5.0, num_slots: int = 128, clock=time.time):
+        self._counters: Dict[str, _WindowCounter] = {}
+        self._tick_seconds = tick_seconds
+        self._num_slots = num_slots
+        self._wheel: List[Set[str]] = [set() for _ in range(num_slots)]
+        self._clock = clock
+        self._current_tick = int(clock() // tick_seconds)
+
+    def _schedule(self, client_key: str, counter: _WindowCounter) -> None:
+        # Ticks beyond one revolution land in an earlier slot and are
+        # re-scheduled when that slot is swept.
+        tick = max(int(counter.expires_at // self._tick_seconds), self._current_tick + 1)
+        slot = tick % self._num_slots
+        if slot != counter.wheel_slot:
+            if counter.wheel_slot >= 0:
+                self._wheel[counter.wheel_slot].discard(client_key)
+            self._wheel[slot].add(client_key)
+            counter.wheel_slot = slot
+
+    def _advance(self, now: float) -> int:
+        """Sweep slots whose tick has passed; returns the number of expired keys."""
+        target_tick = int(now // self._tick_seconds)
+        if target_tick <= self._current_tick:
+            return 0
+
+        steps = min(target_tick - self._current_tick, self._num_slots)
+        slots = [(self._current_tick + step) % self._num_slots for step in range(1, steps + 1)]
+        self._current_tick = target_tick
+
+        expired = 0
+        for slot in slots:
+            keys, self._wheel[slot] = self._wheel[slot], set()
+            for client_key in keys:
+                counter = self._counters.get(client_key)
+                if counter is None:
+                    continue
+                counter.wheel_slot = -1
+                if counter.expires_at <= now:
+                    del self._counters[client_key]
+                    expired += 1
+                else:
+                    self._schedule(client_key, counter)
+        return expired
+
+    async def is_rate_limited(
+        self,
+        client_key: str,
+        max_requests: int,
+        window_seconds: int
+    ) -> Tuple[bool, int]:
+        now = self._clock()
+        self._advance(now)
+
+        counter = self._counters.get(client_key)
+        if counter is None:
+            counter = _WindowCounter(int(now // window_seconds))
+            self._counters[client_key] = counter
+
+        is_limited, remaining = sliding_window_check(counter, now, max_requests, window_seconds)
+
+        # Counts are irrelevant two windows after the last request
+        counter.expires_at = now + 2 * window_seconds
+        self._schedule(client_key, counter)
+        return is_limited, remaining
+
+    async def cleanup(self) -> None:
+        expired = self._advance(self._clock())
+        if expired:
+            logger.debug(f"Rate limiter cleanup: expired {expired} idle keys")
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+
 class RedisRateLimitStore(RateLimitStore):
     """
-    Redis-based rate limit storage using sliding window log.
+    Redis-based rate limit storage using a sliding-window counter.
+
+    Each request is a single EVALSHA round trip: the Lua script rolls the
+    window, checks the weighted estimate and increments only when allowed,
+    all atomically on the server. Redis server time is used so instances
+    with skewed clocks share one view of the window.
 
     Suitable for multi-instance production deployments.
     Requires: pip install redis
     """
 
+    # KEYS[1] = counter hash; ARGV[1] = max_requests, ARGV[2] = window_seconds
+    SLIDING_WINDOW_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local index = math.floor(now / window)
+local state = redis.call('HMGET', KEYS[1], 'idx', 'cur', 'prev')
+local stored_index = tonumber(state[1]) or index
+local current = tonumber(state[2]) or 0
+local previous = tonumber(state[3]) or 0
+if index == stored_index + 1 then
+    previous = current
+    current = 0
+elseif index ~= stored_index then
+    previous = 0
+    current = 0
+end
+local estimated = previous * (1 - (now - index * window) / window) + current
+if estimated >= limit then
+    return {1, 0}
+end
+current = current + 1
+redis.call('HSET', KEYS[1], 'idx', index, 'cur', current, 'prev', previous)
+redis.call('EXPIRE', KEYS[1], window * 2)
+return {0, math.max(0, limit - math.ceil(estimated) - 1)}
+"""
+
     def __init__(self, redis_url: str, key_prefix: str = "ratelimit:"):
         self._redis_url = redis_url
         self._key_prefix = key_prefix
         self._redis = None
+        self._script = None
 
     async def _get_redis(self):
         """Lazy initialize Redis connection."""
@@ -173,47 +343,28 @@ class RedisRateLimitStore(RateLimitStore):
                 raise
         return self._redis
 
+    async def _get_script(self):
+        """Register the sliding-window script (EVALSHA with EVAL fallback)."""
+        if self._script is None:
+            redis_client = await self._get_redis()
+            self._script = redis_client.register_script(self.SLIDING_WINDOW_SCRIPT)
+        return self._script
+
     async def is_rate_limited(
         self,
         client_key: str,
         max_requests: int,
         window_seconds: int
     ) -> Tuple[bool, int]:
-        """
-        Check rate limit using Redis sorted set (sliding window log).
-
-        Uses atomic MULTI/EXEC for consistency.
-        """
-        redis_client = await self._get_redis()
-        now = time.time()
-        window_start = now - window_seconds
+        """Check rate limit with the sliding-window Lua script (one round trip)."""
         redis_key = f"{self._key_prefix}{client_key}"
 
         try:
-            # Use pipeline for atomicity
-            pipe = redis_client.pipeline()
-
-            # Remove old entries
-            pipe.zremrangebyscore(redis_key, "-inf", window_start)
-            # Count remaining entries
-            pipe.zcard(redis_key)
-            # Add new entry with current timestamp as both score and member
-            pipe.zadd(redis_key, {str(now): now})
-            # Set TTL on the key
-            pipe.expire(redis_key, window_seconds + 60)
-
-            results = await pipe.execute()
-
-            # results[1] is the count before adding new entry
-            current_count = results[1]
-            remaining = max(0, max_requests - current_count - 1)
-
-            if current_count >= max_requests:
-                # Exceeded limit - remove the entry we just added
-                await redis_client.zrem(redis_key, str(now))
-                return True, 0
-
-            return False, remaining
+            script = await self._get_script()
+            is_limited, remaining = await script(
+                keys=[redis_key], args=[max_requests, window_seconds]
+            )
+            return bool(int(is_limited)), int(remaining)
 
         except Exception as e:
             logger.error(f"Redis rate limit error: {e}")
@@ -254,9 +405,9 @@ def init_rate_limit_store(
             logger.info("Using Redis rate limit store")
         except Exception as e:
             logger.warning(f"Redis rate limit store failed, falling back to in-memory: {e}")
-            _rate_limit_store = InMemoryRateLimitStore()
+            _rate_limit_store = SlidingWindowRateLimitStore()
     else:
-        _rate_limit_store = InMemoryRateLimitStore()
+        _rate_limit_store = SlidingWindowRateLimitStore()
         logger.info("Using in-memory rate limit store")
 
     return _rate_limit_store
@@ -266,7 +417,7 @@ def get_rate_limit_store() -> RateLimitStore:
     """Get the current rate limit store instance."""
     global _rate_limit_store
     if _rate_limit_store is None:
-        _rate_limit_store = InMemoryRateLimitStore()
+        _rate_limit_store = SlidingWindowRateLimitStore()
     return _rate_limit_store
 
 
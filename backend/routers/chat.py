@@ -19,9 +19,10 @@ import json
 import logging
 import time
 import traceback
-from typing import List, Optional, Tuple
+from typing import AsyncIterator, List, Optional, Tuple
 from uuid import UUID, uuid4
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -562,6 +563,128 @@ async def get_orchestrator_for_user(user_id: Optional[str] = None) -> AgentOrche
 # API Endpoints
 # ============================================================================
 
+async def _graph_context_follow_ups(project_id: str) -> List[str]:
+    """v0.11.0: Graph-context follow-ups for when the orchestrator provides none."""
+    try:
+        top_concepts_rows = await db.fetch(
+            """
+            SELECT name FROM entities
+            WHERE project_id = $1 AND entity_type = 'Concept'
+            ORDER BY centrality_betweenness DESC NULLS LAST
+            LIMIT 5
+            """,
+            project_id
+        )
+        gap_count_val = await db.fetchval(
+            "SELECT COUNT(*) FROM structural_gaps WHERE project_id = $1",
+            project_id
+        )
+
+        if top_concepts_rows:
+            names = [r["name"] for r in top_concepts_rows]
+            suggested_follow_ups = [
+                f"How are {names[0]} and {names[min(1, len(names)-1)]} related in this research?",
+                f"What are the key findings about {names[0]}?",
+                "Which research methodologies are most commonly used?",
+            ]
+            if gap_count_val and gap_count_val > 0:
+                suggested_follow_ups.append(
+                    f"There are {gap_count_val} research gaps detected. What are the main opportunities?"
+                )
+            return suggested_follow_ups
+    except Exception as e:
+        logger.debug(f"Failed to generate graph-context follow-ups: {e}")
+    return []
+
+
+async def _build_chat_response(request: ChatRequest, conversation_id: str, result) -> ChatResponse:
+    """Convert an OrchestratorResult into the flat ChatResponse."""
+    # Convert string citations to SimpleCitation objects
+    citations = [
+        SimpleCitation(id=str(i), label=cite, entity_type="Concept")  # Concept-centric
+        for i, cite in enumerate(result.citations or [])
+    ]
+    suggested_follow_ups = result.suggested_follow_ups or []
+    if not suggested_follow_ups:
+        suggested_follow_ups = await _graph_context_follow_ups(str(request.project_id))
+
+    # Convert research gaps to response format
+    research_gaps = [
+        ResearchGapSummary(
+            description=gap.description,
+            questions=gap.questions,
+            bridge_concepts=gap.bridge_concepts,
+        )
+        for gap in (result.research_gaps or [])
+    ]
+
+    agent_trace = None
+    if request.include_trace:
+        agent_trace = {
+            "intent": result.intent,
+            "confidence": result.confidence,
+            "processing_steps": result.processing_steps,
+        }
+
+    return ChatResponse(
+        conversation_id=conversation_id,
+        answer=result.content,
+        intent=result.intent,
+        citations=citations,
+        highlighted_nodes=result.highlighted_nodes or [],
+        highlighted_edges=result.highlighted_edges or [],
+        suggested_follow_ups=suggested_follow_ups,
+        agent_trace=agent_trace,
+        retrieval_trace=result.retrieval_trace,
+        research_gaps=research_gaps,
+        hidden_connections=result.hidden_connections or [],
+    )
+
+
+async def _persist_chat_turn(
+    request: ChatRequest,
+    conversation_id: str,
+    user_id: Optional[str],
+    response: ChatResponse,
+) -> None:
+    """Store the user/assistant pair (creating the conversation if new)."""
+    assistant_message = ChatMessage(
+        role="assistant",
+        content=response.answer,
+        timestamp=datetime.now(),
+        citations=[c.label for c in response.citations],
+        highlighted_nodes=response.highlighted_nodes,
+        highlighted_edges=response.highlighted_edges,
+        suggested_follow_ups=response.suggested_follow_ups,
+    )
+    user_message = ChatMessage(role="user", content=request.message, timestamp=datetime.now())
+
+    # Check if this is a new conversation
+    existing_conv = await _db_get_conversation(conversation_id)
+    if not existing_conv:
+        await _db_create_conversation(
+            conversation_id=conversation_id,
+            project_id=str(request.project_id),
+            user_id=user_id,
+        )
+
+    # Add messages to conversation
+    await _db_add_messages(conversation_id, user_message, assistant_message)
+
+
+def _error_chat_response(request: ChatRequest, conversation_id: str) -> ChatResponse:
+    return ChatResponse(
+        conversation_id=conversation_id,
+        answer="I encountered an error processing your request. Please try again.",
+        agent_trace={"error": "Processing error occurred"} if request.include_trace else None,
+    )
+
+
+def _sse(event: str, data) -> str:
+    """Format one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
 @router.post("/query", response_model=ChatResponse)
 async def chat_query(
     request: ChatRequest,
@@ -590,16 +713,6 @@ async def chat_query(
     # Get orchestrator and process query
     orchestrator = await get_orchestrator_for_user(current_user.id if current_user else None)
 
-    answer = ""
-    intent: Optional[str] = None
-    citations: List[SimpleCitation] = []
-    highlighted_nodes: List[str] = []
-    highlighted_edges: List[str] = []
-    suggested_follow_ups: List[str] = []
-    research_gaps: List[ResearchGapSummary] = []
-    hidden_connections: List[str] = []
-    agent_trace = None
-
     try:
         result = await orchestrator.process_query(
             query=request.message,
@@ -609,108 +722,76 @@ async def chat_query(
             selected_node_ids=request.selected_node_ids,
             pinned_node_ids=request.pinned_node_ids,
         )
+        response = await _build_chat_response(request, conversation_id, result)
+    except Exception as e:
+        logger.error(f"Chat query failed: {e}")
+        response = _error_chat_response(request, conversation_id)
 
-        answer = result.content
-        intent = result.intent
-        # Convert string citations to SimpleCitation objects
-        citations = [
-            SimpleCitation(id=str(i), label=cite, entity_type="Concept")  # Concept-centric
-            for i, cite in enumerate(result.citations or [])
-        ]
-        highlighted_nodes = result.highlighted_nodes or []
-        highlighted_edges = result.highlighted_edges or []
-        suggested_follow_ups = result.suggested_follow_ups or []
-
-        # v0.11.0: Generate graph-context follow-ups if orchestrator didn't provide any
-        if not suggested_follow_ups:
-            try:
-                top_concepts_rows = await db.fetch(
-                    """
-                    SELECT name FROM entities
-                    WHERE project_id = $1 AND entity_type = 'Concept'
-                    ORDER BY centrality_betweenness DESC NULLS LAST
-                    LIMIT 5
-                    """,
-                    str(request.project_id)
-                )
-                gap_count_val = await db.fetchval(
-                    "SELECT COUNT(*) FROM structural_gaps WHERE project_id = $1",
-                    str(request.project_id)
-                )
+    # Store conversation in database (with fallback to memory)
+    await _persist_chat_turn(request, conversation_id, user_id, response)
 
-                if top_concepts_rows:
-                    names = [r["name"] for r in top_concepts_rows]
-                    suggested_follow_ups = [
-                        f"How are {names[0]} and {names[min(1, len(names)-1)]} related in this research?",
-                        f"What are the key findings about {names[0]}?",
-                        "Which research methodologies are most commonly used?",
-                    ]
-                    if gap_count_val and gap_count_val > 0:
-                        suggested_follow_ups.append(
-                            f"There are {gap_count_val} research gaps detected. What are the main opportunities?"
-                        )
-            except Exception as e:
-                logger.debug(f"Failed to generate graph-context follow-ups: {e}")
-
-        # Convert research gaps to response format
-        research_gaps = [
-            ResearchGapSummary(
-                description=gap.description,
-                questions=gap.questions,
-                bridge_concepts=gap.bridge_concepts,
-            )
-            for gap in (result.research_gaps or [])
-        ]
-        hidden_connections = result.hidden_connections or []
+    return response
 
-        if request.include_trace:
-            agent_trace = {
-                "intent": result.intent,
-                "confidence": result.confidence,
-                "processing_steps": result.processing_steps,
-            }
 
-    except Exception as e:
-        logger.error(f"Chat query failed: {e}")
-        answer = "I encountered an error processing your request. Please try again."
-        agent_trace = {"error": "Processing error occurred"} if request.include_trace else None
+@router.post("/query/stream")
+async def chat_query_stream(
+    request: ChatRequest,
+    current_user: Optional[User] = Depends(require_auth_if_configured),
+):
+    """
+    Streaming variant of ``/query`` (Server-Sent Events).
 
-    # Store conversation in database (with fallback to memory)
-    assistant_message = ChatMessage(
-        role="assistant",
-        content=answer,
-        timestamp=datetime.now(),
-        citations=[c.label for c in citations],
-        highlighted_nodes=highlighted_nodes,
-        highlighted_edges=highlighted_edges,
-        suggested_follow_ups=suggested_follow_ups,
-    )
-    user_message = ChatMessage(role="user", content=request.message, timestamp=datetime.now())
+    Events:
+    - ``stage``: a pipeline stage finished (``step``, ``result``, ``latency_ms``)
+    - ``retrieval_trace``: retrieval trace, as soon as reasoning is done
+    - ``token``: ``{"text": ...}`` chunk of the answer
+    - ``done``: the complete ChatResponse; its ``answer`` is authoritative
+    - ``error``: processing failed; a ``done`` event still follows
 
-    # Check if this is a new conversation
-    existing_conv = await _db_get_conversation(conversation_id)
-    if not existing_conv:
-        await _db_create_conversation(
-            conversation_id=conversation_id,
-            project_id=str(request.project_id),
-            user_id=user_id,
-        )
+    The turn is persisted exactly like ``/query`` once the answer is complete.
+    """
+    # Verify project access before the stream starts so errors are plain HTTP errors
+    await verify_project_access(request.project_id, current_user, "query")
 
-    # Add messages to conversation
-    await _db_add_messages(conversation_id, user_message, assistant_message)
+    conversation_id = request.conversation_id or str(uuid4())
+    user_id = current_user.id if current_user else None
+    orchestrator = await get_orchestrator_for_user(user_id)
 
-    return ChatResponse(
-        conversation_id=conversation_id,
-        answer=answer,
-        intent=intent,
-        citations=citations,
-        highlighted_nodes=highlighted_nodes,
-        highlighted_edges=highlighted_edges,
-        suggested_follow_ups=suggested_follow_ups,
-        agent_trace=agent_trace,
-        retrieval_trace=getattr(result, 'retrieval_trace', None) if result else None,
-        research_gaps=research_gaps,
-        hidden_connections=hidden_connections,
+    async def event_stream() -> AsyncIterator[str]:
+        response = None
+        try:
+            async for event in orchestrator.process_query_stream(
+                query=request.message,
+                project_id=str(request.project_id),
+                conversation_id=conversation_id,
+                include_processing_steps=request.include_trace,
+                selected_node_ids=request.selected_node_ids,
+                pinned_node_ids=request.pinned_node_ids,
+            ):
+                kind, data = event["event"], event["data"]
+                if kind == "token":
+                    yield _sse("token", {"text": data})
+                elif kind == "result":
+                    response = await _build_chat_response(request, conversation_id, data)
+                else:
+                    yield _sse(kind, data)
+        except Exception as e:
+            logger.error(f"Streaming chat query failed: {e}")
+            yield _sse("error", {"message": "Processing error occurred"})
+            response = _error_chat_response(request, conversation_id)
+
+        if response is None:
+            response = _error_chat_response(request, conversation_id)
+        await _persist_chat_turn(request, conversation_id, user_id, response)
+        yield _sse("done", response.model_dump(mode="json"))
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Don't let proxies buffer the stream
+        },
     )
 
 
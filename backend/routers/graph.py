@@ -24,9 +24,11 @@ from datetime import datetime
 import io
 
 from database import db
+from graph.community_detector import COMMUNITY_ROWS_SQL
 from graph.entity_resolution import EntityResolutionService
 from graph.graph_store import GraphStore
-from graph.metrics_cache import metrics_cache
+from graph.graph_snapshot import ANALYTIC_ENTITY_TYPES, graph_snapshot_service
+from graph.metrics_cache import metrics_cache, graph_metrics_store
 from auth.dependencies import require_auth_if_configured
 from auth.models import User
 from routers.projects import check_project_access
@@ -1356,313 +1358,87 @@ async def get_gap_analysis(
         )
 
 
-@router.post("/gaps/{project_id}/refresh", response_model=GapAnalysisResponse)
+class GapRefreshJobResponse(BaseModel):
+    job_id: str
+    project_id: str
+    status: str
+    message: str
+
+
+class GapRefreshStatusResponse(BaseModel):
+    job_id: str
+    status: str
+    progress: float
+    message: str
+    error: Optional[str] = None
+    result: Optional[dict] = None
+
+
+@router.post("/gaps/{project_id}/refresh", response_model=GapRefreshJobResponse, status_code=202)
 async def refresh_gap_analysis(
     project_id: UUID,
     database=Depends(get_db),
     current_user: Optional[User] = Depends(require_auth_if_configured),
 ):
-    """Re-run gap detection on the project's concept graph. Requires auth in production."""
+    """
+    Start re-running gap detection on the project's concept graph as a background job.
+
+    Poll GET /gaps/{project_id}/refresh/{job_id}; the previous analysis is served
+    until the new one is committed. Requires auth in production.
+    """
     # Verify project access
     await verify_project_access(database, project_id, current_user, "modify")
 
-    try:
-        from graph.gap_detector import GapDetector
-        import numpy as np
-        from sklearn.feature_extraction.text import TfidfVectorizer
-
-        min_concepts_for_embedding_path = 10
-        max_concepts_for_gap = 1200
-        max_tfidf_features = 64
-
-        # Get all concepts with embeddings
-        # Try to get concepts with embeddings first
-        concept_rows = await database.fetch(
-            """
-            SELECT id, name, properties, embedding
-            FROM entities
-            WHERE project_id = $1
-            AND entity_type IN ('Concept', 'Method', 'Finding', 'Problem', 'Dataset', 'Metric', 'Innovation', 'Limitation')
-            AND embedding IS NOT NULL
-            ORDER BY id
-            LIMIT $2
-            """,
-            str(project_id),
-            max_concepts_for_gap,
-        )
-
-        use_tfidf_fallback = False
-
-        if not concept_rows or len(concept_rows) < min_concepts_for_embedding_path:
-            # TF-IDF fallback: fetch all concepts regardless of embedding status
-            logger.warning(
-                "Only %d concepts with embeddings (need %d+). Using TF-IDF fallback.",
-                len(concept_rows) if concept_rows else 0,
-                min_concepts_for_embedding_path,
-            )
-            all_concept_rows = await database.fetch(
-                """
-                SELECT id, name, properties
-                FROM entities
-                WHERE project_id = $1
-                AND entity_type IN ('Concept', 'Method', 'Finding', 'Problem', 'Dataset', 'Metric', 'Innovation', 'Limitation')
-                ORDER BY id
-                LIMIT $2
-                """,
-                str(project_id),
-                max_concepts_for_gap,
-            )
-
-            if not all_concept_rows or len(all_concept_rows) < 3:
-                return GapAnalysisResponse(
-                    clusters=[],
-                    gaps=[],
-                    centrality_metrics=[],
-                    total_concepts=len(all_concept_rows) if all_concept_rows else 0,
-                    total_relationships=0,
-                    no_gaps_reason="insufficient_concepts",
-                )
-
-            # Generate TF-IDF pseudo-embeddings
-            try:
-                concept_names = [(r["name"] or "").strip() for r in all_concept_rows]
-                concept_names = [n if n else f"concept_{all_concept_rows[i]['id'][:8]}" for i, n in enumerate(concept_names)]
-                vectorizer = TfidfVectorizer(
-                    max_features=max_tfidf_features,
-                    stop_words='english',
-                    dtype=np.float32,
-                )
-                tfidf_matrix = vectorizer.fit_transform(concept_names)
-                feature_count = tfidf_matrix.shape[1]
-                if feature_count == 0:
-                    raise ValueError("TF-IDF produced zero features")
-
-                # Create synthetic concept_rows with TF-IDF embeddings
-                concept_rows = []
-                for i, row in enumerate(all_concept_rows):
-                    concept_rows.append({
-                        "id": row["id"],
-                        "name": row["name"],
-                        "properties": row["properties"],
-                        "embedding": tfidf_matrix.getrow(i).toarray().astype(np.float32, copy=False).ravel().tolist(),
-                    })
-                use_tfidf_fallback = True
-                logger.info(
-                    "TF-IDF fallback: generated pseudo-embeddings for %d concepts "
-                    "(features=%d, concept_cap=%d)",
-                    len(concept_rows),
-                    feature_count,
-                    max_concepts_for_gap,
-                )
-            except Exception as e:
-                logger.error(f"TF-IDF fallback failed: {e}")
-                return GapAnalysisResponse(
-                    clusters=[],
-                    gaps=[],
-                    centrality_metrics=[],
-                    total_concepts=len(all_concept_rows),
-                    total_relationships=0,
-                    no_gaps_reason="embedding_unavailable",
-                )
-
-        # Get relationships
-        relationship_rows = await database.fetch(
-            """
-            SELECT id, source_id, target_id, relationship_type::text, properties
-            FROM relationships
-            WHERE project_id = $1
-            """,
-            str(project_id),
-        )
-
-        # Convert to format expected by GapDetector
-        concepts = []
-        for row in concept_rows:
-            if use_tfidf_fallback:
-                embedding = row["embedding"]  # Already a list from TF-IDF
-            else:
-                embedding = _parse_embedding(row["embedding"]) or None
-            concepts.append({
-                "id": str(row["id"]),
-                "name": row["name"],
-                "embedding": embedding,
-                "properties": row.get("properties") or {},
-            })
-
-        relationships = [
-            {
-                "id": str(row["id"]),
-                "source_id": str(row["source_id"]),  # Fixed: was "source", gap_detector expects "source_id"
-                "target_id": str(row["target_id"]),  # Fixed: was "target", gap_detector expects "target_id"
-                "type": row["relationship_type"],
-                "properties": row["properties"] or {},
-            }
-            for row in relationship_rows
-        ]
+    from graph.gap_refresh import start_gap_refresh
+    from routers.import_ import get_job_store
 
-        # Run gap detection
-        from llm.user_provider import create_llm_provider_for_user
+    try:
+        job_store = await get_job_store()
         user_id = str(current_user.id) if current_user else None
-        llm = await create_llm_provider_for_user(user_id)
-        gap_detector = GapDetector(llm_provider=llm)
-        analysis = await gap_detector.analyze_graph(concepts, relationships)
-
-        # Store results
-        # Clear old data
-        await database.execute(
-            "DELETE FROM concept_clusters WHERE project_id = $1",
-            str(project_id),
-        )
-        await database.execute(
-            "DELETE FROM structural_gaps WHERE project_id = $1",
-            str(project_id),
-        )
-
-        # Store clusters
-        # Build concept id -> name mapping for lookup
-        concept_name_map = {c["id"]: c["name"] for c in concepts}
-
-        # Build edge pairs for intra-cluster density computation
-        edge_pairs = [
-            (rel["source_id"], rel["target_id"])
-            for rel in relationships
-        ]
-
-        for cluster in analysis.get("clusters", []):
-            # Get concept names from the mapping
-            cluster_concept_names = [
-                concept_name_map.get(cid, "")
-                for cid in cluster.concept_ids
-            ]
-
-            # Generate meaningful label using LLM (with fallback)
-            if cluster.keywords:
-                label = await gap_detector._generate_cluster_label(cluster.keywords)
-            elif cluster_concept_names:
-                filtered_names = [n for n in cluster_concept_names if n and n.strip()]
-                label = ", ".join(filtered_names[:3]) if filtered_names else f"Cluster {cluster.id + 1}"
-            else:
-                label = f"Cluster {cluster.id + 1}"
-
-            # Compute intra-cluster edge density
-            cluster_node_ids = set(str(cid) for cid in cluster.concept_ids)
-            n = len(cluster_node_ids)
-            if n >= 2:
-                intra_edges = sum(
-                    1 for src, tgt in edge_pairs
-                    if src in cluster_node_ids and tgt in cluster_node_ids
-                )
-                max_edges = n * (n - 1) / 2
-                density = intra_edges / max_edges if max_edges > 0 else 0.0
-            else:
-                density = 0.0
-
-            logger.info(f"Storing cluster {cluster.id}: {len(cluster.concept_ids)} concepts, name={cluster.name}, label={label}, density={density:.3f}")
-
-            await database.execute(
-                """
-                INSERT INTO concept_clusters (project_id, cluster_id, concepts, concept_names, size, density, label)
-                VALUES ($1, $2, $3, $4, $5, $6, $7)
-                """,
-                str(project_id),
-                cluster.id,  # ConceptCluster uses 'id' not 'cluster_id'
-                [str(cid) for cid in cluster.concept_ids],  # Convert to strings for TEXT[]
-                cluster_concept_names,  # Derived from concept_ids
-                len(cluster.concept_ids),  # Computed size
-                density,  # Actual intra-cluster edge density
-                label,
-            )
-
-        # Store gaps
-        for gap in analysis.get("gaps", []):
-            # Convert potential_edges to JSON-serializable format
-            potential_edges_json = [
-                {
-                    "source_id": pe.source_id,
-                    "target_id": pe.target_id,
-                    "similarity": pe.similarity,
-                    "gap_id": pe.gap_id,
-                    "source_name": pe.source_name,
-                    "target_name": pe.target_name,
-                }
-                for pe in (gap.potential_edges or [])
-            ]
-
-            # Convert concept IDs to sets for efficient lookup
-            concept_ids_a = set(str(cid) for cid in gap.concept_a_ids)
-            concept_ids_b = set(str(cid) for cid in gap.concept_b_ids)
-            a_names = [c["name"] for c in concepts if c["id"] in concept_ids_a and c["name"]][:5]
-            b_names = [c["name"] for c in concepts if c["id"] in concept_ids_b and c["name"]][:5]
-
-            # Fallback 1: cluster keywords
-            if not a_names:
-                cl_a = next((cl for cl in analysis.get("clusters", [])
-                             if cl.id == gap.cluster_a_id), None)
-                if cl_a and cl_a.keywords:
-                    a_names = [k for k in cl_a.keywords[:3] if k and k.strip()]
-            if not b_names:
-                cl_b = next((cl for cl in analysis.get("clusters", [])
-                             if cl.id == gap.cluster_b_id), None)
-                if cl_b and cl_b.keywords:
-                    b_names = [k for k in cl_b.keywords[:3] if k and k.strip()]
-
-            # Fallback 2: default label
-            if not a_names:
-                a_names = [f"Cluster {gap.cluster_a_id + 1}"]
-            if not b_names:
-                b_names = [f"Cluster {gap.cluster_b_id + 1}"]
-
-            await database.execute(
-                """
-                INSERT INTO structural_gaps (
-                    project_id, cluster_a_id, cluster_b_id,
-                    cluster_a_concepts, cluster_b_concepts,
-                    cluster_a_names, cluster_b_names,
-                    gap_strength, bridge_candidates, research_questions, potential_edges
-                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
-                """,
-                str(project_id),
-                gap.cluster_a_id,
-                gap.cluster_b_id,
-                list(concept_ids_a),
-                list(concept_ids_b),
-                a_names,
-                b_names,
-                gap.gap_strength,
-                # v0.29.0: Store concept names instead of UUIDs for bridge_candidates
-                [c["name"] for c in concepts
-                 if c["id"] in set(gap.bridge_concepts or []) and c["name"]]
-                or gap.bridge_concepts or [],
-                gap.suggested_research_questions or [],
-                json.dumps(potential_edges_json),
-            )
+        job_id = await start_gap_refresh(job_store, str(project_id), database, user_id)
+        job = await job_store.get_job(job_id)
+    except Exception as e:
+        logger.error(f"Failed to start gap analysis refresh: {e}")
+        raise HTTPException(status_code=500, detail="Failed to refresh gap analysis. Please try again later.")
 
-        # Update entity centrality
-        for metric in analysis.get("centrality_metrics", []):
-            await database.execute(
-                """
-                UPDATE entities
-                SET properties = properties || $1::jsonb
-                WHERE id = $2
-                """,
-                {
-                    "centrality_degree": metric.degree_centrality,
-                    "centrality_betweenness": metric.betweenness_centrality,
-                    "centrality_pagerank": metric.pagerank,
-                },
-                metric.concept_id,
-            )
+    return GapRefreshJobResponse(
+        job_id=job_id,
+        project_id=str(project_id),
+        status=job.status.value if job else "pending",
+        message=job.message if job and job.message else "Gap analysis refresh started",
+    )
 
-        await metrics_cache.invalidate_project(str(project_id))
 
-        # Return updated analysis
-        return await get_gap_analysis(project_id, database, current_user)
+@router.get("/gaps/{project_id}/refresh/{job_id}", response_model=GapRefreshStatusResponse)
+async def get_gap_refresh_status(
+    project_id: UUID,
+    job_id: UUID,
+    database=Depends(get_db),
+    current_user: Optional[User] = Depends(require_auth_if_configured),
+):
+    """Get the status of a gap analysis refresh job."""
+    await verify_project_access(database, project_id, current_user, "access")
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to refresh gap analysis: {e}")
-        raise HTTPException(status_code=500, detail="Failed to refresh gap analysis. Please try again later.")
+    from graph.gap_refresh import GAP_REFRESH_JOB_TYPE
+    from routers.import_ import get_job_store
+
+    job_store = await get_job_store()
+    job = await job_store.get_job(str(job_id))
+    if (
+        not job
+        or job.job_type != GAP_REFRESH_JOB_TYPE
+        or job.metadata.get("project_id") != str(project_id)
+    ):
+        raise HTTPException(status_code=404, detail="Gap refresh job not found")
+
+    return GapRefreshStatusResponse(
+        job_id=job.id,
+        status=job.status.value,
+        progress=job.progress,
+        message=job.message,
+        error=job.error,
+        result=job.result,
+    )
 
 
 @router.get("/gaps/detail/{gap_id}", response_model=StructuralGapResponse)
@@ -2811,6 +2587,9 @@ class CentralityResponse(BaseModel):
     metric: str
     centrality: dict  # node_id -> score
     top_bridges: List[tuple]  # [(node_id, score), ...]
+    approximate: bool = False  # True when betweenness used k-source sampling
+    sample_size: Optional[int] = None
+    error_bound: Optional[float] = None  # Max abs. error at 95% confidence
 
 
 class SliceRequest(BaseModel):
@@ -2852,73 +2631,37 @@ async def get_centrality(
 
     Supported metrics: betweenness, degree, eigenvector
 
+    Computation runs in a worker process. Above
+    ``centrality_approx_node_threshold`` nodes, betweenness is estimated from
+    sampled source nodes and the response carries the sampling error bound.
+
     Returns:
         - centrality: dict mapping node_id to centrality score
         - top_bridges: list of (node_id, score) for top 10 nodes
+        - approximate / sample_size / error_bound: betweenness sampling info
     """
-    cache_key = f"centrality:{project_id}:{metric}"
-    cached = await metrics_cache.get(cache_key)
+    cache_key = f"centrality:{metric}"
+    graph_version, cached = await graph_metrics_store.get(database, project_id, cache_key)
     if cached is not None:
         return cached
 
     try:
         from graph.centrality_analyzer import centrality_analyzer
 
-        # Get nodes
-        node_rows = await database.fetch(
-            """
-            SELECT id, entity_type, name, properties
-            FROM entities
-            WHERE project_id = $1
-            """,
-            str(project_id),
-        )
+        snapshot = await graph_snapshot_service.get(database, project_id)
 
-        # Get edges
-        edge_rows = await database.fetch(
-            """
-            SELECT id, source_id, target_id, relationship_type::text, properties,
-                   COALESCE((properties->>'weight')::float, 1.0) as weight
-            FROM relationships
-            WHERE project_id = $1
-            """,
-            str(project_id),
-        )
-
-        if not node_rows:
+        if snapshot.num_nodes == 0:
             payload = {
                 "metric": metric,
                 "centrality": {},
                 "top_bridges": [],
             }
-            await metrics_cache.set(cache_key, payload)
+            await graph_metrics_store.set(database, project_id, cache_key, graph_version, payload)
             return payload
 
-        # Convert to format expected by analyzer
-        nodes = [
-            {
-                "id": str(row["id"]),
-                "entity_type": row["entity_type"],
-                "name": row["name"],
-                "properties": _parse_json_field(row["properties"]),
-            }
-            for row in node_rows
-        ]
-
-        edges = [
-            {
-                "id": str(row["id"]),
-                "source": str(row["source_id"]),
-                "target": str(row["target_id"]),
-                "relationship_type": row["relationship_type"],
-                "weight": _safe_float(row["weight"], 1.0),
-            }
-            for row in edge_rows
-        ]
-
-        # Compute centrality
-        metrics = centrality_analyzer.compute_all_centrality(
-            nodes, edges, cache_key=str(project_id)
+        # Compute centrality (off the event loop)
+        metrics = await centrality_analyzer.compute_snapshot_centrality_async(
+            snapshot, cache_key=f"{project_id}@{graph_version}"
         )
 
         # Get requested metric
@@ -2936,7 +2679,7 @@ async def get_centrality(
 
         # Add names to top bridges
         top_bridges_with_names = [
-            (node_id, score, centrality_analyzer.get_node_name(node_id, nodes))
+            (node_id, score, snapshot.name_of(node_id))
             for node_id, score in top_bridges
         ]
 
@@ -2944,8 +2687,11 @@ async def get_centrality(
             "metric": metric,
             "centrality": centrality,
             "top_bridges": top_bridges_with_names,
+            "approximate": metrics.approximate,
+            "sample_size": metrics.sample_size,
+            "error_bound": metrics.error_bound,
         }
-        await metrics_cache.set(cache_key, payload)
+        await graph_metrics_store.set(database, project_id, cache_key, graph_version, payload)
         return payload
 
     except HTTPException:
@@ -3019,34 +2765,17 @@ async def get_diversity_metrics(
     # Verify project access
     await verify_project_access(database, project_id, current_user, "access")
 
-    cache_key = f"diversity:{project_id}"
-    cached = await metrics_cache.get(cache_key)
+    cache_key = "diversity"
+    graph_version, cached = await graph_metrics_store.get(database, project_id, cache_key)
     if cached is not None:
         return cached
 
     try:
+        import numpy as np
         from graph.diversity_analyzer import diversity_analyzer
 
-        # Get nodes
-        node_rows = await database.fetch(
-            """
-            SELECT id, entity_type::text, name, properties
-            FROM entities
-            WHERE project_id = $1
-            AND entity_type IN ('Concept', 'Method', 'Finding', 'Problem', 'Dataset', 'Metric', 'Innovation', 'Limitation')
-            """,
-            str(project_id),
-        )
-
-        # Get edges
-        edge_rows = await database.fetch(
-            """
-            SELECT id, source_id, target_id
-            FROM relationships
-            WHERE project_id = $1
-            """,
-            str(project_id),
-        )
+        snapshot = await graph_snapshot_service.get(database, project_id)
+        node_mask = snapshot.node_mask(include_types=ANALYTIC_ENTITY_TYPES)
 
         # Get clusters
         cluster_rows = await database.fetch(
@@ -3059,7 +2788,7 @@ async def get_diversity_metrics(
             str(project_id),
         )
 
-        if not node_rows:
+        if not node_mask.any():
             payload = {
                 "shannon_entropy": 0.0,
                 "normalized_entropy": 0.0,
@@ -3070,14 +2799,14 @@ async def get_diversity_metrics(
                 "dominant_cluster_ratio": 1.0,
                 "gini_coefficient": 1.0,
             }
-            await metrics_cache.set(cache_key, payload)
+            await graph_metrics_store.set(database, project_id, cache_key, graph_version, payload)
             return payload
 
-        # Convert to format for analyzer
-        nodes = [{"id": str(row["id"])} for row in node_rows]
+        # Convert to format for analyzer (all project edges, as before)
+        nodes = [{"id": snapshot.node_ids[i]} for i in np.flatnonzero(node_mask)]
         edges = [
-            {"source": str(row["source_id"]), "target": str(row["target_id"])}
-            for row in edge_rows
+            {"source": source, "target": target}
+            for source, target, _, _ in snapshot.iter_edges()
         ]
         clusters = [
             {"node_ids": [str(c) for c in (row["concepts"] or [])], "size": row["size"]}
@@ -3101,7 +2830,7 @@ async def get_diversity_metrics(
             "dominant_cluster_ratio": metrics.dominant_cluster_ratio,
             "gini_coefficient": metrics.gini_coefficient,
         }
-        await metrics_cache.set(cache_key, payload)
+        await graph_metrics_store.set(database, project_id, cache_key, graph_version, payload)
         return payload
 
     except HTTPException:
@@ -3133,35 +2862,17 @@ async def get_graph_metrics(
     # Verify project access
     await verify_project_access(database, project_id, current_user, "access")
 
-    cache_key = f"graph_metrics:{project_id}"
-    cached = await metrics_cache.get(cache_key)
+    cache_key = "graph_metrics"
+    graph_version, cached = await graph_metrics_store.get(database, project_id, cache_key)
     if cached is not None:
         return cached
 
     try:
+        import numpy as np
         from graph.centrality_analyzer import centrality_analyzer, ClusterResult
 
-        # Get nodes
-        node_rows = await database.fetch(
-            """
-            SELECT id, entity_type::text, name, properties
-            FROM entities
-            WHERE project_id = $1
-            AND entity_type IN ('Concept', 'Method', 'Finding', 'Problem', 'Dataset', 'Metric', 'Innovation', 'Limitation')
-            """,
-            str(project_id),
-        )
-
-        # Get edges
-        edge_rows = await database.fetch(
-            """
-            SELECT id, source_id, target_id, relationship_type::text,
-                   COALESCE((properties->>'weight')::float, 1.0) as weight
-            FROM relationships
-            WHERE project_id = $1
-            """,
-            str(project_id),
-        )
+        snapshot = await graph_snapshot_service.get(database, project_id)
+        node_mask = snapshot.node_mask(include_types=ANALYTIC_ENTITY_TYPES)
 
         # Get clusters
         cluster_rows = await database.fetch(
@@ -3174,7 +2885,7 @@ async def get_graph_metrics(
             str(project_id),
         )
 
-        if not node_rows:
+        if not node_mask.any():
             payload = {
                 "modularity": 0.0,
                 "diversity": 0.0,
@@ -3185,29 +2896,17 @@ async def get_graph_metrics(
                 "edge_count": 0,
                 "cluster_count": 0,
             }
-            await metrics_cache.set(cache_key, payload)
+            await graph_metrics_store.set(database, project_id, cache_key, graph_version, payload)
             return payload
 
-        # Convert to format expected by analyzer
-        nodes = [
-            {
-                "id": str(row["id"]),
-                "entity_type": row["entity_type"],
-                "name": row["name"],
-                "properties": _parse_json_field(row["properties"]),
-            }
-            for row in node_rows
-        ]
-
+        # Convert to format expected by analyzer. Edges outside the concept
+        # subgraph are ignored by the analyzer but still count in edge_count.
+        nodes = snapshot.node_dicts(node_mask)
         edges = [
-            {
-                "id": str(row["id"]),
-                "source": str(row["source_id"]),
-                "target": str(row["target_id"]),
-                "weight": _safe_float(row["weight"], 1.0),
-            }
-            for row in edge_rows
+            {"source": source, "target": target, "weight": weight}
+            for source, target, _, weight in snapshot.iter_edges(snapshot.edge_mask(node_mask))
         ]
+        edge_count = snapshot.num_edges
 
         # Convert clusters to ClusterResult objects
         clusters = [
@@ -3222,25 +2921,13 @@ async def get_graph_metrics(
         ]
 
         # v0.19.0: Auto-compute clusters if none exist (fixes 0% InsightHUD metrics)
-        if not clusters and len(node_rows) >= 4:
+        if not clusters and len(nodes) >= 4:
             try:
-                import numpy as np
+                embedded = np.flatnonzero(node_mask & snapshot.has_embedding)
 
-                embedding_rows = await database.fetch(
-                    """
-                    SELECT id, name, embedding
-                    FROM entities
-                    WHERE project_id = $1
-                    AND entity_type IN ('Concept', 'Method', 'Finding', 'Problem', 'Dataset', 'Metric', 'Innovation', 'Limitation')
-                    AND embedding IS NOT NULL
-                    ORDER BY id
-                    """,
-                    str(project_id),
-                )
-
-                if embedding_rows and len(embedding_rows) >= 4:
-                    metric_nodes = [{"id": str(r["id"]), "name": r["name"]} for r in embedding_rows]
-                    embeddings = np.array([_parse_embedding(r["embedding"]) for r in embedding_rows], dtype=np.float32)
+                if len(embedded) >= 4:
+                    metric_nodes = [{"id": snapshot.node_ids[i], "name": snapshot.names[i]} for i in embedded]
+                    embeddings = snapshot.embedding_matrix(embedded)
                     optimal_k = centrality_analyzer.compute_optimal_k(embeddings, min_k=2, max_k=min(10, len(metric_nodes) - 1))
                     auto_clusters = centrality_analyzer.cluster_nodes(metric_nodes, embeddings, n_clusters=optimal_k)
                     clusters = [
@@ -3261,24 +2948,10 @@ async def get_graph_metrics(
 
         # v0.30.0: Extended cluster quality metrics
         # Build embeddings map for cluster quality
-        embeddings_map = {}
-        try:
-            emb_rows = await database.fetch(
-                """
-                SELECT id, embedding
-                FROM entities
-                WHERE project_id = $1
-                AND embedding IS NOT NULL
-                AND entity_type IN ('Concept', 'Method', 'Finding', 'Problem', 'Dataset', 'Metric', 'Innovation', 'Limitation')
-                """,
-                str(project_id),
-            )
-            for row in emb_rows:
-                emb = _parse_embedding(row["embedding"])
-                if emb:
-                    embeddings_map[str(row["id"])] = emb
-        except Exception as e:
-            logger.warning(f"Failed to load embeddings for cluster quality: {e}")
+        embeddings_map = {
+            snapshot.node_ids[i]: snapshot.embedding_of(i)
+            for i in np.flatnonzero(node_mask & snapshot.has_embedding)
+        }
 
         cluster_quality = centrality_analyzer.compute_cluster_quality(
             nodes, edges, clusters, embeddings_map=embeddings_map if embeddings_map else None
@@ -3378,7 +3051,7 @@ async def get_graph_metrics(
             "avg_clustering": metrics["avg_clustering"],
             "num_components": metrics["num_components"],
             "node_count": len(nodes),
-            "edge_count": len(edges),
+            "edge_count": edge_count,
             "cluster_count": len(clusters),
             "modularity_raw": cluster_quality.get("modularity_raw", None),
             "modularity_interpretation": cluster_quality.get("modularity_interpretation", None),
@@ -3391,7 +3064,7 @@ async def get_graph_metrics(
             "cross_paper_ratio": entity_quality.get("cross_paper_ratio", None),
             "type_distribution": entity_quality.get("type_distribution", None),
         }
-        await metrics_cache.set(cache_key, payload)
+        await graph_metrics_store.set(database, project_id, cache_key, graph_version, payload)
         return payload
 
     except HTTPException:
@@ -3477,12 +3150,14 @@ async def slice_graph(
             for row in edge_rows
         ]
 
-        # Perform slicing
+        # Perform slicing (centrality computed off the event loop)
+        metrics = await centrality_analyzer.compute_all_centrality_async(nodes, edges)
         filtered_nodes, filtered_edges, removed_ids, top_bridges = centrality_analyzer.slice_graph(
             nodes,
             edges,
             request.remove_top_n,
             request.metric,
+            metrics=metrics,
         )
 
         # Format response
@@ -3566,8 +3241,9 @@ async def recompute_clusters(
         )
 
         # Clear prior derived cluster materialization to keep analysis outputs aligned.
+        # Community-detection rows share the table and are kept.
         await database.execute(
-            "DELETE FROM concept_clusters WHERE project_id = $1",
+            f"DELETE FROM concept_clusters WHERE project_id = $1 AND NOT COALESCE({COMMUNITY_ROWS_SQL}, false)",
             str(project_id),
         )
 
@@ -3697,8 +3373,9 @@ async def recompute_clusters(
                     size,
                     density,
                     label,
-                    color
-                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+                    color,
+                    detection_method
+                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, 'kmeans')
                 """,
                 str(project_id),
                 cluster.cluster_id,
@@ -3732,6 +3409,7 @@ async def recompute_clusters(
             cluster_entry["density"] = cluster_density_by_id.get(cluster_id, 0.0)
 
         await metrics_cache.invalidate_project(str(project_id))
+        await graph_metrics_store.invalidate_project(database, project_id)
 
         return {
             "clusters": formatted_clusters,
@@ -4976,14 +4654,22 @@ async def rebuild_embeddings_and_relationships(
 
         # Step 2: Build relationships
         logger.info(f"Building relationships for project {project_id}")
-        relationships_created = await graph_store.build_concept_relationships(str(project_id))
-        logger.info(f"Created {relationships_created} relationships")
+        relationship_stats = await graph_store.build_concept_relationships_with_stats(str(project_id))
+        relationships_created = relationship_stats["inserted"]
+        relationships_updated = relationship_stats["updated"]
+        logger.info(
+            f"Created {relationships_created} relationships, updated {relationships_updated}"
+        )
 
         return {
             "status": "success",
-            "message": f"Rebuilt {embeddings_created} embeddings and {relationships_created} relationships",
+            "message": (
+                f"Rebuilt {embeddings_created} embeddings and "
+                f"{relationships_created + relationships_updated} relationships"
+            ),
             "embeddings_created": embeddings_created,
             "relationships_created": relationships_created,
+            "relationships_updated": relationships_updated,
         }
 
     except HTTPException:
@@ -5082,6 +4768,96 @@ async def get_communities(
 # Phase 2A: Research Landscape Summary Endpoint
 # ============================================
 
+async def _get_project_summary_details(database, project_id: UUID) -> dict:
+    """Project name, paper count and temporal info for the summary (cached 300s)."""
+    cache_key = f"project_summary_details:{project_id}"
+    cached = await metrics_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    project_row = await database.fetchrow(
+        "SELECT name FROM projects WHERE id = $1",
+        str(project_id),
+    )
+    project_name = project_row["name"] if project_row else "Unknown Project"
+
+    paper_count = await database.fetchval(
+        "SELECT COUNT(*) FROM paper_metadata WHERE project_id = $1",
+        str(project_id),
+    ) or 0
+
+    # ---- Temporal info ----
+    min_year = None
+    max_year = None
+    emerging_concepts: list = []
+    try:
+        temporal_row = await database.fetchrow(
+            """
+            SELECT
+                MIN(first_seen_year) as min_year,
+                MAX(COALESCE(last_seen_year, first_seen_year)) as max_year
+            FROM entities
+            WHERE project_id = $1
+            """,
+            str(project_id),
+        )
+        min_year = temporal_row["min_year"] if temporal_row else None
+        max_year = temporal_row["max_year"] if temporal_row else None
+
+        if max_year is not None:
+            emerging_threshold = max_year - 2
+            emerging_rows = await database.fetch(
+                """
+                SELECT name
+                FROM entities
+                WHERE project_id = $1
+                AND first_seen_year >= $2
+                AND entity_type IN ('Concept', 'Method', 'Finding', 'Problem', 'Dataset', 'Metric', 'Innovation', 'Limitation')
+                ORDER BY CASE WHEN properties->>'centrality_pagerank' ~ '^-?\\d+(\\.\\d+)?$'
+                              THEN (properties->>'centrality_pagerank')::float
+                              ELSE 0 END DESC NULLS LAST
+                LIMIT 10
+                """,
+                str(project_id),
+                emerging_threshold,
+            )
+            emerging_concepts = [r["name"] for r in emerging_rows]
+    except Exception as temporal_err:
+        logger.warning(f"Temporal info computation failed for summary {project_id}: {temporal_err}")
+
+    details = {
+        "project_name": project_name,
+        "total_papers": paper_count,
+        "temporal_info": {
+            "min_year": min_year,
+            "max_year": max_year,
+            "emerging_concepts": emerging_concepts,
+        },
+    }
+    await metrics_cache.set(cache_key, details, ttl=300)
+    return details
+
+
+def _merge_project_summary(graph_summary: dict, details: dict) -> dict:
+    """Combine the version-keyed graph summary with the project details."""
+    overview = graph_summary["overview"]
+    return {
+        "project_id": graph_summary["project_id"],
+        "project_name": details["project_name"],
+        "overview": {
+            "total_papers": details["total_papers"],
+            "total_entities": overview["total_entities"],
+            "total_relationships": overview["total_relationships"],
+            "entity_type_distribution": overview["entity_type_distribution"],
+        },
+        "quality_metrics": graph_summary["quality_metrics"],
+        "top_entities": graph_summary["top_entities"],
+        "communities": graph_summary["communities"],
+        "structural_gaps": graph_summary["structural_gaps"],
+        "temporal_info": details["temporal_info"],
+    }
+
+
 @router.get("/summary/{project_id}")
 async def get_project_summary(
     project_id: UUID,
@@ -5096,25 +4872,17 @@ async def get_project_summary(
     """
     await verify_project_access(database, project_id, current_user, "access")
 
-    cache_key = f"project_summary:{project_id}"
-    cached = await metrics_cache.get(cache_key)
-    if cached is not None:
-        return cached
+    cache_key = "project_summary"
+    graph_version, cached = await graph_metrics_store.get(database, project_id, cache_key)
 
     try:
-        # ---- Project name ----
-        project_row = await database.fetchrow(
-            "SELECT name FROM projects WHERE id = $1",
-            str(project_id),
-        )
-        project_name = project_row["name"] if project_row else "Unknown Project"
-
-        # ---- Overview: paper / entity / relationship counts ----
-        paper_count = await database.fetchval(
-            "SELECT COUNT(*) FROM paper_metadata WHERE project_id = $1",
-            str(project_id),
-        ) or 0
+        # Project name, paper count and years are not covered by the graph
+        # version, so they are cached separately (short TTL, cleared on update)
+        details = await _get_project_summary_details(database, project_id)
+        if cached is not None:
+            return _merge_project_summary(cached, details)
 
+        # ---- Overview: entity / relationship counts ----
         entity_count = await database.fetchval(
             """
             SELECT COUNT(*) FROM entities
@@ -5329,51 +5097,10 @@ async def get_project_summary(
             for r in gap_rows
         ]
 
-        # ---- Temporal info ----
-        min_year = None
-        max_year = None
-        emerging_concepts: list = []
-        try:
-            temporal_row = await database.fetchrow(
-                """
-                SELECT
-                    MIN(first_seen_year) as min_year,
-                    MAX(COALESCE(last_seen_year, first_seen_year)) as max_year
-                FROM entities
-                WHERE project_id = $1
-                """,
-                str(project_id),
-            )
-            min_year = temporal_row["min_year"] if temporal_row else None
-            max_year = temporal_row["max_year"] if temporal_row else None
-
-            if max_year is not None:
-                emerging_threshold = max_year - 2
-                emerging_rows = await database.fetch(
-                    """
-                    SELECT name
-                    FROM entities
-                    WHERE project_id = $1
-                    AND first_seen_year >= $2
-                    AND entity_type IN ('Concept', 'Method', 'Finding', 'Problem', 'Dataset', 'Metric', 'Innovation', 'Limitation')
-                    ORDER BY CASE WHEN properties->>'centrality_pagerank' ~ '^-?\\d+(\\.\\d+)?$'
-                                  THEN (properties->>'centrality_pagerank')::float
-                                  ELSE 0 END DESC NULLS LAST
-                    LIMIT 10
-                    """,
-                    str(project_id),
-                    emerging_threshold,
-                )
-                emerging_concepts = [r["name"] for r in emerging_rows]
-        except Exception as temporal_err:
-            logger.warning(f"Temporal info computation failed for summary {project_id}: {temporal_err}")
-
         # ---- Assemble response ----
         payload = {
             "project_id": str(project_id),
-            "project_name": project_name,
             "overview": {
-                "total_papers": paper_count,
                 "total_entities": entity_count,
                 "total_relationships": relationship_count,
                 "entity_type_distribution": entity_type_distribution,
@@ -5382,15 +5109,12 @@ async def get_project_summary(
             "top_entities": top_entities,
             "communities": communities,
             "structural_gaps": structural_gaps,
-            "temporal_info": {
-                "min_year": min_year,
-                "max_year": max_year,
-                "emerging_concepts": emerging_concepts,
-            },
         }
 
-        await metrics_cache.set(cache_key, payload, ttl=300)
-        return payload
+        await graph_metrics_store.set(
+            database, project_id, cache_key, graph_version, payload, fallback_ttl=300
+        )
+        return _merge_project_summary(payload, details)
 
     except HTTPException:
         raise
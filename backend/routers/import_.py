@@ -27,7 +27,8 @@ from enum import Enum
 from database import db
 from graph.graph_store import GraphStore
 from importers.scholarag_importer import ScholarAGImporter
-from jobs import JobStore, JobStatus
+from importers.upload_spool import UploadSpool, UploadTooLargeError, safe_relative_path
+from jobs import Job, JobStore, JobStatus
 from config import settings
 from auth.dependencies import require_auth_if_configured
 from auth.models import User
@@ -435,11 +436,19 @@ class _CoalescedJobProgressUpdater:
 
 
 class _QueuedCheckpointSaver:
-    """Serialize checkpoint writes via a single worker task."""
+    """
+    Batch checkpoint writes via a single worker task.
+
+    Papers queued while a write is in flight go out together in the next
+    batch: one insert into the checkpoint log plus one small summary update.
+    """
+
+    MAX_BATCH_SIZE = 100
 
-    def __init__(self, job_store: JobStore, job_id: str):
+    def __init__(self, job_store: JobStore, job_id: str, processed_count: int = 0):
         self.job_store = job_store
         self.job_id = job_id
+        self.processed_count = processed_count
         self._pending: Deque[dict[str, Any]] = deque()
         self._worker: Optional[asyncio.Task] = None
         self._closed = False
@@ -476,18 +485,19 @@ class _QueuedCheckpointSaver:
         self._worker = loop.create_task(self._drain())
         self._worker.add_done_callback(self._handle_worker_done)
 
+    async def _write_next_batch(self) -> None:
+        batch = [self._pending.popleft() for _ in range(min(len(self._pending), self.MAX_BATCH_SIZE))]
+        self.processed_count += len(batch)
+        await save_checkpoint_batch(
+            job_store=self.job_store,
+            job_id=self.job_id,
+            entries=batch,
+            processed_count=self.processed_count,
+        )
+
     async def _drain(self) -> None:
         while self._pending and not self._closed:
-            payload = self._pending.popleft()
-            await save_checkpoint(
-                job_store=self.job_store,
-                job_id=self.job_id,
-                paper_id=payload["paper_id"],
-                index=payload["index"],
-                total_papers=payload["total_papers"],
-                project_id=payload["project_id"],
-                stage=payload["stage"],
-            )
+            await self._write_next_batch()
 
     def _handle_worker_done(self, task: asyncio.Task) -> None:
         try:
@@ -510,16 +520,7 @@ class _QueuedCheckpointSaver:
                 logger.warning(f"[Zotero Import {self.job_id}] Failed to flush checkpoints: {e}")
 
         while self._pending:
-            payload = self._pending.popleft()
-            await save_checkpoint(
-                job_store=self.job_store,
-                job_id=self.job_id,
-                paper_id=payload["paper_id"],
-                index=payload["index"],
-                total_papers=payload["total_papers"],
-                project_id=payload["project_id"],
-                stage=payload["stage"],
-            )
+            await self._write_next_batch()
 
         self._closed = True
 
@@ -528,67 +529,70 @@ class _QueuedCheckpointSaver:
 # BUG-028 Extension: Checkpoint Support for Resume Functionality
 # =============================================================================
 
-async def save_checkpoint(
+async def save_checkpoint_batch(
     job_store: JobStore,
     job_id: str,
-    paper_id: str,
-    index: int,
-    total_papers: int,
-    project_id: str,
-    stage: str = "importing",
+    entries: List[dict],
+    processed_count: Optional[int] = None,
 ) -> None:
     """
-    Save checkpoint after each paper is processed.
+    Save checkpoints for a batch of processed papers.
 
-    BUG-028 Extension: Enables resume from interruption point.
+    Paper IDs are appended to the job's checkpoint log (one batched insert);
+    job metadata only keeps a fixed-size summary for the UI and resume.
 
     Args:
         job_store: JobStore instance
         job_id: Current job ID
-        paper_id: ID of the paper just processed
-        index: Current index in the papers list
-        total_papers: Total number of papers to process
-        project_id: ID of the project being imported into
-        stage: Current import stage
+        entries: Dicts with paper_id, index, total_papers, project_id, stage
+            (in processing order; the last one describes the current state)
+        processed_count: Total papers processed so far, including earlier runs
     """
+    if not entries:
+        return
+
     try:
-        job = await job_store.get_job(job_id)
-        if not job:
-            logger.warning(f"[Checkpoint {job_id}] Job not found, skipping checkpoint")
-            return
+        await job_store.append_checkpoints(
+            job_id, [(entry["paper_id"], entry["index"]) for entry in entries]
+        )
 
-        # Get existing checkpoint or create new one
-        checkpoint = job.metadata.get("checkpoint", {
-            "processed_paper_ids": [],
-            "total_papers": total_papers,
-            "last_processed_index": 0,
-            "project_id": None,
-            "stage": "starting",
-            "updated_at": None,
-        })
-
-        # Update checkpoint
-        if paper_id not in checkpoint.get("processed_paper_ids", []):
-            checkpoint.setdefault("processed_paper_ids", []).append(paper_id)
-        checkpoint["last_processed_index"] = index
-        checkpoint["total_papers"] = total_papers
-        checkpoint["project_id"] = str(project_id) if project_id else None
-        checkpoint["stage"] = stage
-        checkpoint["updated_at"] = datetime.now().isoformat()
-
-        # Save to JobStore
+        last = entries[-1]
+        checkpoint = {
+            "processed_count": processed_count,
+            "total_papers": last["total_papers"],
+            "last_processed_index": last["index"],
+            "project_id": str(last["project_id"]) if last["project_id"] else None,
+            "stage": last["stage"],
+            "updated_at": datetime.now().isoformat(),
+        }
         await job_store.update_job(
             job_id=job_id,
             metadata={"checkpoint": checkpoint},
         )
 
-        logger.debug(f"[Checkpoint {job_id}] Saved: {index + 1}/{total_papers} papers processed")
+        logger.debug(
+            f"[Checkpoint {job_id}] Saved {len(entries)} papers: "
+            f"{last['index'] + 1}/{last['total_papers']} processed"
+        )
 
     except Exception as e:
         # Don't fail the import if checkpoint save fails
         logger.warning(f"[Checkpoint {job_id}] Failed to save checkpoint: {type(e).__name__}: {e}")
 
 
+async def _load_processed_paper_ids(job_store: JobStore, job: Job) -> List[str]:
+    """
+    Processed paper IDs of a job: its checkpoint log (one indexed query)
+    plus any legacy ``processed_paper_ids`` list kept in job metadata.
+    """
+    paper_ids = await job_store.get_processed_paper_ids(job.id)
+    legacy_ids = (job.metadata.get("checkpoint") or {}).get("processed_paper_ids") or []
+    if legacy_ids:
+        seen = set(paper_ids)
+        paper_ids.extend(pid for pid in legacy_ids if pid not in seen)
+    return paper_ids
+
+
 @router.post("/scholarag/validate", response_model=ImportValidationResponse)
 async def validate_scholarag_folder(
     request: ScholaRAGImportRequest,
@@ -1116,14 +1120,20 @@ async def import_pdf(
     if not file.filename or not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="File must be a PDF")
 
-    # Validate file size (max 50MB)
+    # Stream to the upload spool (max 50MB) instead of reading into memory
     MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
-    content = await file.read()
-    if len(content) > MAX_FILE_SIZE:
+    spool = UploadSpool(prefix="pdf_import_")
+    try:
+        spooled = await spool.save(file, max_bytes=MAX_FILE_SIZE, dedupe=True)
+    except UploadTooLargeError:
+        spool.cleanup()
         raise HTTPException(
             status_code=400,
             detail=f"File too large. Maximum size is {MAX_FILE_SIZE // (1024*1024)}MB"
         )
+    except Exception:
+        spool.cleanup()
+        raise
 
     # Create job
     job_store = await get_job_store()
@@ -1131,7 +1141,8 @@ async def import_pdf(
         job_type="pdf_import",
         metadata={
             "filename": file.filename,
-            "file_size": len(content),
+            "file_size": spooled.size,
+            "sha256": spooled.sha256,
             "project_name": project_name,
             "research_question": research_question,
             "extract_concepts": extract_concepts,
@@ -1154,12 +1165,13 @@ async def import_pdf(
     background_tasks.add_task(
         _run_pdf_import,
         job_id=job.id,
-        pdf_content=content,
+        pdf_path=spooled.path,
         filename=file.filename,
         project_name=project_name,
         research_question=research_question,
         extract_concepts=extract_concepts,
         user_id=current_user.id if current_user else None,
+        spool=spool,
     )
 
     return PDFImportResponse(
@@ -1172,14 +1184,15 @@ async def import_pdf(
 
 async def _run_pdf_import(
     job_id: str,
-    pdf_content: bytes,
+    pdf_path: str,
     filename: str,
     project_name: Optional[str],
     research_question: Optional[str],
     extract_concepts: bool,
     user_id: Optional[str] = None,
+    spool: Optional[UploadSpool] = None,
 ):
-    """Background task to run PDF import."""
+    """Background task to run PDF import from a spooled upload (removed when done)."""
     from importers.pdf_importer import PDFImporter
 
     logger.info(f"[PDF Import {job_id}] Starting import: {filename}")
@@ -1256,7 +1269,7 @@ async def _run_pdf_import(
 
         # Run the import
         result = await importer.import_single_pdf(
-            pdf_content=pdf_content,
+            pdf_path=pdf_path,
             filename=filename,
             project_name=project_name,
             research_question=research_question,
@@ -1328,6 +1341,9 @@ async def _run_pdf_import(
             message=f"Import failed: {sanitized_error}",
             error=sanitized_error,
         )
+    finally:
+        if spool is not None:
+            spool.cleanup()
 
 
 @router.post("/pdf/multiple", response_model=PDFImportResponse)
@@ -1366,20 +1382,35 @@ async def import_multiple_pdfs(
                 detail=f"All files must be PDFs. Invalid file: {file.filename}"
             )
 
-    # Read all file contents
+    # Stream all files to the upload spool (200MB total); identical PDFs are
+    # imported once.
     MAX_TOTAL_SIZE = 200 * 1024 * 1024  # 200MB total
+    spool = UploadSpool(prefix="pdf_import_multiple_", max_total_bytes=MAX_TOTAL_SIZE)
     pdf_files = []
-    total_size = 0
+    seen_hashes = set()
+    duplicate_count = 0
 
-    for file in files:
-        content = await file.read()
-        total_size += len(content)
-        if total_size > MAX_TOTAL_SIZE:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Total file size exceeds maximum of {MAX_TOTAL_SIZE // (1024*1024)}MB"
+    try:
+        for index, file in enumerate(files):
+            spooled = await spool.save(
+                file,
+                relative_path=Path(f"{index:04d}") / Path(file.filename).name,
+                dedupe=True,
             )
-        pdf_files.append((file.filename, content))
+            if spooled.sha256 in seen_hashes:
+                duplicate_count += 1
+                continue
+            seen_hashes.add(spooled.sha256)
+            pdf_files.append((file.filename, spooled.path))
+    except UploadTooLargeError:
+        spool.cleanup()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Total file size exceeds maximum of {MAX_TOTAL_SIZE // (1024*1024)}MB"
+        )
+    except Exception:
+        spool.cleanup()
+        raise
 
     # Create job
     job_store = await get_job_store()
@@ -1387,7 +1418,8 @@ async def import_multiple_pdfs(
         job_type="pdf_import_multiple",
         metadata={
             "file_count": len(pdf_files),
-            "total_size": total_size,
+            "duplicate_count": duplicate_count,
+            "total_size": spool.total_bytes,
             "project_name": project_name,
             "research_question": research_question,
             "extract_concepts": extract_concepts,
@@ -1415,6 +1447,7 @@ async def import_multiple_pdfs(
         research_question=research_question,
         extract_concepts=extract_concepts,
         user_id=current_user.id if current_user else None,
+        spool=spool,
     )
 
     return PDFImportResponse(
@@ -1432,8 +1465,9 @@ async def _run_multiple_pdf_import(
     research_question: Optional[str],
     extract_concepts: bool,
     user_id: Optional[str] = None,
+    spool: Optional[UploadSpool] = None,
 ):
-    """Background task to run multiple PDF import."""
+    """Background task to run multiple PDF import from spooled (filename, path) pairs."""
     from importers.pdf_importer import PDFImporter
 
     logger.info(f"[Multi-PDF Import {job_id}] Starting import: {len(pdf_files)} files")
@@ -1565,6 +1599,9 @@ async def _run_multiple_pdf_import(
             message=f"Import failed: {sanitized_error}",
             error=sanitized_error,
         )
+    finally:
+        if spool is not None:
+            spool.cleanup()
 
 
 @router.post("/csv")
@@ -1636,45 +1673,41 @@ async def validate_zotero_folder(
 
     Returns validation results including item count and PDF availability.
     """
-    import tempfile
-    import shutil
     from importers.zotero_rdf_importer import ZoteroRDFImporter
 
     if not files:
         raise HTTPException(status_code=400, detail="No files provided")
 
-    # Create temp directory for validation
-    temp_dir = tempfile.mkdtemp(prefix="zotero_validate_")
+    # Stream uploads into a spool directory for validation
+    spool = UploadSpool(prefix="zotero_validate_")
+    temp_dir = str(spool.path)
 
     try:
         rdf_file = None
         pdf_count = 0
 
-        # Save uploaded files to temp directory, preserving relative paths
+        # Save uploaded files to the spool, preserving relative paths
         logger.info(f"Received {len(files)} files for Zotero validation")
         for file in files:
             logger.info(f"  - filename: '{file.filename}', content_type: {file.content_type}")
-            content = await file.read()
 
             # Security: Validate path (no absolute paths or path traversal)
             filename = file.filename or ""
-            if filename.startswith("/") or ("../" in filename) or ("..\\" in filename) or filename.startswith(".."):
+            relative_path = safe_relative_path(filename)
+            if relative_path is None:
                 logger.warning(f"Rejected unsafe path: {filename}")
                 continue
 
             # Preserve full relative path for ALL files (RDF and PDF)
             # This maintains Zotero's folder structure: files/<item_key>/paper.pdf
-            target_path = Path(temp_dir) / filename
-            target_path.parent.mkdir(parents=True, exist_ok=True)
-
-            with open(target_path, 'wb') as f:
-                f.write(content)
+            is_pdf = filename.lower().endswith('.pdf')
+            spooled = await spool.save(file, relative_path=relative_path, dedupe=is_pdf)
 
             if filename.lower().endswith('.rdf'):
                 rdf_file = filename
-            elif filename.lower().endswith('.pdf'):
+            elif is_pdf:
                 pdf_count += 1
-                logger.info(f"    → Saved PDF to: {target_path}")
+                logger.info(f"    → Saved PDF to: {spooled.path}")
 
         if not rdf_file:
             return ZoteroValidationResponse(
@@ -1699,8 +1732,8 @@ async def validate_zotero_folder(
         )
 
     finally:
-        # Cleanup temp directory
-        shutil.rmtree(temp_dir, ignore_errors=True)
+        # Cleanup spool directory (deduplicated PDFs stay in the blob store)
+        spool.cleanup()
 
 
 @router.post("/zotero", response_model=ZoteroImportResponse)
@@ -1733,7 +1766,6 @@ async def import_zotero_folder(
     Returns:
         Import job information including job_id for status tracking
     """
-    import tempfile
     from uuid import uuid4
 
     if not files:
@@ -1747,40 +1779,35 @@ async def import_zotero_folder(
             detail="RDF file required. Please export from Zotero in RDF format."
         )
 
-    # Stream files to temp dir to avoid holding all PDFs in memory (MEM-002)
-    import tempfile
-    temp_dir = tempfile.mkdtemp(prefix="zotero_import_")
+    # Stream files in chunks to the upload spool so PDFs never sit in memory
+    # (MEM-002); PDFs are deduplicated by content hash across jobs.
     MAX_TOTAL_SIZE = 500 * 1024 * 1024  # 500MB total
+    spool = UploadSpool(prefix="zotero_import_", max_total_bytes=MAX_TOTAL_SIZE)
+    temp_dir = str(spool.path)
     pdf_count = 0
-    total_size = 0
-
-    for file in files:
-        content = await file.read()
-        total_size += len(content)
-        if total_size > MAX_TOTAL_SIZE:
-            import shutil
-            shutil.rmtree(temp_dir, ignore_errors=True)
-            raise HTTPException(
-                status_code=400,
-                detail=f"Total file size exceeds {MAX_TOTAL_SIZE // (1024*1024)}MB limit."
-            )
-
-        filename = file.filename or ""
-        # Security: validate path - check for path traversal (../ or ..\) not just consecutive dots
-        if not filename or filename.startswith("/") or ("../" in filename) or ("..\\" in filename) or filename.startswith(".."):
-            logger.warning(f"Rejected unsafe path: {filename}")
-            continue
-
-        target_path = Path(temp_dir) / filename
-        target_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(target_path, 'wb') as f:
-            f.write(content)
 
-        if filename.lower().endswith('.pdf'):
-            pdf_count += 1
+    try:
+        for file in files:
+            filename = file.filename or ""
+            # Security: validate path - check for path traversal (../ or ..\) not just consecutive dots
+            relative_path = safe_relative_path(filename)
+            if relative_path is None:
+                logger.warning(f"Rejected unsafe path: {filename}")
+                continue
 
-        # Free memory immediately after writing to disk (MEM-002)
-        del content
+            is_pdf = filename.lower().endswith('.pdf')
+            await spool.save(file, relative_path=relative_path, dedupe=is_pdf)
+            if is_pdf:
+                pdf_count += 1
+    except UploadTooLargeError:
+        spool.cleanup()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Total file size exceeds {MAX_TOTAL_SIZE // (1024*1024)}MB limit."
+        )
+    except Exception:
+        spool.cleanup()
+        raise
 
     # Count items (basic RDF parsing to get count)
     rdf_path = next((Path(temp_dir) / f for f in os.listdir(temp_dir) if f.lower().endswith('.rdf')), None)
@@ -1788,14 +1815,11 @@ async def import_zotero_folder(
     if rdf_path:
         try:
             import xml.etree.ElementTree as ET
-            with open(rdf_path, 'rb') as f:
-                rdf_content = f.read()
-            root = ET.fromstring(rdf_content)
+            root = ET.parse(rdf_path).getroot()
             # Count bibliographic items
             for item_type in ['Article', 'Book', 'BookSection', 'ConferencePaper',
                              'JournalArticle', 'Report', 'Thesis', 'Document']:
                 items_count += len(root.findall(f'.//{{{NAMESPACES_FOR_COUNT["bib"]}}}{item_type}', NAMESPACES_FOR_COUNT))
-            del rdf_content  # Free memory
         except:
             pass
 
@@ -1805,7 +1829,7 @@ async def import_zotero_folder(
         job_type="zotero_import",
         metadata={
             "file_count": len(os.listdir(temp_dir)),
-            "total_size": total_size,
+            "total_size": spool.total_bytes,
             "items_count": items_count,
             "project_name": project_name,
             "research_question": research_question,
@@ -1831,8 +1855,16 @@ async def import_zotero_folder(
         try:
             old_job = await job_store.get_job(resume_job_id)
             if old_job and old_job.metadata.get("checkpoint"):
-                resume_checkpoint = old_job.metadata["checkpoint"]
-                processed_count = len(resume_checkpoint.get("processed_paper_ids", []))
+                processed_ids = await _load_processed_paper_ids(job_store, old_job)
+                resume_checkpoint = {
+                    **old_job.metadata["checkpoint"],
+                    "processed_paper_ids": processed_ids,
+                }
+                # Carry the log forward so a second interruption resumes fully
+                await job_store.append_checkpoints(
+                    job.id, [(paper_id, index) for index, paper_id in enumerate(processed_ids)]
+                )
+                processed_count = len(processed_ids)
                 logger.info(f"[Zotero Import {job.id}] Resuming from job {resume_job_id}: {processed_count} papers to skip")
         except Exception as e:
             logger.warning(f"[Zotero Import {job.id}] Failed to load resume checkpoint: {e}")
@@ -1896,10 +1928,12 @@ async def _run_zotero_import(
         job_id=job_id,
         log_prefix="Zotero Import",
     )
-    checkpoint_saver = _QueuedCheckpointSaver(job_store=job_store, job_id=job_id)
+    checkpoint_saver = _QueuedCheckpointSaver(
+        job_store=job_store, job_id=job_id, processed_count=len(skip_paper_ids)
+    )
 
     # BUG-028 Extension: Track processed papers for checkpoint
-    processed_paper_ids = list(skip_paper_ids)  # Start with already processed
+    processed_paper_ids = set(skip_paper_ids)  # Start with already processed
     current_project_id = existing_project_id
 
     def progress_callback(progress):
@@ -1934,7 +1968,7 @@ async def _run_zotero_import(
             progress.current_paper_id and
             progress.current_paper_id not in processed_paper_ids):
 
-            processed_paper_ids.append(progress.current_paper_id)
+            processed_paper_ids.add(progress.current_paper_id)
 
             checkpoint_saver.enqueue(
                 paper_id=progress.current_paper_id,
@@ -2138,10 +2172,12 @@ async def _run_zotero_import_from_dir(
         job_id=job_id,
         log_prefix="Zotero Import",
     )
-    checkpoint_saver = _QueuedCheckpointSaver(job_store=job_store, job_id=job_id)
+    checkpoint_saver = _QueuedCheckpointSaver(
+        job_store=job_store, job_id=job_id, processed_count=len(skip_paper_ids)
+    )
 
     # BUG-028 Extension: Track processed papers for checkpoint
-    processed_paper_ids = list(skip_paper_ids)  # Start with already processed
+    processed_paper_ids = set(skip_paper_ids)  # Start with already processed
     current_project_id = existing_project_id
 
     def progress_callback(progress):
@@ -2171,7 +2207,7 @@ async def _run_zotero_import_from_dir(
             progress.current_paper_id and
             progress.current_paper_id not in processed_paper_ids):
 
-            processed_paper_ids.append(progress.current_paper_id)
+            processed_paper_ids.add(progress.current_paper_id)
 
             checkpoint_saver.enqueue(
                 paper_id=progress.current_paper_id,
@@ -2428,7 +2464,7 @@ async def resume_import(
     )
 
     now = datetime.now()
-    processed_count = len(checkpoint.get("processed_paper_ids", []))
+    processed_count = len(await _load_processed_paper_ids(job_store, original_job))
     total_count = checkpoint.get("total_papers", 0)
 
     response = ImportJobResponse(
@@ -2492,13 +2528,14 @@ async def get_resume_info(
         raise HTTPException(status_code=404, detail="Job not found")
 
     checkpoint = job.metadata.get("checkpoint", {})
+    processed_count = len(await _load_processed_paper_ids(job_store, job)) if checkpoint else 0
 
     return {
         "job_id": job_id,
         "status": job.status.value,
         "can_resume": job.status == JobStatus.INTERRUPTED and bool(checkpoint),
         "checkpoint": {
-            "processed_count": len(checkpoint.get("processed_paper_ids", [])),
+            "processed_count": processed_count,
             "total_papers": checkpoint.get("total_papers", 0),
             "last_processed_index": checkpoint.get("last_processed_index", 0),
             "project_id": checkpoint.get("project_id"),
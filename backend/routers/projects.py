@@ -19,6 +19,7 @@ from datetime import datetime
 from database import db
 from auth.dependencies import require_auth_if_configured
 from auth.models import User
+from graph.metrics_cache import metrics_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -377,6 +378,8 @@ async def update_project(
             """,
             *values,
         )
+        # Summary details (project name) are cached outside the graph version
+        await metrics_cache.invalidate_project(str(project_id))
 
         return await get_project(project_id, database, current_user)
     except HTTPException:
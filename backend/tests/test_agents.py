@@ -276,6 +276,85 @@ class TestQueryExecutionAgent:
         assert data[0]["id"] == "e1"
 
 
+    @pytest.mark.asyncio
+    async def test_independent_tasks_run_concurrently(self, query_agent):
+        """Test independent tasks overlap and dependents wait for their inputs."""
+        import asyncio
+        from agents.task_planning_agent import TaskPlan, SubTask
+        from agents.intent_agent import IntentType
+
+        running = 0
+        peak = 0
+        seen_deps = {}
+
+        async def fake_run(task, dep_results, prefetched=None):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            seen_deps[task.description] = dep_results
+            return [{"id": task.description}]
+
+        query_agent._run_task = fake_run
+        task_plan = TaskPlan(
+            original_query="compare A and B",
+            intent=IntentType.COMPARE,
+            tasks=[
+                SubTask(task_type="search", description="a"),
+                SubTask(task_type="search", description="b"),
+                SubTask(task_type="compare", description="c", depends_on=[0, 1]),
+            ],
+            estimated_complexity="medium",
+        )
+
+        result = await query_agent.execute(task_plan)
+
+        assert peak == 2
+        assert [r.success for r in result.results] == [True, True, True]
+        assert seen_deps["c"] == [[{"id": "a"}], [{"id": "b"}]]
+        assert [s.step_index for s in result.trace_steps] == [0, 1, 2]
+        # The dependent task queued while its inputs ran
+        assert result.trace_steps[2].queue_wait_ms >= result.trace_steps[0].run_ms
+        assert result.trace_steps[2].run_ms > 0
+
+    @pytest.mark.asyncio
+    async def test_timeout_skips_dependents(self, query_agent):
+        """Test a timed-out task fails and its dependents never run."""
+        import asyncio
+        from agents.task_planning_agent import TaskPlan, SubTask
+        from agents.intent_agent import IntentType
+
+        ran = []
+
+        async def fake_run(task, dep_results, prefetched=None):
+            ran.append(task.description)
+            if task.description == "slow":
+                await asyncio.sleep(1)
+            return {"nodes": []}
+
+        query_agent._run_task = fake_run
+        query_agent.task_timeout_seconds = 0.01
+        task_plan = TaskPlan(
+            original_query="q",
+            intent=IntentType.SEARCH,
+            tasks=[
+                SubTask(task_type="search", description="slow"),
+                SubTask(task_type="analyze", description="dependent", depends_on=[0]),
+                SubTask(task_type="search", description="independent"),
+            ],
+            estimated_complexity="low",
+        )
+
+        result = await query_agent.execute(task_plan)
+
+        assert "Timed out" in result.results[0].error
+        assert result.results[1].error == "Dependencies not satisfied"
+        assert result.results[2].success
+        assert "dependent" not in ran
+        assert not hasattr(query_agent, "_previous_results")
+
+
 class TestReasoningAgent:
     """Test Reasoning Agent functionality."""
 
@@ -559,3 +638,192 @@ class TestOrchestrator:
             context = orchestrator.get_context_summary("conv-1")
             assert context is not None
             assert context["num_messages"] == 4  # 2 user + 2 assistant messages
+
+
+class TestPipelinedOrchestrator:
+    """Test concurrent stages, speculative prefetch and latency reporting."""
+
+    @pytest.mark.asyncio
+    async def test_intent_and_extraction_overlap_and_prefetch_is_used(self):
+        import asyncio
+        from agents.orchestrator import AgentOrchestrator
+        from agents.intent_agent import IntentResult, IntentType
+        from agents.concept_extraction_agent import ExtractionResult
+        from agents.reasoning_agent import ReasoningResult
+        from agents.response_agent import ResponseResult
+
+        graph_store = MagicMock()
+        graph_store.search_entities = AsyncMock(return_value=[
+            {"id": f"e{i}", "name": f"Entity {i}"} for i in range(25)
+        ])
+        orchestrator = AgentOrchestrator(graph_store=graph_store)
+        in_flight = 0
+        peak = 0
+
+        async def slow_stage(result):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            return result
+
+        orchestrator.intent_agent.classify = lambda q: slow_stage(
+            IntentResult(intent=IntentType.SEARCH, confidence=0.9)
+        )
+        orchestrator.concept_agent.extract = lambda q: slow_stage(
+            ExtractionResult(entities=[], keywords=[], query_without_entities=q)
+        )
+        orchestrator.reasoning_agent.reason = AsyncMock(
+            return_value=ReasoningResult(final_conclusion="ok", steps=[], confidence=0.8)
+        )
+        orchestrator.response_agent.generate = AsyncMock(
+            return_value=ResponseResult(answer="answer")
+        )
+
+        with patch("config.get_settings") as mock_settings:
+            mock_settings.return_value.hybrid_trace_v1 = False
+            result = await orchestrator.process_query(
+                query="graph neural networks",
+                project_id="project-1",
+                include_processing_steps=True,
+            )
+
+        assert peak == 2
+        # The planned search (limit 20) was served by the speculative search
+        graph_store.search_entities.assert_awaited_once()
+        assert graph_store.search_entities.call_args.kwargs["limit"] == 30
+        execution = orchestrator.reasoning_agent.reason.call_args[0][2]
+        assert len(execution.results[0].data) == 20
+
+        steps = {s["step"]: s for s in result.processing_steps}
+        assert steps["intent_classification"]["latency_ms"] >= 15
+        breakdown = steps["latency_breakdown"]["result"]
+        assert breakdown["pipelined"] is True
+        assert {"candidate_prefetch", "task_planning", "query_execution", "total_ms"} <= set(breakdown)
+        # Overlapped stages: total is below the two slow stages run back to back
+        assert breakdown["total_ms"] < breakdown["intent_classification"] + breakdown["concept_extraction"]
+
+    @pytest.mark.asyncio
+    async def test_sequential_mode_skips_prefetch(self):
+        from agents.orchestrator import AgentOrchestrator
+
+        graph_store = MagicMock()
+        graph_store.search_entities = AsyncMock(return_value=[])
+        orchestrator = AgentOrchestrator(graph_store=graph_store, pipelined=False)
+
+        result = await orchestrator.process_query(
+            query="what is x", project_id="project-1", include_processing_steps=True,
+        )
+
+        breakdown = result.processing_steps[-1]["result"]
+        assert breakdown["pipelined"] is False
+        assert "candidate_prefetch" not in breakdown
+
+
+    @pytest.mark.asyncio
+    async def test_no_prefetch_for_intents_without_query_search(self):
+        from agents.orchestrator import AgentOrchestrator
+        from agents.intent_agent import IntentResult, IntentType
+
+        graph_store = MagicMock()
+        graph_store.search_entities = AsyncMock(return_value=[])
+        orchestrator = AgentOrchestrator(graph_store=graph_store)
+        orchestrator.intent_agent.classify = AsyncMock(
+            return_value=IntentResult(intent=IntentType.IDENTIFY_GAPS, confidence=0.9)
+        )
+
+        result = await orchestrator.process_query(
+            query="what is missing", project_id="project-1", include_processing_steps=True,
+        )
+
+        breakdown = result.processing_steps[-1]["result"]
+        assert breakdown["pipelined"] is True
+        assert "candidate_prefetch" not in breakdown
+        graph_store.search_entities.assert_not_called()
+
+
+class TestStreamingResponse:
+    """Test token streaming from ResponseAgent through the orchestrator."""
+
+    @staticmethod
+    def _streaming_llm(chunks):
+        llm = MagicMock()
+
+        async def generate_stream(**kwargs):
+            for chunk in chunks:
+                yield chunk
+
+        llm.generate_stream = generate_stream
+        return llm
+
+    @pytest.mark.asyncio
+    async def test_response_agent_streams_then_returns_result(self):
+        from agents.intent_agent import IntentType
+        from agents.reasoning_agent import ReasoningResult
+        from agents.response_agent import ResponseAgent, ResponseResult
+
+        agent = ResponseAgent(llm_provider=self._streaming_llm(["Graphs ", "connect ", "ideas."]))
+        reasoning = ReasoningResult(final_conclusion="fallback", steps=[], confidence=0.8)
+
+        items = [item async for item in agent.generate_stream("q", reasoning, IntentType.SEARCH)]
+
+        assert items[:3] == ["Graphs ", "connect ", "ideas."]
+        assert isinstance(items[-1], ResponseResult)
+        assert items[-1].answer == "Graphs connect ideas."
+        assert items[-1].suggested_follow_ups
+
+    @pytest.mark.asyncio
+    async def test_response_agent_stream_falls_back_without_llm(self):
+        from agents.intent_agent import IntentType
+        from agents.reasoning_agent import ReasoningResult
+        from agents.response_agent import ResponseAgent
+
+        agent = ResponseAgent()
+        reasoning = ReasoningResult(final_conclusion="Only conclusion", steps=[], confidence=0.5)
+
+        items = [item async for item in agent.generate_stream("q", reasoning, IntentType.SEARCH)]
+
+        assert items[0] == "Only conclusion"
+        assert items[1].answer == "Only conclusion"
+
+    @pytest.mark.asyncio
+    async def test_orchestrator_stream_event_order(self):
+        from agents.orchestrator import AgentOrchestrator, OrchestratorResult
+        from agents.intent_agent import IntentResult, IntentType
+        from agents.concept_extraction_agent import ExtractionResult
+        from agents.reasoning_agent import ReasoningResult
+
+        orchestrator = AgentOrchestrator()
+        orchestrator.intent_agent.classify = AsyncMock(
+            return_value=IntentResult(intent=IntentType.SEARCH, confidence=0.9)
+        )
+        orchestrator.concept_agent.extract = AsyncMock(
+            return_value=ExtractionResult(entities=[], keywords=[], query_without_entities="q")
+        )
+        orchestrator.reasoning_agent.reason = AsyncMock(
+            return_value=ReasoningResult(final_conclusion="c", steps=[], confidence=0.7)
+        )
+        orchestrator.response_agent.llm = self._streaming_llm(["Hello", " world"])
+
+        events = [
+            e async for e in orchestrator.process_query_stream(
+                query="q", project_id="p", include_processing_steps=True
+            )
+        ]
+
+        kinds = [e["event"] for e in events]
+        stages = [e["data"]["step"] for e in events if e["event"] == "stage"]
+        assert stages[:5] == [
+            "intent_classification", "concept_extraction", "task_planning",
+            "query_execution", "reasoning",
+        ]
+        # Tokens arrive before the response stage completes; result is last
+        first_token = kinds.index("token")
+        assert kinds.index("stage", first_token) > first_token
+        assert [e["data"] for e in events if e["event"] == "token"] == ["Hello", " world"]
+        assert kinds[-1] == "result"
+        result = events[-1]["data"]
+        assert isinstance(result, OrchestratorResult)
+        assert result.content == "Hello world"
+        assert "first_token" in result.processing_steps[-1]["result"]
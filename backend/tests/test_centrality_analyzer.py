@@ -0,0 +1,89 @@
+"""
+Tests for CentralityAnalyzer off-loop computation and sampled betweenness.
+
+Unit tests only — no database connections required.
+"""
+
+import pytest
+
+from graph.centrality_analyzer import (
+    CentralityAnalyzer,
+    betweenness_error_bound,
+    shutdown_process_pool,
+)
+
+
+def _path_graph(n: int):
+    nodes = [{"id": f"n{i}", "name": f"Node {i}"} for i in range(n)]
+    edges = [
+        {"source": f"n{i}", "target": f"n{i + 1}", "weight": 1.0}
+        for i in range(n - 1)
+    ]
+    return nodes, edges
+
+
+class TestSampledBetweenness:
+    """Betweenness switches to k-source sampling above the node threshold."""
+
+    def test_exact_below_threshold(self):
+        analyzer = CentralityAnalyzer(approx_node_threshold=100, betweenness_samples=4)
+        nodes, edges = _path_graph(10)
+
+        metrics = analyzer.compute_all_centrality(nodes, edges)
+
+        assert metrics.approximate is False
+        assert metrics.sample_size is None
+        assert metrics.error_bound is None
+        # Middle of a path is the strongest bridge
+        top_id, _ = analyzer.get_top_bridges(metrics.betweenness, 1)[0]
+        assert top_id in {"n4", "n5"}
+
+    def test_sampled_above_threshold_reports_error_bound(self):
+        analyzer = CentralityAnalyzer(approx_node_threshold=10, betweenness_samples=8)
+        nodes, edges = _path_graph(30)
+
+        metrics = analyzer.compute_all_centrality(nodes, edges)
+
+        assert metrics.approximate is True
+        assert metrics.sample_size == 8
+        assert metrics.error_bound == pytest.approx(betweenness_error_bound(30, 8), abs=1e-6)
+        assert set(metrics.betweenness) == {n["id"] for n in nodes}
+
+    def test_error_bound_shrinks_with_samples(self):
+        assert betweenness_error_bound(1000, 400) < betweenness_error_bound(1000, 100)
+        assert betweenness_error_bound(0, 10) == 0.0
+
+    def test_edges_to_unknown_nodes_are_ignored(self):
+        analyzer = CentralityAnalyzer(approx_node_threshold=100)
+        nodes, edges = _path_graph(3)
+        edges.append({"source": "n0", "target": "missing", "weight": 1.0})
+
+        metrics = analyzer.compute_all_centrality(nodes, edges)
+
+        assert "missing" not in metrics.degree
+
+
+@pytest.mark.asyncio
+class TestAsyncCentrality:
+    """compute_all_centrality_async runs in the process pool and caches."""
+
+    async def test_async_matches_sync(self):
+        analyzer = CentralityAnalyzer(approx_node_threshold=100, process_workers=1)
+        nodes, edges = _path_graph(12)
+        try:
+            async_metrics = await analyzer.compute_all_centrality_async(nodes, edges)
+        finally:
+            shutdown_process_pool()
+        sync_metrics = analyzer.compute_all_centrality(nodes, edges)
+
+        assert async_metrics.betweenness == pytest.approx(sync_metrics.betweenness)
+        assert async_metrics.pagerank == pytest.approx(sync_metrics.pagerank)
+
+    async def test_async_uses_cache(self):
+        analyzer = CentralityAnalyzer(approx_node_threshold=100)
+        nodes, edges = _path_graph(5)
+        cached = analyzer.compute_all_centrality(nodes, edges, cache_key="proj")
+
+        result = await analyzer.compute_all_centrality_async([], [], cache_key="proj")
+
+        assert result is cached
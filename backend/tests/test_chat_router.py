@@ -112,3 +112,41 @@ class TestExplainNodeLogic:
         }
         assert "Unable to generate explanation" in error_response["explanation"]
         assert len(error_response["suggested_questions"]) == 3
+
+
+class TestChatQueryStream:
+    """Tests for the SSE streaming chat endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_stream_emits_stages_tokens_and_persists(self):
+        from agents.orchestrator import OrchestratorResult
+        from routers import chat as chat_router
+
+        async def fake_stream(**kwargs):
+            yield {"event": "stage", "data": {"step": "intent_classification", "latency_ms": 1.0}}
+            yield {"event": "retrieval_trace", "data": {"steps": []}}
+            yield {"event": "token", "data": "Hi"}
+            yield {"event": "token", "data": " there"}
+            yield {"event": "result", "data": OrchestratorResult(
+                content="Hi there", suggested_follow_ups=["next?"], intent="search",
+            )}
+
+        orchestrator = MagicMock()
+        orchestrator.process_query_stream = fake_stream
+        request = chat_router.ChatRequest(project_id=uuid4(), message="hello")
+
+        with patch.object(chat_router, "verify_project_access", AsyncMock()), \
+             patch.object(chat_router, "get_orchestrator_for_user", AsyncMock(return_value=orchestrator)), \
+             patch.object(chat_router, "_persist_chat_turn", AsyncMock()) as persist:
+            response = await chat_router.chat_query_stream(request, current_user=None)
+            body = "".join([chunk async for chunk in response.body_iterator])
+
+        assert response.media_type == "text/event-stream"
+        events = [block.split("\n")[0] for block in body.strip().split("\n\n")]
+        assert events == [
+            "event: stage", "event: retrieval_trace", "event: token", "event: token", "event: done",
+        ]
+        assert 'data: {"text": " there"}' in body
+        persisted = persist.call_args[0][3]
+        assert persisted.answer == "Hi there"
+        assert persisted.suggested_follow_ups == ["next?"]
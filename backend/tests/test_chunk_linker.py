@@ -0,0 +1,81 @@
+"""
+Tests for the shared Aho-Corasick entity-to-chunk linker.
+
+Unit tests only — the database is mocked.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from importers.chunk_linker import (
+    EntityNameAutomaton,
+    link_entities_to_chunks,
+    match_entities_to_chunks,
+)
+
+
+class TestEntityNameAutomaton:
+
+    def test_finds_overlapping_patterns(self):
+        automaton = EntityNameAutomaton(["neural network", "network", "graph neural network"])
+
+        found = automaton.find("A Graph Neural Network model")
+
+        assert found == {0, 1, 2}
+
+    def test_respects_word_boundaries(self):
+        automaton = EntityNameAutomaton(["graph", "c++"])
+
+        assert automaton.find("this paragraph is about graphs") == set()
+        assert automaton.find("written in C++, not graph-free") == {0, 1}
+
+
+class TestMatchEntitiesToChunks:
+
+    def test_maps_entities_to_matching_chunks(self):
+        entities = [("e1", "Transformer"), ("e2", "BERT"), ("e3", "ab"), ("e4", "transformer")]
+        chunks = [
+            {"id": "c1", "text": "The transformer architecture."},
+            {"id": "c2", "text": "BERT is a Transformer encoder."},
+            {"id": "c3", "text": None},
+        ]
+
+        matches = match_entities_to_chunks(entities, chunks)
+
+        assert matches == {
+            "e1": ["c1", "c2"],
+            "e4": ["c1", "c2"],
+            "e2": ["c2"],
+        }
+
+
+@pytest.mark.asyncio
+class TestLinkEntitiesToChunks:
+
+    async def test_single_batched_update(self):
+        db = MagicMock()
+        db.execute = AsyncMock()
+        chunks = [
+            {"id": "c1", "text": "attention and transformers"},
+            {"id": "c2", "text": "self attention"},
+        ]
+
+        links = await link_entities_to_chunks(
+            db, "p1", [("e1", "attention"), ("e2", "dropout")], chunks
+        )
+
+        assert links == 2
+        db.execute.assert_awaited_once()
+        sql, entity_ids, chunk_ids = db.execute.call_args[0]
+        assert "unnest($1::uuid[], $2::text[])" in sql
+        assert entity_ids == ["e1", "e1"]
+        assert chunk_ids == ["c1", "c2"]
+
+    async def test_no_matches_skips_update(self):
+        db = MagicMock()
+        db.execute = AsyncMock()
+
+        links = await link_entities_to_chunks(db, "p1", [("e1", "dropout")], [{"id": "c1", "text": "x"}])
+
+        assert links == 0
+        db.execute.assert_not_called()
@@ -0,0 +1,102 @@
+"""
+Tests for the gap-detection clustering engine (graph.clustering_engine).
+"""
+
+import numpy as np
+import pytest
+
+
+def _blobs(n_per_cluster=400, n_clusters=4, dim=32, seed=0):
+    """Well-separated Gaussian blobs; returns (X, true_labels)."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(scale=10.0, size=(n_clusters, dim))
+    X = np.vstack([c + rng.normal(scale=0.3, size=(n_per_cluster, dim)) for c in centers])
+    labels = np.repeat(np.arange(n_clusters), n_per_cluster)
+    return X.astype(np.float32), labels
+
+
+def _purity(predicted, truth):
+    """Fraction of rows whose predicted cluster's majority true label matches."""
+    matched = 0
+    for label in np.unique(predicted):
+        matched += np.bincount(truth[predicted == label]).max()
+    return matched / len(truth)
+
+
+class TestClusterEmbeddings:
+
+    def test_small_input_uses_exact_kmeans(self):
+        from graph.clustering_engine import cluster_embeddings
+
+        X, truth = _blobs(n_per_cluster=20, n_clusters=3, dim=8)
+        result = cluster_embeddings(X, n_clusters=3, exact_threshold=2000)
+
+        assert result.method == "kmeans"
+        assert result.centers.shape == (3, 8)
+        assert _purity(result.labels, truth) == 1.0
+
+    def test_large_input_uses_minibatch_with_reduction(self):
+        from graph.clustering_engine import cluster_embeddings
+
+        X, truth = _blobs()
+        result = cluster_embeddings(
+            X, min_clusters=2, max_clusters=8,
+            exact_threshold=500, sample_size=800, reduction="pca", reduced_dim=8,
+        )
+
+        assert result.method == "minibatch_kmeans"
+        assert result.n_clusters == 4
+        assert result.reduced_dim == 8 and result.sample_size == 800
+        # Centers are mapped back to the input space
+        assert result.centers.shape == (4, 32)
+        assert result.silhouette is not None and result.silhouette > 0.5
+        assert _purity(result.labels, truth) > 0.99
+
+    def test_random_projection_and_fixed_k(self):
+        from graph.clustering_engine import cluster_embeddings
+
+        X, truth = _blobs(n_clusters=3)
+        result = cluster_embeddings(
+            X, n_clusters=3, exact_threshold=100, reduction="random", reduced_dim=16,
+        )
+
+        assert result.method == "minibatch_kmeans"
+        assert result.n_clusters == 3 and result.reduced_dim == 16
+        assert _purity(result.labels, truth) > 0.99
+
+    def test_warm_sweep_inertia_decreases(self):
+        from graph.clustering_engine import _warm_sweep
+
+        X, _ = _blobs(n_per_cluster=100)
+        k_values, inertias, centers, labels = _warm_sweep(X, 2, 6, random_state=0)
+
+        assert k_values == [2, 3, 4, 5, 6]
+        assert [c.shape[0] for c in centers] == k_values
+        assert all(len(l) == len(X) for l in labels)
+        # Inertia keeps dropping up to the true cluster count (4)
+        assert inertias[2] < inertias[1] < inertias[0]
+
+
+@pytest.mark.asyncio
+async def test_gap_detector_clusters_without_concept_cap(monkeypatch):
+    """cluster_concepts handles more concepts than the exact threshold."""
+    from config import settings
+    from graph.clustering_engine import shutdown_process_pool
+    from graph.gap_detector import GapDetector
+
+    monkeypatch.setattr(settings, "gap_clustering_exact_threshold", 300)
+    monkeypatch.setattr(settings, "gap_clustering_sample_size", 500)
+    X, _ = _blobs(n_per_cluster=400, n_clusters=3, dim=16)
+    concepts = [
+        {"id": str(i), "name": f"concept {i}", "embedding": X[i]} for i in range(len(X))
+    ]
+
+    detector = GapDetector(llm_provider=None)
+    try:
+        clusters = await detector.cluster_concepts(concepts, n_clusters=3)
+    finally:
+        shutdown_process_pool()
+
+    assert len(clusters) == 3
+    assert sum(len(c.concept_ids) for c in clusters) == len(concepts)
+    assert all(c.centroid.shape == (16,) for c in clusters)
@@ -0,0 +1,216 @@
+"""
+Tests for incremental community detection (graph.community_detector).
+
+Unit tests only — the database is mocked; refinement uses label propagation
+(the Leiden refinement test is skipped without leidenalg).
+"""
+
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from graph.graph_snapshot import build_graph_snapshot
+
+
+def _entity(node_id, entity_type="Concept"):
+    return {"id": node_id, "entity_type": entity_type, "name": f"name-{node_id}", "embedding": None}
+
+
+def _rel(source, target, weight=1.0):
+    return {
+        "source_id": source,
+        "target_id": target,
+        "relationship_type": "RELATED_TO",
+        "weight": weight,
+        "property_weight": 1.0,
+    }
+
+
+# Two stored triangles {a,b,c} and {d,e,f}, an untouched triangle {g,h,i},
+# and a new concept "n" attached to the first one by new edges.
+ENTITIES = [_entity(x) for x in "abcdefghin"] + [_entity("p", "Paper")]
+OLD_EDGES = [
+    _rel("a", "b"), _rel("b", "c"), _rel("a", "c"),
+    _rel("d", "e"), _rel("e", "f"), _rel("d", "f"),
+    _rel("g", "h"), _rel("h", "i"), _rel("g", "i"),
+]
+NEW_EDGES = [_rel("n", "a"), _rel("n", "b"), _rel("p", "n")]
+STORED = {0: ["a", "b", "c"], 1: ["d", "e", "f"], 2: ["g", "h", "i"]}
+
+
+def _snapshot():
+    return build_graph_snapshot("proj", 2, ENTITIES, OLD_EDGES + NEW_EDGES)
+
+
+class TestIncrementalPlan:
+
+    def test_only_touched_communities_and_new_nodes_are_free(self):
+        from graph.community_detector import plan_incremental_update
+
+        snapshot = _snapshot()
+        plan = plan_incremental_update(snapshot, STORED, [("n", "a"), ("n", "b"), ("p", "n")])
+
+        ids = [snapshot.node_ids[i] for i in plan.universe]
+        free = {node_id for node_id, f in zip(ids, plan.free) if f}
+        assert "p" not in ids  # Papers never join concept communities
+        assert free == {"a", "b", "c", "n"}
+        assert plan.touched_communities == 1
+
+    def test_no_new_edges_inside_graph(self):
+        from graph.community_detector import plan_incremental_update
+
+        assert plan_incremental_update(_snapshot(), STORED, [("p", "n")]) is None
+
+
+class TestRefinementAndDiff:
+
+    def test_new_node_joins_neighbour_community_and_diff_is_minimal(self):
+        from graph.community_detector import (
+            build_community_diff,
+            plan_incremental_update,
+            refine_with_label_propagation,
+        )
+
+        snapshot = _snapshot()
+        plan = plan_incremental_update(snapshot, STORED, [("n", "a"), ("n", "b")])
+        labels = refine_with_label_propagation(
+            plan.universe.size, plan.edges, plan.weights, plan.membership, plan.free
+        )
+        diff = build_community_diff(
+            snapshot, plan.universe, labels, plan.free, STORED, {0: "Stored label"}, 3,
+            "label_propagation",
+        )
+
+        assert diff.nodes_added == 1 and diff.nodes_moved == 0
+        assert diff.deleted_ids == []
+        (upsert,) = diff.upserts
+        assert upsert[0] == 0 and set(upsert[1]) == {"a", "b", "c", "n"}
+        assert upsert[4] == "Stored label"
+        assert sorted(c.community_id for c in diff.communities) == [0, 1, 2]
+
+    def test_untouched_small_community_is_kept(self):
+        from graph.community_detector import (
+            build_community_diff,
+            plan_incremental_update,
+            refine_with_label_propagation,
+        )
+
+        stored = {0: ["a", "b", "c"], 1: ["d", "e", "f"], 2: ["g", "h"]}
+        snapshot = _snapshot()
+        plan = plan_incremental_update(snapshot, stored, [("n", "a"), ("n", "b")])
+        labels = refine_with_label_propagation(
+            plan.universe.size, plan.edges, plan.weights, plan.membership, plan.free
+        )
+        diff = build_community_diff(
+            snapshot, plan.universe, labels, plan.free, stored, {}, 3, "label_propagation",
+        )
+
+        assert plan.touched_communities == 1
+        assert diff.deleted_ids == [] and diff.nodes_moved == 0
+        assert [u[0] for u in diff.upserts] == [0]
+        assert sorted(c.community_id for c in diff.communities) == [0, 1, 2]
+
+    def test_fixed_nodes_never_move(self):
+        from graph.community_detector import refine_with_label_propagation
+
+        # Node 1 is fixed in community 1 even though its neighbours are in 0
+        edges = np.array([[0, 1], [1, 2], [0, 2]])
+        labels = refine_with_label_propagation(
+            3, edges, np.ones(3), np.array([0, 1, 0]), np.array([True, False, True]),
+        )
+        assert labels[1] == 1
+
+    def test_leiden_keeps_fixed_nodes_and_assigns_new_ones(self):
+        pytest.importorskip("igraph")
+        pytest.importorskip("leidenalg")
+        from graph.community_detector import plan_incremental_update, refine_with_leiden
+
+        snapshot = _snapshot()
+        plan = plan_incremental_update(snapshot, STORED, [("n", "a"), ("n", "b")])
+        labels = refine_with_leiden(
+            plan.universe.size, plan.edges, plan.weights, plan.membership, plan.free, 1.0
+        )
+
+        fixed = ~plan.free
+        assert np.array_equal(labels[fixed], plan.membership[fixed])
+        ids = [snapshot.node_ids[i] for i in plan.universe]
+        label_of = dict(zip(ids, labels.tolist()))
+        assert label_of["n"] == label_of["a"] == label_of["b"]
+        assert label_of["n"] not in {label_of["d"], label_of["g"]}
+
+
+@pytest.mark.asyncio
+async def test_update_communities_incremental_writes_diff(monkeypatch):
+    from graph import graph_snapshot
+    from graph.community_detector import CommunityDetector
+
+    service = graph_snapshot.GraphSnapshotService()
+    monkeypatch.setattr(graph_snapshot, "graph_snapshot_service", service)
+    monkeypatch.setattr(service, "get", AsyncMock(return_value=_snapshot()))
+
+    stored_rows = [
+        {"cluster_id": cid, "concepts": members, "label": None, "written_at": None}
+        for cid, members in STORED.items()
+    ]
+    new_edge_rows = [{"source_id": "n", "target_id": "a"}, {"source_id": "n", "target_id": "b"}]
+
+    conn = MagicMock()
+    conn.execute = AsyncMock()
+    conn.executemany = AsyncMock()
+    database = MagicMock()
+    database.fetch = AsyncMock(side_effect=[stored_rows, new_edge_rows])
+    database.execute = AsyncMock()
+
+    @asynccontextmanager
+    async def _transaction():
+        yield conn
+
+    database.transaction = _transaction
+    detector = CommunityDetector(db_connection=database)
+    detector._has_leiden = False
+
+    update = await detector.update_communities_incremental("proj")
+
+    assert update.mode == "incremental"
+    assert update.nodes_changed == 1 and update.touched_communities == 1
+    assert update.upserted == 1 and update.deleted == 0
+    conn.executemany.assert_awaited_once()
+    assert len(conn.executemany.await_args.args[1]) == 1
+
+    # Gap-refresh clusters in concept_clusters are never read or touched
+    from graph.community_detector import COMMUNITY_ROWS_SQL
+
+    assert COMMUNITY_ROWS_SQL in database.fetch.await_args_list[0].args[0]
+    assert f"WHERE {COMMUNITY_ROWS_SQL} DO UPDATE" in conn.executemany.await_args.args[0]
+    assert all(COMMUNITY_ROWS_SQL in c.args[0] for c in conn.execute.await_args_list)
+    # Cached diversity/graph metrics read concept_clusters
+    assert "bump_graph_version" in database.execute.await_args.args[0]
+
+
+@pytest.mark.asyncio
+async def test_update_without_changes_advances_watermark(monkeypatch):
+    from graph import graph_snapshot
+    from graph.community_detector import CommunityDetector
+
+    service = graph_snapshot.GraphSnapshotService()
+    monkeypatch.setattr(graph_snapshot, "graph_snapshot_service", service)
+    monkeypatch.setattr(service, "get", AsyncMock(return_value=_snapshot()))
+
+    stored_rows = [
+        {"cluster_id": cid, "concepts": members, "label": None, "written_at": None}
+        for cid, members in STORED.items()
+    ]
+    database = MagicMock()
+    # Only a Paper edge is new: nothing to refine
+    database.fetch = AsyncMock(side_effect=[stored_rows, [{"source_id": "p", "target_id": "n"}]])
+    database.execute = AsyncMock()
+    detector = CommunityDetector(db_connection=database)
+
+    update = await detector.update_communities_incremental("proj")
+
+    assert update.mode == "unchanged"
+    database.execute.assert_awaited_once()
+    assert "SET updated_at = NOW()" in database.execute.await_args.args[0]
+    assert "'leiden'" in database.execute.await_args.args[0]
@@ -0,0 +1,115 @@
+"""
+Tests for ConceptNormalizer fuzzy indexing and bulk normalization.
+
+Unit tests only — the database is mocked.
+"""
+
+from contextlib import asynccontextmanager
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from graph.concept_normalizer import (
+    ConceptNormalizer,
+    FuzzyNameIndex,
+    normalize_string,
+    similarity_ratio,
+)
+
+
+class TestFuzzyNameIndex:
+
+    def test_matches_linear_scan(self):
+        names = [
+            "Graph Neural Network",
+            "Graph Neural Networks",
+            "Knowledge Graph",
+            "Knowledge Graphs Embedding",
+            "Attention Mechanism",
+            "Self Attention",
+        ]
+        index = FuzzyNameIndex(names)
+
+        for query in ["graph neural netwrk", "knowledge graph", "self-attention", "unrelated topic"]:
+            normalized = normalize_string(query)
+            expected = None
+            best = 0.0
+            for name in names:
+                score = similarity_ratio(normalized, normalize_string(name))
+                if score > best and score >= 0.85:
+                    expected, best = name, score
+            got = index.best_match(normalized, 0.85)
+            assert (got[0] if got else None) == expected
+
+    def test_alias_entry_and_remove(self):
+        index = FuzzyNameIndex(["Machine Learning"])
+        index.add("Statistical Learning Methods", canonical_name="Machine Learning")
+
+        assert index.best_match("statistical learning method", 0.85)[0] == "Machine Learning"
+        index.remove("Statistical Learning Methods")
+        assert index.best_match("statistical learning method", 0.85) is None
+
+
+def _db(concept_names):
+    db = MagicMock()
+
+    async def fetch(query, *args):
+        if "concept_aliases" in query:
+            return []
+        return [{"name": name} for name in concept_names]
+
+    db.fetch = AsyncMock(side_effect=fetch)
+    return db
+
+
+@pytest.mark.asyncio
+class TestConceptNormalizer:
+
+    async def test_project_index_loaded_once(self):
+        db = _db(["Cognitive Load Theory", "Scaffolding"])
+        normalizer = ConceptNormalizer(db_connection=db)
+
+        first = await normalizer.normalize("cognitive load theroy", project_id="p1")
+        second = await normalizer.normalize("scaffoldings", project_id="p1")
+
+        assert first.canonical_name == "Cognitive Load Theory"
+        assert first.match_type == "fuzzy"
+        assert second.canonical_name == "Scaffolding"
+        entity_queries = [c for c in db.fetch.call_args_list if "FROM entities" in c[0][0]]
+        assert len(entity_queries) == 1
+
+    async def test_normalize_many_dedupes_and_keeps_order(self):
+        db = _db(["Cognitive Load Theory"])
+        normalizer = ConceptNormalizer(db_connection=db)
+        normalizer.normalize = AsyncMock(wraps=normalizer.normalize)
+
+        results = await normalizer.normalize_many(
+            ["ML", "Cognitive load theory", "ml", "Brand New Idea"], project_id="p1"
+        )
+
+        assert [r.canonical_name for r in results] == [
+            "machine learning", "Cognitive Load Theory", "machine learning", "Brand New Idea",
+        ]
+        assert [r.original_name for r in results][2] == "ml"
+        assert normalizer.normalize.await_count == 3
+
+    async def test_merge_updates_index_incrementally(self):
+        db = _db(["Learner Motivation", "Student Motivation"])
+        conn = MagicMock()
+        conn.fetchrow = AsyncMock(side_effect=[{"name": "Student Motivation"}, {"name": "Learner Motivation"}])
+        conn.execute = AsyncMock()
+
+        @asynccontextmanager
+        async def transaction():
+            yield conn
+
+        db.transaction = transaction
+        normalizer = ConceptNormalizer(db_connection=db)
+        await normalizer.normalize("warm up", project_id="p1")
+
+        assert await normalizer.merge_concepts("canon-id", "dup-id", "p1") is True
+        result = await normalizer.normalize("student motivations", project_id="p1")
+
+        assert result.canonical_name == "Learner Motivation"
+        entity_queries = [c for c in db.fetch.call_args_list if "FROM entities" in c[0][0]]
+        assert len(entity_queries) == 1
@@ -0,0 +1,148 @@
+"""
+Tests for EntityDAO.bulk_upsert_relationships (COPY + single merge).
+
+Unit tests only — the asyncpg connection is mocked.
+"""
+
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+
+def _mock_db(merge_row):
+    conn = MagicMock()
+    conn.execute = AsyncMock()
+    conn.copy_records_to_table = AsyncMock()
+    conn.fetchrow = AsyncMock(return_value=merge_row)
+
+    db = MagicMock()
+
+    @asynccontextmanager
+    async def transaction():
+        yield conn
+
+    db.transaction = transaction
+    return db, conn
+
+
+@pytest.mark.asyncio
+class TestBulkUpsertRelationships:
+
+    async def test_stages_with_copy_and_merges_once(self):
+        from graph.persistence.entity_dao import EntityDAO
+
+        db, conn = _mock_db({"inserted": 2, "updated": 1})
+        dao = EntityDAO(db=db)
+        relationships = [
+            ("s1", "t1", "RELATED_TO", {"confidence": 0.9}, 0.9),
+            ("s2", "t2", "is_related_to", {"confidence": 0.8}, 0.8),
+            ("s3", "t3", "RELATED_TO", None, None),
+        ]
+
+        stats = await dao.bulk_upsert_relationships("proj-1", relationships)
+
+        assert stats == {"inserted": 2, "updated": 1}
+        conn.copy_records_to_table.assert_called_once()
+        table = conn.copy_records_to_table.call_args[0][0]
+        records = conn.copy_records_to_table.call_args[1]["records"]
+        assert table == "_relationship_stage"
+        assert len(records) == 3
+        # Relationship types normalized, properties serialized, weight defaulted
+        assert records[1][4] == "RELATED_TO"
+        assert json.loads(records[0][5]) == {"confidence": 0.9}
+        assert records[2][6] == 1.0
+
+        merge_sql = conn.fetchrow.call_args[0][0]
+        assert "INSERT INTO relationships" in merge_sql
+        assert "ON CONFLICT (source_id, target_id, relationship_type)" in merge_sql
+        assert "DISTINCT ON" in merge_sql
+        assert "RETURNING (xmax = 0)" in merge_sql
+
+    async def test_rejected_row_does_not_drop_the_batch(self):
+        import asyncpg
+
+        from graph.persistence.entity_dao import EntityDAO
+
+        db, conn = _mock_db(None)
+        staged = []
+
+        async def _copy(table, records, columns):
+            staged[:] = records
+
+        async def _merge(sql):
+            if any(record[2] == "bad" for record in staged):
+                raise asyncpg.exceptions.ForeignKeyViolationError("source entity missing")
+            return {"inserted": len(staged), "updated": 0}
+
+        conn.copy_records_to_table = AsyncMock(side_effect=_copy)
+        conn.fetchrow = AsyncMock(side_effect=_merge)
+        dao = EntityDAO(db=db)
+        relationships = [(f"s{i}", f"t{i}", "RELATED_TO", {}, 1.0) for i in range(5)]
+        relationships.insert(2, ("bad", "t", "RELATED_TO", {}, 1.0))
+
+        stats = await dao.bulk_upsert_relationships("proj-1", relationships)
+
+        assert stats == {"inserted": 5, "updated": 0}
+
+    async def test_connection_error_is_not_split(self):
+        from graph.persistence.entity_dao import EntityDAO
+
+        db, conn = _mock_db(None)
+        conn.fetchrow = AsyncMock(side_effect=ConnectionError("down"))
+        dao = EntityDAO(db=db)
+
+        with pytest.raises(ConnectionError):
+            await dao.bulk_upsert_relationships(
+                "proj-1", [("s1", "t1", "RELATED_TO", {}, 1.0), ("s2", "t2", "RELATED_TO", {}, 1.0)]
+            )
+        conn.fetchrow.assert_awaited_once()
+
+    async def test_empty_input_skips_db(self):
+        from graph.persistence.entity_dao import EntityDAO
+
+        db, conn = _mock_db(None)
+        dao = EntityDAO(db=db)
+
+        assert await dao.bulk_upsert_relationships("proj-1", []) == {"inserted": 0, "updated": 0}
+        conn.copy_records_to_table.assert_not_called()
+
+    async def test_in_memory_fallback(self):
+        from graph.persistence.entity_dao import EntityDAO
+
+        dao = EntityDAO(db=None)
+        stats = await dao.bulk_upsert_relationships(
+            "proj-1", [("s1", "t1", "RELATED_TO", {}, 0.7)]
+        )
+
+        assert stats == {"inserted": 1, "updated": 0}
+        assert len(dao.edges) == 1
+
+
+@pytest.mark.asyncio
+class TestBuildConceptRelationshipsBulk:
+
+    async def test_uses_bulk_write_path(self):
+        from graph.analytics.graph_analytics import GraphAnalytics
+
+        db = MagicMock()
+        db.fetch = AsyncMock(return_value=[
+            {"id": "00000000-0000-0000-0000-000000000001", "name": "A", "embedding": [1.0, 0.0]},
+            {"id": "00000000-0000-0000-0000-000000000002", "name": "B", "embedding": [0.99, 0.1]},
+        ])
+        dao = MagicMock()
+        dao.add_relationship = AsyncMock()
+        dao.bulk_upsert_relationships = AsyncMock(return_value={"inserted": 1, "updated": 0})
+
+        analytics = GraphAnalytics(db=db, entity_dao=dao)
+        stats = await analytics.build_concept_relationships_with_stats(
+            "00000000-0000-0000-0000-0000000000aa"
+        )
+
+        assert stats == {"candidates": 1, "inserted": 1, "updated": 0}
+        dao.bulk_upsert_relationships.assert_awaited_once()
+        dao.add_relationship.assert_not_called()
+        (source_id, target_id, rel_type, props, weight), = dao.bulk_upsert_relationships.call_args[0][1]
+        assert rel_type == "RELATED_TO"
+        assert props["auto_generated"] is True
@@ -6,8 +6,12 @@ import json
 import re
 
 import pytest
+from unittest.mock import AsyncMock, MagicMock
 
 from graph.entity_extractor import ExtractedEntity, EntityType
+import numpy as np
+
+import graph.entity_resolution as entity_resolution
 from graph.entity_resolution import EntityResolutionService
 
 
@@ -160,3 +164,133 @@ async def test_resolve_entities_async_uses_llm_confirmation_for_uncertain_pairs(
     assert async_stats.llm_pairs_confirmed == 1
     assert async_stats.potential_false_merge_count == 1
     assert len(async_stats.potential_false_merge_samples) == 1
+
+
+@pytest.mark.asyncio
+async def test_cross_paper_linking_runs_one_statement_per_entity_type():
+    service = EntityResolutionService()
+    db = MagicMock()
+    db.fetchrow = AsyncMock(side_effect=[
+        {"groups_found": 2, "pairs_found": 5, "links_created": 3},
+        {"groups_found": 0, "pairs_found": 0, "links_created": 0},
+    ])
+    db.fetchval = AsyncMock(side_effect=AssertionError("no per-pair lookups"))
+    db.execute = AsyncMock(side_effect=AssertionError("no per-pair inserts"))
+
+    result = await service.cross_paper_entity_linking(
+        "proj-1", db, entity_types=["Method", "Dataset"]
+    )
+
+    assert result == {
+        "groups_found": 2,
+        "links_created": 3,
+        "skipped_existing": 2,
+        "entity_types": ["Method", "Dataset"],
+    }
+    assert db.fetchrow.await_count == 2
+    sql, project_id, entity_type = db.fetchrow.call_args_list[0][0]
+    assert (project_id, entity_type) == ("proj-1", "Method")
+    assert "ON CONFLICT (source_id, target_id, relationship_type)" in sql
+    assert "RETURNING 1" in sql
+    assert "b.paper_id <> a.paper_id" in sql
+
+
+def _clustered_embedding_records(n: int, dim: int = 32, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(n // 4, dim))
+    vectors = centers[np.arange(n) % len(centers)] + 0.05 * rng.normal(size=(n, dim))
+    return [
+        {
+            "entity_type": "Concept",
+            "context_bucket": "__default__",
+            "canonical_name": f"concept {i}",
+            "embedding": vectors[i],
+        }
+        for i in range(n)
+    ]
+
+
+def test_embedding_candidates_ann_path_matches_exact(monkeypatch):
+    service = EntityResolutionService()
+    records = _clustered_embedding_records(200)
+
+    exact = service._generate_embedding_candidate_pairs(records, embedding_review_threshold=0.9)
+    monkeypatch.setattr(entity_resolution, "EXACT_EMBEDDING_BUCKET_MAX", 10)
+    approx = service._generate_embedding_candidate_pairs(records, embedding_review_threshold=0.9)
+
+    exact_pairs = {(left[2], right[2]) for left, right, _ in exact}
+    approx_pairs = {(left[2], right[2]) for left, right, _ in approx}
+    assert exact_pairs
+    # Every approximate pair is verified exactly; recall should be near-total.
+    assert approx_pairs <= exact_pairs
+    assert len(approx_pairs) >= 0.95 * len(exact_pairs)
+    assert all(score >= 0.9 for _, _, score in approx)
+    assert [s for _, _, s in approx] == sorted((s for _, _, s in approx), reverse=True)
+
+
+def test_string_candidates_minhash_blocking_keeps_near_duplicates(monkeypatch):
+    service = EntityResolutionService()
+    base_names = [f"topic {word} analysis" for word in (
+        "alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel",
+    )]
+    variants = {name: name.replace(" analysis", "  analysis") for name in base_names}
+    names = base_names + list(variants.values())
+    keys = [("Concept", "__default__", name) for name in names]
+
+    exact = service._generate_candidate_pairs(keys, min_similarity=0.9)
+    monkeypatch.setattr(entity_resolution, "EXACT_STRING_BUCKET_MAX", 4)
+    blocked = service._generate_candidate_pairs(keys, min_similarity=0.9)
+
+    variant_pairs = {tuple(sorted((name, variant))) for name, variant in variants.items()}
+    blocked_pairs = {(left[2], right[2]) for left, right, _ in blocked}
+    assert variant_pairs <= {(left[2], right[2]) for left, right, _ in exact}
+    assert variant_pairs <= blocked_pairs
+    assert blocked_pairs <= {(left[2], right[2]) for left, right, _ in exact}
+
+
+def test_lsh_recall_at_review_threshold():
+    # Pairs with cosine in [0.825, 0.845]: just above llm_review_threshold (0.82)
+    rng = np.random.default_rng(7)
+    n_pairs, dim = 300, 64
+    base = entity_resolution._normalize_rows(rng.standard_normal((n_pairs, dim)))
+    noise = rng.standard_normal((n_pairs, dim)).astype(np.float32)
+    noise -= np.sum(noise * base, axis=1, keepdims=True) * base
+    noise = entity_resolution._normalize_rows(noise)
+    cos = rng.uniform(0.825, 0.845, size=(n_pairs, 1)).astype(np.float32)
+    unit = entity_resolution._normalize_rows(np.vstack([base, cos * base + np.sqrt(1 - cos**2) * noise]))
+
+    rows, cols, _ = entity_resolution._lsh_cosine_pairs(unit, threshold=0.82)
+
+    found = {(int(i), int(j)) for i, j in zip(rows, cols)}
+    hits = sum((i, i + n_pairs) in found for i in range(n_pairs))
+    assert hits >= 0.97 * n_pairs
+
+
+def _anisotropic_duplicates(n=600, dim=32, seed=3):
+    # Shared offset makes every vector point the same way; odd rows are
+    # near-duplicates of the preceding even row.
+    rng = np.random.default_rng(seed)
+    vectors = 2.0 * rng.standard_normal(dim) + rng.standard_normal((n, dim))
+    vectors[1::2] = vectors[0::2] + 0.3 * rng.standard_normal((n // 2, dim))
+    return entity_resolution._normalize_rows(vectors)
+
+
+def test_lsh_oversized_groups_fall_back_to_blocked_exact(monkeypatch):
+    unit = _anisotropic_duplicates()
+    monkeypatch.setattr(entity_resolution, "ANN_MAX_GROUP_SIZE", 8)
+    monkeypatch.setattr(entity_resolution, "ANN_EXACT_BLOCK_ELEMENTS", 1000)
+
+    # Two bits per table: every group is oversized, so the blocked exact path runs
+    rows, cols, _ = entity_resolution._lsh_cosine_pairs(unit, 0.95, bits_per_table=2, tables=4)
+    exact_rows, exact_cols, _ = entity_resolution._exact_cosine_pairs(unit, 0.95)
+
+    assert set(zip(rows.tolist(), cols.tolist())) == set(zip(exact_rows.tolist(), exact_cols.tolist()))
+
+
+def test_lsh_finds_near_duplicates_in_anisotropic_embeddings():
+    unit = _anisotropic_duplicates()
+
+    rows, cols, _ = entity_resolution._lsh_cosine_pairs(unit, 0.95)
+
+    found = set(zip(rows.tolist(), cols.tolist()))
+    assert all((i, i + 1) in found for i in range(0, unit.shape[0], 2))
@@ -55,6 +55,18 @@ class TestGapDetector:
             assert hasattr(cluster, 'concept_ids')
             assert hasattr(cluster, 'color')
 
+    @pytest.mark.asyncio
+    async def test_cluster_concepts_without_labeling(self, gap_detector, sample_concepts):
+        """Test that label_clusters=False skips the per-cluster label calls."""
+        gap_detector._generate_cluster_label = AsyncMock(return_value="Topic")
+
+        clusters = await gap_detector.cluster_concepts(
+            sample_concepts, n_clusters=2, label_clusters=False
+        )
+
+        assert len(clusters) == 2
+        gap_detector._generate_cluster_label.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_cluster_with_few_concepts(self, gap_detector):
         """Test clustering with fewer concepts than clusters."""
@@ -328,3 +340,101 @@ class TestFullGraphAnalysis:
         assert isinstance(result["clusters"], list)
         assert isinstance(result["gaps"], list)
         assert isinstance(result["summary"], str)
+
+    @pytest.mark.asyncio
+    async def test_structure_scoring_runs_off_event_loop(self, sample_data):
+        """Centrality, gap and bridge scoring run in a worker thread."""
+        import threading
+
+        from graph.gap_detector import GapDetector
+
+        concepts, relationships = sample_data
+        detector = GapDetector()
+        loop_thread = threading.get_ident()
+        scoring_threads = []
+        score_structure = detector._score_structure
+
+        def _record_thread(*args, **kwargs):
+            scoring_threads.append(threading.get_ident())
+            return score_structure(*args, **kwargs)
+
+        detector._score_structure = _record_thread
+        result = await detector.analyze_graph(concepts, relationships)
+
+        assert len(scoring_threads) == 1
+        assert scoring_threads[0] != loop_thread
+        assert len(result["centrality"]) == len(concepts)
+
+
+class TestVectorizedGapScoring:
+    """Batched bridge / potential-edge scoring matches per-pair cosine similarity."""
+
+    @pytest.fixture
+    def concepts(self):
+        rng = np.random.default_rng(7)
+        items = [
+            {"id": f"c{i}", "name": f"concept {i}", "embedding": rng.normal(size=8).tolist()}
+            for i in range(30)
+        ]
+        items.append({"id": "no-emb", "name": "no embedding", "embedding": None})
+        return items
+
+    @staticmethod
+    def _cos(a, b):
+        a, b = np.asarray(a), np.asarray(b)
+        return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+    def test_potential_edges_match_pairwise_reference(self, concepts):
+        from graph.gap_detector import GapDetector, StructuralGap
+
+        gap = StructuralGap(concept_a_ids=["c0", "c1", "c2", "no-emb"], concept_b_ids=["c3", "c4", "c5", "c6"])
+        edges = GapDetector().compute_potential_edges(gap, concepts, top_n=3, min_similarity=-1.0)
+
+        by_id = {c["id"]: c for c in concepts}
+        expected = sorted(
+            ((self._cos(by_id[a]["embedding"], by_id[b]["embedding"]), a, b)
+             for a in ["c0", "c1", "c2"] for b in ["c3", "c4", "c5", "c6"]),
+            reverse=True,
+        )[:3]
+        assert [(e.source_id, e.target_id) for e in edges] == [(a, b) for _, a, b in expected]
+        assert [e.similarity for e in edges] == pytest.approx([s for s, _, _ in expected], abs=1e-5)
+        assert edges[0].source_name == by_id[edges[0].source_id]["name"]
+
+    def test_bridge_candidates_match_reference_and_batch(self, concepts):
+        from graph.gap_detector import CentralityMetrics, GapDetector, StructuralGap
+
+        detector = GapDetector()
+        gap_1 = StructuralGap(concept_a_ids=["c0", "c1"], concept_b_ids=["c2", "c3"])
+        gap_2 = StructuralGap(concept_a_ids=["c4"], concept_b_ids=["c5", "c6"])
+        centrality = [CentralityMetrics(entity_id="c10", betweenness=0.5)]
+
+        by_id = {c["id"]: c for c in concepts}
+        scores = []
+        for c in concepts:
+            if c["id"] in {"c0", "c1", "c2", "c3"} or c["embedding"] is None:
+                continue
+            sim_a = np.mean([self._cos(c["embedding"], by_id[x]["embedding"]) for x in ("c0", "c1")])
+            sim_b = np.mean([self._cos(c["embedding"], by_id[x]["embedding"]) for x in ("c2", "c3")])
+            bonus = 1.5 if c["id"] == "c10" else 1.0
+            scores.append((np.sqrt(max(sim_a * sim_b, 0.0)) * bonus, c["id"]))
+        expected = [cid for _, cid in sorted(scores, key=lambda x: -x[0])[:5]]
+
+        assert detector.find_bridge_candidates(gap_1, concepts, centrality) == expected
+
+        batch = detector.find_bridge_candidates_batch([gap_1, gap_2], concepts, centrality)
+        assert batch[gap_1.id] == expected
+        assert len(batch[gap_2.id]) == 5
+        assert not {"c4", "c5", "c6"} & set(batch[gap_2.id])
+
+    def test_potential_edges_chunking_matches_single_block(self, concepts, monkeypatch):
+        from graph import gap_detector
+        from graph.gap_detector import GapDetector, StructuralGap
+
+        gap = StructuralGap(
+            concept_a_ids=[f"c{i}" for i in range(12)], concept_b_ids=[f"c{i}" for i in range(12, 30)]
+        )
+        whole = GapDetector().compute_potential_edges(gap, concepts, top_n=7, min_similarity=0.0)
+        monkeypatch.setattr(gap_detector, "POTENTIAL_EDGE_BLOCK_ELEMENTS", 20)
+        chunked = GapDetector().compute_potential_edges(gap, concepts, top_n=7, min_similarity=0.0)
+
+        assert [(e.source_id, e.target_id) for e in chunked] == [(e.source_id, e.target_id) for e in whole]
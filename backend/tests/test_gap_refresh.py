@@ -0,0 +1,165 @@
+"""
+Tests for the gap refresh background job (graph.gap_refresh).
+
+Unit tests only — the database and LLM are mocked.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from graph.gap_detector import CentralityMetrics, ConceptCluster, StructuralGap
+
+
+def _analysis():
+    clusters = [
+        ConceptCluster(id=0, concept_ids=["a", "b", "c"], keywords=["alpha", "beta"]),
+        ConceptCluster(id=1, concept_ids=["d", "e"], keywords=[]),
+    ]
+    gap = StructuralGap(
+        id="g1",
+        cluster_a_id=0,
+        cluster_b_id=1,
+        gap_strength=0.8,
+        concept_a_ids=["a", "b", "c"],
+        concept_b_ids=["d", "e"],
+        bridge_concepts=["c", "a"],
+    )
+    metrics = [CentralityMetrics(entity_id="a", degree=0.5, betweenness=0.25, pagerank=0.1)]
+    return {"clusters": clusters, "gaps": [gap], "centrality": metrics}
+
+
+CONCEPTS = [
+    {"id": cid, "name": name, "embedding": np.zeros(2, dtype=np.float32)}
+    for cid, name in [("a", "alpha"), ("b", "beta"), ("c", "gamma"), ("d", ""), ("e", None)]
+]
+RELATIONSHIPS = [
+    {"source_id": "a", "target_id": "b"},
+    {"source_id": "b", "target_id": "c"},
+    {"source_id": "c", "target_id": "d"},  # Crosses clusters
+]
+
+
+class TestBuildPersistenceRows:
+
+    def test_cluster_rows_density_and_labels(self):
+        from graph.gap_refresh import build_persistence_rows
+
+        rows = build_persistence_rows("p", CONCEPTS, RELATIONSHIPS, _analysis(), {0: "Alpha topic"})
+
+        first, second = rows["clusters"]
+        assert first[:5] == ("p", 0, ["a", "b", "c"], ["alpha", "beta", "gamma"], 3)
+        assert first[5] == pytest.approx(2 / 3)
+        assert first[6] == "Alpha topic"
+        assert second[5] == 0.0 and second[6] == "Cluster 2"
+
+    def test_gap_rows_use_names_in_concept_order_with_fallbacks(self):
+        from graph.gap_refresh import build_persistence_rows
+
+        rows = build_persistence_rows("p", CONCEPTS, RELATIONSHIPS, _analysis(), {})
+
+        (gap,) = rows["gaps"]
+        assert gap[5] == ["alpha", "beta", "gamma"]
+        assert gap[6] == ["Cluster 2"]  # No names, no keywords
+        assert gap[8] == ["alpha", "gamma"]  # Bridge names, concept order
+
+    def test_centrality_arrays(self):
+        from graph.gap_refresh import build_persistence_rows
+
+        rows = build_persistence_rows("p", CONCEPTS, RELATIONSHIPS, _analysis(), {})
+
+        assert rows["centrality"] == {
+            "ids": ["a"], "degree": [0.5], "betweenness": [0.25], "pagerank": [0.1],
+        }
+
+
+@pytest.mark.asyncio
+async def test_label_clusters_bounded_concurrency(monkeypatch):
+    from config import settings
+    from graph.gap_refresh import label_clusters
+
+    monkeypatch.setattr(settings, "gap_refresh_label_concurrency", 2)
+    in_flight = peak = 0
+
+    async def _generate(keywords):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return keywords[0].title()
+
+    detector = MagicMock()
+    detector._generate_cluster_label = _generate
+    clusters = [ConceptCluster(id=i, concept_ids=[str(i)], keywords=[f"k{i}"]) for i in range(6)]
+    clusters.append(ConceptCluster(id=6, concept_ids=["x"], keywords=[]))
+
+    labels = await label_clusters(detector, clusters, {"x": "x-name"})
+
+    assert peak == 2
+    assert labels[0] == "K0" and labels[6] == "x-name"
+
+
+@pytest.mark.asyncio
+async def test_persist_writes_in_one_transaction():
+    from graph.gap_refresh import build_persistence_rows, persist_gap_analysis
+
+    conn = MagicMock()
+    conn.execute = AsyncMock()
+    conn.executemany = AsyncMock()
+    database = MagicMock()
+
+    @asynccontextmanager
+    async def _transaction():
+        yield conn
+
+    database.transaction = _transaction
+    rows = build_persistence_rows("p", CONCEPTS, RELATIONSHIPS, _analysis(), {})
+
+    await persist_gap_analysis(database, "p", rows)
+
+    statements = [c.args[0] for c in conn.execute.await_args_list]
+    assert "pg_advisory_xact_lock" in statements[0]
+    assert "DELETE FROM concept_clusters" in statements[1]
+    assert "NOT COALESCE(detection_method IN" in statements[1]  # communities are kept
+    assert "'kmeans'" in conn.executemany.await_args_list[0].args[0]
+    assert "DELETE FROM structural_gaps" in statements[2]
+    assert "unnest" in statements[3] and len(statements) == 4
+    assert conn.executemany.await_count == 2
+    assert len(conn.executemany.await_args_list[0].args[1]) == 2
+
+
+@pytest.mark.asyncio
+async def test_run_gap_refresh_completes_job(monkeypatch):
+    from graph import gap_refresh
+    from graph.graph_snapshot import graph_snapshot_service
+    from jobs.job_store import JobStatus, JobStore
+    import llm.user_provider
+
+    job_store = JobStore(db_connection=None)
+    job = await job_store.create_job(job_type=gap_refresh.GAP_REFRESH_JOB_TYPE)
+    persisted = {}
+
+    async def _persist(database, project_id, rows):
+        persisted.update(rows)
+
+    monkeypatch.setattr(graph_snapshot_service, "get", AsyncMock(return_value=MagicMock()))
+    monkeypatch.setattr(
+        gap_refresh, "build_gap_inputs",
+        lambda snapshot: gap_refresh.GapInputs(CONCEPTS, RELATIONSHIPS, total_concepts=5),
+    )
+    monkeypatch.setattr(gap_refresh, "persist_gap_analysis", _persist)
+    monkeypatch.setattr(llm.user_provider, "create_llm_provider_for_user", AsyncMock(return_value=None))
+    monkeypatch.setattr("graph.gap_detector.GapDetector.analyze_graph", AsyncMock(return_value=_analysis()))
+    database = MagicMock()
+    database.execute = AsyncMock()
+
+    await gap_refresh.run_gap_refresh(job_store, job.id, "p", database)
+
+    done = await job_store.get_job(job.id)
+    assert done.status == JobStatus.COMPLETED
+    assert done.result["clusters"] == 2 and done.result["gaps"] == 1
+    assert len(persisted["clusters"]) == 2
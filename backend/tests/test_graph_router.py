@@ -175,3 +175,129 @@ class TestMetricsCacheHelpers:
 
         assert await cache.get(f"diversity:{project_id}") is None
         assert await cache.get(f"graph_metrics:{other_project}") == {"value": 2}
+
+
+@pytest.mark.asyncio
+class TestGraphMetricsStore:
+    """Tests for the persistent, graph-version-stamped metrics store."""
+
+    async def test_get_returns_payload_for_current_version(self):
+        from graph.metrics_cache import GraphMetricsStore
+
+        store = GraphMetricsStore()
+        database = MagicMock()
+        database.fetchval = AsyncMock(side_effect=[7, {"modularity": 0.4}])
+
+        version, payload = await store.get(database, "proj-1", "graph_metrics")
+
+        assert version == 7
+        assert payload == {"modularity": 0.4}
+        # Payload lookup is pinned to the current graph version
+        assert database.fetchval.call_args_list[1][0][3] == 7
+
+    async def test_local_hit_skips_payload_query(self):
+        from graph.metrics_cache import GraphMetricsStore
+
+        store = GraphMetricsStore()
+        database = MagicMock()
+        database.fetchval = AsyncMock(return_value=3)
+        database.execute = AsyncMock()
+
+        await store.set(database, "proj-1", "diversity", 3, {"value": 1})
+        version, payload = await store.get(database, "proj-1", "diversity")
+
+        assert (version, payload) == (3, {"value": 1})
+        database.fetchval.assert_called_once()
+        sql = database.execute.call_args[0][0]
+        assert "INSERT INTO graph_metrics_store" in sql
+        assert "ON CONFLICT" in sql
+
+    async def test_version_bump_misses_old_payload(self):
+        from graph.metrics_cache import GraphMetricsStore
+
+        store = GraphMetricsStore()
+        database = MagicMock()
+        database.execute = AsyncMock()
+        await store.set(database, "proj-1", "diversity", 3, {"value": 1})
+
+        database.fetchval = AsyncMock(side_effect=[4, None])
+        version, payload = await store.get(database, "proj-1", "diversity")
+
+        assert version == 4
+        assert payload is None
+
+    async def test_falls_back_to_local_cache_without_store_tables(self):
+        from graph.metrics_cache import GraphMetricsStore
+
+        store = GraphMetricsStore()
+        database = MagicMock()
+        database.fetchval = AsyncMock(side_effect=Exception("relation does not exist"))
+        database.execute = AsyncMock()
+
+        await store.set(database, "proj-1", "centrality:degree", None, {"ok": True})
+        version, payload = await store.get(database, "proj-1", "centrality:degree")
+
+        assert version is None
+        assert payload == {"ok": True}
+        database.execute.assert_not_called()
+
+    async def test_invalidate_project_bumps_version(self):
+        from graph.metrics_cache import GraphMetricsStore
+
+        store = GraphMetricsStore()
+        database = MagicMock()
+        database.execute = AsyncMock()
+
+        await store.invalidate_project(database, "proj-1")
+
+        assert "bump_graph_version" in database.execute.call_args[0][0]
+
+    async def test_fallback_entries_expire_after_fallback_ttl(self):
+        from graph.metrics_cache import GraphMetricsStore
+
+        store = GraphMetricsStore()
+        database = MagicMock()
+        database.fetchval = AsyncMock(side_effect=Exception("relation does not exist"))
+
+        await store.set(database, "proj-1", "project_summary", None, {"ok": True}, fallback_ttl=0)
+        _, payload = await store.get(database, "proj-1", "project_summary")
+
+        assert payload is None
+
+
+@pytest.mark.asyncio
+class TestProjectSummaryCaching:
+    """The version-keyed summary must not pin project fields the graph version ignores."""
+
+    async def test_cached_graph_summary_uses_fresh_project_name(self, monkeypatch):
+        import routers.graph as graph_router
+        from graph.metrics_cache import MetricsTTLCache
+
+        project_id = UUID("00000000-0000-0000-0000-000000000042")
+        graph_summary = {
+            "project_id": str(project_id),
+            "overview": {
+                "total_entities": 10,
+                "total_relationships": 4,
+                "entity_type_distribution": {"Concept": 10},
+            },
+            "quality_metrics": {},
+            "top_entities": [],
+            "communities": [],
+            "structural_gaps": [],
+        }
+        monkeypatch.setattr(graph_router, "verify_project_access", AsyncMock())
+        monkeypatch.setattr(graph_router, "metrics_cache", MetricsTTLCache())
+        monkeypatch.setattr(
+            graph_router.graph_metrics_store, "get", AsyncMock(return_value=(5, graph_summary))
+        )
+        database = MagicMock()
+        database.fetchrow = AsyncMock(side_effect=[{"name": "Renamed"}, {"min_year": None, "max_year": None}])
+        database.fetchval = AsyncMock(return_value=3)
+
+        summary = await graph_router.get_project_summary(project_id, database=database, current_user=None)
+
+        assert summary["project_name"] == "Renamed"
+        assert summary["overview"]["total_papers"] == 3
+        assert summary["overview"]["total_entities"] == 10
+        assert summary["temporal_info"]["min_year"] is None
@@ -0,0 +1,136 @@
+"""
+Tests for the shared project graph snapshot (graph.graph_snapshot).
+
+Unit tests only — the database is mocked.
+"""
+
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+
+def _entity(node_id, entity_type="Concept", name=None, embedding=None):
+    return {"id": node_id, "entity_type": entity_type, "name": name or node_id, "embedding": embedding}
+
+
+def _rel(source, target, rel_type="RELATED_TO", weight=1.0, property_weight=1.0):
+    return {
+        "source_id": source,
+        "target_id": target,
+        "relationship_type": rel_type,
+        "weight": weight,
+        "property_weight": property_weight,
+    }
+
+
+ENTITIES = [
+    _entity("a", embedding="[1, 0]"),
+    _entity("b", embedding=[0.0, 1.0]),
+    _entity("c", "Method"),
+    _entity("d"),
+    _entity("p", "Paper"),
+]
+RELATIONSHIPS = [
+    _rel("a", "b", weight=2.0, property_weight=0.5),
+    _rel("b", "c"),
+    _rel("p", "a", "DISCUSSES_CONCEPT"),
+    _rel("a", "missing"),  # Endpoint outside the project: dropped
+]
+
+
+def _mock_db(version=1):
+    database = MagicMock()
+    database.fetchval = AsyncMock(return_value=version)
+    database.fetch = AsyncMock(side_effect=lambda sql, *args: ENTITIES if "FROM entities" in sql else RELATIONSHIPS)
+    return database
+
+
+class TestBuildGraphSnapshot:
+
+    def test_csr_adjacency_and_edge_arrays(self):
+        from graph.graph_snapshot import build_graph_snapshot
+
+        snapshot = build_graph_snapshot("proj", 3, ENTITIES, RELATIONSHIPS)
+
+        assert snapshot.num_nodes == 5
+        assert snapshot.num_edges == 3
+        a, b, c = (snapshot.index[x] for x in "abc")
+        assert sorted(snapshot.neighbors(a).tolist()) == sorted([b, snapshot.index["p"]])
+        assert snapshot.neighbors(c).tolist() == [b]
+        assert snapshot.degree().tolist() == [2, 2, 1, 0, 1]
+        assert snapshot.weights[0] == 2.0 and snapshot.property_weights[0] == 0.5
+        assert snapshot.compact_edges()[0] == ("a", "b", 0.5)
+
+    def test_embeddings_are_float32_matrix(self):
+        from graph.graph_snapshot import build_graph_snapshot
+
+        snapshot = build_graph_snapshot("proj", 3, ENTITIES, RELATIONSHIPS)
+
+        assert snapshot.embeddings.dtype == np.float32
+        assert snapshot.has_embedding.tolist() == [True, True, False, False, False]
+        np.testing.assert_array_equal(snapshot.embedding_matrix(np.array([0, 1])), np.eye(2))
+
+    def test_masks_and_connected_components(self):
+        from graph.graph_snapshot import build_graph_snapshot
+
+        snapshot = build_graph_snapshot("proj", 3, ENTITIES, RELATIONSHIPS)
+        concepts = snapshot.node_mask(include_types=("Concept",))
+        assert concepts.tolist() == [True, True, False, True, False]
+        assert snapshot.edge_mask(concepts).tolist() == [True, False, False]
+
+        no_papers = snapshot.node_mask(exclude_types=("Paper",))
+        labels = snapshot.connected_components(no_papers)
+        assert labels.tolist() == [0, 0, 0, 1, -1]
+
+
+@pytest.mark.asyncio
+class TestGraphSnapshotService:
+
+    async def test_reuses_snapshot_until_version_changes(self):
+        from graph.graph_snapshot import GraphSnapshotService
+
+        database = _mock_db(version=1)
+        service = GraphSnapshotService(max_bytes=10 ** 9, max_projects=4)
+
+        first = await service.get(database, "proj")
+        second = await service.get(database, "proj")
+        assert second is first
+        assert database.fetch.await_count == 2  # One entity + one relationship scan
+
+        database.fetchval.return_value = 2
+        third = await service.get(database, "proj")
+        assert third is not first and third.version == 2
+        assert database.fetch.await_count == 4
+        assert service.get_stats()["hits"] == 1
+
+    async def test_lru_eviction_by_bytes(self):
+        from graph.graph_snapshot import GraphSnapshotService
+
+        database = _mock_db()
+        service = GraphSnapshotService(max_bytes=10 ** 9, max_projects=4)
+        one = await service.get(database, "p1")
+        service.max_bytes = int(one.nbytes * 2.5)
+
+        await service.get(database, "p2")
+        await service.get(database, "p1")  # p1 becomes most recent
+        await service.get(database, "p3")
+
+        stats = service.get_stats()
+        assert stats["projects"] == 2 and stats["evictions"] == 1
+        assert stats["bytes"] <= service.max_bytes
+        assert list(service._snapshots) == ["p1", "p3"]
+
+
+@pytest.mark.asyncio
+async def test_community_connected_components_use_snapshot(monkeypatch):
+    from graph import graph_snapshot
+    from graph.community_detector import CommunityDetector
+
+    monkeypatch.setattr(graph_snapshot, "graph_snapshot_service", graph_snapshot.GraphSnapshotService())
+    detector = CommunityDetector(db_connection=_mock_db())
+    detector._has_leiden = False
+
+    communities = await detector.detect_communities("proj", min_community_size=2)
+
+    assert [c.entity_ids for c in communities] == [["a", "b", "c"]]
+    assert communities[0].detection_method == "connected_components"
@@ -0,0 +1,89 @@
+"""
+Tests for incremental import checkpoints (JobStore checkpoint log + batched saver).
+
+Unit tests only — the database is mocked.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+
+def _entry(paper_id, index, total=10):
+    return {
+        "paper_id": paper_id,
+        "index": index,
+        "total_papers": total,
+        "project_id": "",
+        "stage": "importing",
+    }
+
+
+@pytest.mark.asyncio
+class TestJobStoreCheckpoints:
+
+    async def test_memory_log_dedupes_and_keeps_order(self):
+        from jobs import JobStore
+
+        store = JobStore()
+        await store.append_checkpoints("job-1", [("p1", 0), ("p2", 1)])
+        await store.append_checkpoints("job-1", [("p2", 1), ("p3", 2)])
+
+        assert await store.get_processed_paper_ids("job-1") == ["p1", "p2", "p3"]
+        assert await store.get_processed_paper_ids("job-2") == []
+
+    async def test_db_uses_one_batched_insert_and_one_query(self):
+        from jobs import JobStore
+
+        db = MagicMock()
+        db.executemany = AsyncMock()
+        db.fetch = AsyncMock(return_value=[{"paper_id": "p1"}, {"paper_id": "p2"}])
+        store = JobStore(db_connection=db)
+
+        assert await store.append_checkpoints("job-1", [("p1", 0), ("p2", 1)]) is True
+        db.executemany.assert_awaited_once()
+        sql, rows = db.executemany.call_args[0]
+        assert "ON CONFLICT (job_id, paper_id) DO NOTHING" in sql
+        assert rows == [("job-1", "p1", 0), ("job-1", "p2", 1)]
+
+        assert await store.get_processed_paper_ids("job-1") == ["p1", "p2"]
+        db.fetch.assert_awaited_once()
+        assert "WHERE job_id = $1" in db.fetch.call_args[0][0]
+
+
+@pytest.mark.asyncio
+class TestQueuedCheckpointSaver:
+
+    async def test_batches_pending_papers(self):
+        from routers.import_ import _QueuedCheckpointSaver
+
+        job_store = MagicMock()
+        job_store.append_checkpoints = AsyncMock(return_value=True)
+        job_store.update_job = AsyncMock()
+        saver = _QueuedCheckpointSaver(job_store=job_store, job_id="job-1", processed_count=5)
+
+        for i in range(4):
+            saver.enqueue(**_entry(f"p{i}", i))
+        await saver.flush_and_close()
+
+        # All four papers queued before the worker ran go out as one batch
+        job_store.append_checkpoints.assert_awaited_once_with(
+            "job-1", [("p0", 0), ("p1", 1), ("p2", 2), ("p3", 3)]
+        )
+        checkpoint = job_store.update_job.call_args.kwargs["metadata"]["checkpoint"]
+        assert checkpoint["processed_count"] == 9
+        assert checkpoint["last_processed_index"] == 3
+        assert "processed_paper_ids" not in checkpoint
+
+    async def test_load_processed_ids_merges_legacy_metadata(self):
+        from jobs import Job, JobStore
+        from routers.import_ import _load_processed_paper_ids
+
+        store = JobStore()
+        await store.append_checkpoints("job-1", [("p1", 0), ("p2", 1)])
+        job = Job(
+            id="job-1",
+            job_type="zotero_import",
+            metadata={"checkpoint": {"processed_paper_ids": ["p0", "p1"]}},
+        )
+
+        assert await _load_processed_paper_ids(store, job) == ["p1", "p2", "p0"]
@@ -0,0 +1,177 @@
+"""
+Tests for the two-tier LLM response cache (LRU, persistent backend, semantic layer).
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+
+def _embed_fn(vectors):
+    async def embed(text):
+        return vectors[text]
+    return embed
+
+
+class TestLRU:
+
+    def test_evicts_least_recently_used(self):
+        from cache import LLMCache
+
+        cache = LLMCache(max_size=2)
+        cache.set("a", prompt="pa")
+        cache.set("b", prompt="pb")
+        assert cache.get(prompt="pa") == "a"  # pa becomes most recent
+
+        cache.set("c", prompt="pc")
+
+        assert cache.get(prompt="pb") is None
+        assert cache.get(prompt="pa") == "a"
+        assert cache.get(prompt="pc") == "c"
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_byte_cap_and_stats(self):
+        from cache import LLMCache
+
+        cache = LLMCache(max_size=100, max_bytes=10)
+        cache.set("12345", prompt="p1")
+        cache.set("67890", prompt="p2")
+        cache.set("abcde", prompt="p3")
+
+        stats = cache.get_stats()
+        assert stats["size"] == 2
+        assert stats["size_bytes"] == 10
+        assert stats["bytes_stored"] == 15
+
+        cache.get(prompt="p3")
+        cache.get(prompt="missing")
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["bytes_served"] == 5
+        assert stats["hit_rate"] == 0.5
+
+    def test_overwrite_keeps_byte_count(self):
+        from cache import LLMCache
+
+        cache = LLMCache()
+        cache.set("aaaa", prompt="p")
+        cache.set("bb", prompt="p")
+
+        assert cache.get_stats()["size_bytes"] == 2
+        cache.invalidate()
+        assert cache.get_stats()["size_bytes"] == 0
+
+
+@pytest.mark.asyncio
+class TestPersistentTier:
+
+    async def test_sqlite_survives_new_instance(self, tmp_path):
+        from cache import LLMCache, SQLiteCacheBackend
+
+        path = str(tmp_path / "llm_cache.sqlite3")
+        first = LLMCache(backend=SQLiteCacheBackend(path))
+        await first.aset("answer", prompt="q", model="m")
+
+        second = LLMCache(backend=SQLiteCacheBackend(path))
+        assert await second.aget(prompt="q", model="m") == "answer"
+        # Promoted into the in-process tier
+        assert second.get(prompt="q", model="m") == "answer"
+        stats = second.get_stats()
+        assert stats["persistent_hits"] == 1
+        assert stats["backend"] == "sqlite"
+
+    async def test_sqlite_expired_entries_are_cleaned(self, tmp_path):
+        from cache import SQLiteCacheBackend
+
+        backend = SQLiteCacheBackend(str(tmp_path / "c.sqlite3"))
+        await backend.set("k", "v", ttl=-1)
+
+        assert await backend.get("k") is None
+        assert await backend.cleanup() == 1
+
+    async def test_backend_errors_fail_open(self):
+        from cache import LLMCache
+
+        backend = MagicMock()
+        backend.name = "redis"
+        backend.get = AsyncMock(side_effect=ConnectionError("down"))
+        backend.set = AsyncMock(side_effect=ConnectionError("down"))
+        cache = LLMCache(backend=backend)
+
+        assert await cache.aget(prompt="q") is None
+        await cache.aset("r", prompt="q")
+        assert await cache.aget(prompt="q") == "r"
+        assert cache.get_stats()["backend_errors"] == 2
+
+    async def test_postgres_backend_skipped_when_disconnected(self):
+        from cache import PostgresCacheBackend
+
+        database = MagicMock()
+        database.is_connected = False
+        database.fetchval = AsyncMock()
+
+        assert await PostgresCacheBackend(database).get("k") is None
+        database.fetchval.assert_not_called()
+
+
+@pytest.mark.asyncio
+class TestSemanticLayer:
+
+    async def test_near_identical_prompt_hits(self):
+        from cache import LLMCache, SemanticCache
+
+        semantic = SemanticCache(
+            _embed_fn({
+                "find papers on ai tutors": [1.0, 0.0],
+                "find papers about ai tutors": [0.99, 0.05],
+                "compare two methods": [0.0, 1.0],
+            }),
+            threshold=0.95,
+        )
+        cache = LLMCache(semantic=semantic)
+        params = {"system_prompt": "s", "model": "m", "temperature": 0.1, "max_tokens": 200}
+
+        response, vector = await cache.semantic_get("intent", "find papers on ai tutors", **params)
+        assert response is None
+        cache.semantic_set("intent", "find papers on ai tutors", vector, '{"intent": "search"}', **params)
+
+        hit, _ = await cache.semantic_get("intent", "find papers about ai tutors", **params)
+        miss, _ = await cache.semantic_get("intent", "compare two methods", **params)
+        other_scope, _ = await cache.semantic_get(
+            "intent", "find papers about ai tutors", **{**params, "max_tokens": 50}
+        )
+
+        assert hit == '{"intent": "search"}'
+        assert miss is None
+        assert other_scope is None
+        assert cache.get_stats()["semantic_hits"] == 1
+
+    async def test_generate_with_semantic_cache_falls_back_to_generate(self):
+        from cache import generate_with_semantic_cache
+
+        provider = MagicMock()
+        provider.generate = AsyncMock(return_value="label")
+
+        result = await generate_with_semantic_cache(
+            provider, namespace="cluster_label", semantic_text="a, b", prompt="p", max_tokens=20
+        )
+
+        assert result == "label"
+        provider.generate.assert_awaited_once_with(prompt="p", max_tokens=20)
+
+    async def test_cached_provider_generate_semantic(self):
+        from cache import LLMCache, SemanticCache
+        from llm.cached_provider import CachedLLMProvider
+
+        inner = MagicMock()
+        inner.get_model = MagicMock(return_value="m")
+        inner.generate = AsyncMock(return_value='{"intent": "search"}')
+        cache = LLMCache(semantic=SemanticCache(_embed_fn({"q1": [1.0, 0.0], "q2": [0.98, 0.02]})))
+        provider = CachedLLMProvider(inner)
+
+        with patch("llm.cached_provider.get_llm_cache", return_value=cache):
+            first = await provider.generate_semantic("intent", "q1", prompt="Classify q1")
+            second = await provider.generate_semantic("intent", "q2", prompt="Classify q2")
+
+        assert first == second == '{"intent": "search"}'
+        inner.generate.assert_awaited_once()
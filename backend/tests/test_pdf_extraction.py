@@ -0,0 +1,88 @@
+"""
+Tests for off-loop PDF extraction (process pool, timeout, metadata parsing).
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import fitz
+import pytest
+
+import importers.pdf_extraction as pdf_extraction
+from importers.pdf_extraction import (
+    PDFExtraction,
+    extract_pdf_async,
+    parse_pdf_metadata,
+    shutdown_process_pool,
+)
+
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    path = tmp_path / "sample_paper.pdf"
+    doc = fitz.open()
+    for text in ("Graph Learning for Citation Networks\nAlice, Bob", "Second page body"):
+        page = doc.new_page()
+        page.insert_text((72, 72), text)
+    doc.new_page()  # blank page is dropped from the compact page list
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def _reset_pool():
+    yield
+    shutdown_process_pool()
+
+
+def test_parse_pdf_metadata_properties_and_fallbacks():
+    metadata = parse_pdf_metadata(
+        {"title": "", "author": "Alice; Bob", "creationDate": "D:20210101"},
+        "Short\nA Sufficiently Long Paper Title\n",
+        "",
+        "/tmp/my_paper-v2.pdf",
+    )
+
+    assert metadata["title"] == "A Sufficiently Long Paper Title"
+    assert metadata["authors"] == ["Alice", "Bob"]
+    assert metadata["year"] == 2021
+    assert parse_pdf_metadata(None, "", "", "/tmp/my_paper-v2.pdf")["title"] == "my paper v2"
+
+
+@pytest.mark.asyncio
+async def test_extracts_compact_pages_in_process_pool(sample_pdf):
+    extraction = await extract_pdf_async(sample_pdf, include_metadata=True)
+
+    assert extraction.error is None
+    assert len(extraction.pages) == 2
+    assert "Second page body" in extraction.text
+    assert extraction.metadata["title"] == "Graph Learning for Citation Networks"
+
+
+@pytest.mark.asyncio
+async def test_max_pages_and_missing_file(sample_pdf):
+    extraction = await extract_pdf_async(sample_pdf, max_pages=1)
+    assert len(extraction.pages) == 1
+
+    missing = await extract_pdf_async("/nonexistent/file.pdf")
+    assert missing.pages == []
+    assert missing.error
+
+
+@pytest.mark.asyncio
+async def test_timeout_returns_error_and_discards_pool(monkeypatch):
+    pool = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(pdf_extraction, "_process_pool", pool)
+
+    def slow_extract(*args):
+        time.sleep(0.5)
+        return PDFExtraction(pages=["late"])
+
+    monkeypatch.setattr(pdf_extraction, "extract_pdf_content", slow_extract)
+
+    extraction = await extract_pdf_async("any.pdf", timeout=0.05)
+
+    assert extraction.error == "timeout"
+    assert pdf_extraction._process_pool is None
+    pool.shutdown(wait=True)
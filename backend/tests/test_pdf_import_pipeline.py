@@ -0,0 +1,152 @@
+"""
+Tests for the staged multi-PDF import pipeline.
+
+Unit tests only — PDF parsing, LLM extraction and storage are mocked.
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from graph.entity_extractor import EntityType, ExtractedEntity
+from graph.entity_resolution import EntityResolutionService
+from importers.pdf_extraction import PDFExtraction
+from importers.pdf_importer import PDFImporter, run_staged_pipeline
+
+
+class _Item:
+    def __init__(self, name):
+        self.filename = name
+        self.error = None
+        self.seen = []
+
+
+@pytest.mark.asyncio
+class TestRunStagedPipeline:
+
+    async def test_respects_stage_concurrency_and_completes_each_item(self):
+        active = {"parse": 0, "llm": 0}
+        peak = {"parse": 0, "llm": 0}
+
+        def make_stage(name):
+            async def handler(item):
+                active[name] += 1
+                peak[name] = max(peak[name], active[name])
+                await asyncio.sleep(0.01)
+                item.seen.append(name)
+                active[name] -= 1
+            return handler
+
+        items = [_Item(f"p{i}.pdf") for i in range(8)]
+        done = []
+        await run_staged_pipeline(
+            items,
+            [("parse", make_stage("parse"), 2), ("llm", make_stage("llm"), 3)],
+            on_complete=done.append,
+            queue_size=1,
+        )
+
+        assert sorted(i.filename for i in done) == sorted(i.filename for i in items)
+        assert all(i.seen == ["parse", "llm"] for i in items)
+        assert peak["parse"] <= 2
+        assert peak["llm"] <= 3
+
+    async def test_failed_item_skips_later_stages(self):
+        async def parse(item):
+            if item.filename == "bad.pdf":
+                raise ValueError("corrupt")
+            item.seen.append("parse")
+
+        async def persist(item):
+            item.seen.append("persist")
+
+        items = [_Item("good.pdf"), _Item("bad.pdf")]
+        done = []
+        await run_staged_pipeline(items, [("parse", parse, 1), ("persist", persist, 1)], done.append)
+
+        assert len(done) == 2
+        assert items[0].seen == ["parse", "persist"]
+        assert items[1].seen == []
+        assert items[1].error == "corrupt"
+
+
+def _importer(progress):
+    importer = PDFImporter.__new__(PDFImporter)
+    importer.db = None
+    importer.owner_id = None
+    importer.progress_callback = lambda stage, value, message: progress.append((stage, value, message))
+    importer.graph_store = MagicMock()
+    importer.graph_store.add_entity = AsyncMock(side_effect=lambda **kw: f"id-{kw['name']}")
+    importer.graph_store.add_relationship = AsyncMock()
+    importer.graph_store.store_chunks = AsyncMock()
+    importer.semantic_chunker = MagicMock()
+    importer.semantic_chunker.chunk_academic_text = MagicMock(return_value={"chunks": [], "sections": []})
+    importer.entity_extractor = MagicMock()
+    importer.entity_extractor.llm = None
+    importer.entity_extractor.extract_from_paper = AsyncMock(return_value={
+        "concepts": [
+            ExtractedEntity(entity_type=EntityType.CONCEPT, name="Graph Learning", confidence=0.9),
+        ],
+    })
+    importer.entity_resolution = EntityResolutionService()
+    return importer
+
+
+@pytest.mark.asyncio
+async def test_import_multiple_pdfs_aggregates_stats_and_reports_progress():
+    progress = []
+    importer = _importer(progress)
+
+    async def fake_extract(path, **kwargs):
+        with open(path, "rb") as fh:
+            content = fh.read()
+        if content == b"empty":
+            return PDFExtraction()
+        return PDFExtraction(
+            pages=[content.decode() * 200],
+            metadata={"title": content.decode(), "authors": ["Alice"]},
+        )
+
+    with patch("importers.pdf_importer.extract_pdf_async", new=fake_extract), \
+            patch("importers.pdf_importer.ConceptCentricRelationshipBuilder") as builder_cls:
+        builder_cls.return_value.build_relationships = AsyncMock()
+        result = await importer.import_multiple_pdfs(
+            [("a.pdf", b"paper a "), ("b.pdf", b"empty"), ("c.pdf", b"paper c ")],
+            project_name="Pipeline",
+        )
+
+    stats = result["stats"]
+    assert result["success"] is True
+    assert stats["papers_imported"] == 2
+    assert stats["papers_failed"] == 1
+    assert stats["authors_extracted"] == 2
+    assert stats["concepts_extracted"] == 2
+    assert importer.entity_extractor.extract_from_paper.await_count == 2
+
+    messages = [message for _, _, message in progress]
+    assert any("[parse]" in m and "a.pdf" in m for m in messages)
+    assert any(m.startswith("Processed 3/3") for m in messages)
+    assert any("b.pdf failed" in m for m in messages)
+    assert progress[-1][0] == "complete"
+
+
+@pytest.mark.asyncio
+async def test_import_multiple_pdfs_reads_spooled_paths_in_place(tmp_path):
+    importer = _importer([])
+    spooled = tmp_path / "a.pdf"
+    spooled.write_bytes(b"paper a ")
+    seen_paths = []
+
+    async def fake_extract(path, **kwargs):
+        seen_paths.append(path)
+        return PDFExtraction(pages=["paper a " * 200], metadata={"title": "A", "authors": ["Alice"]})
+
+    with patch("importers.pdf_importer.extract_pdf_async", new=fake_extract), \
+            patch("importers.pdf_importer.ConceptCentricRelationshipBuilder") as builder_cls:
+        builder_cls.return_value.build_relationships = AsyncMock()
+        result = await importer.import_multiple_pdfs([("a.pdf", str(spooled))], project_name="Spool")
+
+    assert result["stats"]["papers_imported"] == 1
+    assert seen_paths == [str(spooled)]
+    assert spooled.exists()  # The spool owns the file, not the importer
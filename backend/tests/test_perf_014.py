@@ -138,8 +138,9 @@ class TestConcurrentPipeline:
         )
 
     @pytest.mark.asyncio
-    async def test_process_single_paper_uses_thread_for_pdf(self):
-        """asyncio.to_thread is called with extract_text_from_pdf when a PDF is available."""
+    async def test_process_single_paper_uses_process_pool_for_pdf(self):
+        """PDF text is extracted through the PDF process pool when a PDF is available."""
+        from importers.pdf_extraction import PDFExtraction
         from importers.zotero_rdf_importer import ZoteroRDFImporter, ZoteroItem
 
         mock_graph_store = AsyncMock()
@@ -171,7 +172,11 @@ class TestConcurrentPipeline:
         }
         results_lock = asyncio.Lock()
 
-        with patch("asyncio.to_thread", new=AsyncMock(return_value="extracted text")) as mock_to_thread:
+        extraction = PDFExtraction(pages=["extracted text"])
+        with patch(
+            "importers.zotero_rdf_importer.extract_pdf_async",
+            new=AsyncMock(return_value=extraction),
+        ) as mock_extract:
             await importer._process_single_paper(
                 item=item,
                 pdf_map=pdf_map,
@@ -184,10 +189,8 @@ class TestConcurrentPipeline:
                 results_lock=results_lock,
             )
 
-        mock_to_thread.assert_called_once()
-        # First positional arg should be the extract_text_from_pdf method
-        called_fn = mock_to_thread.call_args[0][0]
-        assert called_fn == importer.extract_text_from_pdf
+        mock_extract.assert_awaited_once_with("/fake/path.pdf", max_pages=50)
+        assert results["pdfs_processed"] == 1
 
     def test_concept_cache_lock_attribute_exists(self):
         """ZoteroRDFImporter._concept_cache exists and _process_single_paper uses concept_cache_lock."""
@@ -0,0 +1,153 @@
+"""
+Tests for QuotaService write-behind usage tracking.
+
+Unit tests only — the database is mocked.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+USER_ID = "00000000-0000-0000-0000-000000000001"
+
+
+def _mock_db(usage=0):
+    db = MagicMock()
+    db.fetchval = AsyncMock(return_value=usage)
+    db.execute = AsyncMock()
+    db.executemany = AsyncMock()
+    return db
+
+
+@pytest.mark.asyncio
+class TestWriteBehind:
+
+    async def test_track_usage_does_not_write(self):
+        from middleware.quota_service import QuotaService
+
+        db = _mock_db()
+        service = QuotaService(db=db)
+
+        for _ in range(3):
+            await service.track_usage(USER_ID, "openalex", "/openalex/search", response_time_ms=100)
+
+        db.execute.assert_not_called()
+        db.executemany.assert_not_called()
+        assert service.get_buffer_stats()["buffered_records"] == 1
+        assert service.get_buffer_stats()["pending_calls"] == 3
+
+    async def test_flush_writes_one_batch_of_aggregates(self):
+        from middleware.quota_service import QuotaService
+
+        db = _mock_db()
+        service = QuotaService(db=db)
+        await service.track_usage(USER_ID, "openalex", "/openalex/search", response_time_ms=100)
+        await service.track_usage(USER_ID, "openalex", "/openalex/search", response_time_ms=300)
+        await service.track_usage(None, "zotero", "/zotero/items", call_count=5)
+
+        assert await service.flush_buffer() == 2
+
+        db.executemany.assert_awaited_once()
+        rows = sorted(db.executemany.call_args[0][1], key=lambda row: row[2])
+        assert rows[0][:5] == (USER_ID, None, "openalex", "/openalex/search", 2)
+        assert rows[0][8] == 200  # average response time
+        assert rows[1][0] is None  # anonymous stored as NULL
+        assert rows[1][4] == 5
+        assert service.get_buffer_stats()["pending_calls"] == 0
+
+    async def test_pending_usage_counts_toward_quota(self):
+        from middleware.quota_service import QuotaService
+
+        db = _mock_db(usage=10)
+        service = QuotaService(db=db)
+        await service.track_usage(USER_ID, "openalex", "/openalex/search", call_count=4)
+
+        status = await service.check_quota(USER_ID, "openalex")
+
+        assert status.used == 10 + 4 + 1  # persisted + buffered + this call
+
+    async def test_failed_flush_keeps_counts(self):
+        from middleware.quota_service import QuotaService
+
+        db = _mock_db()
+        db.executemany = AsyncMock(side_effect=ConnectionError("down"))
+        service = QuotaService(db=db)
+        await service.track_usage(USER_ID, "openalex", "/openalex/search", call_count=2)
+
+        assert await service.flush_buffer() == 0
+        await service.track_usage(USER_ID, "openalex", "/openalex/search", call_count=1)
+
+        stats = service.get_buffer_stats()
+        assert stats["buffered_records"] == 1
+        assert stats["pending_calls"] == 3
+        assert stats["flush_failures"] == 1
+
+        db.executemany = AsyncMock()
+        assert await service.flush_buffer() == 1
+        assert db.executemany.call_args[0][1][0][4] == 3
+
+    async def test_non_uuid_project_id_is_stored_as_null(self):
+        from middleware.quota_service import QuotaService
+
+        db = _mock_db()
+        service = QuotaService(db=db)
+        await service.track_usage(USER_ID, "openalex", "/search", project_id="not-a-uuid")
+
+        await service.flush_buffer()
+
+        assert db.executemany.call_args[0][1][0][1] is None
+
+    async def test_rejected_row_does_not_block_flush(self):
+        import asyncpg
+
+        from middleware.quota_service import MAX_ROW_WRITE_ATTEMPTS, QuotaService
+
+        deleted_project = "00000000-0000-0000-0000-0000000000ff"
+        written = []
+
+        async def _executemany(query, rows):
+            if any(row[1] == deleted_project for row in rows):
+                raise asyncpg.exceptions.ForeignKeyViolationError("project does not exist")
+            written.extend(rows)
+
+        db = _mock_db()
+        db.executemany = AsyncMock(side_effect=_executemany)
+        service = QuotaService(db=db)
+        await service.track_usage(USER_ID, "openalex", "/search", call_count=2)
+        await service.track_usage(USER_ID, "zotero", "/sync", project_id=deleted_project)
+
+        assert await service.flush_buffer() == 1
+        assert [row[2] for row in written] == ["openalex"]
+        assert service.get_buffer_stats()["buffered_records"] == 1
+
+        for _ in range(MAX_ROW_WRITE_ATTEMPTS - 1):
+            assert await service.flush_buffer() == 0
+
+        stats = service.get_buffer_stats()
+        assert stats["buffered_records"] == 0
+        assert stats["pending_calls"] == 0
+        assert stats["rows_dropped"] == 1
+
+    async def test_buffer_is_bounded(self):
+        from middleware.quota_service import OVERFLOW_ENDPOINT, QuotaService
+
+        service = QuotaService(db=_mock_db(), max_buffer_keys=2)
+        for i in range(5):
+            await service.track_usage(USER_ID, "openalex", f"/openalex/works/{i}")
+
+        stats = service.get_buffer_stats()
+        assert stats["buffered_records"] == 3  # two endpoints + one overflow bucket
+        assert stats["pending_calls"] == 5
+        assert stats["overflow_folds"] == 3
+        assert any(key[3] == OVERFLOW_ENDPOINT for key in service._usage_buffer)
+
+    async def test_stop_flushes_remaining_usage(self):
+        from middleware.quota_service import QuotaService
+
+        db = _mock_db()
+        service = QuotaService(db=db, flush_interval=60)
+        service.start()
+        await service.track_usage(USER_ID, "openalex", "/openalex/search")
+
+        assert await service.stop() == 1
+        db.executemany.assert_awaited_once()
+        assert service.get_buffer_stats()["flusher_running"] is False
@@ -0,0 +1,104 @@
+"""
+Tests for the sliding-window rate limit stores (middleware.rate_limiter).
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+class TestSlidingWindowRateLimitStore:
+
+    async def test_limits_within_window(self):
+        from middleware.rate_limiter import SlidingWindowRateLimitStore
+
+        clock = FakeClock(1_000_020.0)  # Start of a 60s window
+        store = SlidingWindowRateLimitStore(clock=clock)
+
+        results = [await store.is_rate_limited("ip:/api/chat", 3, 60) for _ in range(4)]
+
+        assert results == [(False, 2), (False, 1), (False, 0), (True, 0)]
+
+    async def test_previous_window_is_weighted(self):
+        from middleware.rate_limiter import SlidingWindowRateLimitStore
+
+        window_start = 60.0 * 16_667
+        clock = FakeClock(window_start - 59)
+        store = SlidingWindowRateLimitStore(clock=clock)
+        for _ in range(10):
+            await store.is_rate_limited("k", 10, 60)
+
+        # 30s into the next window: 10 * 0.5 = 5 requests still count
+        clock.now = window_start + 30
+        allowed = 0
+        while not (await store.is_rate_limited("k", 10, 60))[0]:
+            allowed += 1
+        assert allowed == 5
+
+        # Two windows later, the key starts fresh
+        clock.now += 120
+        assert await store.is_rate_limited("k", 10, 60) == (False, 9)
+
+    async def test_idle_keys_expire_via_timing_wheel(self):
+        from middleware.rate_limiter import SlidingWindowRateLimitStore
+
+        clock = FakeClock()
+        store = SlidingWindowRateLimitStore(tick_seconds=5.0, num_slots=8, clock=clock)
+        for i in range(50):
+            await store.is_rate_limited(f"client-{i}", 10, 60)
+        assert len(store) == 50
+
+        clock.now += 60
+        await store.is_rate_limited("active", 10, 60)
+        await store.cleanup()
+        assert len(store) == 51  # Not expired yet (2 windows)
+
+        clock.now += 65
+        await store.cleanup()
+        assert len(store) == 1  # Only "active" remains until its own expiry
+
+        clock.now += 200
+        await store.cleanup()
+        assert len(store) == 0
+
+    async def test_default_store_is_sliding_window(self):
+        from middleware.rate_limiter import SlidingWindowRateLimitStore, init_rate_limit_store
+
+        assert isinstance(init_rate_limit_store(), SlidingWindowRateLimitStore)
+
+
+@pytest.mark.asyncio
+class TestRedisRateLimitStore:
+
+    async def test_single_script_call(self):
+        from middleware.rate_limiter import RedisRateLimitStore
+
+        script = AsyncMock(return_value=[0, 7])
+        redis_client = MagicMock()
+        redis_client.register_script = MagicMock(return_value=script)
+        store = RedisRateLimitStore("redis://localhost:6379")
+        store._redis = redis_client
+
+        assert await store.is_rate_limited("ip:/api/chat", 10, 60) == (False, 7)
+        assert await store.is_rate_limited("ip:/api/chat", 10, 60) == (False, 7)
+
+        redis_client.register_script.assert_called_once()
+        assert script.await_args.kwargs == {"keys": ["ratelimit:ip:/api/chat"], "args": [10, 60]}
+
+    async def test_fails_open(self):
+        from middleware.rate_limiter import RedisRateLimitStore
+
+        redis_client = MagicMock()
+        redis_client.register_script = MagicMock(return_value=AsyncMock(side_effect=ConnectionError("down")))
+        store = RedisRateLimitStore("redis://localhost:6379")
+        store._redis = redis_client
+
+        assert await store.is_rate_limited("k", 10, 60) == (False, 10)
@@ -0,0 +1,127 @@
+"""
+Tests for provider-aware LLM rate limiting and concurrent batch extraction.
+
+Unit tests only — the LLM provider and clock are mocked.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from llm.rate_limiter import (
+    DEFAULT_PROVIDER_LIMITS,
+    ProviderLimits,
+    TokenBucketLimiter,
+    get_provider_limiter,
+    get_provider_limits,
+    provider_key,
+)
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucketLimiter:
+
+    def test_provider_key_strips_cache_wrapper(self):
+        assert provider_key(SimpleNamespace(name="cached_groq")) == "groq"
+        assert provider_key(MagicMock()) == "default"
+        assert provider_key(None) == "default"
+        assert get_provider_limits("unknown") is DEFAULT_PROVIDER_LIMITS
+        assert get_provider_limiter("groq") is get_provider_limiter("groq")
+
+    async def test_burst_then_waits_for_request_refill(self):
+        clock = _FakeClock()
+        limiter = TokenBucketLimiter(
+            ProviderLimits(requests_per_minute=60, tokens_per_minute=60_000, max_concurrency=2),
+            clock=clock,
+        )
+        sleeps = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+            clock.now += seconds
+
+        with patch("llm.rate_limiter.asyncio.sleep", fake_sleep):
+            assert await limiter.acquire() == 0
+            assert await limiter.acquire() == 0
+            waited = await limiter.acquire()
+
+        # 60 RPM -> one request per second once the burst of 2 is spent
+        assert waited == pytest.approx(1.0)
+        assert sleeps == [pytest.approx(1.0)]
+
+    async def test_waits_for_token_budget(self):
+        clock = _FakeClock()
+        limiter = TokenBucketLimiter(
+            ProviderLimits(requests_per_minute=600, tokens_per_minute=6_000, max_concurrency=5),
+            clock=clock,
+        )
+
+        async def fake_sleep(seconds):
+            clock.now += seconds
+
+        with patch("llm.rate_limiter.asyncio.sleep", fake_sleep):
+            assert await limiter.acquire(5_000) == 0
+            # 1,000 tokens left, 100 tokens/s refill -> 2s for 1,200 tokens
+            assert await limiter.acquire(1_200) == pytest.approx(2.0)
+            # Oversized requests are clamped to the bucket size instead of hanging
+            assert await limiter.acquire(50_000) == pytest.approx(60.0)
+
+
+class TestConcurrentBatchExtract:
+
+    @pytest.fixture
+    def extractor(self):
+        from graph.entity_extractor import EntityExtractor
+
+        return EntityExtractor(llm_provider=MagicMock(spec=["name", "generate"]))
+
+    async def test_stream_yields_in_completion_order(self, extractor):
+        delays = {"slow": 0.05, "fast": 0.0}
+
+        async def fake_extract(title, abstract, paper_id=None, max_retries=0, **kwargs):
+            await asyncio.sleep(delays[title])
+            return {"paper_id": paper_id}
+
+        extractor.extract_from_paper = fake_extract
+        papers = [
+            {"title": "slow", "abstract": "", "paper_id": "p0"},
+            {"title": "fast", "abstract": "", "paper_id": "p1"},
+        ]
+
+        order = [index async for index, _ in extractor.extract_stream(papers, max_concurrency=2)]
+        assert order == [1, 0]
+
+        results = await extractor.batch_extract(papers, max_concurrency=2)
+        assert [r["paper_id"] for r in results] == ["p0", "p1"]
+
+    async def test_failed_call_retried_without_blocking_batch(self, extractor):
+        calls = {}
+
+        async def flaky_generate(prompt, **kwargs):
+            key = "first" if "Paper A" in prompt else "second"
+            calls[key] = calls.get(key, 0) + 1
+            if key == "first" and calls[key] == 1:
+                raise RuntimeError("429 rate limited")
+            return '{"concepts": [{"name": "graph", "definition": "d", "confidence": 0.9}]}'
+
+        extractor.llm.generate = AsyncMock(side_effect=flaky_generate)
+        papers = [
+            {"title": "Paper A", "abstract": "About graphs.", "paper_id": "a"},
+            {"title": "Paper B", "abstract": "About graphs.", "paper_id": "b"},
+        ]
+
+        with patch("graph.entity_extractor.RETRY_DELAY_SECONDS", 0.0), \
+                patch.dict("llm.rate_limiter._limiters", clear=True):
+            completed = [index async for index, _ in extractor.extract_stream(papers)]
+
+        assert completed[0] == 1
+        assert calls == {"first": 2, "second": 1}
@@ -0,0 +1,82 @@
+"""
+Tests for ConceptCentricRelationshipBuilder blocked semantic similarity search.
+
+Unit tests only — no database connections required.
+"""
+
+import numpy as np
+import pytest
+
+from graph.relationship_builder import ConceptCentricRelationshipBuilder
+
+
+def _concepts(n: int, dim: int = 16, seed: int = 0) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    base = rng.normal(size=(4, dim))
+    # Four tight groups so plenty of pairs clear the threshold
+    vecs = base[np.arange(n) % 4] + 0.15 * rng.normal(size=(n, dim))
+    return [
+        {"id": f"c{i}", "name": f"Concept {i}", "embedding": vecs[i].tolist()}
+        for i in range(n)
+    ]
+
+
+def _brute_force_pairs(concepts: list[dict], threshold: float) -> dict:
+    emb = np.array([c["embedding"] for c in concepts], dtype=np.float64)
+    emb /= np.linalg.norm(emb, axis=1, keepdims=True)
+    sims = emb @ emb.T
+    pairs = {}
+    for i in range(len(concepts)):
+        for j in range(i + 1, len(concepts)):
+            if sims[i, j] >= threshold:
+                pairs[(concepts[i]["id"], concepts[j]["id"])] = sims[i, j]
+    return pairs
+
+
+class TestBlockedSemanticRelationships:
+
+    @pytest.mark.parametrize("block_size", [1, 7, 64])
+    def test_unbounded_matches_brute_force(self, block_size):
+        concepts = _concepts(40)
+        builder = ConceptCentricRelationshipBuilder(max_neighbors=None)
+
+        rels = builder.build_semantic_relationships(
+            concepts, similarity_threshold=0.7, block_size=block_size
+        )
+
+        expected = _brute_force_pairs(concepts, 0.7)
+        got = {(r.source_id, r.target_id): r.confidence for r in rels}
+        assert set(got) == set(expected)
+        for key, score in got.items():
+            assert score == pytest.approx(expected[key], abs=1e-5)
+
+    def test_neighbor_cap_limits_degree(self):
+        concepts = _concepts(40)
+        builder = ConceptCentricRelationshipBuilder(max_neighbors=3)
+
+        rels = builder.build_semantic_relationships(
+            concepts, similarity_threshold=0.0, block_size=8
+        )
+
+        # Every kept pair is in someone's top-3, so edges <= n * k and no duplicates
+        keys = [(r.source_id, r.target_id) for r in rels]
+        assert len(keys) == len(set(keys))
+        assert len(keys) <= 40 * 3
+        assert all(r.source_id != r.target_id for r in rels)
+
+    def test_cap_keeps_strongest_neighbours(self):
+        concepts = _concepts(20)
+        builder = ConceptCentricRelationshipBuilder()
+
+        capped = builder.build_semantic_relationships(
+            concepts, similarity_threshold=0.7, max_neighbors=1
+        )
+        full = _brute_force_pairs(concepts, 0.7)
+
+        for rel in capped:
+            assert (rel.source_id, rel.target_id) in full
+            assert rel.properties["inference_method"] == "embedding_similarity"
+
+    def test_too_few_concepts_returns_empty(self):
+        builder = ConceptCentricRelationshipBuilder()
+        assert builder.build_semantic_relationships(_concepts(1)) == []
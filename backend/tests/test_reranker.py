@@ -0,0 +1,99 @@
+"""
+Tests for SemanticReranker batching, stored-embedding reuse and query cache.
+
+Unit tests only — embedding service and database are mocked.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from graph.reranker import SemanticReranker, clear_query_embedding_cache
+
+
+def _service(vectors_by_text: dict):
+    service = MagicMock()
+    service.embed_texts = MagicMock(
+        side_effect=lambda texts: [vectors_by_text[t] for t in texts]
+    )
+    service.embed_text = MagicMock(side_effect=AssertionError("embed_text must not be called"))
+    return service
+
+
+@pytest.fixture(autouse=True)
+def _reset_query_cache():
+    clear_query_embedding_cache()
+    yield
+    clear_query_embedding_cache()
+
+
+@pytest.mark.asyncio
+class TestSemanticReranker:
+
+    async def test_single_batch_for_query_and_results(self):
+        service = _service({
+            "graph": [1.0, 0.0],
+            "A": [0.0, 1.0],
+            "B": [1.0, 0.0],
+        })
+        reranker = SemanticReranker(embedding_service=service)
+        results = [
+            {"name": "A", "score": 0.5},
+            {"name": "B", "score": 0.5},
+        ]
+
+        reranked = await reranker.rerank("graph", results)
+
+        service.embed_texts.assert_called_once_with(["graph", "A", "B"])
+        assert [r["name"] for r in reranked] == ["B", "A"]
+        assert reranked[0]["rerank_score"] == pytest.approx(1.0)
+        assert reranked[1]["rerank_score"] == pytest.approx(0.0)
+
+    async def test_reuses_stored_entity_embeddings(self):
+        service = _service({"graph": [1.0, 0.0], "B": [0.0, 1.0]})
+        database = MagicMock()
+        database.fetch = AsyncMock(return_value=[
+            {"id": "e1", "embedding": "[1.0, 0.0]"},
+        ])
+        reranker = SemanticReranker(embedding_service=service, database=database)
+        results = [
+            {"id": "e1", "name": "A", "score": 0.1},
+            {"id": "e2", "name": "B", "score": 0.9},
+        ]
+
+        reranked = await reranker.rerank("graph", results)
+
+        # Only the result without a stored embedding is sent to the provider
+        service.embed_texts.assert_called_once_with(["graph", "B"])
+        by_id = {r["id"]: r for r in reranked}
+        assert by_id["e1"]["rerank_score"] == pytest.approx(1.0)
+
+    async def test_stored_embedding_with_other_dimension_is_reembedded(self):
+        service = _service({"graph": [1.0, 0.0], "A": [0.0, 1.0]})
+        database = MagicMock()
+        database.fetch = AsyncMock(return_value=[
+            {"id": "e1", "embedding": [1.0, 0.0, 0.0]},
+        ])
+        reranker = SemanticReranker(embedding_service=service, database=database)
+
+        reranked = await reranker.rerank("graph", [{"id": "e1", "name": "A"}])
+
+        assert service.embed_texts.call_count == 2
+        assert reranked[0]["rerank_score"] == pytest.approx(0.0)
+
+    async def test_repeated_query_uses_cached_embedding(self):
+        service = _service({"graph": [1.0, 0.0], "A": [1.0, 0.0]})
+        reranker = SemanticReranker(embedding_service=service)
+
+        await reranker.rerank("graph", [{"name": "A"}])
+        await reranker.rerank("Graph ", [{"name": "A"}])
+
+        second_call_texts = service.embed_texts.call_args_list[1][0][0]
+        assert second_call_texts == ["A"]
+
+    async def test_failure_returns_original_order(self):
+        service = MagicMock()
+        service.embed_texts = MagicMock(side_effect=RuntimeError("provider down"))
+        reranker = SemanticReranker(embedding_service=service)
+        results = [{"name": "A"}, {"name": "B"}]
+
+        assert await reranker.rerank("q", results, top_k=1) == results[:1]
@@ -0,0 +1,99 @@
+"""
+Tests for the upload spool (chunked streaming, size limits, PDF dedup).
+"""
+
+import hashlib
+import os
+import time
+
+import pytest
+
+from importers.upload_spool import (
+    UploadSpool,
+    UploadTooLargeError,
+    prune_blob_store,
+    safe_relative_path,
+)
+
+
+class FakeUpload:
+    """Minimal UploadFile stand-in that records chunked reads."""
+
+    def __init__(self, filename, data):
+        self.filename = filename
+        self._data = data
+        self._pos = 0
+        self.read_sizes = []
+
+    async def read(self, size=-1):
+        self.read_sizes.append(size)
+        if size is None or size < 0:
+            size = len(self._data) - self._pos
+        chunk = self._data[self._pos:self._pos + size]
+        self._pos += len(chunk)
+        return chunk
+
+
+@pytest.mark.asyncio
+class TestUploadSpool:
+
+    async def test_streams_in_chunks_and_hashes(self, tmp_path):
+        data = os.urandom(3 * 1024 * 1024 + 17)
+        upload = FakeUpload("paper.pdf", data)
+        spool = UploadSpool(root=tmp_path)
+
+        saved = await spool.save(upload)
+
+        assert saved.size == len(data)
+        assert saved.sha256 == hashlib.sha256(data).hexdigest()
+        assert open(saved.path, "rb").read() == data
+        assert all(0 < size < len(data) for size in upload.read_sizes)
+        assert spool.total_bytes == len(data)
+
+    async def test_size_limits_remove_partial_file(self, tmp_path):
+        spool = UploadSpool(root=tmp_path, max_total_bytes=1500)
+
+        with pytest.raises(UploadTooLargeError):
+            await spool.save(FakeUpload("big.pdf", b"x" * 2000), max_bytes=1000)
+        await spool.save(FakeUpload("a.pdf", b"a" * 1000))
+        with pytest.raises(UploadTooLargeError):
+            await spool.save(FakeUpload("b.pdf", b"b" * 1000))
+
+        assert sorted(os.listdir(spool.path)) == ["a.pdf"]
+
+    async def test_identical_pdfs_share_one_blob_across_jobs(self, tmp_path):
+        data = b"%PDF-1.4 same paper"
+        first, second = UploadSpool(root=tmp_path), UploadSpool(root=tmp_path)
+
+        a = await first.save(FakeUpload("a.pdf", data), dedupe=True)
+        b = await second.save(FakeUpload("files/K1/b.pdf", data),
+                              relative_path=safe_relative_path("files/K1/b.pdf"), dedupe=True)
+
+        assert (a.deduplicated, b.deduplicated) == (False, True)
+        assert os.path.samefile(a.path, b.path)
+        assert len(os.listdir(tmp_path / "blobs")) == 1
+
+        first.cleanup()
+        second.cleanup()
+        assert open(tmp_path / "blobs" / a.sha256, "rb").read() == data
+
+    async def test_prune_keeps_linked_and_recent_blobs(self, tmp_path):
+        spool = UploadSpool(root=tmp_path)
+        kept = await spool.save(FakeUpload("kept.pdf", b"kept"), dedupe=True)
+        other = UploadSpool(root=tmp_path)
+        dropped = await other.save(FakeUpload("drop.pdf", b"drop"), dedupe=True)
+        other.cleanup()
+
+        assert prune_blob_store(retention_hours=1, root=tmp_path) == 0  # Still recent
+        old = time.time() - 7200
+        for sha in (kept.sha256, dropped.sha256):
+            os.utime(tmp_path / "blobs" / sha, (old, old))
+
+        assert prune_blob_store(retention_hours=1, root=tmp_path) == 1
+        assert os.listdir(tmp_path / "blobs") == [kept.sha256]
+
+
+def test_safe_relative_path_rejects_traversal():
+    assert safe_relative_path("files/K1/paper.pdf") is not None
+    for bad in ("", "/etc/passwd", "../x.pdf", "files/../../x.pdf", "..\\x.pdf"):
+        assert safe_relative_path(bad) is None
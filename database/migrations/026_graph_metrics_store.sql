@@ -0,0 +1,151 @@
+-- Migration 026: Persistent Graph Metrics Store
+-- Version-stamped storage for centrality / metrics / diversity / summary payloads
+-- All operations are idempotent
+
+BEGIN;
+
+-- ============================================================================
+-- 1. Project graph version counter
+-- Bumped by statement-level triggers on entities/relationships writes.
+-- No FK to projects: cascaded deletes would otherwise fail while the project
+-- row is already gone. Orphaned rows are a single BIGINT each.
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS project_graph_versions (
+    project_id UUID PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+COMMENT ON TABLE project_graph_versions IS 'Monotonic graph version per project; bumped on entity/relationship writes';
+
+-- ============================================================================
+-- 2. Computed metrics, valid only while graph_version matches
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS graph_metrics_store (
+    project_id UUID NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    metric_key VARCHAR(100) NOT NULL,
+    graph_version BIGINT NOT NULL,
+    payload JSONB NOT NULL,
+    computed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (project_id, metric_key)
+);
+
+COMMENT ON TABLE graph_metrics_store IS 'Persisted graph metrics payloads keyed by project graph version';
+
+-- ============================================================================
+-- 3. Version bump helpers
+-- ============================================================================
+CREATE OR REPLACE FUNCTION bump_graph_version(p_project_ids UUID[])
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO project_graph_versions (project_id, version, updated_at)
+    SELECT DISTINCT pid, 1, NOW()
+    FROM unnest(p_project_ids) AS pid
+    WHERE pid IS NOT NULL
+    ON CONFLICT (project_id) DO UPDATE
+    SET version = project_graph_versions.version + 1,
+        updated_at = NOW();
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION trg_graph_version_new_rows()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM bump_graph_version(ARRAY(SELECT DISTINCT project_id FROM new_rows));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION trg_graph_version_old_rows()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM bump_graph_version(ARRAY(SELECT DISTINCT project_id FROM old_rows));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Entity updates only bump when graph-relevant columns change
+-- (centrality written back into properties must not invalidate itself).
+CREATE OR REPLACE FUNCTION trg_graph_version_entities_update()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM bump_graph_version(ARRAY(
+        SELECT DISTINCT n.project_id
+        FROM new_rows n
+        JOIN old_rows o ON o.id = n.id
+        WHERE o.name IS DISTINCT FROM n.name
+           OR o.entity_type IS DISTINCT FROM n.entity_type
+           OR o.project_id IS DISTINCT FROM n.project_id
+           OR o.source_paper_ids IS DISTINCT FROM n.source_paper_ids
+           OR o.embedding IS DISTINCT FROM n.embedding
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION trg_graph_version_relationships_update()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM bump_graph_version(ARRAY(
+        SELECT DISTINCT n.project_id
+        FROM new_rows n
+        JOIN old_rows o ON o.id = n.id
+        WHERE o.source_id IS DISTINCT FROM n.source_id
+           OR o.target_id IS DISTINCT FROM n.target_id
+           OR o.relationship_type IS DISTINCT FROM n.relationship_type
+           OR o.weight IS DISTINCT FROM n.weight
+           OR o.properties->>'weight' IS DISTINCT FROM n.properties->>'weight'
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- 4. Statement-level triggers (one bump per statement, not per row)
+-- ============================================================================
+DROP TRIGGER IF EXISTS graph_version_entities_insert ON entities;
+CREATE TRIGGER graph_version_entities_insert
+    AFTER INSERT ON entities
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_graph_version_new_rows();
+
+DROP TRIGGER IF EXISTS graph_version_entities_update ON entities;
+CREATE TRIGGER graph_version_entities_update
+    AFTER UPDATE ON entities
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_graph_version_entities_update();
+
+DROP TRIGGER IF EXISTS graph_version_entities_delete ON entities;
+CREATE TRIGGER graph_version_entities_delete
+    AFTER DELETE ON entities
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_graph_version_old_rows();
+
+DROP TRIGGER IF EXISTS graph_version_relationships_insert ON relationships;
+CREATE TRIGGER graph_version_relationships_insert
+    AFTER INSERT ON relationships
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_graph_version_new_rows();
+
+DROP TRIGGER IF EXISTS graph_version_relationships_update ON relationships;
+CREATE TRIGGER graph_version_relationships_update
+    AFTER UPDATE ON relationships
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_graph_version_relationships_update();
+
+DROP TRIGGER IF EXISTS graph_version_relationships_delete ON relationships;
+CREATE TRIGGER graph_version_relationships_delete
+    AFTER DELETE ON relationships
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_graph_version_old_rows();
+
+-- ============================================================================
+-- 5. Track migration
+-- ============================================================================
+INSERT INTO _migrations (name) VALUES ('026_graph_metrics_store.sql') ON CONFLICT DO NOTHING;
+CREATE TABLE IF NOT EXISTS schema_migrations (version VARCHAR(255) PRIMARY KEY, description TEXT, applied_at TIMESTAMP WITH TIME ZONE DEFAULT NOW());
+INSERT INTO schema_migrations (version, description) VALUES
+    ('026_graph_metrics_store', 'Version-stamped persistent graph metrics store')
+ON CONFLICT (version) DO NOTHING;
+
+COMMIT;
@@ -0,0 +1,25 @@
+-- Migration 027: Persistent LLM Response Cache
+-- Shared tier behind the in-process LLMCache (LLM_CACHE_BACKEND=postgres)
+-- All operations are idempotent
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS llm_cache_entries (
+    cache_key VARCHAR(64) PRIMARY KEY,  -- SHA-256 of prompt + params
+    value TEXT NOT NULL,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_cache_entries_expires_at
+    ON llm_cache_entries (expires_at);
+
+COMMENT ON TABLE llm_cache_entries IS 'LLM responses keyed by request hash; shared across workers and restarts';
+
+INSERT INTO _migrations (name) VALUES ('027_llm_cache.sql') ON CONFLICT DO NOTHING;
+CREATE TABLE IF NOT EXISTS schema_migrations (version VARCHAR(255) PRIMARY KEY, description TEXT, applied_at TIMESTAMP WITH TIME ZONE DEFAULT NOW());
+INSERT INTO schema_migrations (version, description) VALUES
+    ('027_llm_cache', 'Persistent LLM response cache')
+ON CONFLICT (version) DO NOTHING;
+
+COMMIT;
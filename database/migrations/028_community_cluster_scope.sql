@@ -0,0 +1,34 @@
+-- Migration 028: Separate community rows from gap clusters in concept_clusters
+-- Community detection (leiden / connected_components / label_propagation) and
+-- gap refresh (kmeans, referenced by structural_gaps) share concept_clusters
+-- and number their clusters independently from 0. Scope the cluster_id
+-- uniqueness per kind so neither writer can overwrite the other's rows.
+-- All operations are idempotent
+
+BEGIN;
+
+-- 1. Per-kind unique cluster ids
+CREATE UNIQUE INDEX IF NOT EXISTS idx_clusters_project_community_id
+    ON concept_clusters(project_id, cluster_id)
+    WHERE detection_method IN ('leiden', 'connected_components', 'label_propagation');
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_clusters_project_gap_cluster_id
+    ON concept_clusters(project_id, cluster_id)
+    WHERE NOT COALESCE(detection_method IN ('leiden', 'connected_components', 'label_propagation'), false);
+
+-- 2. Drop the shared (project_id, cluster_id) constraint from migration 008
+DROP INDEX IF EXISTS idx_clusters_project_cluster_id;
+
+COMMENT ON COLUMN concept_clusters.detection_method IS
+    'Algorithm used: kmeans (gap clusters), leiden, connected_components, label_propagation (communities)';
+
+-- ============================================================================
+-- 3. Track migration
+-- ============================================================================
+INSERT INTO _migrations (name) VALUES ('028_community_cluster_scope.sql') ON CONFLICT DO NOTHING;
+CREATE TABLE IF NOT EXISTS schema_migrations (version VARCHAR(255) PRIMARY KEY, description TEXT, applied_at TIMESTAMP WITH TIME ZONE DEFAULT NOW());
+INSERT INTO schema_migrations (version, description) VALUES
+    ('028_community_cluster_scope', 'Per-kind unique cluster ids for communities and gap clusters')
+ON CONFLICT (version) DO NOTHING;
+
+COMMIT;
@@ -671,10 +671,29 @@ class ApiClient {
     return this.request<GapAnalysisResult>(`/api/graph/gaps/${projectId}/analysis`);
   }
 
+  /**
+   * Re-run gap detection. The backend runs it as a background job; this polls
+   * the job and returns the new analysis once it has been committed.
+   */
   async refreshGapAnalysis(projectId: string): Promise<GapAnalysisResult> {
-    return this.request<GapAnalysisResult>(`/api/graph/gaps/${projectId}/refresh`, {
+    const job = await this.request<{ job_id: string }>(`/api/graph/gaps/${projectId}/refresh`, {
       method: 'POST',
     });
+
+    const deadline = Date.now() + 10 * 60 * 1000;
+    while (Date.now() < deadline) {
+      const status = await this.request<{ status: string; error?: string | null }>(
+        `/api/graph/gaps/${projectId}/refresh/${job.job_id}`
+      );
+      if (status.status === 'completed') {
+        return this.getGapAnalysis(projectId);
+      }
+      if (status.status === 'failed' || status.status === 'interrupted') {
+        throw new Error(status.error || 'Gap analysis refresh failed');
+      }
+      await this.delay(2000);
+    }
+    throw new Error('Gap analysis refresh timed out');
   }
 
   async getGapDetails(gapId: string): Promise<StructuralGap> {
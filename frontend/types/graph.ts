@@ -34,6 +34,8 @@ export interface TraceStep {
   edge_ids: string[];
   thought: string;
   duration_ms: number;
+  queue_wait_ms?: number;
+  run_ms?: number;
 }
 
 export interface RetrievalTrace {
@@ -269,7 +271,8 @@ export interface ImportValidationResult {
 
 // BUG-028 Extension: Checkpoint for resume support
 export interface ImportCheckpoint {
-  processed_paper_ids: string[];
+  processed_count?: number;
+  processed_paper_ids?: string[];  // Legacy checkpoints only; now stored in import_checkpoints
   total_papers: number;
   last_processed_index: number;
   project_id?: string;